@@ -0,0 +1,31 @@
+#include <algorithm>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "binder/binder.h"
+#include "binder/statement/analyze_statement.h"
+#include "binder/table_ref/bound_base_table_ref.h"
+#include "common/exception.h"
+
+namespace bustub {
+
+auto Binder::BindAnalyze(duckdb_libpgquery::PGVacuumStmt *stmt) -> std::unique_ptr<AnalyzeStatement> {
+  if ((stmt->options & duckdb_libpgquery::PG_VACOPT_VACUUM) != 0) {
+    throw NotImplementedException("VACUUM is not supported");
+  }
+  if (stmt->va_cols != nullptr) {
+    throw NotImplementedException("ANALYZE of some columns is not supported");
+  }
+
+  std::vector<std::string> tables;
+  if (stmt->relation != nullptr) {
+    tables.push_back(BindBaseTableRef(stmt->relation->relname, std::nullopt)->table_);
+  } else {
+    tables = catalog_.GetTableNames();
+    std::sort(tables.begin(), tables.end());
+  }
+  return std::make_unique<AnalyzeStatement>(std::move(tables));
+}
+
+}  // namespace bustub
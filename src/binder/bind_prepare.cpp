@@ -0,0 +1,95 @@
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "binder/binder.h"
+#include "binder/bound_expression.h"
+#include "binder/expressions/bound_constant.h"
+#include "binder/expressions/bound_parameter.h"
+#include "binder/statement/prepare_statement.h"
+#include "common/exception.h"
+#include "fmt/format.h"
+#include "type/type_id.h"
+
+namespace bustub {
+
+namespace {
+
+auto BindParamType(duckdb_libpgquery::PGTypeName *type_name) -> TypeId {
+  auto name =
+      std::string(reinterpret_cast<duckdb_libpgquery::PGValue *>(type_name->names->tail->data.ptr_value)->val.str);
+  if (name == "int4") {
+    return TypeId::INTEGER;
+  }
+  if (name == "int8") {
+    return TypeId::BIGINT;
+  }
+  if (name == "varchar") {
+    return TypeId::VARCHAR;
+  }
+  if (name == "bool") {
+    return TypeId::BOOLEAN;
+  }
+  throw NotImplementedException(fmt::format("unsupported parameter type: {}", name));
+}
+
+}  // namespace
+
+auto Binder::BindPrepare(duckdb_libpgquery::PGPrepareStmt *stmt) -> std::unique_ptr<PrepareStatement> {
+  std::vector<TypeId> param_types;
+  if (stmt->argtypes != nullptr) {
+    for (auto c = stmt->argtypes->head; c != nullptr; c = lnext(c)) {
+      param_types.push_back(BindParamType(reinterpret_cast<duckdb_libpgquery::PGTypeName *>(c->data.ptr_value)));
+    }
+  }
+
+  // Parameters are only allowed within the prepared statement; the ones without a declared type are added as found.
+  if (param_types_ != nullptr) {
+    throw bustub::Exception("nested PREPARE is not supported");
+  }
+  param_types_ = &param_types;
+  std::unique_ptr<BoundStatement> statement;
+  try {
+    statement = BindStatement(stmt->query);
+  } catch (...) {
+    param_types_ = nullptr;
+    throw;
+  }
+  param_types_ = nullptr;
+
+  return std::make_unique<PrepareStatement>(stmt->name, std::move(param_types), std::move(statement));
+}
+
+auto Binder::BindExecute(duckdb_libpgquery::PGExecuteStmt *stmt) -> std::unique_ptr<ExecuteStatement> {
+  std::vector<Value> params;
+  if (stmt->params != nullptr) {
+    for (auto &expr : BindExpressionList(stmt->params)) {
+      if (expr->type_ != ExpressionType::CONSTANT) {
+        throw bustub::NotImplementedException("Only constant parameters are supported");
+      }
+      params.push_back(dynamic_cast<const BoundConstant &>(*expr).val_);
+    }
+  }
+  return std::make_unique<ExecuteStatement>(stmt->name, std::move(params));
+}
+
+auto Binder::BindDeallocate(duckdb_libpgquery::PGDeallocateStmt *stmt) -> std::unique_ptr<DeallocateStatement> {
+  return std::make_unique<DeallocateStatement>(stmt->name == nullptr ? "" : stmt->name);
+}
+
+auto Binder::BindParamRef(duckdb_libpgquery::PGParamRef *node) -> std::unique_ptr<BoundExpression> {
+  if (param_types_ == nullptr) {
+    throw bustub::Exception("parameters are only supported in prepared statements");
+  }
+  if (node->number < 1) {
+    throw bustub::Exception(fmt::format("invalid parameter ${}", node->number));
+  }
+  auto param_idx = static_cast<uint32_t>(node->number - 1);
+  if (param_idx >= param_types_->size()) {
+    param_types_->resize(param_idx + 1, TypeId::INTEGER);
+  }
+  return std::make_unique<BoundParameter>(param_idx, (*param_types_)[param_idx]);
+}
+
+}  // namespace bustub
@@ -800,6 +800,8 @@ auto Binder::BindExpression(duckdb_libpgquery::PGNode *node) -> std::unique_ptr<
       return BindAExpr(reinterpret_cast<duckdb_libpgquery::PGAExpr *>(node));
     case duckdb_libpgquery::T_PGBoolExpr:
       return BindBoolExpr(reinterpret_cast<duckdb_libpgquery::PGBoolExpr *>(node));
+    case duckdb_libpgquery::T_PGParamRef:
+      return BindParamRef(reinterpret_cast<duckdb_libpgquery::PGParamRef *>(node));
     default:
       break;
   }
@@ -25,11 +25,13 @@
 #include "binder/bound_expression.h"
 #include "binder/bound_order_by.h"
 #include "binder/bound_statement.h"
+#include "binder/statement/analyze_statement.h"
 #include "binder/statement/create_statement.h"
 #include "binder/statement/delete_statement.h"
 #include "binder/statement/explain_statement.h"
 #include "binder/statement/index_statement.h"
 #include "binder/statement/insert_statement.h"
+#include "binder/statement/prepare_statement.h"
 #include "binder/statement/select_statement.h"
 #include "binder/statement/update_statement.h"
 #include "binder/table_ref/bound_base_table_ref.h"
@@ -71,6 +73,14 @@ auto Binder::BindStatement(duckdb_libpgquery::PGNode *stmt) -> std::unique_ptr<B
       return BindVariableSet(reinterpret_cast<duckdb_libpgquery::PGVariableSetStmt *>(stmt));
     case duckdb_libpgquery::T_PGVariableShowStmt:
       return BindVariableShow(reinterpret_cast<duckdb_libpgquery::PGVariableShowStmt *>(stmt));
+    case duckdb_libpgquery::T_PGVacuumStmt:
+      return BindAnalyze(reinterpret_cast<duckdb_libpgquery::PGVacuumStmt *>(stmt));
+    case duckdb_libpgquery::T_PGPrepareStmt:
+      return BindPrepare(reinterpret_cast<duckdb_libpgquery::PGPrepareStmt *>(stmt));
+    case duckdb_libpgquery::T_PGExecuteStmt:
+      return BindExecute(reinterpret_cast<duckdb_libpgquery::PGExecuteStmt *>(stmt));
+    case duckdb_libpgquery::T_PGDeallocateStmt:
+      return BindDeallocate(reinterpret_cast<duckdb_libpgquery::PGDeallocateStmt *>(stmt));
     default:
       throw NotImplementedException(NodeTagToString(stmt->type));
   }
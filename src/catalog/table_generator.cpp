@@ -77,9 +77,10 @@ void TableGenerator::FillTable(TableInfo *info, TableInsertMeta *table_meta) {
       for (const auto &col : values) {
         entry.emplace_back(col[i]);
       }
-      auto rid =
-          info->table_->InsertTuple(TupleMeta{INVALID_TXN_ID, INVALID_TXN_ID, false}, Tuple(entry, &info->schema_));
+      Tuple tuple(entry, &info->schema_);
+      auto rid = info->table_->InsertTuple(TupleMeta{INVALID_TXN_ID, INVALID_TXN_ID, false}, tuple);
       BUSTUB_ENSURE(rid != std::nullopt, "Sequential insertion cannot fail");
+      info->stats_.Insert(tuple, info->schema_);
       num_inserted++;
     }
   }
@@ -0,0 +1,281 @@
+#include "catalog/table_statistics.h"
+
+#include <algorithm>
+#include <cmath>
+#include <iterator>
+#include <utility>
+
+#include "common/util/hash_util.h"
+
+namespace bustub {
+
+namespace {
+
+auto AsDouble(const Value &value) -> std::optional<double> {
+  switch (value.GetTypeId()) {
+    case TypeId::TINYINT:
+      return value.GetAs<int8_t>();
+    case TypeId::SMALLINT:
+      return value.GetAs<int16_t>();
+    case TypeId::INTEGER:
+      return value.GetAs<int32_t>();
+    case TypeId::BIGINT:
+      return static_cast<double>(value.GetAs<int64_t>());
+    case TypeId::DECIMAL:
+      return value.GetAs<double>();
+    default:
+      return std::nullopt;
+  }
+}
+
+/**
+ * @return a well-spread hash of the value. Integers are hashed from their value directly, as `HashUtil::HashValue`
+ * maps many small integers to the same hash, which would make them count as one value.
+ */
+auto SketchHash(const Value &value) -> uint64_t {
+  switch (value.GetTypeId()) {
+    case TypeId::TINYINT:
+      return HashUtil::MixHash(static_cast<uint64_t>(value.GetAs<int8_t>()));
+    case TypeId::SMALLINT:
+      return HashUtil::MixHash(static_cast<uint64_t>(value.GetAs<int16_t>()));
+    case TypeId::INTEGER:
+      return HashUtil::MixHash(static_cast<uint64_t>(value.GetAs<int32_t>()));
+    case TypeId::BIGINT:
+      return HashUtil::MixHash(static_cast<uint64_t>(value.GetAs<int64_t>()));
+    default:
+      return HashUtil::MixHash(HashUtil::HashValue(&value));
+  }
+}
+
+auto IsLess(const Value &lhs, const Value &rhs) -> bool { return lhs.CompareLessThan(rhs) == CmpBool::CmpTrue; }
+
+/** @return the position of `value` between `lo` and `hi`, from 0 to 1; 0.5 if the values are not numbers */
+auto Interpolate(const Value &lo, const Value &hi, const Value &value) -> double {
+  const auto lo_num = AsDouble(lo);
+  const auto hi_num = AsDouble(hi);
+  const auto num = AsDouble(value);
+  if (!lo_num.has_value() || !hi_num.has_value() || !num.has_value()) {
+    return 0.5;
+  }
+  if (*hi_num <= *lo_num) {
+    return *num < *lo_num ? 0 : 1;
+  }
+  return std::clamp((*num - *lo_num) / (*hi_num - *lo_num), 0.0, 1.0);
+}
+
+}  // namespace
+
+void HyperLogLog::Add(const Value &value) {
+  const uint64_t hash = SketchHash(value);
+  const auto idx = hash >> (64 - PRECISION);
+  // The rank of the first set bit after the index bits; the guard bit bounds it when all of them are 0.
+  const uint64_t rest = (hash << PRECISION) | (uint64_t{1} << (PRECISION - 1));
+  const auto rank = static_cast<uint8_t>(__builtin_clzll(rest) + 1);
+  registers_[idx] = std::max(registers_[idx], rank);
+}
+
+auto HyperLogLog::Estimate() const -> double {
+  constexpr double m = NUM_REGISTERS;
+  double sum = 0;
+  size_t zeros = 0;
+  for (const auto reg : registers_) {
+    sum += std::ldexp(1.0, -reg);
+    zeros += reg == 0 ? 1 : 0;
+  }
+  const double alpha = 0.7213 / (1 + 1.079 / m);
+  const double estimate = alpha * m * m / sum;
+  // Small cardinalities are estimated better by linear counting of the empty registers.
+  if (estimate <= 2.5 * m && zeros > 0) {
+    return m * std::log(m / static_cast<double>(zeros));
+  }
+  return estimate;
+}
+
+void ColumnStatistics::Add(const Value &value) {
+  if (value.IsNull()) {
+    null_count_ += 1;
+    return;
+  }
+  value_count_ += 1;
+  distinct_.Add(value);
+  if (!min_.has_value() || IsLess(value, *min_)) {
+    min_ = value;
+  }
+  if (!max_.has_value() || IsLess(*max_, value)) {
+    max_ = value;
+  }
+  if (bucket_bounds_.empty()) {
+    return;
+  }
+  // Count the value into its bucket; a value above the histogram extends the last bucket.
+  auto it = std::lower_bound(bucket_bounds_.begin(), bucket_bounds_.end(), value, IsLess);
+  if (it == bucket_bounds_.end()) {
+    bucket_bounds_.back() = value;
+    it = std::prev(bucket_bounds_.end());
+  }
+  bucket_counts_[it - bucket_bounds_.begin()] += 1;
+}
+
+void ColumnStatistics::Remove(const Value &value) {
+  if (value.IsNull()) {
+    null_count_ = std::max(null_count_ - 1, 0.0);
+    return;
+  }
+  value_count_ = std::max(value_count_ - 1, 0.0);
+  if (bucket_bounds_.empty()) {
+    return;
+  }
+  auto it = std::lower_bound(bucket_bounds_.begin(), bucket_bounds_.end(), value, IsLess);
+  if (it != bucket_bounds_.end()) {
+    auto &count = bucket_counts_[it - bucket_bounds_.begin()];
+    count = std::max(count - 1, 0.0);
+  }
+}
+
+void ColumnStatistics::Sample(const Value &value) {
+  if (value.IsNull()) {
+    return;
+  }
+  sampled_count_ += 1;
+  if (sample_.size() < SAMPLE_SIZE) {
+    sample_.push_back(value);
+    return;
+  }
+  // Keep the value with probability SAMPLE_SIZE / sampled_count_, in place of a random one.
+  const auto pos = HashUtil::MixHash(sampled_count_) % sampled_count_;
+  if (pos < SAMPLE_SIZE) {
+    sample_[pos] = value;
+  }
+}
+
+void ColumnStatistics::BuildHistogram() {
+  bucket_bounds_.clear();
+  bucket_counts_.clear();
+  if (!sample_.empty()) {
+    std::sort(sample_.begin(), sample_.end(), IsLess);
+    const auto num_buckets = std::min(NUM_BUCKETS, sample_.size());
+    for (size_t i = 0; i < num_buckets; i++) {
+      bucket_bounds_.push_back(sample_[(i + 1) * sample_.size() / num_buckets - 1]);
+      bucket_counts_.push_back(value_count_ / static_cast<double>(num_buckets));
+    }
+  }
+  sample_ = {};
+  sampled_count_ = 0;
+}
+
+auto ColumnStatistics::EstimateDistinct() const -> double {
+  return std::max(std::min(distinct_.Estimate(), value_count_), 1.0);
+}
+
+auto ColumnStatistics::EstimateBelow(const Value &value, bool inclusive) const -> double {
+  const double equal = 1 / EstimateDistinct();
+  if (IsLess(value, *min_)) {
+    return 0;
+  }
+  if (IsLess(*max_, value)) {
+    return 1;
+  }
+
+  double below;
+  if (bucket_bounds_.empty()) {
+    // Without a histogram, assume that the values are spread evenly over their range.
+    below = Interpolate(*min_, *max_, value);
+  } else {
+    double total = 0;
+    double count = 0;
+    for (size_t i = 0; i < bucket_bounds_.size(); i++) {
+      total += bucket_counts_[i];
+      const auto &lo = i == 0 ? *min_ : bucket_bounds_[i - 1];
+      const auto &hi = bucket_bounds_[i];
+      if (IsLess(hi, value)) {
+        count += bucket_counts_[i];
+      } else if (IsLess(lo, value)) {
+        count += bucket_counts_[i] * Interpolate(lo, hi, value);
+      }
+    }
+    below = total == 0 ? 0 : count / total;
+  }
+  return std::clamp(inclusive ? below + equal : below, 0.0, 1.0);
+}
+
+auto ColumnStatistics::EstimateSelectivity(ComparisonType comp_type, const Value &value) const -> double {
+  if (value_count_ == 0 || value.IsNull()) {
+    return 0;
+  }
+  if (!value.CheckComparable(*min_)) {
+    return comp_type == ComparisonType::Equal ? 0.1 : 1.0 / 3;
+  }
+  const bool in_range = !IsLess(value, *min_) && !IsLess(*max_, value);
+  const double equal = in_range ? 1 / EstimateDistinct() : 0;
+  switch (comp_type) {
+    case ComparisonType::Equal:
+      return equal;
+    case ComparisonType::NotEqual:
+      return 1 - equal;
+    case ComparisonType::LessThan:
+      return EstimateBelow(value, false);
+    case ComparisonType::LessThanOrEqual:
+      return EstimateBelow(value, true);
+    case ComparisonType::GreaterThan:
+      return 1 - EstimateBelow(value, true);
+    case ComparisonType::GreaterThanOrEqual:
+      return 1 - EstimateBelow(value, false);
+  }
+  return 1;
+}
+
+void TableStatistics::Reset(double row_count, std::vector<ColumnStatistics> columns) {
+  std::scoped_lock lock(latch_);
+  is_analyzed_ = true;
+  row_count_ = row_count;
+  columns_ = std::move(columns);
+}
+
+void TableStatistics::Insert(const Tuple &tuple, const Schema &schema) {
+  std::scoped_lock lock(latch_);
+  row_count_ += 1;
+  for (uint32_t i = 0; i < columns_.size(); i++) {
+    columns_[i].Add(tuple.GetValue(&schema, i));
+  }
+}
+
+void TableStatistics::Delete(const Tuple &tuple, const Schema &schema) {
+  std::scoped_lock lock(latch_);
+  row_count_ = std::max(row_count_ - 1, 0.0);
+  for (uint32_t i = 0; i < columns_.size(); i++) {
+    columns_[i].Remove(tuple.GetValue(&schema, i));
+  }
+}
+
+auto TableStatistics::IsAnalyzed() const -> bool {
+  std::scoped_lock lock(latch_);
+  return is_analyzed_;
+}
+
+auto TableStatistics::GetRowCount() const -> double {
+  std::scoped_lock lock(latch_);
+  return row_count_;
+}
+
+auto TableStatistics::EstimateDistinct(uint32_t column_idx) const -> std::optional<double> {
+  std::scoped_lock lock(latch_);
+  if (!is_analyzed_ || column_idx >= columns_.size()) {
+    return std::nullopt;
+  }
+  return columns_[column_idx].EstimateDistinct();
+}
+
+auto TableStatistics::EstimateSelectivity(uint32_t column_idx, ComparisonType comp_type, const Value &value) const
+    -> std::optional<double> {
+  std::scoped_lock lock(latch_);
+  if (!is_analyzed_ || column_idx >= columns_.size()) {
+    return std::nullopt;
+  }
+  if (row_count_ == 0) {
+    return 0;
+  }
+  const auto &column = columns_[column_idx];
+  return column.EstimateSelectivity(comp_type, value) * column.GetValueCount() / row_count_;
+}
+
+}  // namespace bustub
@@ -1,17 +1,22 @@
-// DDL (Data Definition Language) statement handling in BusTub, including create table, create index, and set/show
-// variable.
+// DDL (Data Definition Language) statement handling in BusTub, including create table, create index, set/show
+// variable, prepared statements, and analyze.
 
+#include <memory>
+#include <mutex>  // NOLINT
 #include <optional>
 #include <shared_mutex>
 #include <string>
 #include <tuple>
+#include <utility>
 
 #include "binder/binder.h"
 #include "binder/bound_expression.h"
 #include "binder/bound_statement.h"
+#include "binder/statement/analyze_statement.h"
 #include "binder/statement/create_statement.h"
 #include "binder/statement/explain_statement.h"
 #include "binder/statement/index_statement.h"
+#include "binder/statement/prepare_statement.h"
 #include "binder/statement/select_statement.h"
 #include "binder/statement/set_show_statement.h"
 #include "buffer/buffer_pool_manager.h"
@@ -28,6 +33,8 @@
 #include "execution/executors/mock_scan_executor.h"
 #include "execution/expressions/abstract_expression.h"
 #include "execution/plans/abstract_plan.h"
+#include "execution/plans/mock_scan_plan.h"
+#include "execution/plans/seq_scan_plan.h"
 #include "fmt/core.h"
 #include "fmt/format.h"
 #include "optimizer/optimizer.h"
@@ -43,6 +50,7 @@ namespace bustub {
 void BustubInstance::HandleCreateStatement(Transaction *txn, const CreateStatement &stmt, ResultWriter &writer) {
   std::unique_lock<std::shared_mutex> l(catalog_lock_);
   auto info = catalog_->CreateTable(txn, stmt.table_, Schema(stmt.columns_));
+  InvalidatePlans();
   l.unlock();
 
   if (info == nullptr) {
@@ -75,6 +83,7 @@ void BustubInstance::HandleIndexStatement(Transaction *txn, const IndexStatement
   auto info = catalog_->CreateIndex<IntegerKeyType, IntegerValueType, IntegerComparatorType>(
       txn, stmt.index_name_, stmt.table_->table_, stmt.table_->schema_, key_schema, col_ids, TWO_INTEGER_SIZE,
       IntegerHashFunctionType{});
+  InvalidatePlans();
   l.unlock();
 
   if (info == nullptr) {
@@ -134,6 +143,133 @@ void BustubInstance::HandleVariableShowStatement(Transaction *txn, const Variabl
 void BustubInstance::HandleVariableSetStatement(Transaction *txn, const VariableSetStatement &stmt,
                                                 ResultWriter &writer) {
   session_variables_[stmt.variable_] = stmt.value_;
+  InvalidatePlans();
+}
+
+void BustubInstance::HandlePrepareStatement(Transaction *txn, const PrepareStatement &stmt, std::string sql,
+                                            ResultWriter &writer) {
+  auto prepared = std::make_shared<PreparedStatement>();
+  prepared->sql_ = std::move(sql);
+  prepared->param_types_ = stmt.param_types_;
+  prepared->param_values_ = std::make_shared<ParameterValues>();
+  prepared->plan_ = PlanStatement(*stmt.statement_, prepared->param_values_);
+
+  std::scoped_lock lock(prepared_statements_latch_);
+  if (!prepared_statements_.emplace(stmt.name_, std::move(prepared)).second) {
+    throw Exception(fmt::format("prepared statement {} already exists", stmt.name_));
+  }
+}
+
+auto BustubInstance::HandleExecuteStatement(Transaction *txn, const ExecuteStatement &stmt, ResultWriter &writer,
+                                            std::shared_ptr<CheckOptions> check_options) -> bool {
+  std::shared_ptr<PreparedStatement> prepared;
+  {
+    std::scoped_lock lock(prepared_statements_latch_);
+    auto it = prepared_statements_.find(stmt.name_);
+    if (it == prepared_statements_.end()) {
+      throw Exception(fmt::format("prepared statement {} does not exist", stmt.name_));
+    }
+    prepared = it->second;
+  }
+  if (stmt.params_.size() != prepared->param_types_.size()) {
+    throw Exception(fmt::format("prepared statement {} expects {} parameters, got {}", stmt.name_,
+                                prepared->param_types_.size(), stmt.params_.size()));
+  }
+
+  std::scoped_lock lock(prepared->latch_);
+  prepared->param_values_->clear();
+  for (size_t i = 0; i < stmt.params_.size(); i++) {
+    const auto &param = stmt.params_[i];
+    const auto type = prepared->param_types_[i];
+    prepared->param_values_->push_back(param.GetTypeId() == type ? param : param.CastAs(type));
+  }
+  return ExecutePlan(*prepared->plan_, txn, writer, std::move(check_options));
+}
+
+void BustubInstance::RefreshPreparedStatements() {
+  const uint64_t version = plan_version_;
+  if (prepared_version_ == version) {
+    return;
+  }
+
+  std::vector<std::shared_ptr<PreparedStatement>> prepared_statements;
+  {
+    std::scoped_lock lock(prepared_statements_latch_);
+    for (const auto &[name, prepared] : prepared_statements_) {
+      prepared_statements.push_back(prepared);
+    }
+  }
+
+  for (const auto &prepared : prepared_statements) {
+    std::scoped_lock lock(prepared->latch_);
+    if (prepared->plan_->version_ == version) {
+      continue;
+    }
+    std::shared_lock<std::shared_mutex> l(catalog_lock_);
+    bustub::Binder binder(*catalog_);
+    binder.ParseAndSave(prepared->sql_);
+    auto statement = binder.BindStatement(binder.statement_nodes_.at(0));
+    l.unlock();
+    const auto &prepare_stmt = dynamic_cast<const PrepareStatement &>(*statement);
+    prepared->plan_ = PlanStatement(*prepare_stmt.statement_, prepared->param_values_);
+  }
+  prepared_version_ = version;
+}
+
+void BustubInstance::HandleDeallocateStatement(Transaction *txn, const DeallocateStatement &stmt,
+                                               ResultWriter &writer) {
+  std::scoped_lock lock(prepared_statements_latch_);
+  if (stmt.name_.empty()) {
+    prepared_statements_.clear();
+    return;
+  }
+  if (prepared_statements_.erase(stmt.name_) == 0) {
+    throw Exception(fmt::format("prepared statement {} does not exist", stmt.name_));
+  }
+}
+
+void BustubInstance::HandleAnalyzeStatement(Transaction *txn, const AnalyzeStatement &stmt, ResultWriter &writer) {
+  for (const auto &table_name : stmt.tables_) {
+    std::shared_lock<std::shared_mutex> l(catalog_lock_);
+    auto *table_info = catalog_->GetTable(table_name);
+    l.unlock();
+    if (table_info == Catalog::NULL_TABLE_INFO) {
+      throw Exception(fmt::format("table {} does not exist", table_name));
+    }
+
+    // Scan the whole table, which is generated rather than stored for a mock table.
+    const auto &schema = table_info->schema_;
+    AbstractPlanNodeRef plan;
+    if (StringUtil::StartsWith(table_name, "__mock")) {
+      plan = std::make_shared<MockScanPlanNode>(std::make_shared<Schema>(schema), table_name);
+    } else {
+      plan = std::make_shared<SeqScanPlanNode>(std::make_shared<Schema>(schema), table_info->oid_, table_name);
+    }
+    auto exec_ctx = MakeExecutorContext(txn, false);
+    exec_ctx->SetParallelism(GetParallelism());
+
+    double row_count = 0;
+    std::vector<ColumnStatistics> columns(schema.GetColumnCount());
+    execution_engine_->Execute(
+        plan,
+        [&](const TupleBatch &batch) {
+          row_count += static_cast<double>(batch.Size());
+          for (uint32_t i = 0; i < columns.size(); i++) {
+            for (const auto &value : batch.Column(i)) {
+              columns[i].Add(value);
+              columns[i].Sample(value);
+            }
+          }
+          return true;
+        },
+        txn, exec_ctx.get());
+    for (auto &column : columns) {
+      column.BuildHistogram();
+    }
+    table_info->stats_.Reset(row_count, std::move(columns));
+  }
+  // Plans are costed with the statistics, so replan the cached ones.
+  InvalidatePlans();
 }
 
 }  // namespace bustub
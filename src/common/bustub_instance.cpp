@@ -7,9 +7,11 @@
 #include "binder/binder.h"
 #include "binder/bound_expression.h"
 #include "binder/bound_statement.h"
+#include "binder/statement/analyze_statement.h"
 #include "binder/statement/create_statement.h"
 #include "binder/statement/explain_statement.h"
 #include "binder/statement/index_statement.h"
+#include "binder/statement/prepare_statement.h"
 #include "binder/statement/select_statement.h"
 #include "binder/statement/set_show_statement.h"
 #include "buffer/buffer_pool_manager.h"
@@ -17,6 +19,7 @@
 #include "catalog/table_generator.h"
 #include "common/bustub_instance.h"
 #include "common/exception.h"
+#include "common/plan_cache.h"
 #include "common/util/string_util.h"
 #include "concurrency/lock_manager.h"
 #include "concurrency/transaction.h"
@@ -226,6 +229,14 @@ auto BustubInstance::ExecuteSqlTxn(const std::string &sql, ResultWriter &writer,
     throw Exception(fmt::format("unsupported internal command: {}", sql));
   }
 
+  RefreshPreparedStatements();
+
+  // A statement that ran before is executed from the plan cache, skipping parsing, binding, planning and optimizing.
+  auto cache_key = PlanCache::Normalize(sql);
+  if (auto cached_plan = plan_cache_.Get(cache_key, plan_version_); cached_plan != nullptr) {
+    return ExecutePlan(*cached_plan, txn, writer, std::move(check_options));
+  }
+
   bool is_successful = true;
 
   std::shared_lock<std::shared_mutex> l(catalog_lock_);
@@ -236,8 +247,6 @@ auto BustubInstance::ExecuteSqlTxn(const std::string &sql, ResultWriter &writer,
   for (auto *stmt : binder.statement_nodes_) {
     auto statement = binder.BindStatement(stmt);
 
-    bool is_delete = false;
-
     switch (statement->type_) {
       case StatementType::CREATE_STATEMENT: {
         const auto &create_stmt = dynamic_cast<const CreateStatement &>(*statement);
@@ -264,55 +273,104 @@ auto BustubInstance::ExecuteSqlTxn(const std::string &sql, ResultWriter &writer,
         HandleExplainStatement(txn, explain_stmt, writer);
         continue;
       }
-      case StatementType::DELETE_STATEMENT:
-      case StatementType::UPDATE_STATEMENT:
-        is_delete = true;
+      case StatementType::PREPARE_STATEMENT: {
+        const auto &prepare_stmt = dynamic_cast<const PrepareStatement &>(*statement);
+        const auto *raw_stmt = reinterpret_cast<duckdb_libpgquery::PGRawStmt *>(stmt);
+        auto prepare_sql = sql;
+        if (raw_stmt->stmt_location >= 0) {
+          prepare_sql = raw_stmt->stmt_len == 0 ? sql.substr(raw_stmt->stmt_location)
+                                                : sql.substr(raw_stmt->stmt_location, raw_stmt->stmt_len);
+        }
+        HandlePrepareStatement(txn, prepare_stmt, std::move(prepare_sql), writer);
+        continue;
+      }
+      case StatementType::EXECUTE_STATEMENT: {
+        const auto &execute_stmt = dynamic_cast<const ExecuteStatement &>(*statement);
+        is_successful &= HandleExecuteStatement(txn, execute_stmt, writer, std::move(check_options));
+        continue;
+      }
+      case StatementType::DEALLOCATE_STATEMENT: {
+        const auto &deallocate_stmt = dynamic_cast<const DeallocateStatement &>(*statement);
+        HandleDeallocateStatement(txn, deallocate_stmt, writer);
+        continue;
+      }
+      case StatementType::ANALYZE_STATEMENT: {
+        const auto &analyze_stmt = dynamic_cast<const AnalyzeStatement &>(*statement);
+        HandleAnalyzeStatement(txn, analyze_stmt, writer);
+        continue;
+      }
       default:
         break;
     }
 
-    std::shared_lock<std::shared_mutex> l(catalog_lock_);
+    auto plan = PlanStatement(*statement, nullptr);
+    if (binder.statement_nodes_.size() == 1) {
+      plan_cache_.Put(cache_key, plan);
+    }
+    is_successful &= ExecutePlan(*plan, txn, writer, std::move(check_options));
+  }
+
+  return is_successful;
+}
+
+auto BustubInstance::PlanStatement(const BoundStatement &statement,
+                                   std::shared_ptr<const ParameterValues> parameter_values)
+    -> std::shared_ptr<const CachedPlan> {
+  std::shared_lock<std::shared_mutex> l(catalog_lock_);
+  const uint64_t version = plan_version_;
 
-    // Plan the query.
-    bustub::Planner planner(*catalog_);
-    planner.PlanQuery(*statement);
+  // Plan the query.
+  bustub::Planner planner(*catalog_, std::move(parameter_values));
+  planner.PlanQuery(statement);
 
-    // Optimize the query.
-    bustub::Optimizer optimizer(*catalog_, IsForceStarterRule());
-    auto optimized_plan = optimizer.Optimize(planner.plan_);
+  // Optimize the query.
+  bustub::Optimizer optimizer(*catalog_, IsForceStarterRule());
+  auto optimized_plan = optimizer.Optimize(planner.plan_);
 
-    l.unlock();
+  l.unlock();
 
-    // Execute the query.
-    auto exec_ctx = MakeExecutorContext(txn, is_delete);
-    if (check_options != nullptr) {
-      exec_ctx->InitCheckOptions(std::move(check_options));
-    }
-    std::vector<Tuple> result_set{};
-    is_successful &= execution_engine_->Execute(optimized_plan, &result_set, txn, exec_ctx.get());
+  const bool is_modify =
+      statement.type_ == StatementType::DELETE_STATEMENT || statement.type_ == StatementType::UPDATE_STATEMENT;
+  return std::make_shared<const CachedPlan>(
+      CachedPlan{std::move(optimized_plan), planner.plan_->output_schema_, is_modify, version});
+}
 
-    // Return the result set as a vector of string.
-    auto schema = planner.plan_->OutputSchema();
+auto BustubInstance::ExecutePlan(const CachedPlan &plan, Transaction *txn, ResultWriter &writer,
+                                 std::shared_ptr<CheckOptions> check_options) -> bool {
+  // Execute the query.
+  auto exec_ctx = MakeExecutorContext(txn, plan.is_modify_);
+  exec_ctx->SetParallelism(GetParallelism());
+  exec_ctx->SetMemoryBudget(GetOperatorMemoryBudget());
+  if (check_options != nullptr) {
+    exec_ctx->InitCheckOptions(std::move(check_options));
+  }
 
-    // Generate header for the result set.
-    writer.BeginTable(false);
-    writer.BeginHeader();
-    for (const auto &column : schema.GetColumns()) {
-      writer.WriteHeaderCell(column.GetName());
-    }
-    writer.EndHeader();
+  const auto &schema = *plan.output_schema_;
 
-    // Transforming result set into strings.
-    for (const auto &tuple : result_set) {
-      writer.BeginRow();
-      for (uint32_t i = 0; i < schema.GetColumnCount(); i++) {
-        writer.WriteCell(tuple.GetValue(&schema, i).ToString());
-      }
-      writer.EndRow();
-    }
-    writer.EndTable();
+  // Generate header for the result set.
+  writer.BeginTable(false);
+  writer.BeginHeader();
+  for (const auto &column : schema.GetColumns()) {
+    writer.WriteHeaderCell(column.GetName());
   }
+  writer.EndHeader();
 
+  // Write the rows as the query produces them, so that large results are neither buffered nor delayed.
+  auto is_successful = execution_engine_->Execute(
+      plan.plan_,
+      [&](const TupleBatch &batch) {
+        for (size_t row = 0; row < batch.Size(); row++) {
+          writer.BeginRow();
+          for (uint32_t i = 0; i < schema.GetColumnCount(); i++) {
+            writer.WriteCell(batch.ValueAt(row, i).ToString());
+          }
+          writer.EndRow();
+        }
+        writer.Flush();
+        return true;
+      },
+      txn, exec_ctx.get());
+  writer.EndTable();
   return is_successful;
 }
 
@@ -328,6 +386,7 @@ void BustubInstance::GenerateTestTable() {
 
   std::shared_lock<std::shared_mutex> l(catalog_lock_);
   gen.GenerateTestTables();
+  InvalidatePlans();
   l.unlock();
 
   txn_manager_->Commit(txn);
@@ -347,6 +406,7 @@ void BustubInstance::GenerateMockTable() {
   for (auto table_name = &mock_table_list[0]; *table_name != nullptr; table_name++) {
     catalog_->CreateTable(txn, *table_name, GetMockTableSchemaOf(*table_name), false);
   }
+  InvalidatePlans();
   l.unlock();
 
   txn_manager_->Commit(txn);
@@ -0,0 +1,99 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// plan_cache.cpp
+//
+// Identification: src/common/plan_cache.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "common/plan_cache.h"
+
+#include <cctype>
+#include <memory>
+#include <string>
+#include <utility>
+
+namespace bustub {
+
+auto PlanCache::Normalize(const std::string &sql) -> std::string {
+  std::string key;
+  key.reserve(sql.size());
+  char quote = 0;
+  bool pending_space = false;
+  for (char c : sql) {
+    if (quote != 0) {
+      key.push_back(c);
+      if (c == quote) {
+        quote = 0;
+      }
+      continue;
+    }
+    if (std::isspace(static_cast<unsigned char>(c)) != 0) {
+      pending_space = !key.empty();
+      continue;
+    }
+    if (pending_space) {
+      key.push_back(' ');
+      pending_space = false;
+    }
+    if (c == '\'' || c == '"') {
+      quote = c;
+    }
+    key.push_back(static_cast<char>(std::tolower(static_cast<unsigned char>(c))));
+  }
+  while (!key.empty() && (key.back() == ';' || key.back() == ' ')) {
+    key.pop_back();
+  }
+  return key;
+}
+
+auto PlanCache::Get(const std::string &key, uint64_t version) -> std::shared_ptr<const CachedPlan> {
+  std::scoped_lock lock(latch_);
+  auto it = index_.find(key);
+  if (it == index_.end()) {
+    return nullptr;
+  }
+  if (it->second->second->version_ != version) {
+    entries_.erase(it->second);
+    index_.erase(it);
+    return nullptr;
+  }
+  entries_.splice(entries_.begin(), entries_, it->second);
+  return it->second->second;
+}
+
+void PlanCache::Put(const std::string &key, std::shared_ptr<const CachedPlan> plan) {
+  if (capacity_ == 0) {
+    return;
+  }
+  std::scoped_lock lock(latch_);
+  auto it = index_.find(key);
+  if (it != index_.end()) {
+    it->second->second = std::move(plan);
+    entries_.splice(entries_.begin(), entries_, it->second);
+    return;
+  }
+  if (entries_.size() == capacity_) {
+    index_.erase(entries_.back().first);
+    entries_.pop_back();
+  }
+  entries_.emplace_front(key, std::move(plan));
+  index_.emplace(key, entries_.begin());
+}
+
+void PlanCache::Clear() {
+  std::scoped_lock lock(latch_);
+  entries_.clear();
+  index_.clear();
+}
+
+auto PlanCache::Size() -> size_t {
+  std::scoped_lock lock(latch_);
+  return entries_.size();
+}
+
+}  // namespace bustub
@@ -1,29 +1,237 @@
-//===----------------------------------------------------------------------===//
-//
-//                         BusTub
-//
-// aggregation_executor.cpp
-//
-// Identification: src/execution/aggregation_executor.cpp
-//
-// Copyright (c) 2015-2021, Carnegie Mellon University Database Group
-//
-//===----------------------------------------------------------------------===//
-#include <memory>
-#include <vector>
-
-#include "execution/executors/aggregation_executor.h"
-
-namespace bustub {
-
-AggregationExecutor::AggregationExecutor(ExecutorContext *exec_ctx, const AggregationPlanNode *plan,
-                                         std::unique_ptr<AbstractExecutor> &&child_executor)
-    : AbstractExecutor(exec_ctx) {}
-
-void AggregationExecutor::Init() {}
-
-auto AggregationExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
-
-auto AggregationExecutor::GetChildExecutor() const -> const AbstractExecutor * { return child_executor_.get(); }
-
-}  // namespace bustub
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// aggregation_executor.cpp
+//
+// Identification: src/execution/aggregation_executor.cpp
+//
+// Copyright (c) 2015-2021, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>  // NOLINT
+#include <deque>
+#include <exception>
+#include <memory>
+#include <mutex>   // NOLINT
+#include <thread>  // NOLINT
+#include <utility>
+#include <vector>
+
+#include "execution/executors/aggregation_executor.h"
+
+namespace bustub {
+
+namespace {
+
+auto ReturnTypes(const std::vector<AbstractExpressionRef> &exprs) -> std::vector<TypeId> {
+  std::vector<TypeId> types;
+  types.reserve(exprs.size());
+  for (const auto &expr : exprs) {
+    types.push_back(expr->GetReturnType());
+  }
+  return types;
+}
+
+}  // namespace
+
+AggregationExecutor::AggregationExecutor(ExecutorContext *exec_ctx, const AggregationPlanNode *plan,
+                                         std::unique_ptr<AbstractExecutor> &&child_executor)
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      child_executor_(std::move(child_executor)),
+      key_types_(ReturnTypes(plan->GetGroupBys())),
+      input_types_(ReturnTypes(plan->GetAggregates())) {}
+
+auto AggregationExecutor::MakeTable() const -> AggregationHashTable {
+  return {key_types_, plan_->GetAggregateTypes(), input_types_};
+}
+
+void AggregationExecutor::AggregateBatch(const TupleBatch &batch, AggregationHashTable *table,
+                                         std::vector<std::vector<Value>> *keys,
+                                         std::vector<std::vector<Value>> *inputs) const {
+  const auto &group_bys = plan_->GetGroupBys();
+  const auto &aggregates = plan_->GetAggregates();
+  const auto &agg_types = plan_->GetAggregateTypes();
+  keys->resize(group_bys.size());
+  inputs->resize(aggregates.size());
+  for (size_t i = 0; i < group_bys.size(); i++) {
+    group_bys[i]->EvaluateBatch(batch, &(*keys)[i]);
+  }
+  for (size_t i = 0; i < aggregates.size(); i++) {
+    // The input of COUNT(*) is a constant placeholder that is never read.
+    if (agg_types[i] != AggregationType::CountStarAggregate) {
+      aggregates[i]->EvaluateBatch(batch, &(*inputs)[i]);
+    }
+  }
+  table->InsertBatch(*keys, *inputs, batch.Size());
+}
+
+void AggregationExecutor::Init() {
+  child_executor_->Init();
+  tables_.clear();
+  table_idx_ = 0;
+  next_group_ = 0;
+  emitted_initial_ = false;
+
+  const size_t workers = exec_ctx_->GetParallelism();
+  if (workers > 1) {
+    RunParallel(workers);
+  } else {
+    RunSerial();
+  }
+}
+
+void AggregationExecutor::RunSerial() {
+  tables_.push_back(MakeTable());
+  std::vector<std::vector<Value>> keys;
+  std::vector<std::vector<Value>> inputs;
+  TupleBatch batch;
+  while (child_executor_->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+    AggregateBatch(batch, &tables_[0], &keys, &inputs);
+  }
+}
+
+void AggregationExecutor::RunParallel(size_t workers) {
+  std::vector<AggregationHashTable> partials;
+  for (size_t i = 0; i < workers; i++) {
+    partials.push_back(MakeTable());
+  }
+
+  // Phase 1: the child is read by this thread, and the workers pre-aggregate whole batches into their partial table.
+  std::mutex latch;
+  std::condition_variable batch_ready;
+  std::condition_variable batch_taken;
+  std::deque<TupleBatch> batches;
+  bool done = false;
+  std::exception_ptr error;
+
+  std::vector<std::thread> threads;
+  for (size_t w = 0; w < workers; w++) {
+    threads.emplace_back([&, w] {
+      std::vector<std::vector<Value>> keys;
+      std::vector<std::vector<Value>> inputs;
+      while (true) {
+        TupleBatch batch;
+        {
+          std::unique_lock lock(latch);
+          batch_ready.wait(lock, [&] { return !batches.empty() || done; });
+          if (batches.empty()) {
+            return;
+          }
+          batch = std::move(batches.front());
+          batches.pop_front();
+          batch_taken.notify_one();
+        }
+        try {
+          AggregateBatch(batch, &partials[w], &keys, &inputs);
+        } catch (...) {
+          std::scoped_lock lock(latch);
+          error = std::current_exception();
+        }
+      }
+    });
+  }
+
+  try {
+    TupleBatch batch;
+    while (child_executor_->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+      std::unique_lock lock(latch);
+      batch_taken.wait(lock, [&] { return batches.size() < 2 * workers || error != nullptr; });
+      if (error != nullptr) {
+        break;
+      }
+      batches.push_back(std::move(batch));
+      batch_ready.notify_one();
+    }
+  } catch (...) {
+    std::scoped_lock lock(latch);
+    error = std::current_exception();
+  }
+  {
+    std::scoped_lock lock(latch);
+    done = true;
+    batch_ready.notify_all();
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  if (error != nullptr) {
+    std::rethrow_exception(error);
+  }
+
+  // Phase 2: every hash partition holds disjoint groups, so the workers merge the partitions independently.
+  const size_t partitions = workers;
+  for (size_t p = 0; p < partitions; p++) {
+    tables_.push_back(MakeTable());
+  }
+  std::atomic<size_t> next_partition{0};
+  threads.clear();
+  for (size_t w = 0; w < workers; w++) {
+    threads.emplace_back([&] {
+      try {
+        for (size_t p = next_partition++; p < partitions; p = next_partition++) {
+          for (const auto &partial : partials) {
+            for (size_t group = 0; group < partial.Size(); group++) {
+              if (partial.PartitionOf(group, partitions) == p) {
+                tables_[p].MergeGroup(partial, group);
+              }
+            }
+          }
+        }
+      } catch (...) {
+        std::scoped_lock lock(latch);
+        error = std::current_exception();
+      }
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  if (error != nullptr) {
+    std::rethrow_exception(error);
+  }
+}
+
+auto AggregationExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  const size_t key_count = plan_->GetGroupBys().size();
+  const size_t agg_count = plan_->GetAggregates().size();
+  std::vector<Value> values;
+  values.reserve(key_count + agg_count);
+
+  while (table_idx_ < tables_.size() && next_group_ == tables_[table_idx_].Size()) {
+    table_idx_++;
+    next_group_ = 0;
+  }
+  if (table_idx_ < tables_.size()) {
+    const auto &table = tables_[table_idx_];
+    for (size_t i = 0; i < key_count; i++) {
+      values.push_back(table.KeyAt(next_group_, i));
+    }
+    for (size_t i = 0; i < agg_count; i++) {
+      values.push_back(table.AggregateAt(next_group_, i));
+    }
+    next_group_++;
+    *tuple = Tuple{values, &GetOutputSchema()};
+    return true;
+  }
+
+  // An aggregation without GROUP BY produces one row even if its input is empty.
+  const bool empty =
+      std::all_of(tables_.begin(), tables_.end(), [](const AggregationHashTable &table) { return table.Size() == 0; });
+  if (empty && key_count == 0 && !emitted_initial_) {
+    for (size_t i = 0; i < agg_count; i++) {
+      values.push_back(tables_[0].InitialAggregate(i));
+    }
+    emitted_initial_ = true;
+    *tuple = Tuple{values, &GetOutputSchema()};
+    return true;
+  }
+  return false;
+}
+
+auto AggregationExecutor::GetChildExecutor() const -> const AbstractExecutor * { return child_executor_.get(); }
+
+}  // namespace bustub
@@ -0,0 +1,358 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// aggregation_hash_table.cpp
+//
+// Identification: src/execution/aggregation_hash_table.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/aggregation_hash_table.h"
+
+#include <algorithm>
+#include <cstring>
+#include <utility>
+
+#include "common/macros.h"
+#include "storage/index/key_encoder.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+constexpr uint64_t SLOT_HASH_MASK = 0xFFFFFFFF00000000ULL;
+
+inline auto IsIntegerType(TypeId type) -> bool {
+  return type == TypeId::TINYINT || type == TypeId::SMALLINT || type == TypeId::INTEGER || type == TypeId::BIGINT;
+}
+
+/** @return the value of a non-NULL integer of type `type` */
+inline auto IntegerOf(const Value &value, TypeId type) -> int64_t {
+  switch (type) {
+    case TypeId::TINYINT:
+      return value.GetAs<int8_t>();
+    case TypeId::SMALLINT:
+      return value.GetAs<int16_t>();
+    case TypeId::INTEGER:
+      return value.GetAs<int32_t>();
+    default:
+      return value.GetAs<int64_t>();
+  }
+}
+
+inline auto Apply(AggregationType agg_type, int64_t lhs, int64_t rhs) -> int64_t {
+  switch (agg_type) {
+    case AggregationType::SumAggregate:
+      return lhs + rhs;
+    case AggregationType::MinAggregate:
+      return std::min(lhs, rhs);
+    default:
+      return std::max(lhs, rhs);
+  }
+}
+
+inline auto Apply(AggregationType agg_type, const Value &lhs, const Value &rhs) -> Value {
+  switch (agg_type) {
+    case AggregationType::SumAggregate:
+      return lhs.Add(rhs);
+    case AggregationType::MinAggregate:
+      return lhs.Min(rhs);
+    default:
+      return lhs.Max(rhs);
+  }
+}
+
+/** Combine a non-NULL `value` into the running SUM, MIN or MAX `result`, which is NULL unless `valid` is set. */
+template <typename T>
+inline void Combine(AggregationType agg_type, const T &value, T *result, uint8_t *valid) {
+  *result = *valid != 0 ? Apply(agg_type, *result, value) : value;
+  *valid = 1;
+}
+
+}  // namespace
+
+AggregationHashTable::AggregationHashTable(std::vector<TypeId> key_types, std::vector<AggregationType> agg_types,
+                                           std::vector<TypeId> input_types)
+    : key_types_(std::move(key_types)),
+      agg_types_(std::move(agg_types)),
+      input_types_(std::move(input_types)),
+      int_key_(key_types_.size() == 1 && IsIntegerType(key_types_[0])) {
+  for (const auto input_type : input_types_) {
+    accumulators_.push_back(Accumulator{IsIntegerType(input_type), {}, {}, {}});
+  }
+  Clear();
+}
+
+void AggregationHashTable::Clear() {
+  slots_.assign(INITIAL_SLOTS, 0);
+  hashes_.clear();
+  group_keys_.clear();
+  key_arena_.clear();
+  key_offsets_.assign(1, 0);
+  int_keys_.clear();
+  null_group_ = NO_GROUP;
+  for (auto &accumulator : accumulators_) {
+    accumulator.ints_.clear();
+    accumulator.values_.clear();
+    accumulator.valid_.clear();
+  }
+}
+
+auto AggregationHashTable::NewGroup(hash_t hash, int64_t int_key) -> size_t {
+  const size_t group = hashes_.size();
+  hashes_.push_back(hash);
+  if (int_key_) {
+    int_keys_.push_back(int_key);
+  } else {
+    key_arena_.append(key_buffer_);
+    key_offsets_.push_back(key_arena_.size());
+  }
+  for (auto &accumulator : accumulators_) {
+    accumulator.ints_.push_back(0);
+    accumulator.valid_.push_back(0);
+    if (!accumulator.typed_) {
+      accumulator.values_.emplace_back();
+    }
+  }
+  return group;
+}
+
+auto AggregationHashTable::FindOrInsert(hash_t hash, int64_t int_key, bool *inserted) -> size_t {
+  const uint64_t tag = hash & SLOT_HASH_MASK;
+  const size_t mask = slots_.size() - 1;
+  size_t idx = hash & mask;
+  while (slots_[idx] != 0) {
+    if ((slots_[idx] & SLOT_HASH_MASK) == tag) {
+      const size_t group = (slots_[idx] & ~SLOT_HASH_MASK) - 1;
+      if (int_key_) {
+        if (int_keys_[group] == int_key) {
+          *inserted = false;
+          return group;
+        }
+      } else {
+        const size_t begin = key_offsets_[group];
+        const size_t length = key_offsets_[group + 1] - begin;
+        if (length == key_buffer_.size() && memcmp(key_arena_.data() + begin, key_buffer_.data(), length) == 0) {
+          *inserted = false;
+          return group;
+        }
+      }
+    }
+    idx = (idx + 1) & mask;
+  }
+
+  const size_t group = NewGroup(hash, int_key);
+  slots_[idx] = tag | (group + 1);
+  if (hashes_.size() * 2 > slots_.size()) {
+    Grow();
+  }
+  *inserted = true;
+  return group;
+}
+
+auto AggregationHashTable::FindOrInsertGroup(const std::vector<std::vector<Value>> &keys, size_t row) -> size_t {
+  hash_t hash;
+  int64_t int_key = 0;
+  if (int_key_) {
+    const auto &value = keys[0][row];
+    if (value.IsNull()) {
+      if (null_group_ == NO_GROUP) {
+        null_group_ = NewGroup(0, 0);
+        group_keys_.push_back(value);
+      }
+      return null_group_;
+    }
+    int_key = IntegerOf(value, key_types_[0]);
+    hash = HashUtil::MixHash(static_cast<hash_t>(int_key));
+  } else {
+    key_buffer_.clear();
+    for (const auto &key : keys) {
+      KeyEncoder::EncodeValue(key[row], &key_buffer_);
+    }
+    hash = HashUtil::MixHash(HashUtil::HashBytes(key_buffer_.data(), key_buffer_.size()));
+  }
+
+  bool inserted;
+  const size_t group = FindOrInsert(hash, int_key, &inserted);
+  if (inserted) {
+    for (const auto &key : keys) {
+      group_keys_.push_back(key[row]);
+    }
+  }
+  return group;
+}
+
+void AggregationHashTable::Grow() {
+  slots_.assign(slots_.size() * 2, 0);
+  const size_t mask = slots_.size() - 1;
+  for (size_t group = 0; group < hashes_.size(); group++) {
+    if (group == null_group_) {
+      continue;
+    }
+    size_t idx = hashes_[group] & mask;
+    while (slots_[idx] != 0) {
+      idx = (idx + 1) & mask;
+    }
+    slots_[idx] = (hashes_[group] & SLOT_HASH_MASK) | (group + 1);
+  }
+}
+
+void AggregationHashTable::Accumulate(size_t agg_idx, const std::vector<Value> &input) {
+  auto &acc = accumulators_[agg_idx];
+  const auto input_type = input_types_[agg_idx];
+  const size_t rows = row_groups_.size();
+  switch (agg_types_[agg_idx]) {
+    case AggregationType::CountStarAggregate:
+      for (size_t row = 0; row < rows; row++) {
+        acc.ints_[row_groups_[row]]++;
+      }
+      break;
+    case AggregationType::CountAggregate:
+      for (size_t row = 0; row < rows; row++) {
+        acc.ints_[row_groups_[row]] += input[row].IsNull() ? 0 : 1;
+      }
+      break;
+    case AggregationType::SumAggregate:
+    case AggregationType::MinAggregate:
+    case AggregationType::MaxAggregate: {
+      const auto agg_type = agg_types_[agg_idx];
+      for (size_t row = 0; row < rows; row++) {
+        if (input[row].IsNull()) {
+          continue;
+        }
+        const size_t group = row_groups_[row];
+        if (acc.typed_) {
+          Combine(agg_type, IntegerOf(input[row], input_type), &acc.ints_[group], &acc.valid_[group]);
+        } else {
+          Combine(agg_type, input[row], &acc.values_[group], &acc.valid_[group]);
+        }
+      }
+      break;
+    }
+  }
+}
+
+void AggregationHashTable::InsertBatch(const std::vector<std::vector<Value>> &keys,
+                                       const std::vector<std::vector<Value>> &inputs, size_t rows) {
+  row_groups_.resize(rows);
+  if (key_types_.empty()) {
+    // Without GROUP BY, every row belongs to the single group.
+    if (rows > 0 && hashes_.empty()) {
+      key_buffer_.clear();
+      NewGroup(0, 0);
+    }
+    std::fill(row_groups_.begin(), row_groups_.end(), 0);
+  } else {
+    for (size_t row = 0; row < rows; row++) {
+      row_groups_[row] = FindOrInsertGroup(keys, row);
+    }
+  }
+  for (size_t agg_idx = 0; agg_idx < agg_types_.size(); agg_idx++) {
+    Accumulate(agg_idx, inputs[agg_idx]);
+  }
+}
+
+auto AggregationHashTable::PartitionOf(size_t group, size_t partitions) const -> size_t {
+  // The low bits of the hash pick the slots, so partition by the high bits to keep the slots of a partition spread.
+  return (hashes_[group] >> 32) % partitions;
+}
+
+void AggregationHashTable::MergeGroup(const AggregationHashTable &other, size_t other_group) {
+  size_t group;
+  bool inserted;
+  if (key_types_.empty()) {
+    inserted = hashes_.empty();
+    if (inserted) {
+      key_buffer_.clear();
+      NewGroup(0, 0);
+    }
+    group = 0;
+  } else if (int_key_ && other_group == other.null_group_) {
+    inserted = null_group_ == NO_GROUP;
+    if (inserted) {
+      null_group_ = NewGroup(0, 0);
+    }
+    group = null_group_;
+  } else {
+    int64_t int_key = 0;
+    if (int_key_) {
+      int_key = other.int_keys_[other_group];
+    } else {
+      const size_t begin = other.key_offsets_[other_group];
+      key_buffer_.assign(other.key_arena_, begin, other.key_offsets_[other_group + 1] - begin);
+    }
+    group = FindOrInsert(other.hashes_[other_group], int_key, &inserted);
+  }
+  if (inserted) {
+    for (size_t i = 0; i < key_types_.size(); i++) {
+      group_keys_.push_back(other.KeyAt(other_group, i));
+    }
+  }
+
+  for (size_t agg_idx = 0; agg_idx < agg_types_.size(); agg_idx++) {
+    auto &acc = accumulators_[agg_idx];
+    const auto &other_acc = other.accumulators_[agg_idx];
+    const auto agg_type = agg_types_[agg_idx];
+    if (agg_type == AggregationType::CountStarAggregate || agg_type == AggregationType::CountAggregate) {
+      acc.ints_[group] += other_acc.ints_[other_group];
+      continue;
+    }
+    if (other_acc.valid_[other_group] == 0) {
+      continue;
+    }
+    // SUM, MIN and MAX are their own combine functions.
+    if (acc.typed_) {
+      Combine(agg_type, other_acc.ints_[other_group], &acc.ints_[group], &acc.valid_[group]);
+    } else {
+      Combine(agg_type, other_acc.values_[other_group], &acc.values_[group], &acc.valid_[group]);
+    }
+  }
+}
+
+auto AggregationHashTable::AggregateAt(size_t group, size_t agg_idx) const -> Value {
+  const auto &acc = accumulators_[agg_idx];
+  const auto input_type = input_types_[agg_idx];
+  switch (agg_types_[agg_idx]) {
+    case AggregationType::CountStarAggregate:
+      return ValueFactory::GetIntegerValue(static_cast<int32_t>(acc.ints_[group]));
+    case AggregationType::CountAggregate:
+      // Like the other aggregates, COUNT is NULL if it has not seen any non-NULL input.
+      if (acc.ints_[group] == 0) {
+        return ValueFactory::GetNullValueByType(TypeId::INTEGER);
+      }
+      return ValueFactory::GetIntegerValue(static_cast<int32_t>(acc.ints_[group]));
+    case AggregationType::SumAggregate:
+    case AggregationType::MinAggregate:
+    case AggregationType::MaxAggregate:
+      if (acc.valid_[group] == 0) {
+        return ValueFactory::GetNullValueByType(input_type);
+      }
+      if (!acc.typed_) {
+        return acc.values_[group];
+      }
+      if (agg_types_[agg_idx] == AggregationType::SumAggregate) {
+        // Sums of narrower integers are INTEGER, unless they do not fit.
+        const int64_t sum = acc.ints_[group];
+        if (input_type != TypeId::BIGINT && sum >= BUSTUB_INT32_MIN && sum <= BUSTUB_INT32_MAX) {
+          return ValueFactory::GetIntegerValue(static_cast<int32_t>(sum));
+        }
+        return ValueFactory::GetBigIntValue(sum);
+      }
+      return {input_type, acc.ints_[group]};
+  }
+  UNREACHABLE("unknown aggregation type");
+}
+
+auto AggregationHashTable::InitialAggregate(size_t agg_idx) const -> Value {
+  if (agg_types_[agg_idx] == AggregationType::CountStarAggregate) {
+    return ValueFactory::GetIntegerValue(0);
+  }
+  return ValueFactory::GetNullValueByType(
+      agg_types_[agg_idx] == AggregationType::CountAggregate ? TypeId::INTEGER : input_types_[agg_idx]);
+}
+
+}  // namespace bustub
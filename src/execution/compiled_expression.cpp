@@ -0,0 +1,336 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// compiled_expression.cpp
+//
+// Identification: src/execution/compiled_expression.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/compiled_expression.h"
+
+#include <functional>
+#include <memory>
+#include <utility>
+#include <vector>
+
+#include "common/macros.h"
+#include "execution/expressions/arithmetic_expression.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/logic_expression.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+/**
+ * Call `f(l, r, i)` for each row `i` of a batch of `n` rows, where `l` and `r` are the positions of the row in the
+ * two operands. Scalar operands are read at position 0; the branch is taken once per batch.
+ */
+template <class F>
+void ForEachRow(bool lhs_scalar, bool rhs_scalar, size_t n, F &&f) {
+  if (!lhs_scalar && !rhs_scalar) {
+    for (size_t i = 0; i < n; i++) {
+      f(i, i, i);
+    }
+  } else if (!lhs_scalar) {
+    for (size_t i = 0; i < n; i++) {
+      f(i, 0, i);
+    }
+  } else if (!rhs_scalar) {
+    for (size_t i = 0; i < n; i++) {
+      f(0, i, i);
+    }
+  } else {
+    for (size_t i = 0; i < n; i++) {
+      f(0, 0, i);
+    }
+  }
+}
+
+auto AsInt64(const Value &value) -> int64_t {
+  switch (value.GetTypeId()) {
+    case TypeId::BOOLEAN:
+    case TypeId::TINYINT:
+      return value.GetAs<int8_t>();
+    case TypeId::SMALLINT:
+      return value.GetAs<int16_t>();
+    case TypeId::INTEGER:
+      return value.GetAs<int32_t>();
+    case TypeId::BIGINT:
+      return value.GetAs<int64_t>();
+    default:
+      UNREACHABLE("not an integer value");
+  }
+}
+
+auto IntegerValue(TypeId type, int64_t value) -> Value {
+  switch (type) {
+    case TypeId::TINYINT:
+      return ValueFactory::GetTinyIntValue(static_cast<int8_t>(value));
+    case TypeId::SMALLINT:
+      return ValueFactory::GetSmallIntValue(static_cast<int16_t>(value));
+    case TypeId::INTEGER:
+      return ValueFactory::GetIntegerValue(static_cast<int32_t>(value));
+    default:
+      return ValueFactory::GetBigIntValue(value);
+  }
+}
+
+}  // namespace
+
+CompiledExpression::CompiledExpression(AbstractExpressionRef expr) : expr_(std::move(expr)) {
+  if (const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(expr_.get()); column_expr != nullptr) {
+    column_idx_ = column_expr->GetColIdx();
+  }
+  result_ = Compile(*expr_);
+}
+
+auto CompiledExpression::KindOf(TypeId type) -> RegisterKind {
+  switch (type) {
+    case TypeId::TINYINT:
+    case TypeId::SMALLINT:
+    case TypeId::INTEGER:
+    case TypeId::BIGINT:
+      return RegisterKind::Integer;
+    case TypeId::BOOLEAN:
+      return RegisterKind::Boolean;
+    case TypeId::VARCHAR:
+      return RegisterKind::String;
+    default:
+      return RegisterKind::Boxed;
+  }
+}
+
+auto CompiledExpression::NewRegister(TypeId type) -> uint32_t {
+  Register reg;
+  reg.kind_ = KindOf(type);
+  reg.type_ = type;
+  registers_.push_back(std::move(reg));
+  return registers_.size() - 1;
+}
+
+void CompiledExpression::Load(const std::vector<Value> &values, Register *reg) {
+  const auto n = values.size();
+  switch (reg->kind_) {
+    case RegisterKind::Integer:
+    case RegisterKind::Boolean:
+      reg->ints_.resize(n);
+      reg->nulls_.resize(n);
+      for (size_t i = 0; i < n; i++) {
+        const bool is_null = values[i].IsNull();
+        reg->nulls_[i] = static_cast<uint8_t>(is_null);
+        reg->ints_[i] = is_null ? 0 : AsInt64(values[i]);
+      }
+      break;
+    case RegisterKind::String:
+      reg->values_ = &values;
+      reg->strings_.resize(n);
+      reg->nulls_.resize(n);
+      for (size_t i = 0; i < n; i++) {
+        const bool is_null = values[i].IsNull();
+        reg->nulls_[i] = static_cast<uint8_t>(is_null);
+        if (is_null) {
+          reg->strings_[i] = {};
+          continue;
+        }
+        // The length of a VARCHAR value counts its trailing '\0'.
+        const auto length = values[i].GetLength();
+        reg->strings_[i] = {values[i].GetData(), length == 0 ? 0 : length - 1};
+      }
+      break;
+    case RegisterKind::Boxed:
+      reg->values_ = &values;
+      break;
+  }
+}
+
+auto CompiledExpression::Interpret(const AbstractExpression &expr) -> uint32_t {
+  const auto dst = NewRegister(expr.GetReturnType());
+  steps_.emplace_back([this, dst, &expr](const TupleBatch &batch) {
+    auto &reg = registers_[dst];
+    expr.EvaluateBatch(batch, &reg.owned_);
+    Load(reg.owned_, &reg);
+  });
+  return dst;
+}
+
+template <class Cmp>
+auto CompiledExpression::EmitCompare(uint32_t lhs, uint32_t rhs) -> uint32_t {
+  const auto dst = NewRegister(TypeId::BOOLEAN);
+  if (registers_[lhs].kind_ == RegisterKind::String) {
+    steps_.emplace_back([this, dst, lhs, rhs](const TupleBatch &batch) {
+      auto &out = registers_[dst];
+      const auto &l = registers_[lhs];
+      const auto &r = registers_[rhs];
+      out.ints_.resize(batch.Size());
+      out.nulls_.resize(batch.Size());
+      ForEachRow(l.scalar_, r.scalar_, batch.Size(), [&](size_t li, size_t ri, size_t i) {
+        out.nulls_[i] = l.nulls_[li] | r.nulls_[ri];
+        out.ints_[i] = static_cast<int64_t>(Cmp{}(l.strings_[li], r.strings_[ri]));
+      });
+    });
+    return dst;
+  }
+  steps_.emplace_back([this, dst, lhs, rhs](const TupleBatch &batch) {
+    auto &out = registers_[dst];
+    const auto &l = registers_[lhs];
+    const auto &r = registers_[rhs];
+    out.ints_.resize(batch.Size());
+    out.nulls_.resize(batch.Size());
+    ForEachRow(l.scalar_, r.scalar_, batch.Size(), [&](size_t li, size_t ri, size_t i) {
+      out.nulls_[i] = l.nulls_[li] | r.nulls_[ri];
+      out.ints_[i] = static_cast<int64_t>(Cmp{}(l.ints_[li], r.ints_[ri]));
+    });
+  });
+  return dst;
+}
+
+auto CompiledExpression::Compile(const AbstractExpression &expr) -> uint32_t {
+  if (const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(&expr); column_expr != nullptr) {
+    const auto dst = NewRegister(expr.GetReturnType());
+    const auto col_idx = column_expr->GetColIdx();
+    steps_.emplace_back(
+        [this, dst, col_idx](const TupleBatch &batch) { Load(batch.Column(col_idx), &registers_[dst]); });
+    return dst;
+  }
+
+  if (const auto *constant_expr = dynamic_cast<const ConstantValueExpression *>(&expr); constant_expr != nullptr) {
+    // Constants are loaded once, into a scalar register.
+    const auto dst = NewRegister(expr.GetReturnType());
+    constants_.push_back(std::make_unique<std::vector<Value>>(1, constant_expr->val_));
+    registers_[dst].scalar_ = true;
+    Load(*constants_.back(), &registers_[dst]);
+    return dst;
+  }
+
+  if (const auto *arithmetic_expr = dynamic_cast<const ArithmeticExpression *>(&expr); arithmetic_expr != nullptr) {
+    // Both operands are INTEGERs; the result wraps around like the 32-bit arithmetic of the expression does.
+    const auto lhs = Compile(*expr.GetChildAt(0));
+    const auto rhs = Compile(*expr.GetChildAt(1));
+    const auto dst = NewRegister(TypeId::INTEGER);
+    const int64_t sign = arithmetic_expr->compute_type_ == ArithmeticType::Plus ? 1 : -1;
+    steps_.emplace_back([this, dst, lhs, rhs, sign](const TupleBatch &batch) {
+      auto &out = registers_[dst];
+      const auto &l = registers_[lhs];
+      const auto &r = registers_[rhs];
+      out.ints_.resize(batch.Size());
+      out.nulls_.resize(batch.Size());
+      ForEachRow(l.scalar_, r.scalar_, batch.Size(), [&](size_t li, size_t ri, size_t i) {
+        out.nulls_[i] = l.nulls_[li] | r.nulls_[ri];
+        out.ints_[i] = static_cast<int32_t>(static_cast<uint32_t>(l.ints_[li] + sign * r.ints_[ri]));
+      });
+    });
+    return dst;
+  }
+
+  if (const auto *comparison_expr = dynamic_cast<const ComparisonExpression *>(&expr); comparison_expr != nullptr) {
+    // Only operands held alike are compared here; anything else needs the casts of `Value`.
+    const auto lhs_kind = KindOf(expr.GetChildAt(0)->GetReturnType());
+    if (lhs_kind != KindOf(expr.GetChildAt(1)->GetReturnType()) || lhs_kind == RegisterKind::Boxed) {
+      return Interpret(expr);
+    }
+    const auto lhs = Compile(*expr.GetChildAt(0));
+    const auto rhs = Compile(*expr.GetChildAt(1));
+    switch (comparison_expr->comp_type_) {
+      case ComparisonType::Equal:
+        return EmitCompare<std::equal_to<>>(lhs, rhs);
+      case ComparisonType::NotEqual:
+        return EmitCompare<std::not_equal_to<>>(lhs, rhs);
+      case ComparisonType::LessThan:
+        return EmitCompare<std::less<>>(lhs, rhs);
+      case ComparisonType::LessThanOrEqual:
+        return EmitCompare<std::less_equal<>>(lhs, rhs);
+      case ComparisonType::GreaterThan:
+        return EmitCompare<std::greater<>>(lhs, rhs);
+      case ComparisonType::GreaterThanOrEqual:
+        return EmitCompare<std::greater_equal<>>(lhs, rhs);
+    }
+    UNREACHABLE("Unsupported comparison type.");
+  }
+
+  if (const auto *logic_expr = dynamic_cast<const LogicExpression *>(&expr); logic_expr != nullptr) {
+    // Three-valued logic: FALSE decides AND and TRUE decides OR, even if the other side is NULL.
+    const auto lhs = Compile(*expr.GetChildAt(0));
+    const auto rhs = Compile(*expr.GetChildAt(1));
+    const auto dst = NewRegister(TypeId::BOOLEAN);
+    const int64_t deciding = logic_expr->logic_type_ == LogicType::And ? 0 : 1;
+    steps_.emplace_back([this, dst, lhs, rhs, deciding](const TupleBatch &batch) {
+      auto &out = registers_[dst];
+      const auto &l = registers_[lhs];
+      const auto &r = registers_[rhs];
+      out.ints_.resize(batch.Size());
+      out.nulls_.resize(batch.Size());
+      ForEachRow(l.scalar_, r.scalar_, batch.Size(), [&](size_t li, size_t ri, size_t i) {
+        const bool l_decides = l.nulls_[li] == 0 && (l.ints_[li] != 0) == (deciding != 0);
+        const bool r_decides = r.nulls_[ri] == 0 && (r.ints_[ri] != 0) == (deciding != 0);
+        if (l_decides || r_decides) {
+          out.nulls_[i] = 0;
+          out.ints_[i] = deciding;
+        } else {
+          out.nulls_[i] = l.nulls_[li] | r.nulls_[ri];
+          out.ints_[i] = 1 - deciding;
+        }
+      });
+    });
+    return dst;
+  }
+
+  return Interpret(expr);
+}
+
+void CompiledExpression::Run(const TupleBatch &batch) {
+  for (const auto &step : steps_) {
+    step(batch);
+  }
+}
+
+void CompiledExpression::Evaluate(const TupleBatch &batch, std::vector<Value> *out) {
+  if (column_idx_.has_value()) {
+    *out = batch.Column(*column_idx_);
+    return;
+  }
+  Run(batch);
+  const auto &reg = registers_[result_];
+  const auto n = batch.Size();
+  out->clear();
+  out->reserve(n);
+  for (size_t row = 0; row < n; row++) {
+    const auto i = reg.scalar_ ? 0 : row;
+    switch (reg.kind_) {
+      case RegisterKind::Integer:
+        out->push_back(reg.nulls_[i] != 0 ? ValueFactory::GetNullValueByType(reg.type_)
+                                          : IntegerValue(reg.type_, reg.ints_[i]));
+        break;
+      case RegisterKind::Boolean:
+        out->push_back(reg.nulls_[i] != 0 ? ValueFactory::GetNullValueByType(TypeId::BOOLEAN)
+                                          : ValueFactory::GetBooleanValue(reg.ints_[i] != 0));
+        break;
+      case RegisterKind::String:
+      case RegisterKind::Boxed:
+        out->push_back((*reg.values_)[i]);
+        break;
+    }
+  }
+}
+
+void CompiledExpression::EvaluatePredicate(const TupleBatch &batch, std::vector<bool> *selection) {
+  Run(batch);
+  const auto &reg = registers_[result_];
+  BUSTUB_ENSURE(reg.kind_ == RegisterKind::Boolean || reg.kind_ == RegisterKind::Integer,
+                "predicate must be a boolean expression");
+  const auto n = batch.Size();
+  selection->resize(n);
+  for (size_t row = 0; row < n; row++) {
+    const auto i = reg.scalar_ ? 0 : row;
+    (*selection)[row] = reg.nulls_[i] == 0 && reg.ints_[i] != 0;
+  }
+}
+
+}  // namespace bustub
@@ -19,6 +19,7 @@
 #include "execution/executors/aggregation_executor.h"
 #include "execution/executors/delete_executor.h"
 #include "execution/executors/filter_executor.h"
+#include "execution/executors/gather_executor.h"
 #include "execution/executors/hash_join_executor.h"
 #include "execution/executors/index_scan_executor.h"
 #include "execution/executors/init_check_executor.h"
@@ -30,6 +31,7 @@
 #include "execution/executors/projection_executor.h"
 #include "execution/executors/seq_scan_executor.h"
 #include "execution/executors/sort_executor.h"
+#include "execution/executors/sort_merge_join_executor.h"
 #include "execution/executors/topn_check_executor.h"
 #include "execution/executors/topn_executor.h"
 #include "execution/executors/update_executor.h"
@@ -46,6 +48,11 @@ namespace bustub {
 
 auto ExecutorFactory::CreateExecutor(ExecutorContext *exec_ctx, const AbstractPlanNodeRef &plan)
     -> std::unique_ptr<AbstractExecutor> {
+  // Run maximal scan pipelines with several workers when the query is parallel.
+  if (exec_ctx->GetParallelism() > 1 && GatherExecutor::IsParallelPipeline(*plan)) {
+    return std::make_unique<GatherExecutor>(exec_ctx, plan);
+  }
+
   auto check_options_set = exec_ctx->GetCheckOptions()->check_options_set_;
   switch (plan->GetType()) {
     // Create a new sequential scan executor
@@ -126,6 +133,14 @@ auto ExecutorFactory::CreateExecutor(ExecutorContext *exec_ctx, const AbstractPl
       return std::make_unique<HashJoinExecutor>(exec_ctx, hash_join_plan, std::move(left), std::move(right));
     }
 
+    // Create a new sort-merge join executor
+    case PlanType::SortMergeJoin: {
+      auto sort_merge_join_plan = dynamic_cast<const SortMergeJoinPlanNode *>(plan.get());
+      auto left = ExecutorFactory::CreateExecutor(exec_ctx, sort_merge_join_plan->GetLeftPlan());
+      auto right = ExecutorFactory::CreateExecutor(exec_ctx, sort_merge_join_plan->GetRightPlan());
+      return std::make_unique<SortMergeJoinExecutor>(exec_ctx, sort_merge_join_plan, std::move(left), std::move(right));
+    }
+
     // Create a new mock scan executor
     case PlanType::MockScan: {
       const auto *mock_scan_plan = dynamic_cast<const MockScanPlanNode *>(plan.get());
@@ -0,0 +1,255 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// external_sort.cpp
+//
+// Identification: src/execution/external_sort.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/external_sort.h"
+
+#include <algorithm>
+#include <cstring>
+#include <thread>  // NOLINT
+
+#include "storage/index/key_encoder.h"
+
+namespace bustub {
+
+auto MakeSortKey(const OrderBys &order_bys, const Tuple &tuple, const Schema &schema) -> std::string {
+  std::string key;
+  for (const auto &[order_by_type, expr] : order_bys) {
+    KeyEncoder::EncodeValue(expr->Evaluate(&tuple, schema), &key, order_by_type == OrderByType::DESC);
+  }
+  return key;
+}
+
+void MakeSortKeys(const OrderBys &order_bys, const TupleBatch &batch, std::vector<std::string> *keys) {
+  keys->assign(batch.Size(), std::string{});
+  std::vector<Value> column;
+  for (const auto &[order_by_type, expr] : order_bys) {
+    expr->EvaluateBatch(batch, &column);
+    for (size_t i = 0; i < batch.Size(); i++) {
+      KeyEncoder::EncodeValue(column[i], &(*keys)[i], order_by_type == OrderByType::DESC);
+    }
+  }
+}
+
+void ExternalSorter::Add(std::string key, Tuple tuple) {
+  buffer_bytes_ += sizeof(Entry) + key.size() + tuple.GetLength();
+  buffer_.push_back({std::move(key), std::move(tuple)});
+  // Without a buffer pool, there is nowhere to spill to and the whole input is sorted in memory.
+  if (buffer_bytes_ > memory_budget_ && bpm_ != nullptr) {
+    SpillRun();
+  }
+}
+
+void ExternalSorter::SortBuffer() {
+  auto less = [](const Entry &lhs, const Entry &rhs) { return KeyEncoder::Compare(lhs.key_, rhs.key_) < 0; };
+  const size_t threads =
+      std::clamp<size_t>(buffer_.size() / SORT_MIN_ENTRIES_PER_THREAD, 1, std::max<size_t>(parallelism_, 1));
+  if (threads == 1) {
+    std::stable_sort(buffer_.begin(), buffer_.end(), less);
+    return;
+  }
+
+  // Sort one chunk per thread, then merge neighbouring chunks pairwise until one is left.
+  std::vector<size_t> bounds;
+  for (size_t i = 0; i <= threads; i++) {
+    bounds.push_back(buffer_.size() * i / threads);
+  }
+  std::vector<std::thread> workers;
+  for (size_t i = 0; i < threads; i++) {
+    workers.emplace_back(
+        [&, i] { std::stable_sort(buffer_.begin() + bounds[i], buffer_.begin() + bounds[i + 1], less); });
+  }
+  for (auto &worker : workers) {
+    worker.join();
+  }
+  while (bounds.size() > 2) {
+    std::vector<size_t> merged_bounds;
+    workers.clear();
+    for (size_t i = 0; i + 2 < bounds.size(); i += 2) {
+      workers.emplace_back([&, i] {
+        std::inplace_merge(buffer_.begin() + bounds[i], buffer_.begin() + bounds[i + 1],
+                           buffer_.begin() + bounds[i + 2], less);
+      });
+      merged_bounds.push_back(bounds[i]);
+    }
+    if (bounds.size() % 2 == 0) {
+      // An odd number of chunks: the last one waits for the next round.
+      merged_bounds.push_back(bounds[bounds.size() - 2]);
+    }
+    merged_bounds.push_back(bounds.back());
+    for (auto &worker : workers) {
+      worker.join();
+    }
+    bounds = std::move(merged_bounds);
+  }
+}
+
+void ExternalSorter::SpillRun() {
+  SortBuffer();
+  auto run = std::make_unique<SpillFile>(bpm_);
+  for (const auto &entry : buffer_) {
+    run->Append(Pack(entry));
+  }
+  run->FinishWrite();
+  runs_.emplace_back(std::move(run));
+  buffer_.clear();
+  buffer_bytes_ = 0;
+}
+
+void ExternalSorter::Sort() {
+  sources_.clear();
+  buffer_idx_ = 0;
+  if (runs_.empty()) {
+    SortBuffer();
+    return;
+  }
+  if (!buffer_.empty()) {
+    SpillRun();
+  }
+
+  // Merge neighbouring runs pass by pass, so that every merged run takes the place of its inputs and equal keys keep
+  // their order, until one final merge is left.
+  while (runs_.size() > SORT_MAX_MERGE_FANIN) {
+    std::deque<std::unique_ptr<SpillFile>> merged_runs;
+    while (!runs_.empty()) {
+      std::vector<std::unique_ptr<SpillFile>> inputs;
+      std::vector<SpillFile *> input_ptrs;
+      while (!runs_.empty() && inputs.size() < SORT_MAX_MERGE_FANIN) {
+        inputs.emplace_back(std::move(runs_.front()));
+        input_ptrs.push_back(inputs.back().get());
+        runs_.pop_front();
+      }
+      StartMerge(input_ptrs);
+      auto merged = std::make_unique<SpillFile>(bpm_);
+      Entry entry;
+      while (NextMerged(&entry)) {
+        merged->Append(Pack(entry));
+      }
+      merged->FinishWrite();
+      sources_.clear();
+      merged_runs.emplace_back(std::move(merged));
+    }
+    runs_ = std::move(merged_runs);
+  }
+
+  std::vector<SpillFile *> final_runs;
+  for (const auto &run : runs_) {
+    final_runs.push_back(run.get());
+  }
+  StartMerge(final_runs);
+}
+
+auto ExternalSorter::Next(Tuple *tuple) -> bool {
+  if (runs_.empty()) {
+    if (buffer_idx_ == buffer_.size()) {
+      return false;
+    }
+    *tuple = std::move(buffer_[buffer_idx_++].tuple_);
+    return true;
+  }
+  Entry entry;
+  if (!NextMerged(&entry)) {
+    return false;
+  }
+  *tuple = std::move(entry.tuple_);
+  return true;
+}
+
+void ExternalSorter::StartMerge(const std::vector<SpillFile *> &runs) {
+  sources_.clear();
+  for (auto *run : runs) {
+    sources_.emplace_back(std::make_unique<MergeSource>(run));
+    Advance(sources_.back().get());
+  }
+  tree_.Init(&sources_);
+}
+
+auto ExternalSorter::NextMerged(Entry *entry) -> bool {
+  const size_t winner = tree_.Winner();
+  auto &source = *sources_[winner];
+  if (source.exhausted_) {
+    return false;
+  }
+  *entry = std::move(source.head_);
+  Advance(&source);
+  tree_.Replay(winner);
+  return true;
+}
+
+void ExternalSorter::Advance(MergeSource *source) {
+  Tuple packed;
+  if (source->reader_.Next(&packed)) {
+    Unpack(packed, &source->head_);
+  } else {
+    source->exhausted_ = true;
+  }
+}
+
+auto ExternalSorter::Pack(const Entry &entry) -> Tuple {
+  // | packed size | key size | key | tuple size | tuple data |, as expected by Tuple::DeserializeFrom
+  const uint32_t key_size = entry.key_.size();
+  const uint32_t packed_size = 2 * sizeof(uint32_t) + key_size + entry.tuple_.GetLength();
+  std::vector<char> buffer(sizeof(uint32_t) + packed_size);
+  char *data = buffer.data();
+  memcpy(data, &packed_size, sizeof(uint32_t));
+  memcpy(data + sizeof(uint32_t), &key_size, sizeof(uint32_t));
+  memcpy(data + 2 * sizeof(uint32_t), entry.key_.data(), key_size);
+  entry.tuple_.SerializeTo(data + 2 * sizeof(uint32_t) + key_size);
+  Tuple packed;
+  packed.DeserializeFrom(data);
+  return packed;
+}
+
+void ExternalSorter::Unpack(const Tuple &packed, Entry *entry) {
+  const char *data = packed.GetData();
+  uint32_t key_size;
+  memcpy(&key_size, data, sizeof(uint32_t));
+  entry->key_.assign(data + sizeof(uint32_t), key_size);
+  entry->tuple_.DeserializeFrom(data + sizeof(uint32_t) + key_size);
+}
+
+void ExternalSorter::LoserTree::Init(std::vector<std::unique_ptr<MergeSource>> *sources) {
+  sources_ = sources;
+  // Every inner node starts with a virtual source that beats everything, so the first replays fill the tree.
+  const size_t k = sources->size();
+  tree_.assign(std::max<size_t>(k, 1), k);
+  for (size_t i = k; i-- > 0;) {
+    Replay(i);
+  }
+}
+
+void ExternalSorter::LoserTree::Replay(size_t source) {
+  const size_t k = sources_->size();
+  size_t winner = source;
+  for (size_t node = (source + k) / 2; node > 0; node /= 2) {
+    if (Less(tree_[node], winner)) {
+      std::swap(tree_[node], winner);
+    }
+  }
+  tree_[0] = winner;
+}
+
+auto ExternalSorter::LoserTree::Less(size_t lhs, size_t rhs) const -> bool {
+  const size_t k = sources_->size();
+  if (lhs == k || rhs == k) {
+    return lhs == k && rhs != k;
+  }
+  const auto &l = *(*sources_)[lhs];
+  const auto &r = *(*sources_)[rhs];
+  if (l.exhausted_ || r.exhausted_) {
+    return !l.exhausted_ && r.exhausted_;
+  }
+  const int cmp = KeyEncoder::Compare(l.head_.key_, r.head_.key_);
+  // Ties go to the older run, which keeps the merge stable.
+  return cmp < 0 || (cmp == 0 && lhs < rhs);
+}
+
+}  // namespace bustub
@@ -6,7 +6,10 @@ namespace bustub {
 
 FilterExecutor::FilterExecutor(ExecutorContext *exec_ctx, const FilterPlanNode *plan,
                                std::unique_ptr<AbstractExecutor> &&child_executor)
-    : AbstractExecutor(exec_ctx), plan_(plan), child_executor_(std::move(child_executor)) {}
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      child_executor_(std::move(child_executor)),
+      predicate_(plan_->GetPredicate()) {}
 
 void FilterExecutor::Init() {
   // Initialize the child executor
@@ -31,4 +34,16 @@ auto FilterExecutor::Next(Tuple *tuple, RID *rid) -> bool {
   }
 }
 
+auto FilterExecutor::NextBatch(TupleBatch *batch, size_t max_rows) -> bool {
+  // Keep pulling until a batch has a matching tuple, an empty batch means the filter is exhausted.
+  while (child_executor_->NextBatch(batch, max_rows)) {
+    predicate_.EvaluatePredicate(*batch, &selection_);
+    batch->Compact(selection_);
+    if (!batch->IsEmpty()) {
+      return true;
+    }
+  }
+  return false;
+}
+
 }  // namespace bustub
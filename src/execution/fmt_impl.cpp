@@ -10,6 +10,7 @@
 #include "execution/plans/hash_join_plan.h"
 #include "execution/plans/limit_plan.h"
 #include "execution/plans/projection_plan.h"
+#include "execution/plans/sort_merge_join_plan.h"
 #include "execution/plans/sort_plan.h"
 #include "execution/plans/topn_plan.h"
 
@@ -41,6 +42,11 @@ auto HashJoinPlanNode::PlanNodeToString() const -> std::string {
                      right_key_expressions_);
 }
 
+auto SortMergeJoinPlanNode::PlanNodeToString() const -> std::string {
+  return fmt::format("SortMergeJoin {{ type={}, left_key={}, right_key={} }}", join_type_, left_key_expressions_,
+                     right_key_expressions_);
+}
+
 auto ProjectionPlanNode::PlanNodeToString() const -> std::string {
   return fmt::format("Projection {{ exprs={} }}", expressions_);
 }
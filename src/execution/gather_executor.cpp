@@ -0,0 +1,161 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// gather_executor.cpp
+//
+// Identification: src/execution/gather_executor.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/executors/gather_executor.h"
+
+#include <utility>
+
+#include "execution/executor_factory.h"
+
+namespace bustub {
+
+GatherExecutor::GatherExecutor(ExecutorContext *exec_ctx, AbstractPlanNodeRef plan)
+    : AbstractExecutor(exec_ctx), plan_(std::move(plan)) {
+  const size_t workers = exec_ctx->GetParallelism();
+  for (size_t i = 0; i < workers; i++) {
+    // The worker contexts are serial (parallelism 1), so the factory builds a plain copy of the pipeline for them.
+    auto worker_ctx = std::make_unique<ExecutorContext>(
+        exec_ctx->GetTransaction(), exec_ctx->GetCatalog(), exec_ctx->GetBufferPoolManager(),
+        exec_ctx->GetTransactionManager(), exec_ctx->GetLockManager(), exec_ctx->IsDelete());
+    worker_ctx->InitCheckOptions(exec_ctx->GetCheckOptions());
+    worker_executors_.emplace_back(ExecutorFactory::CreateExecutor(worker_ctx.get(), plan_));
+    worker_ctxs_.emplace_back(std::move(worker_ctx));
+  }
+}
+
+GatherExecutor::~GatherExecutor() { Stop(); }
+
+void GatherExecutor::Init() {
+  Stop();
+  auto morsel_queue = std::make_shared<MorselQueue>();
+  for (auto &worker_ctx : worker_ctxs_) {
+    worker_ctx->SetMorselQueue(morsel_queue);
+  }
+  {
+    std::scoped_lock lock(latch_);
+    cancelled_ = false;
+    error_ = nullptr;
+    running_workers_ = worker_executors_.size();
+  }
+  for (size_t i = 0; i < worker_executors_.size(); i++) {
+    workers_.emplace_back([this, i] { RunWorker(i); });
+  }
+}
+
+void GatherExecutor::RunWorker(size_t worker) {
+  auto &executor = worker_executors_[worker];
+  // Two batches in flight per worker keep the workers busy without buffering the whole result.
+  const size_t max_queued = 2 * worker_executors_.size();
+  try {
+    executor->Init();
+    while (true) {
+      TupleBatch batch;
+      if (!executor->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+        break;
+      }
+      std::unique_lock lock(latch_);
+      batch_taken_.wait(lock, [&] { return cancelled_ || batches_.size() < max_queued; });
+      if (cancelled_) {
+        break;
+      }
+      batches_.emplace_back(std::move(batch));
+      batch_ready_.notify_one();
+    }
+  } catch (...) {
+    std::scoped_lock lock(latch_);
+    if (error_ == nullptr) {
+      error_ = std::current_exception();
+    }
+  }
+  std::scoped_lock lock(latch_);
+  running_workers_--;
+  batch_ready_.notify_all();
+}
+
+void GatherExecutor::Stop() {
+  {
+    std::scoped_lock lock(latch_);
+    cancelled_ = true;
+    batch_taken_.notify_all();
+  }
+  for (auto &worker : workers_) {
+    worker.join();
+  }
+  workers_.clear();
+  batches_.clear();
+  pending_.Clear();
+  pending_row_ = 0;
+}
+
+auto GatherExecutor::FillPending() -> bool {
+  if (pending_row_ < pending_.Size()) {
+    return true;
+  }
+  std::unique_lock lock(latch_);
+  batch_ready_.wait(lock, [&] { return !batches_.empty() || running_workers_ == 0 || error_ != nullptr; });
+  if (error_ != nullptr) {
+    lock.unlock();
+    auto error = error_;
+    Stop();
+    std::rethrow_exception(error);
+  }
+  if (batches_.empty()) {
+    return false;
+  }
+  pending_ = std::move(batches_.front());
+  batches_.pop_front();
+  pending_row_ = 0;
+  batch_taken_.notify_one();
+  return true;
+}
+
+auto GatherExecutor::NextBatch(TupleBatch *batch, size_t max_rows) -> bool {
+  if (!FillPending()) {
+    return false;
+  }
+  if (pending_row_ == 0 && pending_.Size() <= max_rows) {
+    // Hand out a whole batch without copying it.
+    std::swap(*batch, pending_);
+    pending_.Clear();
+    return true;
+  }
+  batch->Reset(&GetOutputSchema());
+  while (pending_row_ < pending_.Size() && batch->Size() < max_rows) {
+    batch->AppendRowFrom(pending_, pending_row_++);
+  }
+  return true;
+}
+
+auto GatherExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  if (!FillPending()) {
+    return false;
+  }
+  *tuple = pending_.GetTuple(pending_row_);
+  *rid = pending_.GetRID(pending_row_);
+  pending_row_++;
+  return true;
+}
+
+auto GatherExecutor::IsParallelPipeline(const AbstractPlanNode &plan) -> bool {
+  switch (plan.GetType()) {
+    case PlanType::SeqScan:
+    case PlanType::MockScan:
+      return true;
+    case PlanType::Filter:
+    case PlanType::Projection:
+      return IsParallelPipeline(*plan.GetChildAt(0));
+    default:
+      return false;
+  }
+}
+
+}  // namespace bustub
@@ -12,20 +12,448 @@
 
 #include "execution/executors/hash_join_executor.h"
 
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <mutex>   // NOLINT
+#include <thread>  // NOLINT
+
+#include "storage/table/tuple_batch.h"
+#include "type/value_factory.h"
+
 namespace bustub {
 
+namespace {
+
+/** A slot of the partition hash table: the upper half of the key hash, and the row offset plus one (0 is empty). */
+inline auto MakeSlot(hash_t hash, size_t row) -> uint64_t { return (hash & 0xFFFFFFFF00000000ULL) | (row + 1); }
+
+}  // namespace
+
 HashJoinExecutor::HashJoinExecutor(ExecutorContext *exec_ctx, const HashJoinPlanNode *plan,
                                    std::unique_ptr<AbstractExecutor> &&left_child,
                                    std::unique_ptr<AbstractExecutor> &&right_child)
-    : AbstractExecutor(exec_ctx) {
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      left_child_(std::move(left_child)),
+      right_child_(std::move(right_child)),
+      key_count_(plan->LeftJoinKeyExpressions().size()) {
   if (!(plan->GetJoinType() == JoinType::LEFT || plan->GetJoinType() == JoinType::INNER)) {
     // Note for 2023 Spring: You ONLY need to implement left join and inner join.
     throw bustub::NotImplementedException(fmt::format("join type {} not supported", plan->GetJoinType()));
   }
+  BUSTUB_ENSURE(plan->RightJoinKeyExpressions().size() == key_count_, "join keys must have the same columns");
+}
+
+auto HashJoinExecutor::HashKey(const Value *keys, bool *null_key) const -> hash_t {
+  hash_t hash = 0;
+  *null_key = false;
+  for (size_t k = 0; k < key_count_; k++) {
+    if (keys[k].IsNull()) {
+      *null_key = true;
+    } else {
+      hash = HashUtil::CombineHashes(hash, HashUtil::HashValue(&keys[k]));
+    }
+  }
+  return HashUtil::MixHash(hash);
+}
+
+void HashJoinExecutor::AppendRow(Tuple tuple, const Value *keys, JoinInput *input) {
+  bool null_key;
+  input->hashes_.push_back(HashKey(keys, &null_key));
+  input->null_keys_.push_back(null_key);
+  input->keys_.insert(input->keys_.end(), keys, keys + key_count_);
+  input->tuples_.emplace_back(std::move(tuple));
+}
+
+auto HashJoinExecutor::MakeSpillFiles() const -> std::vector<std::unique_ptr<SpillFile>> {
+  std::vector<std::unique_ptr<SpillFile>> spill;
+  for (size_t p = 0; p < (static_cast<size_t>(1) << HASH_JOIN_SPILL_BITS); p++) {
+    spill.emplace_back(std::make_unique<SpillFile>(exec_ctx_->GetBufferPoolManager()));
+  }
+  return spill;
+}
+
+void HashJoinExecutor::SpillRow(const Tuple &tuple, hash_t hash, size_t level,
+                                std::vector<std::unique_ptr<SpillFile>> *spill) {
+  // Spill partitions use the middle bits of the hash: the top bits pick radix partitions, the low bits pick slots.
+  const size_t partition = (hash >> (32 + HASH_JOIN_SPILL_BITS * level)) & (spill->size() - 1);
+  (*spill)[partition]->Append(tuple);
+}
+
+void HashJoinExecutor::SpillInput(JoinInput *input, std::vector<std::unique_ptr<SpillFile>> *spill) {
+  for (size_t i = 0; i < input->tuples_.size(); i++) {
+    SpillRow(input->tuples_[i], input->hashes_[i], 0, spill);
+  }
+  *input = JoinInput{};
+}
+
+auto HashJoinExecutor::ReadChild(AbstractExecutor *child, const InputSide &side,
+                                 std::vector<std::unique_ptr<SpillFile>> *spill) -> bool {
+  bool spilling = !spill->empty();
+  const bool can_spill = exec_ctx_->GetBufferPoolManager() != nullptr;
+  TupleBatch batch;
+  std::vector<std::vector<Value>> key_columns(key_count_);
+  std::vector<Value> keys(key_count_);
+  while (child->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+    for (size_t k = 0; k < key_count_; k++) {
+      (*side.key_expressions_)[k]->EvaluateBatch(batch, &key_columns[k]);
+    }
+    for (size_t i = 0; i < batch.Size(); i++) {
+      for (size_t k = 0; k < key_count_; k++) {
+        keys[k] = key_columns[k][i];
+      }
+      auto tuple = batch.GetTuple(i);
+      if (!spilling && can_spill && memory_used_ + RowBytes(tuple.GetLength()) > exec_ctx_->GetMemoryBudget()) {
+        *spill = MakeSpillFiles();
+        SpillInput(side.input_, spill);
+        spilling = true;
+      }
+      if (spilling) {
+        bool null_key;
+        SpillRow(tuple, HashKey(keys.data(), &null_key), 0, spill);
+      } else {
+        memory_used_ += RowBytes(tuple.GetLength());
+        AppendRow(std::move(tuple), keys.data(), side.input_);
+      }
+    }
+  }
+  return !spilling;
+}
+
+void HashJoinExecutor::LoadSpillFile(SpillFile *file, const InputSide &side) {
+  std::vector<Value> keys(key_count_);
+  auto reader = file->Read();
+  Tuple tuple;
+  while (reader.Next(&tuple)) {
+    for (size_t k = 0; k < key_count_; k++) {
+      keys[k] = (*side.key_expressions_)[k]->Evaluate(&tuple, *side.schema_);
+    }
+    AppendRow(std::move(tuple), keys.data(), side.input_);
+  }
+}
+
+void HashJoinExecutor::SplitSpillFile(SpillFile *file, const InputSide &side, size_t level,
+                                      std::vector<std::unique_ptr<SpillFile>> *spill) {
+  std::vector<Value> keys(key_count_);
+  auto reader = file->Read();
+  Tuple tuple;
+  while (reader.Next(&tuple)) {
+    for (size_t k = 0; k < key_count_; k++) {
+      keys[k] = (*side.key_expressions_)[k]->Evaluate(&tuple, *side.schema_);
+    }
+    bool null_key;
+    SpillRow(tuple, HashKey(keys.data(), &null_key), level, spill);
+  }
+}
+
+void HashJoinExecutor::Partition(size_t radix_bits, JoinInput *input) {
+  const size_t partitions = static_cast<size_t>(1) << radix_bits;
+  const size_t rows = input->tuples_.size();
+  const size_t key_count = rows == 0 ? 0 : input->keys_.size() / rows;
+  auto partition_of = [&](hash_t hash) -> size_t { return radix_bits == 0 ? 0 : hash >> (64 - radix_bits); };
+
+  // Histogram, then prefix sums, then scatter.
+  input->offsets_.assign(partitions + 1, 0);
+  for (const auto hash : input->hashes_) {
+    input->offsets_[partition_of(hash) + 1]++;
+  }
+  for (size_t p = 0; p < partitions; p++) {
+    input->offsets_[p + 1] += input->offsets_[p];
+  }
+  if (partitions == 1) {
+    return;
+  }
+
+  std::vector<size_t> cursors(input->offsets_.begin(), input->offsets_.end() - 1);
+  JoinInput out;
+  out.tuples_.resize(rows);
+  out.keys_.resize(input->keys_.size());
+  out.hashes_.resize(rows);
+  out.null_keys_.resize(rows);
+  for (size_t i = 0; i < rows; i++) {
+    const size_t dst = cursors[partition_of(input->hashes_[i])]++;
+    out.tuples_[dst] = std::move(input->tuples_[i]);
+    std::move(input->keys_.begin() + i * key_count, input->keys_.begin() + (i + 1) * key_count,
+              out.keys_.begin() + dst * key_count);
+    out.hashes_[dst] = input->hashes_[i];
+    out.null_keys_[dst] = input->null_keys_[i];
+  }
+  out.offsets_ = std::move(input->offsets_);
+  *input = std::move(out);
+}
+
+void HashJoinExecutor::Init() {
+  left_child_->Init();
+  right_child_->Init();
+  build_ = JoinInput{};
+  probe_ = JoinInput{};
+  memory_used_ = 0;
+  spill_tasks_.clear();
+  outputs_.clear();
+  output_partition_ = 0;
+  output_row_ = 0;
+  probe_cursor_ = std::nullopt;
+
+  const InputSide build_side{&plan_->RightJoinKeyExpressions(), &right_child_->GetOutputSchema(), &build_};
+  const InputSide probe_side{&plan_->LeftJoinKeyExpressions(), &left_child_->GetOutputSchema(), &probe_};
+  std::vector<std::unique_ptr<SpillFile>> build_spill;
+  std::vector<std::unique_ptr<SpillFile>> probe_spill;
+  const bool build_in_memory = ReadChild(right_child_.get(), build_side, &build_spill);
+  if (!build_in_memory) {
+    // Once the build side has spilled, the probe side is spilled from its first row.
+    probe_spill = MakeSpillFiles();
+  }
+  const bool probe_in_memory = ReadChild(left_child_.get(), probe_side, &probe_spill);
+  if (build_in_memory && probe_in_memory) {
+    JoinInMemory();
+    return;
+  }
+  if (build_in_memory) {
+    build_spill = MakeSpillFiles();
+    SpillInput(&build_, &build_spill);
+  }
+  memory_used_ = 0;
+  for (size_t p = 0; p < build_spill.size(); p++) {
+    build_spill[p]->FinishWrite();
+    probe_spill[p]->FinishWrite();
+    spill_tasks_.push_back({std::move(build_spill[p]), std::move(probe_spill[p]), 0});
+  }
+}
+
+void HashJoinExecutor::RunSpillTask() {
+  auto task = std::move(spill_tasks_.back());
+  spill_tasks_.pop_back();
+  if (task.probe_->Size() == 0 || (task.build_->Size() == 0 && plan_->GetJoinType() == JoinType::INNER)) {
+    return;
+  }
+
+  const InputSide build_side{&plan_->RightJoinKeyExpressions(), &right_child_->GetOutputSchema(), &build_};
+  const InputSide probe_side{&plan_->LeftJoinKeyExpressions(), &left_child_->GetOutputSchema(), &probe_};
+  const size_t task_bytes =
+      task.build_->Bytes() + task.probe_->Bytes() + RowBytes(0) * (task.build_->Size() + task.probe_->Size());
+  if (task_bytes > exec_ctx_->GetMemoryBudget() && task.level_ < HASH_JOIN_MAX_SPILL_LEVEL) {
+    // Still too large: split the pair again with the next hash bits.
+    auto build_spill = MakeSpillFiles();
+    auto probe_spill = MakeSpillFiles();
+    SplitSpillFile(task.build_.get(), build_side, task.level_ + 1, &build_spill);
+    SplitSpillFile(task.probe_.get(), probe_side, task.level_ + 1, &probe_spill);
+    task.build_->Clear();
+    task.probe_->Clear();
+    for (size_t p = 0; p < build_spill.size(); p++) {
+      build_spill[p]->FinishWrite();
+      probe_spill[p]->FinishWrite();
+      spill_tasks_.push_back({std::move(build_spill[p]), std::move(probe_spill[p]), task.level_ + 1});
+    }
+    return;
+  }
+
+  // Small enough, or skewed beyond what splitting can fix: join the pair in memory.
+  LoadSpillFile(task.build_.get(), build_side);
+  LoadSpillFile(task.probe_.get(), probe_side);
+  task.build_->Clear();
+  task.probe_->Clear();
+  JoinInMemory();
+}
+
+void HashJoinExecutor::JoinInMemory() {
+  size_t radix_bits = 0;
+  while (radix_bits < HASH_JOIN_MAX_RADIX_BITS && (build_.tuples_.size() >> radix_bits) > HASH_JOIN_PARTITION_ROWS) {
+    radix_bits++;
+  }
+  Partition(radix_bits, &build_);
+  Partition(radix_bits, &probe_);
+
+  const size_t partitions = build_.offsets_.size() - 1;
+  outputs_.clear();
+  outputs_.resize(partitions);
+  output_partition_ = 0;
+  output_row_ = 0;
+
+  const size_t workers = std::min(exec_ctx_->GetParallelism(), partitions);
+  if (workers <= 1) {
+    // Every partition is probed on demand by `Next`.
+    return;
+  }
+
+  // The output buffered by the workers shares the memory budget with the inputs. Once it is full, the partitions
+  // that are left are probed on demand.
+  const size_t budget = exec_ctx_->GetMemoryBudget();
+  const size_t max_output_bytes = budget > memory_used_ ? budget - memory_used_ : 0;
+  std::atomic<size_t> output_bytes{0};
+  std::atomic<size_t> next_partition{0};
+  std::atomic<bool> budget_exceeded{false};
+  std::mutex error_latch;
+  std::exception_ptr error;
+  std::vector<std::thread> threads;
+  for (size_t w = 0; w < workers; w++) {
+    threads.emplace_back([&] {
+      try {
+        while (!budget_exceeded) {
+          const size_t p = next_partition++;
+          if (p >= partitions) {
+            break;
+          }
+          std::vector<Tuple> output;
+          if (!JoinPartition(p, &output, &output_bytes, max_output_bytes)) {
+            budget_exceeded = true;
+            break;
+          }
+          outputs_[p] = std::move(output);
+        }
+      } catch (...) {
+        std::scoped_lock lock(error_latch);
+        error = std::current_exception();
+      }
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  if (error != nullptr) {
+    std::rethrow_exception(error);
+  }
+}
+
+auto HashJoinExecutor::JoinPartition(size_t partition, std::vector<Tuple> *output, std::atomic<size_t> *output_bytes,
+                                     size_t max_output_bytes) const -> bool {
+  ProbeCursor cursor;
+  OpenPartition(partition, &cursor);
+  size_t bytes = 0;
+  Tuple tuple;
+  while (ProbeNext(&cursor, &tuple)) {
+    const size_t tuple_bytes = sizeof(Tuple) + tuple.GetLength();
+    if (output_bytes->fetch_add(tuple_bytes) + tuple_bytes > max_output_bytes) {
+      output_bytes->fetch_sub(bytes + tuple_bytes);
+      output->clear();
+      return false;
+    }
+    bytes += tuple_bytes;
+    output->push_back(std::move(tuple));
+  }
+  return true;
+}
+
+void HashJoinExecutor::OpenPartition(size_t partition, ProbeCursor *cursor) const {
+  const size_t build_begin = build_.offsets_[partition];
+  const size_t build_end = build_.offsets_[partition + 1];
+
+  // Build: linear probing over a power-of-two table at most half full.
+  size_t capacity = 2;
+  while (capacity < 2 * (build_end - build_begin)) {
+    capacity <<= 1;
+  }
+  const size_t mask = capacity - 1;
+  cursor->partition_ = partition;
+  cursor->slots_.assign(capacity, 0);
+  for (size_t row = build_begin; row < build_end; row++) {
+    if (build_.null_keys_[row]) {
+      continue;
+    }
+    size_t idx = build_.hashes_[row] & mask;
+    while (cursor->slots_[idx] != 0) {
+      idx = (idx + 1) & mask;
+    }
+    cursor->slots_[idx] = MakeSlot(build_.hashes_[row], row - build_begin);
+  }
+  SeekProbeRow(probe_.offsets_[partition], cursor);
 }
 
-void HashJoinExecutor::Init() { throw NotImplementedException("HashJoinExecutor is not implemented"); }
+void HashJoinExecutor::SeekProbeRow(size_t row, ProbeCursor *cursor) const {
+  cursor->probe_row_ = row;
+  cursor->slot_ = row < probe_.offsets_[cursor->partition_ + 1] ? probe_.hashes_[row] & (cursor->slots_.size() - 1) : 0;
+  cursor->matched_ = false;
+}
 
-auto HashJoinExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
+auto HashJoinExecutor::ProbeNext(ProbeCursor *cursor, Tuple *tuple) const -> bool {
+  const size_t build_begin = build_.offsets_[cursor->partition_];
+  const size_t probe_end = probe_.offsets_[cursor->partition_ + 1];
+  const size_t mask = cursor->slots_.size() - 1;
+  while (cursor->probe_row_ < probe_end) {
+    const size_t row = cursor->probe_row_;
+    if (!probe_.null_keys_[row]) {
+      // Resume the lookup of the row at the slot after its last match.
+      const hash_t hash = probe_.hashes_[row];
+      const Value *key = KeyAt(probe_, row);
+      while (cursor->slots_[cursor->slot_] != 0) {
+        const uint64_t slot = cursor->slots_[cursor->slot_];
+        cursor->slot_ = (cursor->slot_ + 1) & mask;
+        if ((slot ^ hash) >> 32 != 0) {
+          continue;
+        }
+        const size_t build_row = build_begin + (slot & 0xFFFFFFFFULL) - 1;
+        const Value *build_key = KeyAt(build_, build_row);
+        bool equal = true;
+        for (size_t k = 0; k < key_count_ && equal; k++) {
+          equal = key[k].CompareEquals(build_key[k]) == CmpBool::CmpTrue;
+        }
+        if (equal) {
+          cursor->matched_ = true;
+          *tuple = MakeOutputTuple(probe_.tuples_[row], &build_.tuples_[build_row]);
+          return true;
+        }
+      }
+    }
+    const bool pad = !cursor->matched_ && plan_->GetJoinType() == JoinType::LEFT;
+    SeekProbeRow(row + 1, cursor);
+    if (pad) {
+      *tuple = MakeOutputTuple(probe_.tuples_[row], nullptr);
+      return true;
+    }
+  }
+  return false;
+}
+
+auto HashJoinExecutor::MakeOutputTuple(const Tuple &left, const Tuple *right) const -> Tuple {
+  const auto &left_schema = left_child_->GetOutputSchema();
+  const auto &right_schema = right_child_->GetOutputSchema();
+  std::vector<Value> values;
+  values.reserve(GetOutputSchema().GetColumnCount());
+  for (uint32_t i = 0; i < left_schema.GetColumnCount(); i++) {
+    values.push_back(left.GetValue(&left_schema, i));
+  }
+  for (uint32_t i = 0; i < right_schema.GetColumnCount(); i++) {
+    values.push_back(right != nullptr ? right->GetValue(&right_schema, i)
+                                      : ValueFactory::GetNullValueByType(right_schema.GetColumn(i).GetType()));
+  }
+  return {values, &GetOutputSchema()};
+}
+
+auto HashJoinExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  while (true) {
+    while (output_partition_ < outputs_.size()) {
+      auto &output = outputs_[output_partition_];
+      if (output.has_value()) {
+        if (output_row_ < output->size()) {
+          *tuple = std::move((*output)[output_row_++]);
+          *rid = tuple->GetRid();
+          return true;
+        }
+        output = std::nullopt;
+        output_row_ = 0;
+      } else {
+        if (!probe_cursor_.has_value()) {
+          probe_cursor_.emplace();
+          OpenPartition(output_partition_, &*probe_cursor_);
+        }
+        if (ProbeNext(&*probe_cursor_, tuple)) {
+          *rid = tuple->GetRid();
+          return true;
+        }
+        probe_cursor_ = std::nullopt;
+      }
+      output_partition_++;
+    }
+    // The inputs are no longer needed once every partition has been joined.
+    outputs_.clear();
+    output_partition_ = 0;
+    build_ = JoinInput{};
+    probe_ = JoinInput{};
+    if (spill_tasks_.empty()) {
+      return false;
+    }
+    RunSpillTask();
+  }
+}
 
 }  // namespace bustub
@@ -11,12 +11,56 @@
 //===----------------------------------------------------------------------===//
 #include "execution/executors/index_scan_executor.h"
 
+#include <optional>
+#include <utility>
+
+#include "common/macros.h"
+
 namespace bustub {
 IndexScanExecutor::IndexScanExecutor(ExecutorContext *exec_ctx, const IndexScanPlanNode *plan)
-    : AbstractExecutor(exec_ctx) {}
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      index_info_(exec_ctx->GetCatalog()->GetIndex(plan->GetIndexOid())),
+      table_info_(exec_ctx->GetCatalog()->GetTable(index_info_->table_name_)),
+      filter_(plan->filter_predicate_, {}, &table_info_->schema_) {}
+
+void IndexScanExecutor::Init() {
+  auto *tree = dynamic_cast<BPlusTreeIndexForTwoIntegerColumn *>(index_info_->index_.get());
+  BUSTUB_ENSURE(tree != nullptr, "index scans only support B+ tree indexes on integer keys");
+  std::optional<IntegerKeyType> low_key;
+  std::optional<IntegerKeyType> high_key;
+  if (!plan_->low_key_.empty()) {
+    low_key = MakeKey(plan_->low_key_);
+  }
+  if (!plan_->high_key_.empty()) {
+    high_key = MakeKey(plan_->high_key_);
+  }
+  // Collect the entries first, so that no index page stays latched while the table heap is read.
+  rids_.clear();
+  cursor_ = 0;
+  tree->ScanRange(low_key.has_value() ? &*low_key : nullptr, high_key.has_value() ? &*high_key : nullptr,
+                  [&](const IntegerKeyType &key, const RID &rid) { rids_.push_back(rid); });
+}
 
-void IndexScanExecutor::Init() { throw NotImplementedException("IndexScanExecutor is not implemented"); }
+auto IndexScanExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  while (cursor_ < rids_.size()) {
+    const RID current = rids_[cursor_++];
+    auto [meta, current_tuple] = table_info_->table_->GetTuple(current);
+    if (meta.is_deleted_ || !filter_.MatchData(current_tuple.GetData()) ||
+        !filter_.MatchResidual(current_tuple, GetOutputSchema())) {
+      continue;
+    }
+    *tuple = std::move(current_tuple);
+    *rid = current;
+    return true;
+  }
+  return false;
+}
 
-auto IndexScanExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
+auto IndexScanExecutor::MakeKey(const std::vector<Value> &values) const -> IntegerKeyType {
+  IntegerKeyType key;
+  key.SetFromKey(Tuple{values, &index_info_->key_schema_});
+  return key;
+}
 
 }  // namespace bustub
@@ -200,32 +200,32 @@ auto GetShuffled(const MockScanPlanNode *plan) -> bool {
   return false;
 }
 
-auto GetFunctionOf(const MockScanPlanNode *plan) -> std::function<Tuple(size_t)> {
+auto GetFunctionOf(const MockScanPlanNode *plan) -> std::function<std::vector<Value>(size_t)> {
   const auto &table = plan->GetTable();
 
   if (table == "__mock_table_1") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.reserve(2);
       values.push_back(ValueFactory::GetIntegerValue(cursor));
       values.push_back(ValueFactory::GetIntegerValue(cursor * 100));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_2") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.reserve(2);
       values.push_back(ValueFactory::GetVarcharValue(fmt::format("{}-\U0001F4A9", cursor)));  // the poop emoji
       values.push_back(
           ValueFactory::GetVarcharValue(StringUtil::Repeat("\U0001F607", cursor % 8)));  // the innocent emoji
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_3") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.reserve(2);
       if (cursor % 2 == 0) {
@@ -234,48 +234,48 @@ auto GetFunctionOf(const MockScanPlanNode *plan) -> std::function<Tuple(size_t)>
         values.push_back(ValueFactory::GetNullValueByType(TypeId::INTEGER));
       }
       values.push_back(ValueFactory::GetVarcharValue(fmt::format("{}-\U0001F4A9", cursor)));  // the poop emoji
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_tas_2022") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetVarcharValue(ta_list_2022[cursor]));
       values.push_back(ValueFactory::GetVarcharValue(ta_oh_2022[cursor]));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_tas_2023") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetVarcharValue(ta_list_2023[cursor]));
       values.push_back(ValueFactory::GetVarcharValue(ta_oh_2023[cursor]));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_schedule_2022") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetVarcharValue(course_on_date[cursor]));
       values.push_back(ValueFactory::GetIntegerValue(cursor == 1 || cursor == 3 ? 1 : 0));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_schedule_2023") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetVarcharValue(course_on_date[cursor]));
       values.push_back(ValueFactory::GetIntegerValue(cursor == 0 || cursor == 2 ? 1 : 0));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_agg_input_small") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetIntegerValue((cursor + 2) % 10));
       values.push_back(ValueFactory::GetIntegerValue(cursor));
@@ -284,12 +284,12 @@ auto GetFunctionOf(const MockScanPlanNode *plan) -> std::function<Tuple(size_t)>
       values.push_back(ValueFactory::GetIntegerValue(233));
       values.push_back(
           ValueFactory::GetVarcharValue(StringUtil::Repeat("\U0001F4A9", (cursor % 8) + 1)));  // the poop emoji
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_agg_input_big") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetIntegerValue((cursor + 2) % 10));
       values.push_back(ValueFactory::GetIntegerValue(cursor));
@@ -298,20 +298,20 @@ auto GetFunctionOf(const MockScanPlanNode *plan) -> std::function<Tuple(size_t)>
       values.push_back(ValueFactory::GetIntegerValue(233));
       values.push_back(
           ValueFactory::GetVarcharValue(StringUtil::Repeat("\U0001F4A9", (cursor % 16) + 1)));  // the poop emoji
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_table_123") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetIntegerValue(cursor + 1));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_graph") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       int src = cursor % GRAPH_NODE_CNT;
       int dst = cursor / GRAPH_NODE_CNT;
@@ -324,81 +324,94 @@ auto GetFunctionOf(const MockScanPlanNode *plan) -> std::function<Tuple(size_t)>
       } else {
         values.push_back(ValueFactory::GetIntegerValue(1));
       }
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_t1") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetIntegerValue(cursor / 10000));
       values.push_back(ValueFactory::GetIntegerValue(cursor % 10000));
       values.push_back(ValueFactory::GetIntegerValue(cursor));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_t4_1m") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       cursor = cursor % 500000;
       values.push_back(ValueFactory::GetIntegerValue(cursor));
       values.push_back(ValueFactory::GetIntegerValue(cursor * 10));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_t5_1m") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       cursor = (cursor + 30000) % 500000;
       values.push_back(ValueFactory::GetIntegerValue(cursor));
       values.push_back(ValueFactory::GetIntegerValue(cursor * 10));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_t6_1m") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       cursor = (cursor + 60000) % 500000;
       values.push_back(ValueFactory::GetIntegerValue(cursor));
       values.push_back(ValueFactory::GetIntegerValue(cursor * 10));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_t7") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetIntegerValue(cursor % 20));
       values.push_back(ValueFactory::GetIntegerValue(cursor));
       values.push_back(ValueFactory::GetIntegerValue(cursor));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
   if (table == "__mock_t8") {
-    return [plan](size_t cursor) {
+    return [](size_t cursor) {
       std::vector<Value> values{};
       values.push_back(ValueFactory::GetIntegerValue(cursor));
-      return Tuple{values, &plan->OutputSchema()};
+      return values;
     };
   }
 
-  // By default, return table of all 0.
-  return [plan](size_t cursor) {
+  // By default, return table of all 0. The columns that the scan does not produce are never read.
+  std::vector<TypeId> types;
+  const auto &column_ids = plan->GetColumnIds();
+  for (uint32_t i = 0; i < plan->OutputSchema().GetColumnCount(); i++) {
+    const auto column_id = column_ids.empty() ? i : column_ids[i];
+    if (column_id >= types.size()) {
+      types.resize(column_id + 1, TypeId::INTEGER);
+    }
+    types[column_id] = plan->OutputSchema().GetColumn(i).GetType();
+  }
+  return [types = std::move(types)](size_t cursor) {
     std::vector<Value> values{};
-    values.reserve(plan->OutputSchema().GetColumnCount());
-    for (const auto &column : plan->OutputSchema().GetColumns()) {
-      values.push_back(ValueFactory::GetZeroValueByType(column.GetType()));
+    values.reserve(types.size());
+    for (const auto type : types) {
+      values.push_back(ValueFactory::GetZeroValueByType(type));
     }
-    return Tuple{values, &plan->OutputSchema()};
+    return values;
   };
 }
 
 MockScanExecutor::MockScanExecutor(ExecutorContext *exec_ctx, const MockScanPlanNode *plan)
-    : AbstractExecutor{exec_ctx}, plan_{plan}, func_(GetFunctionOf(plan)), size_(GetSizeOf(plan)) {
+    : AbstractExecutor{exec_ctx},
+      plan_{plan},
+      func_(GetFunctionOf(plan)),
+      size_(GetSizeOf(plan)),
+      filter_(plan->GetFilterPredicate(), plan->GetColumnIds(), nullptr) {
   if (GetShuffled(plan)) {
     for (size_t i = 0; i < size_; i++) {
       shuffled_idx_.push_back(i);
@@ -412,21 +425,76 @@ MockScanExecutor::MockScanExecutor(ExecutorContext *exec_ctx, const MockScanPlan
 void MockScanExecutor::Init() {
   // Reset the cursor
   cursor_ = 0;
+  morsel_end_ = size_;
+  if (const auto &morsel_queue = exec_ctx_->GetMorselQueue(); morsel_queue != nullptr) {
+    // A parallel worker: scan whatever row ranges the shared queue hands out.
+    morsel_queue->InitRows(size_);
+    morsel_end_ = 0;
+  }
+}
+
+auto MockScanExecutor::FetchMorsel() -> bool {
+  if (cursor_ < morsel_end_) {
+    return true;
+  }
+  const auto &morsel_queue = exec_ctx_->GetMorselQueue();
+  return morsel_queue != nullptr && morsel_queue->NextRows(&cursor_, &morsel_end_);
+}
+
+auto MockScanExecutor::RowAt(size_t cursor) const -> std::vector<Value> {
+  // The workers of a parallel scan shuffle differently, so they all read the table in order instead.
+  if (shuffled_idx_.empty() || exec_ctx_->GetMorselQueue() != nullptr) {
+    return func_(cursor);
+  }
+  return func_(shuffled_idx_[cursor]);
+}
+
+auto MockScanExecutor::Project(std::vector<Value> row) const -> std::vector<Value> {
+  const auto &column_ids = plan_->GetColumnIds();
+  if (column_ids.empty()) {
+    return row;
+  }
+  std::vector<Value> projected;
+  projected.reserve(column_ids.size());
+  for (const auto column_id : column_ids) {
+    projected.push_back(std::move(row[column_id]));
+  }
+  return projected;
 }
 
 auto MockScanExecutor::Next(Tuple *tuple, RID *rid) -> bool {
-  if (cursor_ == size_) {
-    // Scan complete
-    return EXECUTOR_EXHAUSTED;
-  }
-  if (shuffled_idx_.empty()) {
-    *tuple = func_(cursor_);
-  } else {
-    *tuple = func_(shuffled_idx_[cursor_]);
-  }
-  ++cursor_;
-  *rid = MakeDummyRID();
-  return EXECUTOR_ACTIVE;
+  while (FetchMorsel()) {
+    auto row = RowAt(cursor_++);
+    if (!filter_.MatchValues(row)) {
+      continue;
+    }
+    *tuple = Tuple{Project(std::move(row)), &GetOutputSchema()};
+    if (!filter_.MatchResidual(*tuple, GetOutputSchema())) {
+      continue;
+    }
+    *rid = MakeDummyRID();
+    return EXECUTOR_ACTIVE;
+  }
+  // Scan complete
+  return EXECUTOR_EXHAUSTED;
+}
+
+auto MockScanExecutor::NextBatch(TupleBatch *batch, size_t max_rows) -> bool {
+  // Keep scanning until a batch has a matching row, an empty batch means the scan is complete.
+  do {
+    batch->Reset(&GetOutputSchema());
+    while (batch->Size() < max_rows && FetchMorsel()) {
+      auto row = RowAt(cursor_++);
+      if (filter_.MatchValues(row)) {
+        batch->AppendRow(Project(std::move(row)), MakeDummyRID());
+      }
+    }
+    if (batch->IsEmpty()) {
+      return false;
+    }
+    filter_.FilterBatch(batch);
+  } while (batch->IsEmpty());
+  return true;
 }
 
 auto MockScanExecutor::MakeDummyRID() -> RID { return RID{0}; }
@@ -0,0 +1,63 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// morsel_queue.cpp
+//
+// Identification: src/execution/morsel_queue.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/morsel_queue.h"
+
+#include <algorithm>
+
+#include "storage/page/table_page.h"
+
+namespace bustub {
+
+void MorselQueue::InitRows(size_t row_count, size_t rows_per_morsel) {
+  std::call_once(init_flag_, [&] {
+    row_count_ = row_count;
+    rows_per_morsel_ = std::max<size_t>(rows_per_morsel, 1);
+  });
+}
+
+void MorselQueue::InitPages(BufferPoolManager *bpm, page_id_t first_page_id, RID end_rid, size_t pages_per_morsel) {
+  std::call_once(init_flag_, [&] {
+    bpm_ = bpm;
+    next_page_id_ = first_page_id;
+    end_rid_ = end_rid;
+    pages_per_morsel_ = std::max<size_t>(pages_per_morsel, 1);
+  });
+}
+
+auto MorselQueue::NextRows(size_t *begin, size_t *end) -> bool {
+  const size_t start = next_row_.fetch_add(rows_per_morsel_);
+  if (start >= row_count_) {
+    return false;
+  }
+  *begin = start;
+  *end = std::min(start + rows_per_morsel_, row_count_);
+  return true;
+}
+
+auto MorselQueue::NextPages(std::vector<page_id_t> *page_ids) -> bool {
+  page_ids->clear();
+  std::scoped_lock lock(latch_);
+  while (next_page_id_ != INVALID_PAGE_ID && page_ids->size() < pages_per_morsel_) {
+    page_ids->push_back(next_page_id_);
+    if (next_page_id_ == end_rid_.GetPageId()) {
+      // Pages appended after the scan started are not part of the snapshot.
+      next_page_id_ = INVALID_PAGE_ID;
+      break;
+    }
+    auto guard = bpm_->FetchPageRead(next_page_id_);
+    next_page_id_ = guard.As<TablePage>()->GetNextPageId();
+  }
+  return !page_ids->empty();
+}
+
+}  // namespace bustub
@@ -11,23 +11,135 @@
 //===----------------------------------------------------------------------===//
 
 #include "execution/executors/nested_loop_join_executor.h"
+
+#include <limits>
+
 #include "binder/table_ref/bound_join_ref.h"
 #include "common/exception.h"
+#include "type/value_factory.h"
 
 namespace bustub {
 
 NestedLoopJoinExecutor::NestedLoopJoinExecutor(ExecutorContext *exec_ctx, const NestedLoopJoinPlanNode *plan,
                                                std::unique_ptr<AbstractExecutor> &&left_executor,
                                                std::unique_ptr<AbstractExecutor> &&right_executor)
-    : AbstractExecutor(exec_ctx) {
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      left_executor_(std::move(left_executor)),
+      right_executor_(std::move(right_executor)) {
   if (!(plan->GetJoinType() == JoinType::LEFT || plan->GetJoinType() == JoinType::INNER)) {
     // Note for 2023 Spring: You ONLY need to implement left join and inner join.
     throw bustub::NotImplementedException(fmt::format("join type {} not supported", plan->GetJoinType()));
   }
+  const auto &check_options = exec_ctx->GetCheckOptions()->check_options_set_;
+  const bool nlj_check = check_options.find(CheckOption::ENABLE_NLJ_CHECK) != check_options.end();
+  max_block_rows_ = nlj_check ? 1 : std::numeric_limits<size_t>::max();
+}
+
+void NestedLoopJoinExecutor::Init() {
+  left_executor_->Init();
+  block_.clear();
+  matched_.clear();
+  block_loaded_ = false;
+  outputs_.clear();
+  output_idx_ = 0;
 }
 
-void NestedLoopJoinExecutor::Init() { throw NotImplementedException("NestedLoopJoinExecutor is not implemented"); }
+auto NestedLoopJoinExecutor::LoadBlock() -> bool {
+  block_.clear();
+  size_t block_bytes = 0;
+  Tuple tuple;
+  RID rid;
+  while (block_.size() < max_block_rows_ && block_bytes < exec_ctx_->GetMemoryBudget() &&
+         left_executor_->Next(&tuple, &rid)) {
+    block_bytes += sizeof(Tuple) + tuple.GetLength();
+    block_.push_back(std::move(tuple));
+  }
+  if (block_.empty()) {
+    return false;
+  }
+  matched_.assign(block_.size(), false);
+  right_executor_->Init();
+  right_tuples_.clear();
+  block_idx_ = block_.size();
+  block_loaded_ = true;
+  return true;
+}
 
-auto NestedLoopJoinExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
+auto NestedLoopJoinExecutor::LoadRightBatch() -> bool {
+  if (!right_executor_->NextBatch(&right_batch_, BUSTUB_BATCH_SIZE)) {
+    return false;
+  }
+  right_tuples_.clear();
+  for (size_t i = 0; i < right_batch_.Size(); i++) {
+    right_tuples_.push_back(right_batch_.GetTuple(i));
+  }
+  block_idx_ = 0;
+  return true;
+}
+
+void NestedLoopJoinExecutor::JoinRightBatch() {
+  const auto &left_schema = left_executor_->GetOutputSchema();
+  const auto &right_schema = right_executor_->GetOutputSchema();
+  const auto &predicate = plan_->Predicate();
+  for (; block_idx_ < block_.size() && outputs_.size() < BUSTUB_BATCH_SIZE; block_idx_++) {
+    const auto &left = block_[block_idx_];
+    for (const auto &right : right_tuples_) {
+      auto value = predicate->EvaluateJoin(&left, left_schema, &right, right_schema);
+      if (!value.IsNull() && value.GetAs<bool>()) {
+        matched_[block_idx_] = true;
+        outputs_.push_back(MakeOutputTuple(left, &right));
+      }
+    }
+  }
+}
+
+void NestedLoopJoinExecutor::EmitUnmatched() {
+  if (plan_->GetJoinType() != JoinType::LEFT) {
+    return;
+  }
+  for (size_t i = 0; i < block_.size(); i++) {
+    if (!matched_[i]) {
+      outputs_.push_back(MakeOutputTuple(block_[i], nullptr));
+    }
+  }
+}
+
+auto NestedLoopJoinExecutor::MakeOutputTuple(const Tuple &left, const Tuple *right) const -> Tuple {
+  const auto &left_schema = left_executor_->GetOutputSchema();
+  const auto &right_schema = right_executor_->GetOutputSchema();
+  std::vector<Value> values;
+  values.reserve(GetOutputSchema().GetColumnCount());
+  for (uint32_t i = 0; i < left_schema.GetColumnCount(); i++) {
+    values.push_back(left.GetValue(&left_schema, i));
+  }
+  for (uint32_t i = 0; i < right_schema.GetColumnCount(); i++) {
+    values.push_back(right != nullptr ? right->GetValue(&right_schema, i)
+                                      : ValueFactory::GetNullValueByType(right_schema.GetColumn(i).GetType()));
+  }
+  return {values, &GetOutputSchema()};
+}
+
+auto NestedLoopJoinExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  while (true) {
+    if (output_idx_ < outputs_.size()) {
+      *tuple = outputs_[output_idx_++];
+      return true;
+    }
+    outputs_.clear();
+    output_idx_ = 0;
+
+    if (!block_loaded_ && !LoadBlock()) {
+      return false;
+    }
+    if (block_idx_ == block_.size() && !LoadRightBatch()) {
+      // The right child is exhausted for this block.
+      EmitUnmatched();
+      block_loaded_ = false;
+      continue;
+    }
+    JoinRightBatch();
+  }
+}
 
 }  // namespace bustub
@@ -5,7 +5,11 @@ namespace bustub {
 
 ProjectionExecutor::ProjectionExecutor(ExecutorContext *exec_ctx, const ProjectionPlanNode *plan,
                                        std::unique_ptr<AbstractExecutor> &&child_executor)
-    : AbstractExecutor(exec_ctx), plan_(plan), child_executor_(std::move(child_executor)) {}
+    : AbstractExecutor(exec_ctx), plan_(plan), child_executor_(std::move(child_executor)) {
+  for (const auto &expr : plan_->GetExpressions()) {
+    compiled_exprs_.push_back(std::make_unique<CompiledExpression>(expr));
+  }
+}
 
 void ProjectionExecutor::Init() {
   // Initialize the child executor
@@ -33,4 +37,19 @@ auto ProjectionExecutor::Next(Tuple *tuple, RID *rid) -> bool {
 
   return true;
 }
+
+auto ProjectionExecutor::NextBatch(TupleBatch *batch, size_t max_rows) -> bool {
+  batch->Reset(&GetOutputSchema());
+  if (!child_executor_->NextBatch(&child_batch_, max_rows)) {
+    return false;
+  }
+
+  // Compute expressions column by column
+  for (uint32_t i = 0; i < compiled_exprs_.size(); i++) {
+    compiled_exprs_[i]->Evaluate(child_batch_, &batch->ColumnMut(i));
+  }
+  batch->RIDs() = child_batch_.RIDs();
+
+  return true;
+}
 }  // namespace bustub
@@ -0,0 +1,124 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// scan_filter.cpp
+//
+// Identification: src/execution/scan_filter.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/scan_filter.h"
+
+#include <memory>
+#include <vector>
+
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/expressions/logic_expression.h"
+#include "execution/expressions/parameter_value_expression.h"
+
+namespace bustub {
+
+namespace {
+
+auto IsIntegerType(TypeId type) -> bool {
+  return type == TypeId::TINYINT || type == TypeId::SMALLINT || type == TypeId::INTEGER || type == TypeId::BIGINT;
+}
+
+}  // namespace
+
+ScanFilter::ScanFilter(const AbstractExpressionRef &predicate, const std::vector<uint32_t> &column_ids,
+                       const Schema *table_schema) {
+  if (predicate == nullptr) {
+    return;
+  }
+  std::vector<AbstractExpressionRef> conjuncts;
+  SplitConjuncts(predicate, &conjuncts);
+  for (const auto &conjunct : conjuncts) {
+    if (Compile(conjunct, column_ids, table_schema)) {
+      continue;
+    }
+    residual_ =
+        residual_ == nullptr ? conjunct : std::make_shared<LogicExpression>(residual_, conjunct, LogicType::And);
+  }
+  if (residual_ != nullptr) {
+    compiled_residual_ = std::make_unique<CompiledExpression>(residual_);
+  }
+}
+
+auto ScanFilter::Compile(const AbstractExpressionRef &expr, const std::vector<uint32_t> &column_ids,
+                         const Schema *table_schema) -> bool {
+  const auto *comparison_expr = dynamic_cast<const ComparisonExpression *>(expr.get());
+  if (comparison_expr == nullptr) {
+    return false;
+  }
+  auto comp_type = comparison_expr->comp_type_;
+  const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(comparison_expr->GetChildAt(0).get());
+  const auto *constant_expr = comparison_expr->GetChildAt(1).get();
+  if (column_expr == nullptr) {
+    column_expr = dynamic_cast<const ColumnValueExpression *>(comparison_expr->GetChildAt(1).get());
+    constant_expr = comparison_expr->GetChildAt(0).get();
+    comp_type = MirrorComparison(comp_type);
+  }
+  if (column_expr == nullptr || !IsIntegerType(column_expr->GetReturnType())) {
+    return false;
+  }
+
+  // Parameters are assigned before the executors are created, so they are as good as constants here.
+  Value value;
+  if (const auto *constant = dynamic_cast<const ConstantValueExpression *>(constant_expr); constant != nullptr) {
+    value = constant->val_;
+  } else if (const auto *param = dynamic_cast<const ParameterValueExpression *>(constant_expr); param != nullptr) {
+    value = param->GetValue();
+  } else {
+    return false;
+  }
+  if (!IsIntegerType(value.GetTypeId()) || value.IsNull()) {
+    return false;
+  }
+
+  const auto col_idx = column_expr->GetColIdx();
+  const auto column_id = column_ids.empty() ? col_idx : column_ids[col_idx];
+  const auto offset = table_schema == nullptr ? 0 : table_schema->GetColumn(column_id).GetOffset();
+  comparisons_.push_back(Comparison{column_id, offset, column_expr->GetReturnType(), comp_type,
+                                    value.CastAs(TypeId::BIGINT).GetAs<int64_t>()});
+  return true;
+}
+
+auto ScanFilter::Comparison::Read(const Value &value) const -> std::optional<int64_t> {
+  if (value.IsNull()) {
+    return std::nullopt;
+  }
+  switch (type_) {
+    case TypeId::TINYINT:
+      return value.GetAs<int8_t>();
+    case TypeId::SMALLINT:
+      return value.GetAs<int16_t>();
+    case TypeId::INTEGER:
+      return value.GetAs<int32_t>();
+    default:
+      return value.GetAs<int64_t>();
+  }
+}
+
+auto ScanFilter::MatchResidual(const Tuple &tuple, const Schema &schema) const -> bool {
+  if (residual_ == nullptr) {
+    return true;
+  }
+  auto value = residual_->Evaluate(&tuple, schema);
+  return !value.IsNull() && value.GetAs<bool>();
+}
+
+void ScanFilter::FilterBatch(TupleBatch *batch) {
+  if (compiled_residual_ == nullptr) {
+    return;
+  }
+  compiled_residual_->EvaluatePredicate(*batch, &selection_);
+  batch->Compact(selection_);
+}
+
+}  // namespace bustub
@@ -1,23 +1,113 @@
-//===----------------------------------------------------------------------===//
-//
-//                         BusTub
-//
-// seq_scan_executor.cpp
-//
-// Identification: src/execution/seq_scan_executor.cpp
-//
-// Copyright (c) 2015-2021, Carnegie Mellon University Database Group
-//
-//===----------------------------------------------------------------------===//
-
-#include "execution/executors/seq_scan_executor.h"
-
-namespace bustub {
-
-SeqScanExecutor::SeqScanExecutor(ExecutorContext *exec_ctx, const SeqScanPlanNode *plan) : AbstractExecutor(exec_ctx) {}
-
-void SeqScanExecutor::Init() { throw NotImplementedException("SeqScanExecutor is not implemented"); }
-
-auto SeqScanExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
-
-}  // namespace bustub
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// seq_scan_executor.cpp
+//
+// Identification: src/execution/seq_scan_executor.cpp
+//
+// Copyright (c) 2015-2021, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/executors/seq_scan_executor.h"
+
+#include "storage/page/table_page.h"
+
+namespace bustub {
+
+SeqScanExecutor::SeqScanExecutor(ExecutorContext *exec_ctx, const SeqScanPlanNode *plan)
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      table_info_(exec_ctx->GetCatalog()->GetTable(plan->GetTableOid())),
+      filter_(plan->filter_predicate_, plan->column_ids_, &table_info_->schema_) {}
+
+void SeqScanExecutor::Init() {
+  morsel_queue_ = exec_ctx_->GetMorselQueue();
+  if (morsel_queue_ == nullptr) {
+    morsel_queue_ = std::make_shared<MorselQueue>();
+  }
+  // Only the first worker of a parallel scan takes the snapshot, the others join it.
+  auto *table_heap = table_info_->table_.get();
+  morsel_queue_->InitPages(exec_ctx_->GetBufferPoolManager(), table_heap->GetFirstPageId(), table_heap->GetEndRid());
+  page_ids_.clear();
+  page_idx_ = 0;
+  slot_ = 0;
+}
+
+template <class Emit>
+auto SeqScanExecutor::ScanTuples(Emit &&emit) -> bool {
+  const RID end_rid = morsel_queue_->GetEndRid();
+  while (true) {
+    if (page_idx_ == page_ids_.size()) {
+      // NextPages empties the list even when the scan is over, so the position is reset first.
+      page_idx_ = 0;
+      slot_ = 0;
+      if (!morsel_queue_->NextPages(&page_ids_)) {
+        return false;
+      }
+    }
+
+    // The page stays latched while its tuples are checked, and is released before the scan returns.
+    const page_id_t page_id = page_ids_[page_idx_];
+    auto page_guard = exec_ctx_->GetBufferPoolManager()->FetchPageRead(page_id);
+    const auto *page = page_guard.As<TablePage>();
+    const uint32_t num_tuples = page_id == end_rid.GetPageId() ? end_rid.GetSlotNum() : page->GetNumTuples();
+    while (slot_ < num_tuples) {
+      const RID current{page_id, slot_++};
+      auto [meta, data] = page->PeekTuple(current);
+      if (meta.is_deleted_ || !filter_.MatchData(data)) {
+        continue;
+      }
+      if (!emit(*page, current)) {
+        return true;
+      }
+    }
+    page_idx_++;
+    slot_ = 0;
+  }
+}
+
+auto SeqScanExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  return ScanTuples([&](const TablePage &page, const RID &current) {
+    *tuple = page.GetTuple(current).second;
+    if (!plan_->column_ids_.empty()) {
+      *tuple = Tuple{DecodeColumns(*tuple), &GetOutputSchema()};
+    }
+    *rid = current;
+    // Keep scanning while the residual predicate rejects the tuple.
+    return !filter_.MatchResidual(*tuple, GetOutputSchema());
+  });
+}
+
+auto SeqScanExecutor::NextBatch(TupleBatch *batch, size_t max_rows) -> bool {
+  // Keep scanning until a batch has a matching tuple, an empty batch means the scan is complete.
+  do {
+    batch->Reset(&GetOutputSchema());
+    ScanTuples([&](const TablePage &page, const RID &current) {
+      auto tuple = page.GetTuple(current).second;
+      if (plan_->column_ids_.empty()) {
+        batch->AppendTuple(tuple, current);
+      } else {
+        batch->AppendRow(DecodeColumns(tuple), current);
+      }
+      return batch->Size() < max_rows;
+    });
+    if (batch->IsEmpty()) {
+      return false;
+    }
+    filter_.FilterBatch(batch);
+  } while (batch->IsEmpty());
+  return true;
+}
+
+auto SeqScanExecutor::DecodeColumns(const Tuple &tuple) const -> std::vector<Value> {
+  std::vector<Value> values;
+  values.reserve(plan_->column_ids_.size());
+  for (const auto column_id : plan_->column_ids_) {
+    values.push_back(tuple.GetValue(&table_info_->schema_, column_id));
+  }
+  return values;
+}
+
+}  // namespace bustub
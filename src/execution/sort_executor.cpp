@@ -1,13 +1,37 @@
 #include "execution/executors/sort_executor.h"
 
+#include <string>
+
+#include "storage/table/tuple_batch.h"
+
 namespace bustub {
 
 SortExecutor::SortExecutor(ExecutorContext *exec_ctx, const SortPlanNode *plan,
                            std::unique_ptr<AbstractExecutor> &&child_executor)
-    : AbstractExecutor(exec_ctx) {}
+    : AbstractExecutor(exec_ctx), plan_(plan), child_executor_(std::move(child_executor)) {}
+
+void SortExecutor::Init() {
+  child_executor_->Init();
+  sorter_ = std::make_unique<ExternalSorter>(exec_ctx_->GetBufferPoolManager(), exec_ctx_->GetMemoryBudget(),
+                                             exec_ctx_->GetParallelism());
 
-void SortExecutor::Init() { throw NotImplementedException("SortExecutor is not implemented"); }
+  TupleBatch batch;
+  std::vector<std::string> keys;
+  while (child_executor_->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+    MakeSortKeys(plan_->GetOrderBy(), batch, &keys);
+    for (size_t i = 0; i < batch.Size(); i++) {
+      sorter_->Add(std::move(keys[i]), batch.GetTuple(i));
+    }
+  }
+  sorter_->Sort();
+}
 
-auto SortExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
+auto SortExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  if (!sorter_->Next(tuple)) {
+    return false;
+  }
+  *rid = tuple->GetRid();
+  return true;
+}
 
 }  // namespace bustub
@@ -0,0 +1,139 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// sort_merge_join_executor.cpp
+//
+// Identification: src/execution/sort_merge_join_executor.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/executors/sort_merge_join_executor.h"
+
+#include "type/value_factory.h"
+
+namespace bustub {
+
+SortMergeJoinExecutor::SortMergeJoinExecutor(ExecutorContext *exec_ctx, const SortMergeJoinPlanNode *plan,
+                                             std::unique_ptr<AbstractExecutor> &&left_child,
+                                             std::unique_ptr<AbstractExecutor> &&right_child)
+    : AbstractExecutor(exec_ctx),
+      plan_(plan),
+      left_child_(std::move(left_child)),
+      right_child_(std::move(right_child)) {
+  if (!(plan->GetJoinType() == JoinType::LEFT || plan->GetJoinType() == JoinType::INNER)) {
+    throw bustub::NotImplementedException(fmt::format("join type {} not supported", plan->GetJoinType()));
+  }
+  BUSTUB_ENSURE(plan->LeftJoinKeyExpressions().size() == plan->RightJoinKeyExpressions().size(),
+                "join keys must have the same columns");
+}
+
+void SortMergeJoinExecutor::Init() {
+  left_child_->Init();
+  right_child_->Init();
+  group_.clear();
+  group_keys_.clear();
+  group_loaded_ = false;
+  emitting_ = false;
+  match_idx_ = 0;
+  Advance(left_child_.get(), plan_->LeftJoinKeyExpressions(), &left_);
+  Advance(right_child_.get(), plan_->RightJoinKeyExpressions(), &right_);
+}
+
+void SortMergeJoinExecutor::Advance(AbstractExecutor *child, const std::vector<AbstractExpressionRef> &key_exprs,
+                                    Cursor *cursor) {
+  RID rid;
+  cursor->valid_ = child->Next(&cursor->tuple_, &rid);
+  if (!cursor->valid_) {
+    return;
+  }
+  cursor->keys_.clear();
+  cursor->null_key_ = false;
+  for (const auto &expr : key_exprs) {
+    cursor->keys_.push_back(expr->Evaluate(&cursor->tuple_, child->GetOutputSchema()));
+    cursor->null_key_ = cursor->null_key_ || cursor->keys_.back().IsNull();
+  }
+}
+
+auto SortMergeJoinExecutor::CompareKeys(const std::vector<Value> &lhs, const std::vector<Value> &rhs) -> int {
+  for (size_t k = 0; k < lhs.size(); k++) {
+    if (lhs[k].CompareLessThan(rhs[k]) == CmpBool::CmpTrue) {
+      return -1;
+    }
+    if (lhs[k].CompareGreaterThan(rhs[k]) == CmpBool::CmpTrue) {
+      return 1;
+    }
+  }
+  return 0;
+}
+
+void SortMergeJoinExecutor::LoadGroup() {
+  group_.clear();
+  group_keys_ = left_.keys_;
+  group_loaded_ = true;
+  // NULL keys are skipped wherever the child sorted them.
+  while (right_.valid_ && (right_.null_key_ || CompareKeys(right_.keys_, group_keys_) < 0)) {
+    Advance(right_child_.get(), plan_->RightJoinKeyExpressions(), &right_);
+  }
+  while (right_.valid_ && (right_.null_key_ || CompareKeys(right_.keys_, group_keys_) == 0)) {
+    if (!right_.null_key_) {
+      group_.push_back(right_.tuple_);
+    }
+    Advance(right_child_.get(), plan_->RightJoinKeyExpressions(), &right_);
+  }
+}
+
+auto SortMergeJoinExecutor::MakeOutputTuple(const Tuple &left, const Tuple *right) const -> Tuple {
+  const auto &left_schema = left_child_->GetOutputSchema();
+  const auto &right_schema = right_child_->GetOutputSchema();
+  std::vector<Value> values;
+  values.reserve(GetOutputSchema().GetColumnCount());
+  for (uint32_t i = 0; i < left_schema.GetColumnCount(); i++) {
+    values.push_back(left.GetValue(&left_schema, i));
+  }
+  for (uint32_t i = 0; i < right_schema.GetColumnCount(); i++) {
+    values.push_back(right != nullptr ? right->GetValue(&right_schema, i)
+                                      : ValueFactory::GetNullValueByType(right_schema.GetColumn(i).GetType()));
+  }
+  return {values, &GetOutputSchema()};
+}
+
+auto SortMergeJoinExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  while (left_.valid_) {
+    if (emitting_) {
+      if (match_idx_ < group_.size()) {
+        *tuple = MakeOutputTuple(left_.tuple_, &group_[match_idx_++]);
+        return true;
+      }
+      emitting_ = false;
+      Advance(left_child_.get(), plan_->LeftJoinKeyExpressions(), &left_);
+      continue;
+    }
+
+    if (!left_.null_key_) {
+      // Left rows with the key of the previous one rewind to the buffered group instead of reading the right child.
+      if (!group_loaded_ || CompareKeys(left_.keys_, group_keys_) != 0) {
+        LoadGroup();
+      }
+      if (!group_.empty()) {
+        emitting_ = true;
+        match_idx_ = 0;
+        continue;
+      }
+    }
+
+    const bool emit_unmatched = plan_->GetJoinType() == JoinType::LEFT;
+    if (emit_unmatched) {
+      *tuple = MakeOutputTuple(left_.tuple_, nullptr);
+    }
+    Advance(left_child_.get(), plan_->LeftJoinKeyExpressions(), &left_);
+    if (emit_unmatched) {
+      return true;
+    }
+  }
+  return false;
+}
+
+}  // namespace bustub
@@ -0,0 +1,97 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// spill_file.cpp
+//
+// Identification: src/execution/spill_file.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "execution/spill_file.h"
+
+#include <algorithm>
+
+#include "common/exception.h"
+
+namespace bustub {
+
+void SpillFile::Append(const Tuple &tuple) {
+  TmpTuple out{INVALID_PAGE_ID, 0};
+  if (write_page_ != nullptr && write_page_->Insert(tuple, &out)) {
+    size_++;
+    bytes_ += tuple.GetLength();
+    return;
+  }
+  FinishWrite();
+
+  page_id_t page_id;
+  Page *page = bpm_->NewPage(&page_id);
+  if (page == nullptr) {
+    throw Exception(ExceptionType::OUT_OF_MEMORY, "no free frame to spill to");
+  }
+  page_ids_.push_back(page_id);
+  write_page_ = reinterpret_cast<TmpTuplePage *>(page);
+  write_page_->Init(page_id, BUSTUB_PAGE_SIZE);
+  if (!write_page_->Insert(tuple, &out)) {
+    throw Exception(ExceptionType::OUT_OF_RANGE, "tuple too large to spill");
+  }
+  size_++;
+  bytes_ += tuple.GetLength();
+}
+
+void SpillFile::FinishWrite() {
+  if (write_page_ != nullptr) {
+    bpm_->UnpinPage(page_ids_.back(), true);
+    write_page_ = nullptr;
+  }
+}
+
+void SpillFile::Clear() {
+  FinishWrite();
+  for (const auto page_id : page_ids_) {
+    bpm_->DeletePage(page_id);
+  }
+  page_ids_.clear();
+  size_ = 0;
+  bytes_ = 0;
+}
+
+SpillFile::Reader::~Reader() {
+  if (page_ != nullptr) {
+    file_->bpm_->UnpinPage(file_->page_ids_[page_idx_ - 1], false);
+  }
+}
+
+auto SpillFile::Reader::Next(Tuple *tuple) -> bool {
+  while (offset_idx_ == offsets_.size()) {
+    if (page_ != nullptr) {
+      file_->bpm_->UnpinPage(file_->page_ids_[page_idx_ - 1], false);
+      page_ = nullptr;
+    }
+    if (page_idx_ == file_->page_ids_.size()) {
+      return false;
+    }
+    Page *page = file_->bpm_->FetchPage(file_->page_ids_[page_idx_++]);
+    if (page == nullptr) {
+      throw Exception(ExceptionType::OUT_OF_MEMORY, "no free frame to read spilled tuples");
+    }
+    page_ = reinterpret_cast<TmpTuplePage *>(page);
+
+    // A page is read from its free space pointer up, which is the reverse of the insertion order.
+    offsets_.clear();
+    offset_idx_ = 0;
+    Tuple skipped;
+    for (uint32_t offset = page_->GetFreeSpacePointer(); offset < BUSTUB_PAGE_SIZE;
+         offset = page_->Get(offset, &skipped)) {
+      offsets_.push_back(offset);
+    }
+    std::reverse(offsets_.begin(), offsets_.end());
+  }
+  page_->Get(offsets_[offset_idx_++], tuple);
+  return true;
+}
+
+}  // namespace bustub
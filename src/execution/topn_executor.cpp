@@ -1,15 +1,178 @@
 #include "execution/executors/topn_executor.h"
 
+#include <algorithm>
+#include <condition_variable>  // NOLINT
+#include <deque>
+#include <exception>
+#include <mutex>   // NOLINT
+#include <thread>  // NOLINT
+
+#include "storage/index/key_encoder.h"
+
 namespace bustub {
 
 TopNExecutor::TopNExecutor(ExecutorContext *exec_ctx, const TopNPlanNode *plan,
                            std::unique_ptr<AbstractExecutor> &&child_executor)
-    : AbstractExecutor(exec_ctx) {}
+    : AbstractExecutor(exec_ctx), plan_(plan), child_executor_(std::move(child_executor)) {}
+
+auto TopNExecutor::BoundedHeap::Less(const HeapEntry &lhs, const HeapEntry &rhs) -> bool {
+  const int cmp = KeyEncoder::Compare(lhs.key_, rhs.key_);
+  return cmp < 0 || (cmp == 0 && lhs.seq_ < rhs.seq_);
+}
+
+void TopNExecutor::BoundedHeap::Push(const std::string &key, size_t seq, const Tuple &tuple) {
+  if (n_ == 0) {
+    return;
+  }
+  if (entries_.size() == n_) {
+    // Only rows ranking before the current N-th row get in. Later rows lose ties, since their seq is larger.
+    if (KeyEncoder::Compare(key, entries_.front().key_) >= 0) {
+      return;
+    }
+    std::pop_heap(entries_.begin(), entries_.end(), Less);
+    entries_.pop_back();
+  }
+  entries_.push_back({key, seq, tuple});
+  std::push_heap(entries_.begin(), entries_.end(), Less);
+}
+
+auto TopNExecutor::BoundedHeap::Drain() -> std::vector<HeapEntry> {
+  std::sort_heap(entries_.begin(), entries_.end(), Less);
+  return std::move(entries_);
+}
+
+void TopNExecutor::Init() {
+  child_executor_->Init();
+  heaps_.clear();
+  results_.clear();
+  cursor_ = 0;
+
+  // The TopN check counts heap entries on every child Next, which only works when rows are pulled one by one.
+  const auto &check_options = exec_ctx_->GetCheckOptions()->check_options_set_;
+  const size_t workers = exec_ctx_->GetParallelism();
+  if (workers > 1 && check_options.find(CheckOption::ENABLE_TOPN_CHECK) == check_options.end()) {
+    RunParallel(workers);
+  } else {
+    RunSerial();
+  }
+
+  // Merge the heaps: the N smallest entries of all heaps, ties broken by child order.
+  for (auto &heap : heaps_) {
+    auto entries = heap.Drain();
+    std::vector<HeapEntry> merged;
+    merged.reserve(std::min(results_.size() + entries.size(), plan_->GetN()));
+    std::merge(std::make_move_iterator(results_.begin()), std::make_move_iterator(results_.end()),
+               std::make_move_iterator(entries.begin()), std::make_move_iterator(entries.end()),
+               std::back_inserter(merged), [](const HeapEntry &lhs, const HeapEntry &rhs) {
+                 const int cmp = KeyEncoder::Compare(lhs.key_, rhs.key_);
+                 return cmp < 0 || (cmp == 0 && lhs.seq_ < rhs.seq_);
+               });
+    if (merged.size() > plan_->GetN()) {
+      merged.resize(plan_->GetN());
+    }
+    results_ = std::move(merged);
+  }
+  heaps_.clear();
+}
+
+void TopNExecutor::RunSerial() {
+  heaps_.emplace_back(plan_->GetN());
+  Tuple tuple;
+  RID rid;
+  for (size_t seq = 0; child_executor_->Next(&tuple, &rid); seq++) {
+    heaps_[0].Push(MakeSortKey(plan_->GetOrderBy(), tuple, child_executor_->GetOutputSchema()), seq, tuple);
+  }
+}
+
+void TopNExecutor::RunParallel(size_t workers) {
+  for (size_t i = 0; i < workers; i++) {
+    heaps_.emplace_back(plan_->GetN());
+  }
+
+  // The child is read by this thread; the workers rank whole batches, tagged with the seq of their first row.
+  std::mutex latch;
+  std::condition_variable batch_ready;
+  std::condition_variable batch_taken;
+  std::deque<std::pair<size_t, TupleBatch>> batches;
+  bool done = false;
+  std::exception_ptr error;
+
+  std::vector<std::thread> threads;
+  for (size_t w = 0; w < workers; w++) {
+    threads.emplace_back([&, w] {
+      std::vector<std::string> keys;
+      while (true) {
+        std::pair<size_t, TupleBatch> item;
+        {
+          std::unique_lock lock(latch);
+          batch_ready.wait(lock, [&] { return !batches.empty() || done; });
+          if (batches.empty()) {
+            return;
+          }
+          item = std::move(batches.front());
+          batches.pop_front();
+          batch_taken.notify_one();
+        }
+        try {
+          const auto &[first_seq, batch] = item;
+          MakeSortKeys(plan_->GetOrderBy(), batch, &keys);
+          for (size_t i = 0; i < batch.Size(); i++) {
+            heaps_[w].Push(keys[i], first_seq + i, batch.GetTuple(i));
+          }
+        } catch (...) {
+          std::scoped_lock lock(latch);
+          error = std::current_exception();
+        }
+      }
+    });
+  }
 
-void TopNExecutor::Init() { throw NotImplementedException("TopNExecutor is not implemented"); }
+  try {
+    size_t seq = 0;
+    TupleBatch batch;
+    while (child_executor_->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+      const size_t size = batch.Size();
+      std::unique_lock lock(latch);
+      batch_taken.wait(lock, [&] { return batches.size() < 2 * workers || error != nullptr; });
+      if (error != nullptr) {
+        break;
+      }
+      batches.emplace_back(seq, std::move(batch));
+      batch_ready.notify_one();
+      seq += size;
+    }
+  } catch (...) {
+    std::scoped_lock lock(latch);
+    error = std::current_exception();
+  }
+  {
+    std::scoped_lock lock(latch);
+    done = true;
+    batch_ready.notify_all();
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  if (error != nullptr) {
+    std::rethrow_exception(error);
+  }
+}
 
-auto TopNExecutor::Next(Tuple *tuple, RID *rid) -> bool { return false; }
+auto TopNExecutor::Next(Tuple *tuple, RID *rid) -> bool {
+  if (cursor_ == results_.size()) {
+    return false;
+  }
+  *tuple = std::move(results_[cursor_++].tuple_);
+  *rid = tuple->GetRid();
+  return true;
+}
 
-auto TopNExecutor::GetNumInHeap() -> size_t { throw NotImplementedException("TopNExecutor is not implemented"); };
+auto TopNExecutor::GetNumInHeap() -> size_t {
+  size_t total = 0;
+  for (const auto &heap : heaps_) {
+    total += heap.Size();
+  }
+  return total;
+}
 
 }  // namespace bustub
@@ -81,6 +81,10 @@ class ExplainStatement;
 class IndexStatement;
 class DeleteStatement;
 class UpdateStatement;
+class PrepareStatement;
+class ExecuteStatement;
+class DeallocateStatement;
+class AnalyzeStatement;
 
 /**
  * The binder is responsible for transforming the Postgres parse tree to a binder tree
@@ -204,6 +208,16 @@ class Binder {
 
   auto BindVariableShow(duckdb_libpgquery::PGVariableShowStmt *stmt) -> std::unique_ptr<VariableShowStatement>;
 
+  auto BindAnalyze(duckdb_libpgquery::PGVacuumStmt *stmt) -> std::unique_ptr<AnalyzeStatement>;
+
+  auto BindPrepare(duckdb_libpgquery::PGPrepareStmt *stmt) -> std::unique_ptr<PrepareStatement>;
+
+  auto BindExecute(duckdb_libpgquery::PGExecuteStmt *stmt) -> std::unique_ptr<ExecuteStatement>;
+
+  auto BindDeallocate(duckdb_libpgquery::PGDeallocateStmt *stmt) -> std::unique_ptr<DeallocateStatement>;
+
+  auto BindParamRef(duckdb_libpgquery::PGParamRef *node) -> std::unique_ptr<BoundExpression>;
+
   class ContextGuard {
    public:
     explicit ContextGuard(const BoundTableRef **scope, const CTEList **cte_scope) {
@@ -252,6 +266,9 @@ class Binder {
   /** Sometimes we will need to assign a name to some unnamed items. This variable gives them a universal ID. */
   size_t universal_id_{0};
 
+  /** The parameter types of the statement being prepared, or nullptr outside of `PREPARE`. */
+  std::vector<TypeId> *param_types_{nullptr};
+
   duckdb::PostgresParser parser_;
 };
 
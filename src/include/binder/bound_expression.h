@@ -22,6 +22,7 @@ enum class ExpressionType : uint8_t {
   BINARY_OP = 9,  /**< Binary expression type. */
   ALIAS = 10,     /**< Alias expression type. */
   FUNC_CALL = 11, /**< Function call expression type. */
+  PARAMETER = 12, /**< Parameter of a prepared statement, e.g. `$1`. */
 };
 
 /**
@@ -102,6 +103,9 @@ struct fmt::formatter<bustub::ExpressionType> : formatter<string_view> {
       case bustub::ExpressionType::FUNC_CALL:
         name = "FuncCall";
         break;
+      case bustub::ExpressionType::PARAMETER:
+        name = "Parameter";
+        break;
     }
     return formatter<string_view>::format(name, ctx);
   }
@@ -0,0 +1,30 @@
+#pragma once
+
+#include <string>
+#include <utility>
+
+#include "binder/bound_expression.h"
+#include "fmt/format.h"
+#include "type/type_id.h"
+
+namespace bustub {
+
+/**
+ * A parameter of a prepared statement, e.g., `$1`. Its value is only known when the statement is executed.
+ */
+class BoundParameter : public BoundExpression {
+ public:
+  explicit BoundParameter(uint32_t param_idx, TypeId type)
+      : BoundExpression(ExpressionType::PARAMETER), param_idx_(param_idx), type_id_(type) {}
+
+  auto ToString() const -> std::string override { return fmt::format("${}", param_idx_ + 1); }
+
+  auto HasAggregation() const -> bool override { return false; }
+
+  /** The index of the parameter, starting at 0 for `$1`. */
+  uint32_t param_idx_;
+
+  /** The declared type of the parameter. */
+  TypeId type_id_;
+};
+}  // namespace bustub
@@ -0,0 +1,33 @@
+//===----------------------------------------------------------------------===//
+//                         BusTub
+//
+// binder/analyze_statement.h
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "binder/bound_statement.h"
+#include "common/enums/statement_type.h"
+#include "fmt/format.h"
+#include "fmt/ranges.h"
+
+namespace bustub {
+
+/** `ANALYZE [table]` collects the statistics of a table, or of all tables. */
+class AnalyzeStatement : public BoundStatement {
+ public:
+  explicit AnalyzeStatement(std::vector<std::string> tables)
+      : BoundStatement(StatementType::ANALYZE_STATEMENT), tables_(std::move(tables)) {}
+
+  /** The tables to analyze */
+  std::vector<std::string> tables_;
+
+  auto ToString() const -> std::string override { return fmt::format("BoundAnalyze {{ tables={} }}", tables_); }
+};
+
+}  // namespace bustub
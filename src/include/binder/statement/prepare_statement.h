@@ -0,0 +1,74 @@
+//===----------------------------------------------------------------------===//
+//                         BusTub
+//
+// binder/prepare_statement.h
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "binder/bound_statement.h"
+#include "common/enums/statement_type.h"
+#include "common/util/string_util.h"
+#include "fmt/format.h"
+#include "fmt/ranges.h"
+#include "type/type_id.h"
+#include "type/value.h"
+
+namespace bustub {
+
+class PrepareStatement : public BoundStatement {
+ public:
+  explicit PrepareStatement(std::string name, std::vector<TypeId> param_types,
+                            std::unique_ptr<BoundStatement> statement)
+      : BoundStatement(StatementType::PREPARE_STATEMENT),
+        name_(std::move(name)),
+        param_types_(std::move(param_types)),
+        statement_(std::move(statement)) {}
+
+  std::string name_;
+  /** The types of `$1`, `$2`, ...; parameters without a declared type are integers. */
+  std::vector<TypeId> param_types_;
+  std::unique_ptr<BoundStatement> statement_;
+
+  auto ToString() const -> std::string override {
+    return fmt::format("BoundPrepare {{\n  name={},\n  params={},\n  statement={}\n}}", name_, param_types_.size(),
+                       StringUtil::IndentAllLines(statement_->ToString(), 2, true));
+  }
+};
+
+class ExecuteStatement : public BoundStatement {
+ public:
+  explicit ExecuteStatement(std::string name, std::vector<Value> params)
+      : BoundStatement(StatementType::EXECUTE_STATEMENT), name_(std::move(name)), params_(std::move(params)) {}
+
+  std::string name_;
+  std::vector<Value> params_;
+
+  auto ToString() const -> std::string override {
+    std::vector<std::string> params;
+    params.reserve(params_.size());
+    for (const auto &param : params_) {
+      params.push_back(param.ToString());
+    }
+    return fmt::format("BoundExecute {{ name={}, params=[{}] }}", name_, fmt::join(params, ", "));
+  }
+};
+
+class DeallocateStatement : public BoundStatement {
+ public:
+  /** An empty `name` deallocates all prepared statements. */
+  explicit DeallocateStatement(std::string name)
+      : BoundStatement(StatementType::DEALLOCATE_STATEMENT), name_(std::move(name)) {}
+
+  std::string name_;
+
+  auto ToString() const -> std::string override { return fmt::format("BoundDeallocate {{ name={} }}", name_); }
+};
+
+}  // namespace bustub
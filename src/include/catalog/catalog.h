@@ -12,14 +12,17 @@
 
 #pragma once
 
+#include <algorithm>
 #include <memory>
 #include <string>
+#include <thread>  // NOLINT
 #include <unordered_map>
 #include <utility>
 #include <vector>
 
 #include "buffer/buffer_pool_manager.h"
 #include "catalog/schema.h"
+#include "catalog/table_statistics.h"
 #include "container/hash/hash_function.h"
 #include "storage/index/b_plus_tree_index.h"
 #include "storage/index/extendible_hash_table_index.h"
@@ -47,7 +50,11 @@ struct TableInfo {
    * @param oid The unique OID for the table
    */
   TableInfo(Schema schema, std::string name, std::unique_ptr<TableHeap> &&table, table_oid_t oid)
-      : schema_{std::move(schema)}, name_{std::move(name)}, table_{std::move(table)}, oid_{oid} {}
+      : schema_{std::move(schema)},
+        name_{std::move(name)},
+        table_{std::move(table)},
+        oid_{oid},
+        stats_{schema_.GetColumnCount(), false} {}
   /** The table schema */
   Schema schema_;
   /** The table name */
@@ -56,6 +63,8 @@ struct TableInfo {
   std::unique_ptr<TableHeap> table_;
   /** The table OID */
   const table_oid_t oid_;
+  /** The statistics of the table, which are exact for a table created empty */
+  TableStatistics stats_;
 };
 
 /**
@@ -148,6 +157,11 @@ class Catalog {
     auto meta = std::make_unique<TableInfo>(schema, table_name, std::move(table), table_oid);
     auto *tmp = meta.get();
 
+    // A new table is empty, so its statistics start out exact.
+    if (create_table_heap) {
+      tmp->stats_.Reset(0, std::vector<ColumnStatistics>(schema.GetColumnCount()));
+    }
+
     // Update the internal tracking mechanisms
     tables_.emplace(table_oid, std::move(meta));
     table_names_.emplace(table_name, table_oid);
@@ -230,12 +244,16 @@ class Catalog {
     // TODO(chi): support both hash index and btree index
     auto index = std::make_unique<BPlusTreeIndex<KeyType, ValueType, KeyComparator>>(std::move(meta), bpm_);
 
-    // Populate the index with all tuples in table heap
+    // Populate the index with all tuples in table heap: sort the entries in parallel and bulk-load the tree
     auto *table_meta = GetTable(table_name);
+    std::vector<std::pair<KeyType, ValueType>> entries;
     for (auto iter = table_meta->table_->MakeIterator(); !iter.IsEnd(); ++iter) {
       auto [meta, tuple] = iter.GetTuple();
-      index->InsertEntry(tuple.KeyFromTuple(schema, key_schema, key_attrs), tuple.GetRid(), txn);
+      KeyType index_key;
+      index_key.SetFromKey(tuple.KeyFromTuple(schema, key_schema, key_attrs));
+      entries.emplace_back(index_key, tuple.GetRid());
     }
+    index->BulkLoad(std::move(entries), std::max(std::thread::hardware_concurrency(), 1U), txn);
 
     // Get the next OID for the new index
     const auto index_oid = next_index_oid_.fetch_add(1);
@@ -300,7 +318,7 @@ class Catalog {
    * @param index_oid The OID of the index for which to query
    * @return A (non-owning) pointer to the metadata for the index
    */
-  auto GetIndex(index_oid_t index_oid) -> IndexInfo * {
+  auto GetIndex(index_oid_t index_oid) const -> IndexInfo * {
     auto index = indexes_.find(index_oid);
     if (index == indexes_.end()) {
       return NULL_INDEX_INFO;
@@ -335,7 +353,7 @@ class Catalog {
     return indexes;
   }
 
-  auto GetTableNames() -> std::vector<std::string> {
+  auto GetTableNames() const -> std::vector<std::string> {
     std::vector<std::string> result;
     for (const auto &x : table_names_) {
       result.push_back(x.first);
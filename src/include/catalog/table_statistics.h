@@ -0,0 +1,140 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// table_statistics.h
+//
+// Identification: src/include/catalog/table_statistics.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <array>
+#include <cstdint>
+#include <mutex>  // NOLINT
+#include <optional>
+#include <vector>
+
+#include "catalog/schema.h"
+#include "execution/expressions/comparison_expression.h"
+#include "storage/table/tuple.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/**
+ * HyperLogLog estimates the number of distinct values in a multiset with a few kilobytes, whatever its size.
+ */
+class HyperLogLog {
+ public:
+  /** 2^PRECISION registers, for a standard error of about 1.04 / sqrt(2^PRECISION), i.e. ~2% */
+  static constexpr uint32_t PRECISION = 12;
+  static constexpr uint32_t NUM_REGISTERS = 1 << PRECISION;
+
+  void Add(const Value &value);
+
+  auto Estimate() const -> double;
+
+ private:
+  std::array<uint8_t, NUM_REGISTERS> registers_{};
+};
+
+/**
+ * ColumnStatistics describes the values of a column: how many are NULL, their range, an estimate of how many are
+ * distinct, and an equi-depth histogram of their distribution.
+ *
+ * The histogram is built by ANALYZE from a sample of the column. Rows inserted or deleted afterwards are counted into
+ * the buckets they fall in; the distinct estimate and the range only grow, so they become upper bounds after deletes.
+ */
+class ColumnStatistics {
+ public:
+  /** The number of buckets of the histogram */
+  static constexpr size_t NUM_BUCKETS = 32;
+  /** The number of values that ANALYZE samples to build the histogram */
+  static constexpr size_t SAMPLE_SIZE = 10000;
+
+  void Add(const Value &value);
+
+  void Remove(const Value &value);
+
+  /**
+   * Offer a value to the sample of ANALYZE, after it is added. The sample is a uniform reservoir sample of the values.
+   */
+  void Sample(const Value &value);
+
+  /** Build the histogram from the sample, which is then released. */
+  void BuildHistogram();
+
+  /** @return the estimated number of distinct non-NULL values, at least 1 */
+  auto EstimateDistinct() const -> double;
+
+  /** @return the estimated fraction of the non-NULL values `v` for which `v comp_type value` holds */
+  auto EstimateSelectivity(ComparisonType comp_type, const Value &value) const -> double;
+
+  auto GetNullCount() const -> double { return null_count_; }
+  auto GetValueCount() const -> double { return value_count_; }
+
+ private:
+  /** @return the estimated fraction of the non-NULL values below `value` (or at most `value` if `inclusive`) */
+  auto EstimateBelow(const Value &value, bool inclusive) const -> double;
+
+  double null_count_{0};
+  double value_count_{0};
+  std::optional<Value> min_;
+  std::optional<Value> max_;
+  HyperLogLog distinct_;
+
+  /** The upper bound of each bucket, ascending; the lower bound of the first bucket is `min_` */
+  std::vector<Value> bucket_bounds_;
+  /** The number of values in each bucket */
+  std::vector<double> bucket_counts_;
+
+  std::vector<Value> sample_;
+  size_t sampled_count_{0};
+};
+
+/**
+ * TableStatistics holds the row count and the column statistics of a table, for the optimizer to estimate the
+ * cardinalities of plans.
+ *
+ * ANALYZE collects the statistics of a table from a full scan. A table created empty starts with (exact) empty
+ * statistics; mock tables have none until they are analyzed. Inserts and deletes keep the statistics up to date
+ * through `Insert` and `Delete`. All methods are thread-safe.
+ */
+class TableStatistics {
+ public:
+  TableStatistics(size_t column_count, bool is_analyzed) : is_analyzed_(is_analyzed), columns_(column_count) {}
+
+  /** Replace the statistics by those of a full scan. */
+  void Reset(double row_count, std::vector<ColumnStatistics> columns);
+
+  void Insert(const Tuple &tuple, const Schema &schema);
+
+  void Delete(const Tuple &tuple, const Schema &schema);
+
+  /** @return true if the statistics describe the table, i.e. the table was analyzed or created empty */
+  auto IsAnalyzed() const -> bool;
+
+  auto GetRowCount() const -> double;
+
+  /** @return the estimated number of distinct non-NULL values of a column, or nullopt without statistics */
+  auto EstimateDistinct(uint32_t column_idx) const -> std::optional<double>;
+
+  /**
+   * @return the estimated fraction of the rows for which `column comp_type value` is true (i.e. neither false nor
+   * NULL), or nullopt without statistics
+   */
+  auto EstimateSelectivity(uint32_t column_idx, ComparisonType comp_type, const Value &value) const
+      -> std::optional<double>;
+
+ private:
+  mutable std::mutex latch_;
+  bool is_analyzed_;
+  double row_count_{0};
+  std::vector<ColumnStatistics> columns_;
+};
+
+}  // namespace bustub
@@ -12,8 +12,13 @@
 
 #pragma once
 
+#include <algorithm>
+#include <atomic>
+#include <cctype>
+#include <cstdlib>
 #include <iostream>
 #include <memory>
+#include <mutex>  // NOLINT
 #include <optional>
 #include <shared_mutex>
 #include <sstream>
@@ -24,8 +29,10 @@
 
 #include "catalog/catalog.h"
 #include "common/config.h"
+#include "common/plan_cache.h"
 #include "common/util/string_util.h"
 #include "execution/check_options.h"
+#include "execution/expressions/parameter_value_expression.h"
 #include "libfort/lib/fort.hpp"
 #include "type/value.h"
 
@@ -47,6 +54,11 @@ class IndexStatement;
 class VariableSetStatement;
 class VariableShowStatement;
 class ExplainStatement;
+class PrepareStatement;
+class ExecuteStatement;
+class DeallocateStatement;
+class AnalyzeStatement;
+class BoundStatement;
 
 class ResultWriter {
  public:
@@ -61,6 +73,8 @@ class ResultWriter {
   virtual void EndRow() = 0;
   virtual void BeginTable(bool simplified_output) = 0;
   virtual void EndTable() = 0;
+  /** Called after each batch of rows while a query is still running, so that the rows so far can be shown. */
+  virtual void Flush() {}
 
   bool simplified_output_{false};
 };
@@ -97,15 +111,62 @@ class SimpleStreamWriter : public ResultWriter {
     }
   }
   void BeginRow() override {}
-  void EndRow() override { stream_ << std::endl; }
+  void EndRow() override { stream_ << '\n'; }
   void BeginTable(bool simplified_output) override {}
-  void EndTable() override {}
+  void EndTable() override { stream_.flush(); }
+  void Flush() override { stream_.flush(); }
 
   bool disable_header_;
   std::ostream &stream_;
   std::string separator_;
 };
 
+/** Forwards the output to two writers, e.g. to show a result while it is also being collected. */
+class TeeWriter : public ResultWriter {
+ public:
+  TeeWriter(ResultWriter *first, ResultWriter *second) : first_(first), second_(second) {}
+  void WriteCell(const std::string &cell) override {
+    first_->WriteCell(cell);
+    second_->WriteCell(cell);
+  }
+  void WriteHeaderCell(const std::string &cell) override {
+    first_->WriteHeaderCell(cell);
+    second_->WriteHeaderCell(cell);
+  }
+  void BeginHeader() override {
+    first_->BeginHeader();
+    second_->BeginHeader();
+  }
+  void EndHeader() override {
+    first_->EndHeader();
+    second_->EndHeader();
+  }
+  void BeginRow() override {
+    first_->BeginRow();
+    second_->BeginRow();
+  }
+  void EndRow() override {
+    first_->EndRow();
+    second_->EndRow();
+  }
+  void BeginTable(bool simplified_output) override {
+    first_->BeginTable(simplified_output);
+    second_->BeginTable(simplified_output);
+  }
+  void EndTable() override {
+    first_->EndTable();
+    second_->EndTable();
+  }
+  void Flush() override {
+    first_->Flush();
+    second_->Flush();
+  }
+
+ private:
+  ResultWriter *first_;
+  ResultWriter *second_;
+};
+
 class HtmlWriter : public ResultWriter {
   auto Escape(const std::string &data) -> std::string {
     std::string buffer;
@@ -191,23 +252,54 @@ class HtmlWriter : public ResultWriter {
 
 class FortTableWriter : public ResultWriter {
  public:
+  FortTableWriter() = default;
+  /**
+   * Print every table to `stream` instead of keeping it in `tables_`. A long result is printed while the query is still
+   * running, as consecutive tables of at least `rows_per_part` rows.
+   */
+  explicit FortTableWriter(std::ostream *stream, size_t rows_per_part = 1024)
+      : stream_(stream), rows_per_part_(rows_per_part) {}
   void WriteCell(const std::string &cell) override { table_ << cell; }
   void WriteHeaderCell(const std::string &cell) override { table_ << cell; }
   void BeginHeader() override { table_ << fort::header; }
   void EndHeader() override { table_ << fort::endr; }
   void BeginRow() override {}
-  void EndRow() override { table_ << fort::endr; }
+  void EndRow() override {
+    table_ << fort::endr;
+    rows_++;
+  }
   void BeginTable(bool simplified_output) override {
+    simplified_output_ = simplified_output;
     if (simplified_output) {
       table_.set_border_style(FT_EMPTY_STYLE);
     }
   }
-  void EndTable() override {
-    tables_.emplace_back(table_.to_string());
-    table_ = fort::utf8_table{};
+  void EndTable() override { EmitTable(); }
+  void Flush() override {
+    if (stream_ != nullptr && rows_ >= rows_per_part_) {
+      EmitTable();
+    }
   }
   fort::utf8_table table_;
   std::vector<std::string> tables_;
+
+ private:
+  void EmitTable() {
+    if (stream_ != nullptr) {
+      *stream_ << table_.to_string() << std::flush;
+    } else {
+      tables_.emplace_back(table_.to_string());
+    }
+    table_ = fort::utf8_table{};
+    if (simplified_output_) {
+      table_.set_border_style(FT_EMPTY_STYLE);
+    }
+    rows_ = 0;
+  }
+
+  std::ostream *stream_{nullptr};
+  size_t rows_per_part_{0};
+  size_t rows_{0};
 };
 
 class BustubInstance {
@@ -276,7 +368,24 @@ class BustubInstance {
     return variable == "1" || variable == "true" || variable == "yes";
   }
 
+  /** @return the number of workers for each parallel pipeline, set with `SET parallelism = n` */
+  auto GetParallelism() -> size_t { return std::max<size_t>(GetSizeSessionVariable("parallelism", 1), 1); }
+
+  /** @return the bytes an operator may hold before spilling, set with `SET operator_memory_budget = n` */
+  auto GetOperatorMemoryBudget() -> size_t {
+    return GetSizeSessionVariable("operator_memory_budget", DEFAULT_OPERATOR_MEMORY_BUDGET);
+  }
+
  private:
+  /** @return the session variable `key` as a non-negative number, or `default_value` if it is not one */
+  auto GetSizeSessionVariable(const std::string &key, size_t default_value) -> size_t {
+    auto variable = GetSessionVariable(key);
+    if (variable.empty() || !std::all_of(variable.begin(), variable.end(), ::isdigit)) {
+      return default_value;
+    }
+    return std::strtoull(variable.c_str(), nullptr, 10);
+  }
+
   void CmdDisplayTables(ResultWriter &writer);
   void CmdDisplayIndices(ResultWriter &writer);
   void CmdDisplayHelp(ResultWriter &writer);
@@ -287,8 +396,56 @@ class BustubInstance {
   void HandleExplainStatement(Transaction *txn, const ExplainStatement &stmt, ResultWriter &writer);
   void HandleVariableShowStatement(Transaction *txn, const VariableShowStatement &stmt, ResultWriter &writer);
   void HandleVariableSetStatement(Transaction *txn, const VariableSetStatement &stmt, ResultWriter &writer);
+  void HandlePrepareStatement(Transaction *txn, const PrepareStatement &stmt, std::string sql, ResultWriter &writer);
+  auto HandleExecuteStatement(Transaction *txn, const ExecuteStatement &stmt, ResultWriter &writer,
+                              std::shared_ptr<CheckOptions> check_options) -> bool;
+  void HandleDeallocateStatement(Transaction *txn, const DeallocateStatement &stmt, ResultWriter &writer);
+  void HandleAnalyzeStatement(Transaction *txn, const AnalyzeStatement &stmt, ResultWriter &writer);
+
+  /**
+   * Plan the prepared statements again whose plans are older than the catalog or the planner settings. The catalog
+   * only ever grows, so older plans remain correct until then. Must not be called while a binder is alive, as the
+   * statements have to be parsed again.
+   */
+  void RefreshPreparedStatements();
+
+  /**
+   * Plan and optimize a SELECT, INSERT, UPDATE or DELETE statement.
+   * @param parameter_values the values read by the parameters of a prepared statement, or nullptr
+   */
+  auto PlanStatement(const BoundStatement &statement, std::shared_ptr<const ParameterValues> parameter_values)
+      -> std::shared_ptr<const CachedPlan>;
+
+  /** Execute a planned statement, writing its result to `writer` while it runs. */
+  auto ExecutePlan(const CachedPlan &plan, Transaction *txn, ResultWriter &writer,
+                   std::shared_ptr<CheckOptions> check_options) -> bool;
+
+  /** Make all plans stale, after a change of the catalog or of a setting that affects planning. */
+  void InvalidatePlans() { plan_version_++; }
+
+  /** A statement created with `PREPARE`. */
+  struct PreparedStatement {
+    /** The text of the `PREPARE` statement, bound again if the plan has become stale. */
+    std::string sql_;
+    std::vector<TypeId> param_types_;
+    /** The values read by the parameters of the plan, assigned by every execution. */
+    std::shared_ptr<ParameterValues> param_values_;
+    std::shared_ptr<const CachedPlan> plan_;
+    /** Serializes the executions of the statement, as they share `param_values_`. */
+    std::mutex latch_;
+  };
 
   std::unordered_map<std::string, std::string> session_variables_;
+
+  /** Plans of the statements run before, keyed by their normalized text. */
+  PlanCache plan_cache_{PLAN_CACHE_SIZE};
+  /** The version of the catalog and of the planner settings, bumped by every change. */
+  std::atomic<uint64_t> plan_version_{0};
+
+  std::unordered_map<std::string, std::shared_ptr<PreparedStatement>> prepared_statements_;
+  std::mutex prepared_statements_latch_;
+  /** The plan version that all prepared statements have been planned for. */
+  std::atomic<uint64_t> prepared_version_{0};
 };
 
 }  // namespace bustub
@@ -45,5 +45,7 @@ using slot_offset_t = size_t;  // slot offset type
 using oid_t = uint16_t;
 
 static constexpr int VARCHAR_DEFAULT_LENGTH = 128;  // default length for varchar when constructing the column
+static constexpr size_t DEFAULT_OPERATOR_MEMORY_BUDGET = 256 << 20;  // bytes an operator may hold before spilling
+static constexpr size_t PLAN_CACHE_SIZE = 256;                       // number of optimized plans kept per instance
 
 }  // namespace bustub
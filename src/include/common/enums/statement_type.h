@@ -32,6 +32,10 @@ enum class StatementType : uint8_t {
   INDEX_STATEMENT,          // index statement type
   VARIABLE_SET_STATEMENT,   // set variable statement type
   VARIABLE_SHOW_STATEMENT,  // show variable statement type
+  PREPARE_STATEMENT,        // prepare statement type
+  EXECUTE_STATEMENT,        // execute statement type
+  DEALLOCATE_STATEMENT,     // deallocate statement type
+  ANALYZE_STATEMENT,        // analyze statement type
 };
 
 }  // namespace bustub
@@ -75,6 +79,18 @@ struct fmt::formatter<bustub::StatementType> : formatter<string_view> {
       case bustub::StatementType::VARIABLE_SET_STATEMENT:
         name = "VariableSet";
         break;
+      case bustub::StatementType::PREPARE_STATEMENT:
+        name = "Prepare";
+        break;
+      case bustub::StatementType::EXECUTE_STATEMENT:
+        name = "Execute";
+        break;
+      case bustub::StatementType::DEALLOCATE_STATEMENT:
+        name = "Deallocate";
+        break;
+      case bustub::StatementType::ANALYZE_STATEMENT:
+        name = "Analyze";
+        break;
     }
     return formatter<string_view>::format(name, ctx);
   }
@@ -0,0 +1,78 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// plan_cache.h
+//
+// Identification: src/include/common/plan_cache.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <cstdint>
+#include <list>
+#include <memory>
+#include <mutex>  // NOLINT
+#include <string>
+#include <unordered_map>
+#include <utility>
+
+#include "catalog/schema.h"
+#include "execution/plans/abstract_plan.h"
+
+namespace bustub {
+
+/** A statement that has been planned and optimized, and can be executed any number of times. */
+struct CachedPlan {
+  /** The optimized plan. */
+  AbstractPlanNodeRef plan_;
+  /** The result schema, with the column names of the query. */
+  SchemaRef output_schema_;
+  /** Whether the statement deletes or updates rows. */
+  bool is_modify_;
+  /** The version of the catalog and the planner settings the plan was made for. */
+  uint64_t version_;
+};
+
+/**
+ * PlanCache is an LRU cache of optimized plans, keyed by normalized SQL text, so that a statement which is run again
+ * skips parsing, binding, planning and optimizing.
+ *
+ * A plan is only valid for the version of the catalog it was made for: every catalog change (and every change of a
+ * setting that affects planning) bumps the version, and lookups with a newer version treat older plans as misses.
+ */
+class PlanCache {
+ public:
+  explicit PlanCache(size_t capacity) : capacity_(capacity) {}
+
+  /**
+   * Normalize a single SQL statement into a cache key: whitespace runs outside of quotes become one space, letters
+   * outside of quotes are lowercased, and trailing semicolons are dropped.
+   */
+  static auto Normalize(const std::string &sql) -> std::string;
+
+  /** @return the plan cached for `key` at `version`, or nullptr */
+  auto Get(const std::string &key, uint64_t version) -> std::shared_ptr<const CachedPlan>;
+
+  /** Cache `plan` for `key`, evicting the least recently used plan if the cache is full. */
+  void Put(const std::string &key, std::shared_ptr<const CachedPlan> plan);
+
+  /** Remove all plans. */
+  void Clear();
+
+  auto Size() -> size_t;
+
+ private:
+  using Entry = std::pair<std::string, std::shared_ptr<const CachedPlan>>;
+
+  std::mutex latch_;
+  size_t capacity_;
+  /** The cached plans, most recently used first. */
+  std::list<Entry> entries_;
+  std::unordered_map<std::string, std::list<Entry>::iterator> index_;
+};
+
+}  // namespace bustub
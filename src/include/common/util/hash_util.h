@@ -45,6 +45,20 @@ class HashUtil {
     return HashBytes(reinterpret_cast<char *>(both), sizeof(hash_t) * 2);
   }
 
+  /**
+   * Spread the bits of a hash (the 64-bit finalizer of MurmurHash3), so that both its top bits and its low bits are
+   * usable by partitioned and open-addressing hash tables.
+   */
+  static inline auto MixHash(hash_t hash) -> hash_t {
+    uint64_t h = hash;
+    h ^= h >> 33;
+    h *= 0xff51afd7ed558ccdULL;
+    h ^= h >> 33;
+    h *= 0xc4ceb9fe1a85ec53ULL;
+    h ^= h >> 33;
+    return h;
+  }
+
   static inline auto SumHashes(hash_t l, hash_t r) -> hash_t {
     return (l % PRIME_FACTOR + r % PRIME_FACTOR) % PRIME_FACTOR;
   }
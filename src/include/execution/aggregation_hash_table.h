@@ -0,0 +1,152 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// aggregation_hash_table.h
+//
+// Identification: src/include/execution/aggregation_hash_table.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <cstdint>
+#include <limits>
+#include <string>
+#include <vector>
+
+#include "common/util/hash_util.h"
+#include "execution/plans/aggregation_plan.h"
+#include "type/type_id.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/**
+ * AggregationHashTable is the hash table of a hash aggregation, mapping group-by keys to running aggregates.
+ *
+ * Groups are numbered densely in the order they are created. A group key is packed into a byte arena in the
+ * memcmp-comparable format of `KeyEncoder`, or kept as a plain 64-bit integer when the only group-by column is an
+ * integer. The open-addressing table stores a compact key hash and the group number in every slot, so finding or
+ * creating the group of a row is a single probe sequence that allocates nothing for existing groups.
+ *
+ * Accumulators are stored per aggregate in flat arrays indexed by group, and rows are combined a batch at a time:
+ * the groups of all rows of a batch are found first, then every aggregate is updated in a tight loop. COUNT, SUM,
+ * MIN and MAX over integer inputs use plain 64-bit arithmetic; other input types fall back to `Value` arithmetic.
+ *
+ * Tables with the same layout can be merged group by group, which is how the partial tables of a parallel
+ * aggregation are combined.
+ */
+class AggregationHashTable {
+ public:
+  /**
+   * Construct an empty aggregation hash table.
+   * @param key_types the types of the group-by columns
+   * @param agg_types the types of the aggregates
+   * @param input_types the types of the aggregate inputs
+   */
+  AggregationHashTable(std::vector<TypeId> key_types, std::vector<AggregationType> agg_types,
+                       std::vector<TypeId> input_types);
+
+  /**
+   * Combine a batch of input rows into their groups, creating the groups that do not exist yet.
+   * @param keys the group-by values, one column per group-by column
+   * @param inputs the aggregate inputs, one column per aggregate; the columns of COUNT(*) are not read
+   * @param rows the number of rows of the batch
+   */
+  void InsertBatch(const std::vector<std::vector<Value>> &keys, const std::vector<std::vector<Value>> &inputs,
+                   size_t rows);
+
+  /** @return the number of groups */
+  auto Size() const -> size_t { return hashes_.size(); }
+
+  /** @return the group-by value `key_idx` of group `group` */
+  auto KeyAt(size_t group, size_t key_idx) const -> const Value & {
+    return group_keys_[group * key_types_.size() + key_idx];
+  }
+
+  /** @return the hash partition of group `group`, out of `partitions`; equal keys are in the same partition */
+  auto PartitionOf(size_t group, size_t partitions) const -> size_t;
+
+  /**
+   * Combine group `other_group` of `other`, a table with the same layout, into the group with the same key in this
+   * table, creating it if needed. COUNTs are combined by addition, SUM, MIN and MAX by themselves.
+   */
+  void MergeGroup(const AggregationHashTable &other, size_t other_group);
+
+  /** @return the result of aggregate `agg_idx` for group `group` */
+  auto AggregateAt(size_t group, size_t agg_idx) const -> Value;
+
+  /** @return the result of aggregate `agg_idx` over no rows at all */
+  auto InitialAggregate(size_t agg_idx) const -> Value;
+
+  /** Remove all groups. */
+  void Clear();
+
+ private:
+  static constexpr size_t INITIAL_SLOTS = 1024;
+  static constexpr size_t NO_GROUP = std::numeric_limits<size_t>::max();
+
+  /** The running values of one aggregate, indexed by group. */
+  struct Accumulator {
+    /** Whether the input is an integer, so that the aggregate is computed in `ints_` rather than `values_`. */
+    bool typed_;
+    /** COUNT results, and SUM, MIN and MAX results over integer inputs. */
+    std::vector<int64_t> ints_;
+    /** SUM, MIN and MAX results over other inputs. */
+    std::vector<Value> values_;
+    /** Whether a non-NULL input has been seen, i.e. whether SUM, MIN and MAX are not NULL. */
+    std::vector<uint8_t> valid_;
+  };
+
+  /** @return the group of row `row` of `keys`, created if needed */
+  auto FindOrInsertGroup(const std::vector<std::vector<Value>> &keys, size_t row) -> size_t;
+
+  /**
+   * Find the group of a non-NULL key, creating it if needed; the caller adds the group-by values of a new group.
+   * @param hash the key hash
+   * @param int_key the key if it is a single integer, otherwise the encoded key is in `key_buffer_`
+   * @param[out] inserted whether the group was created
+   */
+  auto FindOrInsert(hash_t hash, int64_t int_key, bool *inserted) -> size_t;
+
+  /** Create a group without group-by values, whose key is `int_key` or in `key_buffer_`. */
+  auto NewGroup(hash_t hash, int64_t int_key) -> size_t;
+
+  /** Combine the inputs of aggregate `agg_idx` into the groups of the rows in `row_groups_`. */
+  void Accumulate(size_t agg_idx, const std::vector<Value> &input);
+
+  /** Double the number of slots and re-insert all groups. */
+  void Grow();
+
+  std::vector<TypeId> key_types_;
+  std::vector<AggregationType> agg_types_;
+  std::vector<TypeId> input_types_;
+
+  /** Whether the key is a single integer column, kept in `int_keys_` instead of the key arena. */
+  bool int_key_;
+
+  /** The open-addressing slots: the upper half of the key hash, and the group number plus one (0 is empty). */
+  std::vector<uint64_t> slots_;
+
+  /** Per group: the key hash, and the group-by values. */
+  std::vector<hash_t> hashes_;
+  std::vector<Value> group_keys_;
+
+  /** Encoded keys of all groups; group `g` is at `[key_offsets_[g], key_offsets_[g + 1])`. */
+  std::string key_arena_;
+  std::vector<size_t> key_offsets_;
+  /** Integer keys of all groups when `int_key_`, and the group of the NULL key, if any. */
+  std::vector<int64_t> int_keys_;
+  size_t null_group_{NO_GROUP};
+
+  std::vector<Accumulator> accumulators_;
+
+  /** Scratch space: the encoded key of the current row, and the group of every row of the current batch. */
+  std::string key_buffer_;
+  std::vector<size_t> row_groups_;
+};
+
+}  // namespace bustub
@@ -0,0 +1,114 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// compiled_expression.h
+//
+// Identification: src/include/execution/compiled_expression.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <cstdint>
+#include <functional>
+#include <memory>
+#include <optional>
+#include <string_view>
+#include <vector>
+
+#include "execution/expressions/abstract_expression.h"
+#include "storage/table/tuple_batch.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/**
+ * CompiledExpression evaluates an expression tree on batches of rows, as a flat chain of closures.
+ *
+ * Compiling walks the tree once and emits one closure per node, in evaluation order. Each closure computes its node
+ * for all rows of a batch into a register, and is specialized on the types of its operands and on its operator when
+ * compiled. Registers keep integers and booleans unboxed as `int64_t` with a separate null mask, and strings as views
+ * of the values they come from, so evaluation is a tight loop per node instead of virtual calls and boxed `Value`s per
+ * node and row.
+ *
+ * Nodes without a compiled form (e.g. string functions, DECIMAL values, parameters) are evaluated by the expression
+ * itself with `EvaluateBatch`, and their results feed the rest of the chain.
+ *
+ * A CompiledExpression holds the registers of the batch being evaluated, so each executor compiles its own copy.
+ */
+class CompiledExpression {
+ public:
+  explicit CompiledExpression(AbstractExpressionRef expr);
+
+  CompiledExpression(const CompiledExpression &) = delete;
+  auto operator=(const CompiledExpression &) -> CompiledExpression & = delete;
+
+  /**
+   * Evaluate the expression on every row of `batch`.
+   * @param[out] out Replaced with one value per row of the batch
+   */
+  void Evaluate(const TupleBatch &batch, std::vector<Value> *out);
+
+  /**
+   * Evaluate the expression as a predicate on every row of `batch`.
+   * @param[out] selection Replaced with whether the predicate is true (i.e. neither false nor NULL) for each row
+   */
+  void EvaluatePredicate(const TupleBatch &batch, std::vector<bool> *selection);
+
+ private:
+  /** How a register holds the values of a node. */
+  enum class RegisterKind { Integer, Boolean, String, Boxed };
+
+  struct Register {
+    RegisterKind kind_;
+    /** The type of the node, which boxed results take */
+    TypeId type_;
+    /** A scalar register holds one value for all rows, e.g. a constant */
+    bool scalar_{false};
+    /** Integer and boolean values */
+    std::vector<int64_t> ints_;
+    /** Whether each value is NULL, for all but boxed registers */
+    std::vector<uint8_t> nulls_;
+    /** String values, viewing `values_` */
+    std::vector<std::string_view> strings_;
+    /** The boxed values of a string or boxed register */
+    const std::vector<Value> *values_{nullptr};
+    /** The values computed by the expression itself, for nodes without a compiled form */
+    std::vector<Value> owned_;
+  };
+
+  using Step = std::function<void(const TupleBatch &batch)>;
+
+  /** Emit the steps that compute `expr`. @return the register of its result */
+  auto Compile(const AbstractExpression &expr) -> uint32_t;
+
+  static auto KindOf(TypeId type) -> RegisterKind;
+
+  auto NewRegister(TypeId type) -> uint32_t;
+
+  /** Emit a step that evaluates `expr` with the expression itself. */
+  auto Interpret(const AbstractExpression &expr) -> uint32_t;
+
+  template <class Cmp>
+  auto EmitCompare(uint32_t lhs, uint32_t rhs) -> uint32_t;
+
+  /** Unbox `values` into `reg`. */
+  static void Load(const std::vector<Value> &values, Register *reg);
+
+  void Run(const TupleBatch &batch);
+
+  /** The expression tree, which the steps refer to */
+  AbstractExpressionRef expr_;
+  std::vector<Step> steps_;
+  std::vector<Register> registers_;
+  /** The values of constants, which their scalar registers view */
+  std::vector<std::unique_ptr<std::vector<Value>>> constants_;
+  uint32_t result_;
+  /** Set if the expression is a plain column reference, which is copied as is */
+  std::optional<uint32_t> column_idx_;
+};
+
+}  // namespace bustub
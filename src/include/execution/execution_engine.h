@@ -12,6 +12,7 @@
 
 #pragma once
 
+#include <functional>
 #include <vector>
 
 #include "buffer/buffer_pool_manager.h"
@@ -42,6 +43,13 @@ class ExecutionEngine {
 
   DISALLOW_COPY_AND_MOVE(ExecutionEngine);
 
+  /**
+   * Receives the output of a query one batch at a time, while the query runs. The executors are paused while the sink
+   * runs, so a slow consumer holds back the query instead of letting results pile up. Returning `false` stops the query
+   * early, without reading the remaining output.
+   */
+  using ResultSink = std::function<bool(const TupleBatch &)>;
+
   /**
    * Execute a query plan.
    * @param plan The query plan to execute
@@ -53,6 +61,33 @@ class ExecutionEngine {
   // NOLINTNEXTLINE
   auto Execute(const AbstractPlanNodeRef &plan, std::vector<Tuple> *result_set, Transaction *txn,
                ExecutorContext *exec_ctx) -> bool {
+    auto executor_succeeded = Execute(
+        plan,
+        [result_set](const TupleBatch &batch) {
+          if (result_set != nullptr) {
+            for (size_t row = 0; row < batch.Size(); row++) {
+              result_set->push_back(batch.GetTuple(row));
+            }
+          }
+          return true;
+        },
+        txn, exec_ctx);
+    if (!executor_succeeded && result_set != nullptr) {
+      result_set->clear();
+    }
+    return executor_succeeded;
+  }
+
+  /**
+   * Execute a query plan, streaming its output to `sink`. Batches delivered before a failure are not taken back.
+   * @param plan The query plan to execute
+   * @param sink The consumer of the output batches
+   * @param txn The transaction context in which the query executes
+   * @param exec_ctx The executor context in which the query executes
+   * @return `true` if execution of the query plan succeeds, `false` otherwise
+   */
+  auto Execute(const AbstractPlanNodeRef &plan, const ResultSink &sink, Transaction *txn, ExecutorContext *exec_ctx)
+      -> bool {
     BUSTUB_ASSERT((txn == exec_ctx->GetTransaction()), "Broken Invariant");
 
     // Construct the executor for the abstract plan node
@@ -63,13 +98,10 @@ class ExecutionEngine {
 
     try {
       executor->Init();
-      PollExecutor(executor.get(), plan, result_set);
+      PollExecutor(executor.get(), plan, sink);
       PerformChecks(exec_ctx);
     } catch (const ExecutionException &ex) {
       executor_succeeded = false;
-      if (result_set != nullptr) {
-        result_set->clear();
-      }
     }
 
     return executor_succeeded;
@@ -87,18 +119,16 @@ class ExecutionEngine {
 
  private:
   /**
-   * Poll the executor until exhausted, or exception escapes.
+   * Poll the executor until exhausted, the sink stops it, or exception escapes.
    * @param executor The root executor
    * @param plan The plan to execute
-   * @param result_set The tuple result set
+   * @param sink The consumer of the output batches
    */
-  static void PollExecutor(AbstractExecutor *executor, const AbstractPlanNodeRef &plan,
-                           std::vector<Tuple> *result_set) {
-    RID rid{};
-    Tuple tuple{};
-    while (executor->Next(&tuple, &rid)) {
-      if (result_set != nullptr) {
-        result_set->push_back(tuple);
+  static void PollExecutor(AbstractExecutor *executor, const AbstractPlanNodeRef &plan, const ResultSink &sink) {
+    TupleBatch batch{};
+    while (executor->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+      if (!sink(batch)) {
+        return;
       }
     }
   }
@@ -12,6 +12,7 @@
 
 #pragma once
 
+#include <algorithm>
 #include <deque>
 #include <memory>
 #include <unordered_set>
@@ -22,6 +23,7 @@
 #include "concurrency/transaction.h"
 #include "execution/check_options.h"
 #include "execution/executors/abstract_executor.h"
+#include "execution/morsel_queue.h"
 #include "storage/page/tmp_tuple_page.h"
 
 namespace bustub {
@@ -93,6 +95,21 @@ class ExecutorContext {
 
   auto IsDelete() const -> bool { return is_delete_; }
 
+  /** @return the number of workers that run each parallel pipeline, 1 to run queries serially */
+  auto GetParallelism() const -> size_t { return parallelism_; }
+
+  void SetParallelism(size_t parallelism) { parallelism_ = std::max<size_t>(parallelism, 1); }
+
+  /** @return the number of bytes a single operator may hold in memory before it spills to temporary pages */
+  auto GetMemoryBudget() const -> size_t { return memory_budget_; }
+
+  void SetMemoryBudget(size_t memory_budget) { memory_budget_ = memory_budget; }
+
+  /** @return the morsel queue shared by the scans of the parallel workers, nullptr outside of a parallel pipeline */
+  auto GetMorselQueue() const -> const std::shared_ptr<MorselQueue> & { return morsel_queue_; }
+
+  void SetMorselQueue(std::shared_ptr<MorselQueue> morsel_queue) { morsel_queue_ = std::move(morsel_queue); }
+
  private:
   /** The transaction context associated with this executor context */
   Transaction *transaction_;
@@ -109,6 +126,12 @@ class ExecutorContext {
   /** The set of check options associated with this executor context */
   std::shared_ptr<CheckOptions> check_options_;
   bool is_delete_;
+  /** The degree of parallelism of the query */
+  size_t parallelism_{1};
+  /** The memory budget of every operator of the query */
+  size_t memory_budget_{DEFAULT_OPERATOR_MEMORY_BUDGET};
+  /** The morsel queue of the parallel pipeline this context belongs to */
+  std::shared_ptr<MorselQueue> morsel_queue_;
 };
 
 }  // namespace bustub
@@ -14,6 +14,7 @@
 
 #include "execution/executor_context.h"
 #include "storage/table/tuple.h"
+#include "storage/table/tuple_batch.h"
 
 namespace bustub {
 class ExecutorContext;
@@ -47,6 +48,24 @@ class AbstractExecutor {
    */
   virtual auto Next(Tuple *tuple, RID *rid) -> bool = 0;
 
+  /**
+   * Yield the next batch of tuples from this executor. A consumer uses either `Next` or `NextBatch` on an executor,
+   * never both. The default implementation adapts `Next`, so every executor supports batches; executors override it
+   * to work on whole columns.
+   * @param[out] batch Cleared, then filled with up to `max_rows` tuples following the output schema
+   * @param max_rows The maximum number of tuples to produce
+   * @return `true` if at least one tuple was produced, `false` if there are no more tuples
+   */
+  virtual auto NextBatch(TupleBatch *batch, size_t max_rows) -> bool {
+    batch->Reset(&GetOutputSchema());
+    Tuple tuple{};
+    RID rid{};
+    while (batch->Size() < max_rows && Next(&tuple, &rid)) {
+      batch->AppendTuple(tuple, rid);
+    }
+    return !batch->IsEmpty();
+  }
+
   /** @return The schema of the tuples that this executor produces */
   virtual auto GetOutputSchema() const -> const Schema & = 0;
 
@@ -13,140 +13,29 @@
 #pragma once
 
 #include <memory>
-#include <unordered_map>
 #include <utility>
 #include <vector>
 
-#include "common/util/hash_util.h"
-#include "container/hash/hash_function.h"
+#include "execution/aggregation_hash_table.h"
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/expressions/abstract_expression.h"
 #include "execution/plans/aggregation_plan.h"
 #include "storage/table/tuple.h"
-#include "type/value_factory.h"
+#include "storage/table/tuple_batch.h"
 
 namespace bustub {
 
-/**
- * A simplified hash table that has all the necessary functionality for aggregations.
- */
-class SimpleAggregationHashTable {
- public:
-  /**
-   * Construct a new SimpleAggregationHashTable instance.
-   * @param agg_exprs the aggregation expressions
-   * @param agg_types the types of aggregations
-   */
-  SimpleAggregationHashTable(const std::vector<AbstractExpressionRef> &agg_exprs,
-                             const std::vector<AggregationType> &agg_types)
-      : agg_exprs_{agg_exprs}, agg_types_{agg_types} {}
-
-  /** @return The initial aggregate value for this aggregation executor */
-  auto GenerateInitialAggregateValue() -> AggregateValue {
-    std::vector<Value> values{};
-    for (const auto &agg_type : agg_types_) {
-      switch (agg_type) {
-        case AggregationType::CountStarAggregate:
-          // Count start starts at zero.
-          values.emplace_back(ValueFactory::GetIntegerValue(0));
-          break;
-        case AggregationType::CountAggregate:
-        case AggregationType::SumAggregate:
-        case AggregationType::MinAggregate:
-        case AggregationType::MaxAggregate:
-          // Others starts at null.
-          values.emplace_back(ValueFactory::GetNullValueByType(TypeId::INTEGER));
-          break;
-      }
-    }
-    return {values};
-  }
-
-  /**
-   * TODO(Student)
-   *
-   * Combines the input into the aggregation result.
-   * @param[out] result The output aggregate value
-   * @param input The input value
-   */
-  void CombineAggregateValues(AggregateValue *result, const AggregateValue &input) {
-    for (uint32_t i = 0; i < agg_exprs_.size(); i++) {
-      switch (agg_types_[i]) {
-        case AggregationType::CountStarAggregate:
-        case AggregationType::CountAggregate:
-        case AggregationType::SumAggregate:
-        case AggregationType::MinAggregate:
-        case AggregationType::MaxAggregate:
-          break;
-      }
-    }
-  }
-
-  /**
-   * Inserts a value into the hash table and then combines it with the current aggregation.
-   * @param agg_key the key to be inserted
-   * @param agg_val the value to be inserted
-   */
-  void InsertCombine(const AggregateKey &agg_key, const AggregateValue &agg_val) {
-    if (ht_.count(agg_key) == 0) {
-      ht_.insert({agg_key, GenerateInitialAggregateValue()});
-    }
-    CombineAggregateValues(&ht_[agg_key], agg_val);
-  }
-
-  /**
-   * Clear the hash table
-   */
-  void Clear() { ht_.clear(); }
-
-  /** An iterator over the aggregation hash table */
-  class Iterator {
-   public:
-    /** Creates an iterator for the aggregate map. */
-    explicit Iterator(std::unordered_map<AggregateKey, AggregateValue>::const_iterator iter) : iter_{iter} {}
-
-    /** @return The key of the iterator */
-    auto Key() -> const AggregateKey & { return iter_->first; }
-
-    /** @return The value of the iterator */
-    auto Val() -> const AggregateValue & { return iter_->second; }
-
-    /** @return The iterator before it is incremented */
-    auto operator++() -> Iterator & {
-      ++iter_;
-      return *this;
-    }
-
-    /** @return `true` if both iterators are identical */
-    auto operator==(const Iterator &other) -> bool { return this->iter_ == other.iter_; }
-
-    /** @return `true` if both iterators are different */
-    auto operator!=(const Iterator &other) -> bool { return this->iter_ != other.iter_; }
-
-   private:
-    /** Aggregates map */
-    std::unordered_map<AggregateKey, AggregateValue>::const_iterator iter_;
-  };
-
-  /** @return Iterator to the start of the hash table */
-  auto Begin() -> Iterator { return Iterator{ht_.cbegin()}; }
-
-  /** @return Iterator to the end of the hash table */
-  auto End() -> Iterator { return Iterator{ht_.cend()}; }
-
- private:
-  /** The hash table is just a map from aggregate keys to aggregate values */
-  std::unordered_map<AggregateKey, AggregateValue> ht_{};
-  /** The aggregate expressions that we have */
-  const std::vector<AbstractExpressionRef> &agg_exprs_;
-  /** The types of aggregations that we have */
-  const std::vector<AggregationType> &agg_types_;
-};
-
 /**
  * AggregationExecutor executes an aggregation operation (e.g. COUNT, SUM, MIN, MAX)
  * over the tuples produced by a child executor.
+ *
+ * The child is consumed in batches: the group-by and aggregate expressions are evaluated over whole columns, and
+ * each batch is combined into an `AggregationHashTable`.
+ *
+ * With a degree of parallelism above 1, the aggregation runs in two phases. The child batches are spread over several
+ * workers, which each pre-aggregate into their own partial table. The partial tables are then split by hash
+ * partition, and the workers merge the partitions into the final tables in parallel.
  */
 class AggregationExecutor : public AbstractExecutor {
  public:
@@ -177,35 +66,37 @@ class AggregationExecutor : public AbstractExecutor {
   auto GetChildExecutor() const -> const AbstractExecutor *;
 
  private:
-  /** @return The tuple as an AggregateKey */
-  auto MakeAggregateKey(const Tuple *tuple) -> AggregateKey {
-    std::vector<Value> keys;
-    for (const auto &expr : plan_->GetGroupBys()) {
-      keys.emplace_back(expr->Evaluate(tuple, child_executor_->GetOutputSchema()));
-    }
-    return {keys};
-  }
-
-  /** @return The tuple as an AggregateValue */
-  auto MakeAggregateValue(const Tuple *tuple) -> AggregateValue {
-    std::vector<Value> vals;
-    for (const auto &expr : plan_->GetAggregates()) {
-      vals.emplace_back(expr->Evaluate(tuple, child_executor_->GetOutputSchema()));
-    }
-    return {vals};
-  }
+  /** @return an empty aggregation hash table with the layout of this aggregation */
+  auto MakeTable() const -> AggregationHashTable;
+
+  /** Evaluate the expressions over `batch` into the `keys` and `inputs` columns, and combine them into `table`. */
+  void AggregateBatch(const TupleBatch &batch, AggregationHashTable *table, std::vector<std::vector<Value>> *keys,
+                      std::vector<std::vector<Value>> *inputs) const;
+
+  /** Aggregate all child rows on this thread into a single table. */
+  void RunSerial();
+
+  /** Pre-aggregate the child batches into one partial table per worker, then merge the partials by hash partition. */
+  void RunParallel(size_t workers);
 
- private:
   /** The aggregation plan node */
   const AggregationPlanNode *plan_;
 
   /** The child executor that produces tuples over which the aggregation is computed */
   std::unique_ptr<AbstractExecutor> child_executor_;
 
-  /** Simple aggregation hash table */
-  // TODO(Student): Uncomment SimpleAggregationHashTable aht_;
+  /** The types of the group-by columns and of the aggregate inputs */
+  std::vector<TypeId> key_types_;
+  std::vector<TypeId> input_types_;
+
+  /** The aggregation result, split into hash partitions that hold disjoint groups */
+  std::vector<AggregationHashTable> tables_;
+
+  /** The next group to emit */
+  size_t table_idx_{0};
+  size_t next_group_{0};
 
-  /** Simple aggregation hash table iterator */
-  // TODO(Student): Uncomment SimpleAggregationHashTable::Iterator aht_iterator_;
+  /** Whether the single output row of an aggregation without GROUP BY over no rows has been emitted */
+  bool emitted_initial_{false};
 };
 }  // namespace bustub
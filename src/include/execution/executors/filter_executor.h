@@ -15,6 +15,7 @@
 #include <memory>
 #include <vector>
 
+#include "execution/compiled_expression.h"
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/filter_plan.h"
@@ -48,6 +49,14 @@ class FilterExecutor : public AbstractExecutor {
    */
   auto Next(Tuple *tuple, RID *rid) -> bool override;
 
+  /**
+   * Yield the next batch of tuples from the filter.
+   * @param[out] batch The next tuples produced by the filter
+   * @param max_rows The maximum number of tuples to produce
+   * @return `true` if at least one tuple was produced, `false` if there are no more tuples
+   */
+  auto NextBatch(TupleBatch *batch, size_t max_rows) -> bool override;
+
   /** @return The output schema for the filter plan */
   auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); }
 
@@ -57,5 +66,11 @@ class FilterExecutor : public AbstractExecutor {
 
   /** The child executor from which tuples are obtained */
   std::unique_ptr<AbstractExecutor> child_executor_;
+
+  /** The predicate, compiled for evaluating batches */
+  CompiledExpression predicate_;
+
+  /** The selection of the current batch, kept to reuse its allocation */
+  std::vector<bool> selection_;
 };
 }  // namespace bustub
@@ -0,0 +1,109 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// gather_executor.h
+//
+// Identification: src/include/execution/executors/gather_executor.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <condition_variable>  // NOLINT
+#include <deque>
+#include <exception>
+#include <memory>
+#include <mutex>   // NOLINT
+#include <thread>  // NOLINT
+#include <vector>
+
+#include "execution/executor_context.h"
+#include "execution/executors/abstract_executor.h"
+#include "execution/plans/abstract_plan.h"
+#include "storage/table/tuple_batch.h"
+
+namespace bustub {
+
+/**
+ * GatherExecutor runs a pipeline (filters and projections over a scan) with several workers and gathers their output.
+ * Every worker runs its own copy of the pipeline on its own thread, and the scans of all copies share one
+ * `MorselQueue`, so that they split the table between them. The output order is not deterministic.
+ *
+ * The executor factory puts a gather on top of every maximal parallel pipeline when the degree of parallelism of the
+ * query is above 1, so pipeline breakers such as aggregations, sorts and join builds consume gathered input.
+ */
+class GatherExecutor : public AbstractExecutor {
+ public:
+  /**
+   * Construct a new GatherExecutor instance.
+   * @param exec_ctx The executor context
+   * @param plan The pipeline to run in parallel, see `IsParallelPipeline`
+   */
+  GatherExecutor(ExecutorContext *exec_ctx, AbstractPlanNodeRef plan);
+
+  /** Stop and join the workers. */
+  ~GatherExecutor() override;
+
+  DISALLOW_COPY_AND_MOVE(GatherExecutor);
+
+  /** Initialize the gather: restart the workers on a fresh morsel queue */
+  void Init() override;
+
+  /**
+   * Yield the next tuple produced by any of the workers.
+   * @param[out] tuple The next tuple produced by the pipeline
+   * @param[out] rid The next tuple RID produced by the pipeline
+   * @return `true` if a tuple was produced, `false` if there are no more tuples
+   */
+  auto Next(Tuple *tuple, RID *rid) -> bool override;
+
+  /**
+   * Yield the next batch produced by any of the workers.
+   * @param[out] batch The next tuples produced by the pipeline
+   * @param max_rows The maximum number of tuples to produce
+   * @return `true` if at least one tuple was produced, `false` if there are no more tuples
+   */
+  auto NextBatch(TupleBatch *batch, size_t max_rows) -> bool override;
+
+  /** @return The output schema of the pipeline */
+  auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); }
+
+  /** @return `true` if `plan` is made of filters and projections over a sequential or mock scan */
+  static auto IsParallelPipeline(const AbstractPlanNode &plan) -> bool;
+
+ private:
+  /** Run the pipeline copy of worker `worker` until it is exhausted or the gather is stopped */
+  void RunWorker(size_t worker);
+
+  /** Cancel the workers, wait for them and drop everything they produced */
+  void Stop();
+
+  /** Make sure `pending_` has rows left, waiting for the workers if needed. @return false if all workers are done */
+  auto FillPending() -> bool;
+
+  /** The pipeline run by every worker */
+  AbstractPlanNodeRef plan_;
+
+  /** The executor context and the pipeline copy of every worker */
+  std::vector<std::unique_ptr<ExecutorContext>> worker_ctxs_;
+  std::vector<std::unique_ptr<AbstractExecutor>> worker_executors_;
+  std::vector<std::thread> workers_;
+
+  /** Batches produced by the workers and not consumed yet, protected by `latch_` */
+  std::mutex latch_;
+  std::condition_variable batch_ready_;
+  std::condition_variable batch_taken_;
+  std::deque<TupleBatch> batches_;
+  size_t running_workers_{0};
+  bool cancelled_{false};
+  std::exception_ptr error_;
+
+  /** The batch being handed out, and the next row of it */
+  TupleBatch pending_;
+  size_t pending_row_{0};
+};
+
+}  // namespace bustub
@@ -12,18 +12,54 @@
 
 #pragma once
 
+#include <atomic>
 #include <memory>
+#include <optional>
 #include <utility>
+#include <vector>
 
+#include "common/util/hash_util.h"
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/hash_join_plan.h"
+#include "execution/spill_file.h"
 #include "storage/table/tuple.h"
+#include "storage/table/tuple_batch.h"
+#include "type/value.h"
 
 namespace bustub {
 
+/** The target number of build rows per radix partition, so that the hash table of a partition stays in cache. */
+static constexpr size_t HASH_JOIN_PARTITION_ROWS = 4096;
+
+/** The maximum number of hash bits used to partition the join inputs. */
+static constexpr size_t HASH_JOIN_MAX_RADIX_BITS = 10;
+
+/** The number of hash bits used to split spilled inputs into partitions at every level. */
+static constexpr size_t HASH_JOIN_SPILL_BITS = 4;
+
+/** The maximum number of times a spilled partition is split again when it still exceeds the memory budget. */
+static constexpr size_t HASH_JOIN_MAX_SPILL_LEVEL = 3;
+
 /**
- * HashJoinExecutor executes a nested-loop JOIN on two tables.
+ * HashJoinExecutor executes an equi-JOIN on two tables with a radix-partitioned hash join.
+ *
+ * Both inputs are materialized and split into partitions by the top bits of the join key hash, so that the build
+ * side of every partition fits in cache. Each partition is then joined on its own: its build rows are put into a
+ * flat open-addressing table holding a compact key hash and a row offset per slot, and its probe rows look up that
+ * table. Partitions are independent, so they are joined by the workers of the query in parallel.
+ *
+ * When the inputs exceed the memory budget of the query, the join becomes a grace hash join: both inputs are split
+ * by other bits of the hash into spill files in temporary buffer pool pages, and each pair of spilled partitions is
+ * joined in memory as above, one after the other. A spilled partition that is still too large (for instance because
+ * of skew) is split again with the next hash bits, up to `HASH_JOIN_MAX_SPILL_LEVEL` times.
+ * The output is produced on demand, one probe row at a time, so a join that matches many rows per key does not
+ * materialize its result. Only the workers of a parallel join buffer the output of the partitions they join, as long
+ * as it fits in the memory budget; the partitions left over are probed on demand.
+ * Without a buffer pool (as when only mock tables are used), there is nowhere to spill to and the join always runs
+ * in memory.
+ *
+ * The right child is the build side and the left child the probe side, which keeps left joins simple.
  */
 class HashJoinExecutor : public AbstractExecutor {
  public:
@@ -52,8 +88,143 @@ class HashJoinExecutor : public AbstractExecutor {
   auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); };
 
  private:
-  /** The NestedLoopJoin plan node to be executed. */
+  /**
+   * A materialized join input, with the rows of each partition stored contiguously. Row `i` has the tuple
+   * `tuples_[i]`, the join key `keys_[i * key_count, (i + 1) * key_count)` and the hash `hashes_[i]`.
+   */
+  struct JoinInput {
+    std::vector<Tuple> tuples_;
+    std::vector<Value> keys_;
+    std::vector<hash_t> hashes_;
+    /** Whether row `i` has a NULL join key and can never match */
+    std::vector<bool> null_keys_;
+    /** Partition `p` is made of the rows [offsets_[p], offsets_[p + 1]) */
+    std::vector<size_t> offsets_;
+  };
+
+  /** A pair of spilled partitions still to be joined, at the given split level. */
+  struct SpillTask {
+    std::unique_ptr<SpillFile> build_;
+    std::unique_ptr<SpillFile> probe_;
+    size_t level_;
+  };
+
+  /**
+   * A partition being probed on demand: its hash table, the probe row being looked up, the slot of the table to look
+   * at next for that row, and whether the row has matched yet.
+   */
+  struct ProbeCursor {
+    size_t partition_;
+    std::vector<uint64_t> slots_;
+    size_t probe_row_;
+    size_t slot_;
+    bool matched_;
+  };
+
+  /** One join input being read, and where its rows go. */
+  struct InputSide {
+    const std::vector<AbstractExpressionRef> *key_expressions_;
+    const Schema *schema_;
+    JoinInput *input_;
+  };
+
+  /**
+   * Read all rows of one child into memory, or into `spill` once `spill` is non-empty or the memory budget is
+   * exceeded and there is a buffer pool to spill to. @return false if the rows were spilled
+   */
+  auto ReadChild(AbstractExecutor *child, const InputSide &side, std::vector<std::unique_ptr<SpillFile>> *spill)
+      -> bool;
+
+  /** Append a row whose join key is `keys` to `input`. */
+  void AppendRow(Tuple tuple, const Value *keys, JoinInput *input);
+
+  /** @return the hash of a join key, setting `null_key` if a column of it is NULL */
+  auto HashKey(const Value *keys, bool *null_key) const -> hash_t;
+
+  /** @return an estimate of the memory used by a materialized row whose tuple has `tuple_length` bytes */
+  auto RowBytes(size_t tuple_length) const -> size_t {
+    return sizeof(Tuple) + tuple_length + key_count_ * sizeof(Value) + sizeof(hash_t);
+  }
+
+  /** Create `1 << HASH_JOIN_SPILL_BITS` empty spill files. */
+  auto MakeSpillFiles() const -> std::vector<std::unique_ptr<SpillFile>>;
+
+  /** Append a tuple to the spill file its hash belongs to at split level `level`. */
+  static void SpillRow(const Tuple &tuple, hash_t hash, size_t level, std::vector<std::unique_ptr<SpillFile>> *spill);
+
+  /** Move the rows of `input` into spill files at level 0. */
+  void SpillInput(JoinInput *input, std::vector<std::unique_ptr<SpillFile>> *spill);
+
+  /** Read one spilled file back, evaluating the join keys again. */
+  void LoadSpillFile(SpillFile *file, const InputSide &side);
+
+  /** Split one spilled file with the hash bits of split level `level`. */
+  void SplitSpillFile(SpillFile *file, const InputSide &side, size_t level,
+                      std::vector<std::unique_ptr<SpillFile>> *spill);
+
+  /** Join the spilled partition pair on top of the task stack, or split it again if it is too large. */
+  void RunSpillTask();
+
+  /**
+   * Partition `build_` and `probe_` to join them in memory. With several workers, the partitions are joined in
+   * parallel into `outputs_` until the buffered output exceeds the memory budget.
+   */
+  void JoinInMemory();
+
+  /** Reorder the rows of `input` by partition, using `radix_bits` bits of the hash. */
+  static void Partition(size_t radix_bits, JoinInput *input);
+
+  /**
+   * Join partition `partition` of the inputs into `output`, adding the size of the output to `output_bytes`.
+   * @return false, with `output` cleared, if the output would take `output_bytes` beyond `max_output_bytes`
+   */
+  auto JoinPartition(size_t partition, std::vector<Tuple> *output, std::atomic<size_t> *output_bytes,
+                     size_t max_output_bytes) const -> bool;
+
+  /** Build the hash table of partition `partition` and point `cursor` at its first probe row. */
+  void OpenPartition(size_t partition, ProbeCursor *cursor) const;
+
+  /** Move `cursor` to probe row `row`. */
+  void SeekProbeRow(size_t row, ProbeCursor *cursor) const;
+
+  /** Produce the next output row of the partition of `cursor`. @return false once the partition is done */
+  auto ProbeNext(ProbeCursor *cursor, Tuple *tuple) const -> bool;
+
+  /** @return the output row joining `left` with `right`, or with NULLs if `right` is null */
+  auto MakeOutputTuple(const Tuple &left, const Tuple *right) const -> Tuple;
+
+  /** @return the join key of row `row` of `input` */
+  auto KeyAt(const JoinInput &input, size_t row) const -> const Value * { return &input.keys_[row * key_count_]; }
+
+  /** The HashJoin plan node to be executed. */
   const HashJoinPlanNode *plan_;
+
+  /** The probe (left) and build (right) children */
+  std::unique_ptr<AbstractExecutor> left_child_;
+  std::unique_ptr<AbstractExecutor> right_child_;
+
+  /** The number of columns of the join key */
+  size_t key_count_;
+
+  JoinInput probe_;
+  JoinInput build_;
+
+  /** The estimated memory used by `build_` and `probe_` */
+  size_t memory_used_{0};
+
+  /** The spilled partition pairs still to be joined, as a stack */
+  std::vector<SpillTask> spill_tasks_;
+
+  /**
+   * The output of every partition that a worker joined, or nullopt for a partition to probe on demand, and the
+   * position of the next tuple to emit
+   */
+  std::vector<std::optional<std::vector<Tuple>>> outputs_;
+  size_t output_partition_{0};
+  size_t output_row_{0};
+
+  /** The partition being probed on demand, if any */
+  std::optional<ProbeCursor> probe_cursor_;
 };
 
 }  // namespace bustub
@@ -14,16 +14,22 @@
 
 #include <vector>
 
+#include "catalog/catalog.h"
 #include "common/rid.h"
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/index_scan_plan.h"
+#include "execution/scan_filter.h"
+#include "storage/index/b_plus_tree_index.h"
 #include "storage/table/tuple.h"
 
 namespace bustub {
 
 /**
  * IndexScanExecutor executes an index scan over a table.
+ *
+ * The scan probes the B+ tree for the keys in the range of the plan (all keys by default), and fetches the rows of
+ * the matching entries from the table heap in key order. The rows are then checked against the filter predicate.
  */
 
 class IndexScanExecutor : public AbstractExecutor {
@@ -42,7 +48,17 @@ class IndexScanExecutor : public AbstractExecutor {
   auto Next(Tuple *tuple, RID *rid) -> bool override;
 
  private:
+  /** @return the index key with the given values of the key columns */
+  auto MakeKey(const std::vector<Value> &values) const -> IntegerKeyType;
+
   /** The index scan plan node to be executed. */
   const IndexScanPlanNode *plan_;
+  const IndexInfo *index_info_;
+  const TableInfo *table_info_;
+  ScanFilter filter_;
+
+  /** The RIDs of the index entries in the range, in key order */
+  std::vector<RID> rids_;
+  size_t cursor_{0};
 };
 }  // namespace bustub
@@ -19,6 +19,7 @@
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/mock_scan_plan.h"
+#include "execution/scan_filter.h"
 #include "storage/table/tuple.h"
 
 namespace bustub {
@@ -49,6 +50,14 @@ class MockScanExecutor : public AbstractExecutor {
    */
   auto Next(Tuple *tuple, RID *rid) -> bool override;
 
+  /**
+   * Yield the next batch of tuples from the sequential scan.
+   * @param[out] batch The next tuples produced by the sequential scan
+   * @param max_rows The maximum number of tuples to produce
+   * @return `true` if at least one tuple was produced, `false` if there are no more tuples
+   */
+  auto NextBatch(TupleBatch *batch, size_t max_rows) -> bool override;
+
   /** @return The output schema for the sequential scan */
   auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); }
 
@@ -59,6 +68,15 @@ class MockScanExecutor : public AbstractExecutor {
   /** @return A dummy RID value */
   static auto MakeDummyRID() -> RID;
 
+  /** Make sure the cursor points into a row range to scan. @return `false` when the scan is complete */
+  auto FetchMorsel() -> bool;
+
+  /** @return All columns of the row at `cursor` in scan order */
+  auto RowAt(size_t cursor) const -> std::vector<Value>;
+
+  /** @return The columns of a row that the scan produces */
+  auto Project(std::vector<Value> row) const -> std::vector<Value>;
+
   /** MockScanExecutor::Next() returns `true` when scan is incomplete */
   constexpr static const bool EXECUTOR_ACTIVE{true};
 
@@ -71,14 +89,20 @@ class MockScanExecutor : public AbstractExecutor {
   /** The cursor for the current mock scan */
   std::size_t cursor_{0};
 
-  /** The table function */
-  std::function<Tuple(std::size_t)> func_;
+  /** The end of the row range being scanned; parallel workers take their ranges from the morsel queue */
+  std::size_t morsel_end_{0};
+
+  /** The table function, which generates all columns of a row */
+  std::function<std::vector<Value>(std::size_t)> func_;
 
   /** The size of the mock table */
   std::size_t size_;
 
   /** The shuffled output */
   std::vector<size_t> shuffled_idx_;
+
+  /** The filter predicate of the scan, checked on the generated rows */
+  ScanFilter filter_;
 };
 
 }  // namespace bustub
@@ -14,16 +14,24 @@
 
 #include <memory>
 #include <utility>
+#include <vector>
 
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/nested_loop_join_plan.h"
 #include "storage/table/tuple.h"
+#include "storage/table/tuple_batch.h"
 
 namespace bustub {
 
 /**
- * NestedLoopJoinExecutor executes a nested-loop JOIN on two tables.
+ * NestedLoopJoinExecutor executes a block nested-loop JOIN on two tables.
+ *
+ * Left tuples are buffered in blocks as large as the memory budget of the query allows, and the right child is
+ * scanned once per block instead of once per left tuple. The right side is read in batches; every left tuple of the
+ * block is evaluated against a whole right batch, which stays in cache, in a tight loop.
+ *
+ * With the NLJ check enabled, blocks hold a single left tuple, so the right child is initialized for every left tuple.
  */
 class NestedLoopJoinExecutor : public AbstractExecutor {
  public:
@@ -53,8 +61,43 @@ class NestedLoopJoinExecutor : public AbstractExecutor {
   auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); };
 
  private:
+  /** Read the next block of left tuples and restart the right child. @return false if the left child is exhausted */
+  auto LoadBlock() -> bool;
+
+  /** Read the next batch of the right child. @return false if the right child is exhausted */
+  auto LoadRightBatch() -> bool;
+
+  /** Join the following left tuples of the block with the right batch, until `outputs_` holds a batch of tuples. */
+  void JoinRightBatch();
+
+  /** Add the unmatched tuples of the block, padded with NULLs, to `outputs_`. */
+  void EmitUnmatched();
+
+  /** Build an output tuple from a left tuple and a right tuple, or NULLs if `right` is nullptr. */
+  auto MakeOutputTuple(const Tuple &left, const Tuple *right) const -> Tuple;
+
   /** The NestedLoopJoin plan node to be executed. */
   const NestedLoopJoinPlanNode *plan_;
+
+  std::unique_ptr<AbstractExecutor> left_executor_;
+  std::unique_ptr<AbstractExecutor> right_executor_;
+
+  /** The maximum number of left tuples in a block, 1 when the NLJ check is enabled. */
+  size_t max_block_rows_;
+
+  /** The current block of left tuples, and whether each of them has found a match. */
+  std::vector<Tuple> block_;
+  std::vector<bool> matched_;
+  bool block_loaded_{false};
+
+  /** The current right batch, and the next left tuple of the block to join with it. */
+  TupleBatch right_batch_;
+  std::vector<Tuple> right_tuples_;
+  size_t block_idx_{0};
+
+  /** Joined tuples waiting to be returned. */
+  std::vector<Tuple> outputs_;
+  size_t output_idx_{0};
 };
 
 }  // namespace bustub
@@ -15,6 +15,7 @@
 #include <memory>
 #include <vector>
 
+#include "execution/compiled_expression.h"
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/projection_plan.h"
@@ -47,6 +48,14 @@ class ProjectionExecutor : public AbstractExecutor {
    */
   auto Next(Tuple *tuple, RID *rid) -> bool override;
 
+  /**
+   * Yield the next batch of tuples from the projection.
+   * @param[out] batch The next tuples produced by the projection
+   * @param max_rows The maximum number of tuples to produce
+   * @return `true` if at least one tuple was produced, `false` if there are no more tuples
+   */
+  auto NextBatch(TupleBatch *batch, size_t max_rows) -> bool override;
+
   /** @return The output schema for the projection plan */
   auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); }
 
@@ -56,5 +65,11 @@ class ProjectionExecutor : public AbstractExecutor {
 
   /** The child executor from which tuples are obtained */
   std::unique_ptr<AbstractExecutor> child_executor_;
+
+  /** The batch pulled from the child by `NextBatch` */
+  TupleBatch child_batch_;
+
+  /** The expressions, compiled for evaluating batches */
+  std::vector<std::unique_ptr<CompiledExpression>> compiled_exprs_;
 };
 }  // namespace bustub
@@ -12,17 +12,25 @@
 
 #pragma once
 
+#include <memory>
 #include <vector>
 
+#include "catalog/catalog.h"
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
 #include "execution/plans/seq_scan_plan.h"
+#include "execution/scan_filter.h"
+#include "storage/page/table_page.h"
 #include "storage/table/tuple.h"
 
 namespace bustub {
 
 /**
  * The SeqScanExecutor executor executes a sequential table scan.
+ *
+ * The scan walks the table heap in runs of pages taken from a `MorselQueue`. A serial scan owns its queue; the workers
+ * of a parallel pipeline share the queue of their executor context, so that each page is scanned by one worker.
+ * Tuples are checked against the filter predicate in the page, and only the matching ones are copied out.
  */
 class SeqScanExecutor : public AbstractExecutor {
  public:
@@ -44,11 +52,44 @@ class SeqScanExecutor : public AbstractExecutor {
    */
   auto Next(Tuple *tuple, RID *rid) -> bool override;
 
+  /**
+   * Yield the next batch of tuples from the sequential scan.
+   * @param[out] batch The next tuples produced by the scan
+   * @param max_rows The maximum number of tuples to produce
+   * @return `true` if at least one tuple was produced, `false` if there are no more tuples
+   */
+  auto NextBatch(TupleBatch *batch, size_t max_rows) -> bool override;
+
   /** @return The output schema for the sequential scan */
   auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); }
 
  private:
+  /**
+   * Walk the tuples of the morsels, and call `emit(page, rid)` on each tuple that is not deleted and passes the
+   * compiled comparisons of the filter, until `emit` returns false.
+   * @return false if the scan is complete
+   */
+  template <class Emit>
+  auto ScanTuples(Emit &&emit) -> bool;
+
+  /** @return The values of the columns the scan produces, deserialized from a tuple of the table */
+  auto DecodeColumns(const Tuple &tuple) const -> std::vector<Value>;
+
   /** The sequential scan plan node to be executed */
   const SeqScanPlanNode *plan_;
+
+  /** The table being scanned */
+  TableInfo *table_info_;
+
+  /** The queue handing out the pages to scan */
+  std::shared_ptr<MorselQueue> morsel_queue_;
+
+  /** The pages of the current morsel, and the position of the scan in it */
+  std::vector<page_id_t> page_ids_;
+  size_t page_idx_{0};
+  uint32_t slot_{0};
+
+  /** The filter predicate of the scan */
+  ScanFilter filter_;
 };
 }  // namespace bustub
@@ -17,6 +17,7 @@
 
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
+#include "execution/external_sort.h"
 #include "execution/plans/seq_scan_plan.h"
 #include "execution/plans/sort_plan.h"
 #include "storage/table/tuple.h"
@@ -25,6 +26,10 @@ namespace bustub {
 
 /**
  * The SortExecutor executor executes a sort.
+ *
+ * The ORDER BY values of every row are normalized into a memcmp-comparable key with `KeyEncoder`, and the rows are
+ * sorted by these keys with an `ExternalSorter`, which spills sorted runs to the buffer pool when the input exceeds
+ * the memory budget of the query.
  */
 class SortExecutor : public AbstractExecutor {
  public:
@@ -52,5 +57,11 @@ class SortExecutor : public AbstractExecutor {
  private:
   /** The sort plan node to be executed */
   const SortPlanNode *plan_;
+
+  /** The child executor from which tuples are obtained */
+  std::unique_ptr<AbstractExecutor> child_executor_;
+
+  /** The sort of the child output */
+  std::unique_ptr<ExternalSorter> sorter_;
 };
 }  // namespace bustub
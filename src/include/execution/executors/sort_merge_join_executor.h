@@ -0,0 +1,101 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// sort_merge_join_executor.h
+//
+// Identification: src/include/execution/executors/sort_merge_join_executor.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <memory>
+#include <utility>
+#include <vector>
+
+#include "execution/executor_context.h"
+#include "execution/executors/abstract_executor.h"
+#include "execution/plans/sort_merge_join_plan.h"
+#include "storage/table/tuple.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/**
+ * SortMergeJoinExecutor executes an equi-JOIN on two inputs that are sorted in ascending order on their join keys.
+ *
+ * Both children are read once, in step. The right rows sharing the join key of the current left row are kept in a
+ * rewind buffer, so that following left rows with the same key are joined with them again without re-reading the
+ * right child. Only one group of equal right keys is buffered at a time. Rows with a NULL join key never match.
+ */
+class SortMergeJoinExecutor : public AbstractExecutor {
+ public:
+  /**
+   * Construct a new SortMergeJoinExecutor instance.
+   * @param exec_ctx The executor context
+   * @param plan The sort-merge join plan to be executed
+   * @param left_child The child executor that produces tuples for the left side of join
+   * @param right_child The child executor that produces tuples for the right side of join
+   */
+  SortMergeJoinExecutor(ExecutorContext *exec_ctx, const SortMergeJoinPlanNode *plan,
+                        std::unique_ptr<AbstractExecutor> &&left_child,
+                        std::unique_ptr<AbstractExecutor> &&right_child);
+
+  /** Initialize the join */
+  void Init() override;
+
+  /**
+   * Yield the next tuple from the join.
+   * @param[out] tuple The next tuple produced by the join
+   * @param[out] rid The next tuple RID produced by the join, not used by sort-merge join
+   * @return `true` if a tuple was produced, `false` if there are no more tuples
+   */
+  auto Next(Tuple *tuple, RID *rid) -> bool override;
+
+  /** @return The output schema for the join */
+  auto GetOutputSchema() const -> const Schema & override { return plan_->OutputSchema(); };
+
+ private:
+  /** One side of the merge: the current row of a child and its join keys. */
+  struct Cursor {
+    Tuple tuple_;
+    std::vector<Value> keys_;
+    bool valid_{false};
+    bool null_key_{false};
+  };
+
+  /** Move `cursor` to the next row of `child`, evaluating `key_exprs` on it. */
+  static void Advance(AbstractExecutor *child, const std::vector<AbstractExpressionRef> &key_exprs, Cursor *cursor);
+
+  /** @return negative, zero or positive as `lhs` sorts before, equal to or after `rhs`; neither may contain NULLs */
+  static auto CompareKeys(const std::vector<Value> &lhs, const std::vector<Value> &rhs) -> int;
+
+  /** Skip the right rows before the current left key and buffer the right rows equal to it. */
+  void LoadGroup();
+
+  /** Build an output tuple from a left row and a right row, or NULLs if `right` is nullptr. */
+  auto MakeOutputTuple(const Tuple &left, const Tuple *right) const -> Tuple;
+
+  /** The sort-merge join plan node to be executed */
+  const SortMergeJoinPlanNode *plan_;
+
+  std::unique_ptr<AbstractExecutor> left_child_;
+  std::unique_ptr<AbstractExecutor> right_child_;
+
+  Cursor left_;
+  Cursor right_;
+
+  /** The rewind buffer: the right rows whose join key equals `group_keys_`. */
+  std::vector<Tuple> group_;
+  std::vector<Value> group_keys_;
+  bool group_loaded_{false};
+
+  /** True while the current left row is being joined with the rewind buffer. */
+  bool emitting_{false};
+  size_t match_idx_{0};
+};
+
+}  // namespace bustub
@@ -13,11 +13,13 @@
 #pragma once
 
 #include <memory>
+#include <string>
 #include <utility>
 #include <vector>
 
 #include "execution/executor_context.h"
 #include "execution/executors/abstract_executor.h"
+#include "execution/external_sort.h"
 #include "execution/plans/seq_scan_plan.h"
 #include "execution/plans/topn_plan.h"
 #include "storage/table/tuple.h"
@@ -26,6 +28,10 @@ namespace bustub {
 
 /**
  * The TopNExecutor executor executes a topn.
+ *
+ * Rows are ranked by their normalized sort key (see `MakeSortKey`) and kept in a bounded max-heap of N entries. With
+ * a degree of parallelism above 1, the child batches are spread over several workers that each keep their own heap,
+ * and the heaps are merged once the child is exhausted. Ties keep the child order in both cases.
  */
 class TopNExecutor : public AbstractExecutor {
  public:
@@ -63,5 +69,41 @@ class TopNExecutor : public AbstractExecutor {
   const TopNPlanNode *plan_;
   /** The child executor from which tuples are obtained */
   std::unique_ptr<AbstractExecutor> child_executor_;
+
+  /** A row in a heap, ranked by its sort key, then by its position in the child output */
+  struct HeapEntry {
+    std::string key_;
+    size_t seq_;
+    Tuple tuple_;
+  };
+
+  /** A bounded max-heap holding the N smallest rows seen so far */
+  class BoundedHeap {
+   public:
+    explicit BoundedHeap(size_t n) : n_(n) {}
+    /** Offer a row; the key is only copied if the row makes it into the heap. */
+    void Push(const std::string &key, size_t seq, const Tuple &tuple);
+    auto Size() const -> size_t { return entries_.size(); }
+    /** @return the entries in ascending order, emptying the heap */
+    auto Drain() -> std::vector<HeapEntry>;
+
+   private:
+    static auto Less(const HeapEntry &lhs, const HeapEntry &rhs) -> bool;
+    size_t n_;
+    std::vector<HeapEntry> entries_;
+  };
+
+  /** Fill `heaps_` from the child, one row at a time. */
+  void RunSerial();
+
+  /** Fill `heaps_` from the child with one worker per heap. */
+  void RunParallel(size_t workers);
+
+  /** The heaps, one per worker */
+  std::vector<BoundedHeap> heaps_;
+
+  /** The top N rows in order, and the next one to emit */
+  std::vector<HeapEntry> results_;
+  size_t cursor_{0};
 };
 }  // namespace bustub
@@ -20,6 +20,7 @@
 #include "catalog/schema.h"
 #include "fmt/format.h"
 #include "storage/table/tuple.h"
+#include "storage/table/tuple_batch.h"
 
 #define BUSTUB_EXPR_CLONE_WITH_CHILDREN(cname)                                                                   \
   auto CloneWithChildren(std::vector<AbstractExpressionRef> children) const->std::unique_ptr<AbstractExpression> \
@@ -65,6 +66,21 @@ class AbstractExpression {
   virtual auto EvaluateJoin(const Tuple *left_tuple, const Schema &left_schema, const Tuple *right_tuple,
                             const Schema &right_schema) const -> Value = 0;
 
+  /**
+   * Evaluate the expression for every row of `batch`.
+   * The default implementation materializes each row and calls `Evaluate`; expressions override it to compute whole
+   * columns at once.
+   * @param[out] out Replaced with one value per row of the batch
+   */
+  virtual void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const {
+    out->clear();
+    out->reserve(batch.Size());
+    for (size_t row = 0; row < batch.Size(); row++) {
+      const auto tuple = batch.GetTuple(row);
+      out->push_back(Evaluate(&tuple, batch.GetSchema()));
+    }
+  }
+
   /** @return the child_idx'th child of this expression */
   auto GetChildAt(uint32_t child_idx) const -> const AbstractExpressionRef & { return children_[child_idx]; }
 
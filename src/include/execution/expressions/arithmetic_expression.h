@@ -65,6 +65,20 @@ class ArithmeticExpression : public AbstractExpression {
     return ValueFactory::GetIntegerValue(*res);
   }
 
+  void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const override {
+    std::vector<Value> lhs;
+    std::vector<Value> rhs;
+    GetChildAt(0)->EvaluateBatch(batch, &lhs);
+    GetChildAt(1)->EvaluateBatch(batch, &rhs);
+    out->clear();
+    out->reserve(lhs.size());
+    for (size_t i = 0; i < lhs.size(); i++) {
+      auto res = PerformComputation(lhs[i], rhs[i]);
+      out->push_back(res == std::nullopt ? ValueFactory::GetNullValueByType(TypeId::INTEGER)
+                                         : ValueFactory::GetIntegerValue(*res));
+    }
+  }
+
   /** @return the string representation of the expression node and its children */
   auto ToString() const -> std::string override {
     return fmt::format("({}{}{})", *GetChildAt(0), compute_type_, *GetChildAt(1));
@@ -45,6 +45,8 @@ class ColumnValueExpression : public AbstractExpression {
                            : right_tuple->GetValue(&right_schema, col_idx_);
   }
 
+  void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const override { *out = batch.Column(col_idx_); }
+
   auto GetTupleIdx() const -> uint32_t { return tuple_idx_; }
   auto GetColIdx() const -> uint32_t { return col_idx_; }
 
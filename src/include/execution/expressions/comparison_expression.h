@@ -49,6 +49,18 @@ class ComparisonExpression : public AbstractExpression {
     return ValueFactory::GetBooleanValue(PerformComparison(lhs, rhs));
   }
 
+  void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const override {
+    std::vector<Value> lhs;
+    std::vector<Value> rhs;
+    GetChildAt(0)->EvaluateBatch(batch, &lhs);
+    GetChildAt(1)->EvaluateBatch(batch, &rhs);
+    out->clear();
+    out->reserve(lhs.size());
+    for (size_t i = 0; i < lhs.size(); i++) {
+      out->push_back(ValueFactory::GetBooleanValue(PerformComparison(lhs[i], rhs[i])));
+    }
+  }
+
   /** @return the string representation of the expression node and its children */
   auto ToString() const -> std::string override {
     return fmt::format("({}{}{})", *GetChildAt(0), comp_type_, *GetChildAt(1));
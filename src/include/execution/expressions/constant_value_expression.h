@@ -34,6 +34,10 @@ class ConstantValueExpression : public AbstractExpression {
     return val_;
   }
 
+  void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const override {
+    out->assign(batch.Size(), val_);
+  }
+
   /** @return the string representation of the plan node and its children */
   auto ToString() const -> std::string override { return val_.ToString(); }
 
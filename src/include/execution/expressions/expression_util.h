@@ -0,0 +1,55 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// expression_util.h
+//
+// Identification: src/include/execution/expressions/expression_util.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <vector>
+
+#include "execution/expressions/abstract_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/logic_expression.h"
+
+namespace bustub {
+
+/** @brief collect the operands of the ANDs of a predicate, leaving out the TRUE ones */
+inline void SplitConjuncts(const AbstractExpressionRef &expr, std::vector<AbstractExpressionRef> *conjuncts) {
+  if (const auto *logic_expr = dynamic_cast<const LogicExpression *>(expr.get());
+      logic_expr != nullptr && logic_expr->logic_type_ == LogicType::And) {
+    SplitConjuncts(logic_expr->GetChildAt(0), conjuncts);
+    SplitConjuncts(logic_expr->GetChildAt(1), conjuncts);
+    return;
+  }
+  if (const auto *const_expr = dynamic_cast<const ConstantValueExpression *>(expr.get());
+      const_expr != nullptr && !const_expr->val_.IsNull() && const_expr->val_.CastAs(TypeId::BOOLEAN).GetAs<bool>()) {
+    return;
+  }
+  conjuncts->push_back(expr);
+}
+
+/** @brief the comparison with its operands swapped, e.g. `a < b` for `b > a` */
+inline auto MirrorComparison(ComparisonType comp_type) -> ComparisonType {
+  switch (comp_type) {
+    case ComparisonType::LessThan:
+      return ComparisonType::GreaterThan;
+    case ComparisonType::LessThanOrEqual:
+      return ComparisonType::GreaterThanOrEqual;
+    case ComparisonType::GreaterThan:
+      return ComparisonType::LessThan;
+    case ComparisonType::GreaterThanOrEqual:
+      return ComparisonType::LessThanOrEqual;
+    default:
+      return comp_type;
+  }
+}
+
+}  // namespace bustub
@@ -0,0 +1,68 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// parameter_value_expression.h
+//
+// Identification: src/include/execution/expressions/parameter_value_expression.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "common/exception.h"
+#include "execution/expressions/abstract_expression.h"
+#include "fmt/format.h"
+
+namespace bustub {
+
+/** The values of the parameters of a prepared statement, assigned before each execution. */
+using ParameterValues = std::vector<Value>;
+
+/**
+ * ParameterValueExpression represents a parameter of a prepared statement, e.g. `$1`. The plan is made once; each
+ * execution assigns the parameter values that all parameter expressions of the plan read from.
+ */
+class ParameterValueExpression : public AbstractExpression {
+ public:
+  ParameterValueExpression(uint32_t param_idx, TypeId ret_type, std::shared_ptr<const ParameterValues> values)
+      : AbstractExpression({}, ret_type), param_idx_(param_idx), values_(std::move(values)) {}
+
+  auto Evaluate(const Tuple *tuple, const Schema &schema) const -> Value override { return GetValue(); }
+
+  auto EvaluateJoin(const Tuple *left_tuple, const Schema &left_schema, const Tuple *right_tuple,
+                    const Schema &right_schema) const -> Value override {
+    return GetValue();
+  }
+
+  void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const override {
+    out->assign(batch.Size(), GetValue());
+  }
+
+  /** @return the string representation of the plan node and its children */
+  auto ToString() const -> std::string override { return fmt::format("${}", param_idx_ + 1); }
+
+  BUSTUB_EXPR_CLONE_WITH_CHILDREN(ParameterValueExpression);
+
+  /** @return the value assigned to the parameter for the current execution */
+  auto GetValue() const -> const Value & {
+    if (param_idx_ >= values_->size()) {
+      throw ExecutionException(fmt::format("no value for parameter ${}", param_idx_ + 1));
+    }
+    return (*values_)[param_idx_];
+  }
+
+  /** The index of the parameter, starting at 0 for `$1`. */
+  uint32_t param_idx_;
+
+ private:
+  std::shared_ptr<const ParameterValues> values_;
+};
+}  // namespace bustub
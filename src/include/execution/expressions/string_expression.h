@@ -62,6 +62,16 @@ class StringExpression : public AbstractExpression {
     return ValueFactory::GetVarcharValue(Compute(str));
   }
 
+  void EvaluateBatch(const TupleBatch &batch, std::vector<Value> *out) const override {
+    std::vector<Value> vals;
+    GetChildAt(0)->EvaluateBatch(batch, &vals);
+    out->clear();
+    out->reserve(vals.size());
+    for (const auto &val : vals) {
+      out->push_back(ValueFactory::GetVarcharValue(Compute(val.GetAs<char *>())));
+    }
+  }
+
   /** @return the string representation of the expression node and its children */
   auto ToString() const -> std::string override { return fmt::format("{}({})", expr_type_, *GetChildAt(0)); }
 
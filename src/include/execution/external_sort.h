@@ -0,0 +1,148 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// external_sort.h
+//
+// Identification: src/include/execution/external_sort.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <deque>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "binder/bound_order_by.h"
+#include "buffer/buffer_pool_manager.h"
+#include "common/macros.h"
+#include "execution/expressions/abstract_expression.h"
+#include "execution/spill_file.h"
+#include "storage/table/tuple.h"
+#include "storage/table/tuple_batch.h"
+
+namespace bustub {
+
+/** The maximum number of sorted runs merged at once, each of them pins one page while it is read. */
+static constexpr size_t SORT_MAX_MERGE_FANIN = 32;
+
+/** The minimum number of buffered entries per thread for the in-memory sort to run in parallel. */
+static constexpr size_t SORT_MIN_ENTRIES_PER_THREAD = 4096;
+
+using OrderBys = std::vector<std::pair<OrderByType, AbstractExpressionRef>>;
+
+/** @return the normalized sort key of `tuple`, memcmp-comparable in the order given by `order_bys` */
+auto MakeSortKey(const OrderBys &order_bys, const Tuple &tuple, const Schema &schema) -> std::string;
+
+/** Replace `keys` with the normalized sort keys of the rows of `batch`. */
+void MakeSortKeys(const OrderBys &order_bys, const TupleBatch &batch, std::vector<std::string> *keys);
+
+/**
+ * ExternalSorter sorts tuples by normalized keys (see `KeyEncoder`), whatever their number, within a memory budget.
+ *
+ * Tuples are buffered in memory until the budget is exceeded; the buffer is then sorted into a run and spilled to a
+ * `SpillFile`. Once all tuples have been added, the runs are merged with a loser tree, in several passes if there
+ * are more than `SORT_MAX_MERGE_FANIN` of them. When nothing was spilled, the tuples are simply sorted in memory.
+ *
+ * The sort is stable: tuples with equal keys come out in the order they were added. Every buffer is sorted by up to
+ * `parallelism` threads, each sorting one chunk, and the chunks are then merged pairwise, also in parallel.
+ */
+class ExternalSorter {
+ public:
+  /**
+   * @param bpm the buffer pool the runs are spilled to, or nullptr to sort in memory whatever the budget
+   * @param memory_budget the number of bytes of tuples and keys to buffer before spilling a run
+   * @param parallelism the number of threads sorting a buffer
+   */
+  ExternalSorter(BufferPoolManager *bpm, size_t memory_budget, size_t parallelism = 1)
+      : bpm_(bpm), memory_budget_(memory_budget), parallelism_(parallelism) {}
+
+  DISALLOW_COPY_AND_MOVE(ExternalSorter);
+
+  /** Add a tuple sorted by the normalized key `key`. */
+  void Add(std::string key, Tuple tuple);
+
+  /** Finish the input; the tuples can then be read in order with `Next`. */
+  void Sort();
+
+  /** @return false once all tuples have been returned */
+  auto Next(Tuple *tuple) -> bool;
+
+  /** @return true if the sort spilled runs to the buffer pool */
+  auto IsSpilled() const -> bool { return !runs_.empty(); }
+
+ private:
+  struct Entry {
+    std::string key_;
+    Tuple tuple_;
+  };
+
+  /** A sorted run being merged, with its head entry. */
+  struct MergeSource {
+    explicit MergeSource(SpillFile *run) : reader_(run) {}
+    SpillFile::Reader reader_;
+    Entry head_;
+    bool exhausted_{false};
+  };
+
+  /**
+   * A loser tree over merge sources: `tree_[0]` is the source with the smallest head, and every inner node holds the
+   * source that lost the match played there. Replacing the head of the winner takes one replay from its leaf.
+   */
+  class LoserTree {
+   public:
+    void Init(std::vector<std::unique_ptr<MergeSource>> *sources);
+    auto Winner() const -> size_t { return tree_[0]; }
+    /** Replay the matches on the path of source `source`, after its head has changed. */
+    void Replay(size_t source);
+
+   private:
+    auto Less(size_t lhs, size_t rhs) const -> bool;
+
+    std::vector<std::unique_ptr<MergeSource>> *sources_{nullptr};
+    std::vector<size_t> tree_;
+  };
+
+  /** Sort the buffered entries, stably. */
+  void SortBuffer();
+
+  /** Sort the buffered entries and spill them as a run. */
+  void SpillRun();
+
+  /** Start merging `runs`, which stay owned by the caller. */
+  void StartMerge(const std::vector<SpillFile *> &runs);
+
+  /** Move the next merged entry into `entry`. @return false when the merge is done */
+  auto NextMerged(Entry *entry) -> bool;
+
+  /** Load the next entry of a merge source. */
+  static void Advance(MergeSource *source);
+
+  /** Store a key and a tuple as a single tuple, so that runs keep the normalized keys. */
+  static auto Pack(const Entry &entry) -> Tuple;
+  static void Unpack(const Tuple &packed, Entry *entry);
+
+  BufferPoolManager *bpm_;
+  size_t memory_budget_;
+  size_t parallelism_;
+
+  /** The entries buffered in memory, and their estimated size */
+  std::vector<Entry> buffer_;
+  size_t buffer_bytes_{0};
+  /** The next buffered entry to return when nothing was spilled */
+  size_t buffer_idx_{0};
+
+  /** The sorted runs that still have to be merged */
+  std::deque<std::unique_ptr<SpillFile>> runs_;
+
+  /** The final merge */
+  std::vector<std::unique_ptr<MergeSource>> sources_;
+  LoserTree tree_;
+};
+
+}  // namespace bustub
@@ -0,0 +1,88 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// morsel_queue.h
+//
+// Identification: src/include/execution/morsel_queue.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <atomic>
+#include <mutex>  // NOLINT
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "common/config.h"
+#include "common/macros.h"
+#include "common/rid.h"
+
+namespace bustub {
+
+/** The number of mock table rows handed out at a time. */
+static constexpr size_t ROWS_PER_MORSEL = 16384;
+
+/** The number of table heap pages handed out at a time. */
+static constexpr size_t PAGES_PER_MORSEL = 16;
+
+/**
+ * MorselQueue hands out the input of a scan in small ranges ("morsels"), so that the scans of several parallel
+ * workers split a table between them dynamically: a worker that is done with its morsel simply takes the next one.
+ * A queue hands out either row ranges of a mock table or runs of table heap pages.
+ *
+ * All workers share one queue. Each of them calls the matching Init function, and only the first call takes effect,
+ * so the workers agree on the snapshot of the table they scan.
+ */
+class MorselQueue {
+ public:
+  MorselQueue() = default;
+
+  DISALLOW_COPY_AND_MOVE(MorselQueue);
+
+  /** Hand out the rows [0, row_count), `rows_per_morsel` at a time. */
+  void InitRows(size_t row_count, size_t rows_per_morsel = ROWS_PER_MORSEL);
+
+  /**
+   * Hand out the pages of a table heap, `pages_per_morsel` at a time.
+   * @param first_page_id the first page of the table heap
+   * @param end_rid the RID just past the last tuple to scan; the scan stops there
+   */
+  void InitPages(BufferPoolManager *bpm, page_id_t first_page_id, RID end_rid,
+                 size_t pages_per_morsel = PAGES_PER_MORSEL);
+
+  /**
+   * Take the next row range.
+   * @return false if all rows have been handed out
+   */
+  auto NextRows(size_t *begin, size_t *end) -> bool;
+
+  /**
+   * Take the next run of pages.
+   * @param[out] page_ids replaced with the ids of the pages to scan, in table order
+   * @return false if all pages have been handed out
+   */
+  auto NextPages(std::vector<page_id_t> *page_ids) -> bool;
+
+  /** @return the RID just past the last tuple to scan */
+  auto GetEndRid() const -> RID { return end_rid_; }
+
+ private:
+  std::once_flag init_flag_;
+
+  size_t row_count_{0};
+  size_t rows_per_morsel_{ROWS_PER_MORSEL};
+  std::atomic<size_t> next_row_{0};
+
+  BufferPoolManager *bpm_{nullptr};
+  size_t pages_per_morsel_{PAGES_PER_MORSEL};
+  RID end_rid_{INVALID_PAGE_ID, 0};
+  /** The next page to hand out, protected by `latch_` since the page chain has to be walked. */
+  std::mutex latch_;
+  page_id_t next_page_id_{INVALID_PAGE_ID};
+};
+
+}  // namespace bustub
@@ -42,6 +42,7 @@ enum class PlanType {
   NestedLoopJoin,
   NestedIndexJoin,
   HashJoin,
+  SortMergeJoin,
   Filter,
   Values,
   Projection,
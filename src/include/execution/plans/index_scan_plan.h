@@ -14,10 +14,12 @@
 
 #include <string>
 #include <utility>
+#include <vector>
 
 #include "catalog/catalog.h"
 #include "execution/expressions/abstract_expression.h"
 #include "execution/plans/abstract_plan.h"
+#include "type/value.h"
 
 namespace bustub {
 /**
@@ -29,9 +31,17 @@ class IndexScanPlanNode : public AbstractPlanNode {
    * Creates a new index scan plan node.
    * @param output The output format of this scan plan node
    * @param table_oid The identifier of table to be scanned
+   * @param filter_predicate The predicate that the rows of the scan satisfy, or nullptr
+   * @param low_key The smallest index key to scan, or empty to scan from the first key
+   * @param high_key The index key to stop the scan at (exclusive), or empty to scan to the last key
    */
-  IndexScanPlanNode(SchemaRef output, index_oid_t index_oid)
-      : AbstractPlanNode(std::move(output), {}), index_oid_(index_oid) {}
+  IndexScanPlanNode(SchemaRef output, index_oid_t index_oid, AbstractExpressionRef filter_predicate = nullptr,
+                    std::vector<Value> low_key = {}, std::vector<Value> high_key = {})
+      : AbstractPlanNode(std::move(output), {}),
+        index_oid_(index_oid),
+        filter_predicate_(std::move(filter_predicate)),
+        low_key_(std::move(low_key)),
+        high_key_(std::move(high_key)) {}
 
   auto GetType() const -> PlanType override { return PlanType::IndexScan; }
 
@@ -43,11 +53,33 @@ class IndexScanPlanNode : public AbstractPlanNode {
   /** The table whose tuples should be scanned. */
   index_oid_t index_oid_;
 
-  // Add anything you want here for index lookup
+  /** The predicate to filter the rows of the table with, on the output schema, or nullptr */
+  AbstractExpressionRef filter_predicate_;
+
+  /** The values of the key columns of the first index key to scan, or empty */
+  std::vector<Value> low_key_;
+
+  /** The values of the key columns of the index key that ends the scan (exclusive), or empty */
+  std::vector<Value> high_key_;
 
  protected:
   auto PlanNodeToString() const -> std::string override {
-    return fmt::format("IndexScan {{ index_oid={} }}", index_oid_);
+    auto key_to_string = [](const std::vector<Value> &key) {
+      std::vector<std::string> values;
+      for (const auto &value : key) {
+        values.push_back(value.ToString());
+      }
+      return fmt::format("({})", fmt::join(values, ", "));
+    };
+    std::string range;
+    if (!low_key_.empty() || !high_key_.empty()) {
+      range = fmt::format(", range=[{}, {})", low_key_.empty() ? "-inf" : key_to_string(low_key_),
+                          high_key_.empty() ? "+inf" : key_to_string(high_key_));
+    }
+    if (filter_predicate_) {
+      return fmt::format("IndexScan {{ index_oid={}{}, filter={} }}", index_oid_, range, filter_predicate_);
+    }
+    return fmt::format("IndexScan {{ index_oid={}{} }}", index_oid_, range);
   }
 };
 
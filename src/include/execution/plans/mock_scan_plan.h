@@ -14,6 +14,7 @@
 
 #include <string>
 #include <utility>
+#include <vector>
 
 #include "catalog/catalog.h"
 #include "execution/expressions/abstract_expression.h"
@@ -31,9 +32,15 @@ class MockScanPlanNode : public AbstractPlanNode {
   /**
    * Construct a new MockScanPlanNode instance.
    * @param output The output schema of this mock scan plan node
+   * @param filter_predicate The predicate that the rows of the scan satisfy, on the output schema, or nullptr
+   * @param column_ids The columns of the mock table that the scan produces, or empty for all columns
    */
-  MockScanPlanNode(SchemaRef output, std::string table)
-      : AbstractPlanNode(std::move(output), {}), table_(std::move(table)) {}
+  MockScanPlanNode(SchemaRef output, std::string table, AbstractExpressionRef filter_predicate = nullptr,
+                   std::vector<uint32_t> column_ids = {})
+      : AbstractPlanNode(std::move(output), {}),
+        table_(std::move(table)),
+        filter_predicate_(std::move(filter_predicate)),
+        column_ids_(std::move(column_ids)) {}
 
   /** @return The type of the plan node */
   auto GetType() const -> PlanType override { return PlanType::MockScan; }
@@ -41,14 +48,35 @@ class MockScanPlanNode : public AbstractPlanNode {
   /** @return The table name of this mock scan node, used to determine the generated content. */
   auto GetTable() const -> const std::string & { return table_; }
 
+  /** @return The predicate that the rows of the scan satisfy, or nullptr */
+  auto GetFilterPredicate() const -> const AbstractExpressionRef & { return filter_predicate_; }
+
+  /** @return The indexes of the table columns that the scan produces, in output order; empty for all columns */
+  auto GetColumnIds() const -> const std::vector<uint32_t> & { return column_ids_; }
+
   BUSTUB_PLAN_NODE_CLONE_WITH_CHILDREN(MockScanPlanNode);
 
  protected:
-  auto PlanNodeToString() const -> std::string override { return fmt::format("MockScan {{ table={} }}", table_); }
+  auto PlanNodeToString() const -> std::string override {
+    std::string columns;
+    if (!column_ids_.empty()) {
+      columns = fmt::format(", columns=[{}]", fmt::join(column_ids_, ", "));
+    }
+    if (filter_predicate_) {
+      return fmt::format("MockScan {{ table={}{}, filter={} }}", table_, columns, filter_predicate_);
+    }
+    return fmt::format("MockScan {{ table={}{} }}", table_, columns);
+  }
 
  private:
   /** The table name of this mock scan executor */
   std::string table_;
+
+  /** The predicate to filter the rows of the mock table with */
+  AbstractExpressionRef filter_predicate_;
+
+  /** The columns of the mock table that the scan produces */
+  std::vector<uint32_t> column_ids_;
 };
 
 }  // namespace bustub
@@ -15,6 +15,7 @@
 #include <memory>
 #include <string>
 #include <utility>
+#include <vector>
 
 #include "binder/table_ref/bound_base_table_ref.h"
 #include "catalog/catalog.h"
@@ -33,13 +34,15 @@ class SeqScanPlanNode : public AbstractPlanNode {
    * Construct a new SeqScanPlanNode instance.
    * @param output The output schema of this sequential scan plan node
    * @param table_oid The identifier of table to be scanned
+   * @param column_ids The columns of the table that the scan produces, or empty for all columns
    */
   SeqScanPlanNode(SchemaRef output, table_oid_t table_oid, std::string table_name,
-                  AbstractExpressionRef filter_predicate = nullptr)
+                  AbstractExpressionRef filter_predicate = nullptr, std::vector<uint32_t> column_ids = {})
       : AbstractPlanNode(std::move(output), {}),
         table_oid_{table_oid},
         table_name_(std::move(table_name)),
-        filter_predicate_(std::move(filter_predicate)) {}
+        filter_predicate_(std::move(filter_predicate)),
+        column_ids_(std::move(column_ids)) {}
 
   /** @return The type of the plan node */
   auto GetType() const -> PlanType override { return PlanType::SeqScan; }
@@ -57,17 +60,24 @@ class SeqScanPlanNode : public AbstractPlanNode {
   /** The table name */
   std::string table_name_;
 
-  /** The predicate to filter in seqscan. It will ALWAYS be nullptr unless you enable the MergeFilterScan rule.
-      You don't need to handle it to get a perfect score in project 3 in Spring 2023.
-  */
+  /** The predicate to filter in seqscan, on the output schema. It is nullptr unless the MergeFilterScan rule merged a
+      filter into the scan. */
   AbstractExpressionRef filter_predicate_;
 
+  /** The indexes of the table columns that the scan produces, in output order. Empty if it produces all columns.
+      The filter predicate is evaluated against the output schema. */
+  std::vector<uint32_t> column_ids_;
+
  protected:
   auto PlanNodeToString() const -> std::string override {
+    std::string columns;
+    if (!column_ids_.empty()) {
+      columns = fmt::format(", columns=[{}]", fmt::join(column_ids_, ", "));
+    }
     if (filter_predicate_) {
-      return fmt::format("SeqScan {{ table={}, filter={} }}", table_name_, filter_predicate_);
+      return fmt::format("SeqScan {{ table={}{}, filter={} }}", table_name_, columns, filter_predicate_);
     }
-    return fmt::format("SeqScan {{ table={} }}", table_name_);
+    return fmt::format("SeqScan {{ table={}{} }}", table_name_, columns);
   }
 };
 
@@ -0,0 +1,86 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// sort_merge_join_plan.h
+//
+// Identification: src/include/execution/plans/sort_merge_join_plan.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "binder/table_ref/bound_join_ref.h"
+#include "execution/expressions/abstract_expression.h"
+#include "execution/plans/abstract_plan.h"
+
+namespace bustub {
+
+/**
+ * Sort-merge join performs an equi-JOIN by merging two inputs that are both sorted in ascending order on their
+ * join keys. The output is sorted on the left join keys.
+ */
+class SortMergeJoinPlanNode : public AbstractPlanNode {
+ public:
+  /**
+   * Construct a new SortMergeJoinPlanNode instance.
+   * @param output_schema The output schema for the JOIN
+   * @param left The left child plan, sorted on `left_key_expressions`
+   * @param right The right child plan, sorted on `right_key_expressions`
+   * @param left_key_expressions The expressions for the left JOIN keys
+   * @param right_key_expressions The expressions for the right JOIN keys
+   * @param join_type The join type
+   */
+  SortMergeJoinPlanNode(SchemaRef output_schema, AbstractPlanNodeRef left, AbstractPlanNodeRef right,
+                        std::vector<AbstractExpressionRef> left_key_expressions,
+                        std::vector<AbstractExpressionRef> right_key_expressions, JoinType join_type)
+      : AbstractPlanNode(std::move(output_schema), {std::move(left), std::move(right)}),
+        left_key_expressions_{std::move(left_key_expressions)},
+        right_key_expressions_{std::move(right_key_expressions)},
+        join_type_(join_type) {}
+
+  /** @return The type of the plan node */
+  auto GetType() const -> PlanType override { return PlanType::SortMergeJoin; }
+
+  /** @return The expressions to compute the left join keys */
+  auto LeftJoinKeyExpressions() const -> const std::vector<AbstractExpressionRef> & { return left_key_expressions_; }
+
+  /** @return The expressions to compute the right join keys */
+  auto RightJoinKeyExpressions() const -> const std::vector<AbstractExpressionRef> & { return right_key_expressions_; }
+
+  /** @return The left plan node of the sort-merge join */
+  auto GetLeftPlan() const -> AbstractPlanNodeRef {
+    BUSTUB_ASSERT(GetChildren().size() == 2, "Sort-merge joins should have exactly two children plans.");
+    return GetChildAt(0);
+  }
+
+  /** @return The right plan node of the sort-merge join */
+  auto GetRightPlan() const -> AbstractPlanNodeRef {
+    BUSTUB_ASSERT(GetChildren().size() == 2, "Sort-merge joins should have exactly two children plans.");
+    return GetChildAt(1);
+  }
+
+  /** @return The join type used in the sort-merge join */
+  auto GetJoinType() const -> JoinType { return join_type_; };
+
+  BUSTUB_PLAN_NODE_CLONE_WITH_CHILDREN(SortMergeJoinPlanNode);
+
+  /** The expressions to compute the left JOIN keys */
+  std::vector<AbstractExpressionRef> left_key_expressions_;
+  /** The expressions to compute the right JOIN keys */
+  std::vector<AbstractExpressionRef> right_key_expressions_;
+
+  /** The join type */
+  JoinType join_type_;
+
+ protected:
+  auto PlanNodeToString() const -> std::string override;
+};
+
+}  // namespace bustub
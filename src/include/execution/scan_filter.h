@@ -0,0 +1,152 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// scan_filter.h
+//
+// Identification: src/include/execution/scan_filter.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <optional>
+#include <vector>
+
+#include "catalog/schema.h"
+#include "execution/compiled_expression.h"
+#include "execution/expressions/abstract_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "storage/table/tuple.h"
+#include "storage/table/tuple_batch.h"
+#include "type/limits.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/**
+ * ScanFilter evaluates the filter predicate of a scan.
+ *
+ * The comparisons of an integer column with a constant that are ANDed into the predicate are compiled: they are
+ * checked on the serialized tuple in the table page (or on the generated row of a mock table), before the row is
+ * copied or any of its values is deserialized. The rest of the predicate, the residual, is evaluated on the rows that
+ * pass these checks.
+ */
+class ScanFilter {
+ public:
+  /**
+   * Compile the filter predicate of a scan.
+   * @param predicate The predicate on the output schema of the scan, or nullptr
+   * @param column_ids The table columns that the scan produces, in output order; empty for all columns
+   * @param table_schema The schema of the serialized tuples, or nullptr if the scan only matches rows of values
+   */
+  ScanFilter(const AbstractExpressionRef &predicate, const std::vector<uint32_t> &column_ids,
+             const Schema *table_schema);
+
+  /** @return false if the serialized tuple fails one of the compiled comparisons */
+  auto MatchData(const char *data) const -> bool {
+    for (const auto &comparison : comparisons_) {
+      if (!comparison.Match(comparison.Read(data))) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  /** @return false if the row, which has all columns of the table, fails one of the compiled comparisons */
+  auto MatchValues(const std::vector<Value> &row) const -> bool {
+    for (const auto &comparison : comparisons_) {
+      if (!comparison.Match(comparison.Read(row[comparison.column_id_]))) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  /** @return true if the tuple of the scan output passes the residual predicate */
+  auto MatchResidual(const Tuple &tuple, const Schema &schema) const -> bool;
+
+  /** Remove the rows of a batch of the scan output that fail the residual predicate. */
+  void FilterBatch(TupleBatch *batch);
+
+  /** @return the part of the predicate that is not compiled, or nullptr */
+  auto GetResidual() const -> const AbstractExpressionRef & { return residual_; }
+
+ private:
+  /** `column comp_type value`, on a column of an integer type. */
+  struct Comparison {
+    /** @return the integer in the column of a serialized tuple, or nullopt if it is NULL */
+    auto Read(const char *data) const -> std::optional<int64_t> {
+      switch (type_) {
+        case TypeId::TINYINT:
+          return ReadAs<int8_t>(data + offset_, BUSTUB_INT8_NULL);
+        case TypeId::SMALLINT:
+          return ReadAs<int16_t>(data + offset_, BUSTUB_INT16_NULL);
+        case TypeId::INTEGER:
+          return ReadAs<int32_t>(data + offset_, BUSTUB_INT32_NULL);
+        default:
+          return ReadAs<int64_t>(data + offset_, BUSTUB_INT64_NULL);
+      }
+    }
+
+    /** @return the integer in a value of the column, or nullopt if it is NULL */
+    auto Read(const Value &value) const -> std::optional<int64_t>;
+
+    auto Match(std::optional<int64_t> column) const -> bool {
+      if (!column.has_value()) {
+        return false;
+      }
+      switch (comp_type_) {
+        case ComparisonType::Equal:
+          return *column == value_;
+        case ComparisonType::NotEqual:
+          return *column != value_;
+        case ComparisonType::LessThan:
+          return *column < value_;
+        case ComparisonType::LessThanOrEqual:
+          return *column <= value_;
+        case ComparisonType::GreaterThan:
+          return *column > value_;
+        case ComparisonType::GreaterThanOrEqual:
+          return *column >= value_;
+      }
+      return false;
+    }
+
+    template <class T>
+    static auto ReadAs(const char *storage, T null_value) -> std::optional<int64_t> {
+      T value;
+      std::memcpy(&value, storage, sizeof(T));
+      if (value == null_value) {
+        return std::nullopt;
+      }
+      return value;
+    }
+
+    /** The column in the table */
+    uint32_t column_id_;
+    /** The offset of the column in a serialized tuple of the table */
+    uint32_t offset_;
+    TypeId type_;
+    ComparisonType comp_type_;
+    int64_t value_;
+  };
+
+  /** Compile a conjunct of the predicate. @return false if it has to be evaluated as part of the residual */
+  auto Compile(const AbstractExpressionRef &expr, const std::vector<uint32_t> &column_ids, const Schema *table_schema)
+      -> bool;
+
+  std::vector<Comparison> comparisons_;
+  AbstractExpressionRef residual_;
+
+  /** The residual, compiled for evaluating batches */
+  std::unique_ptr<CompiledExpression> compiled_residual_;
+  std::vector<bool> selection_;
+};
+
+}  // namespace bustub
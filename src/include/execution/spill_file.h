@@ -0,0 +1,86 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// spill_file.h
+//
+// Identification: src/include/execution/spill_file.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "common/config.h"
+#include "common/macros.h"
+#include "storage/page/tmp_tuple_page.h"
+#include "storage/table/tuple.h"
+
+namespace bustub {
+
+/**
+ * SpillFile is an append-only sequence of tuples stored in temporary pages (`TmpTuplePage`) of the buffer pool.
+ * Operators whose state exceeds their memory budget write it to spill files and read it back later; the buffer pool
+ * writes the pages to disk when it needs the frames.
+ *
+ * At most one page is pinned while writing and one per reader while reading. The pages are deleted when the file is
+ * cleared or destroyed.
+ */
+class SpillFile {
+ public:
+  /** Reads the tuples of a spill file in the order they were appended. */
+  class Reader {
+   public:
+    explicit Reader(SpillFile *file) : file_(file) {}
+    ~Reader();
+
+    DISALLOW_COPY_AND_MOVE(Reader);
+
+    /** @return false if all tuples have been read */
+    auto Next(Tuple *tuple) -> bool;
+
+   private:
+    SpillFile *file_;
+    size_t page_idx_{0};
+    TmpTuplePage *page_{nullptr};
+    /** The tuple offsets of the current page in insertion order, and the next one to read */
+    std::vector<uint32_t> offsets_;
+    size_t offset_idx_{0};
+  };
+
+  explicit SpillFile(BufferPoolManager *bpm) : bpm_(bpm) {}
+  ~SpillFile() { Clear(); }
+
+  DISALLOW_COPY_AND_MOVE(SpillFile);
+
+  /** Append a tuple, which must fit into an empty page. */
+  void Append(const Tuple &tuple);
+
+  /** Unpin the page being written. Must be called before the file is read. */
+  void FinishWrite();
+
+  /** Delete all pages. */
+  void Clear();
+
+  /** @return the number of tuples in the file */
+  auto Size() const -> size_t { return size_; }
+
+  /** @return the number of tuple bytes in the file */
+  auto Bytes() const -> size_t { return bytes_; }
+
+  auto Read() -> Reader { return Reader(this); }
+
+ private:
+  BufferPoolManager *bpm_;
+  std::vector<page_id_t> page_ids_;
+  /** The last page, pinned while the file is being written */
+  TmpTuplePage *write_page_{nullptr};
+  size_t size_{0};
+  size_t bytes_{0};
+};
+
+}  // namespace bustub
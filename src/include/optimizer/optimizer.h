@@ -7,6 +7,7 @@
 #include <utility>
 #include <vector>
 
+#include "binder/table_ref/bound_join_ref.h"
 #include "catalog/catalog.h"
 #include "concurrency/transaction.h"
 #include "execution/expressions/abstract_expression.h"
@@ -26,6 +27,14 @@ class Optimizer {
 
   auto OptimizeCustom(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
+  /**
+   * @brief optimize nested loop join into hash join.
+   * In the starter code, we will check NLJs with exactly one equal condition. You can further support optimizing joins
+   * with multiple eq conditions. An inner join whose predicate has other conjuncts besides its equi-join ones checks
+   * them in a filter on the hash join.
+   */
+  auto OptimizeNLJAsHashJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
  private:
   /**
    * @brief merge projections that do identical project.
@@ -42,24 +51,62 @@ class Optimizer {
   auto OptimizeMergeFilterNLJ(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
   /**
-   * @brief optimize nested loop join into hash join.
-   * In the starter code, we will check NLJs with exactly one equal condition. You can further support optimizing joins
-   * with multiple eq conditions.
+   * @brief make the hash join of `left` and `right` on the given keys. The hash table is built on the right input, so
+   * an inner join whose right input is estimated to have more rows swaps its inputs, and a projection on top restores
+   * the column order of `output`.
    */
-  auto OptimizeNLJAsHashJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+  auto MakeHashJoin(const SchemaRef &output, const AbstractPlanNodeRef &left, const AbstractPlanNodeRef &right,
+                    std::vector<AbstractExpressionRef> left_keys, std::vector<AbstractExpressionRef> right_keys,
+                    JoinType join_type) -> AbstractPlanNodeRef;
+
+  /**
+   * @brief split a join predicate made of `AND`ed column equalities into the left and right join keys.
+   * @return false if the predicate has any other form
+   */
+  auto ExtractEquiJoinKeys(const AbstractExpressionRef &expr, std::vector<AbstractExpressionRef> *left_keys,
+                           std::vector<AbstractExpressionRef> *right_keys) -> bool;
+
+  /**
+   * @brief optimize hash join into sort-merge join when both inputs are already sorted on the join keys, or when the
+   * join output is sorted on the join keys right after the join.
+   */
+  auto OptimizeHashJoinAsSortMergeJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
+  /** @brief check if the output of `plan` is sorted in ascending order on `col_idxs` */
+  auto IsSortedOn(const AbstractPlanNodeRef &plan, const std::vector<uint32_t> &col_idxs) -> bool;
 
   /**
    * @brief optimize nested loop join into index join.
    */
   auto OptimizeNLJAsIndexJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
+  /**
+   * @brief fold constant subexpressions and simplify the predicates and expressions of filters, joins and projections.
+   * Comparisons get their constant on the right, and filters (and inner joins) that never hold are replaced by an empty
+   * VALUES.
+   */
+  auto OptimizeConstantFolding(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
+  /**
+   * @brief fold constants in an expression and short-circuit its AND and OR
+   * @param is_predicate whether the expression is a predicate, where a NULL result rejects a row just as FALSE does
+   */
+  auto FoldExpression(const AbstractExpressionRef &expr, bool is_predicate) -> AbstractExpressionRef;
+
+  /**
+   * @brief push the conjuncts of filters and join predicates down to the lowest plan that has their columns: below
+   * inner joins (and below left joins, for the conjuncts that allow it) and through projections. The equalities of an
+   * inner join are closed transitively first, so that its inputs can be joined (or filtered) on the derived ones.
+   */
+  auto OptimizePredicatePushdown(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
   /**
    * @brief eliminate always true filter
    */
   auto OptimizeEliminateTrueFilter(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
   /**
-   * @brief merge filter into filter_predicate of seq scan plan node
+   * @brief merge filter into filter_predicate of seq scan and mock scan plan nodes
    */
   auto OptimizeMergeFilterScan(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
@@ -83,15 +130,35 @@ class Optimizer {
    */
   auto OptimizeOrderByAsIndexScan(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
+  /**
+   * @brief scan a table through an index when the filter of a seq scan bounds the leading key columns (equalities on a
+   * key prefix and then a range on the next key column) and the estimated rows read through it cost less than a full
+   * scan. The whole filter is still checked on the rows of the index range.
+   */
+  auto OptimizeSeqScanAsIndexScan(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
   /** @brief check if the index can be matched */
   auto MatchIndex(const std::string &table_name, uint32_t index_key_idx)
       -> std::optional<std::tuple<index_oid_t, std::string>>;
 
+  /**
+   * @brief find an index whose leading key columns are exactly `key_idxs`. An index on (a, b, c) matches
+   * `{a}`, `{a, b}` and `{a, b, c}`. Indexes with fewer extra key columns are preferred.
+   */
+  auto MatchIndexPrefix(const std::string &table_name, const std::vector<uint32_t> &key_idxs)
+      -> std::optional<std::tuple<index_oid_t, std::string>>;
+
   /**
    * @brief optimize sort + limit as top N
    */
   auto OptimizeSortLimitAsTopN(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
 
+  /**
+   * @brief push the columns that a query reads down into its scans, so that the scans only produce (and decode) those
+   * columns, and rewrite the column references above the scans to the pruned positions.
+   */
+  auto OptimizeProjectionPushdown(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
   /**
    * @brief get the estimated cardinality for a table based on the table name. Useful when join reordering. BusTub
    * doesn't support statistics for now, so it's the only way for you to get the table size :(
@@ -101,6 +168,39 @@ class Optimizer {
    */
   auto EstimatedCardinality(const std::string &table_name) -> std::optional<size_t>;
 
+  /**
+   * @brief reorder chains of three or more inner joins by estimated cost. The relations are joined left-deep in the
+   * order with the smallest intermediate results, found by dynamic programming (greedily for long chains), and each
+   * conjunct of the join predicates is checked by the first join (or scan) that has its columns. A projection restores
+   * the written column order. The written order is kept unless another one is estimated to be cheaper.
+   */
+  auto OptimizeJoinOrder(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef;
+
+  /**
+   * @brief estimate the number of rows that a plan produces, from the statistics of the tables it reads. Tables that
+   * are not analyzed are assumed to have `EstimatedCardinality` rows (or 1000), and predicates on their columns get
+   * fixed selectivities.
+   */
+  auto EstimateCardinality(const AbstractPlanNodeRef &plan) -> double;
+
+  /**
+   * @brief estimate the fraction of rows for which a predicate holds
+   * @param inputs the plans whose outputs the columns of the predicate read, by tuple index
+   */
+  auto EstimateSelectivity(const AbstractExpressionRef &predicate, const std::vector<AbstractPlanNodeRef> &inputs)
+      -> double;
+
+  /** @brief estimate the number of distinct values of a column expression, or nullopt without statistics */
+  auto EstimateDistinct(const AbstractExpressionRef &expr, const std::vector<AbstractPlanNodeRef> &inputs)
+      -> std::optional<double>;
+
+  /** @brief the table column that an output column of a plan comes from unchanged, if any */
+  auto ResolveColumn(const AbstractPlanNodeRef &plan, uint32_t col_idx)
+      -> std::optional<std::pair<const TableInfo *, uint32_t>>;
+
+  /** @brief the number of rows of a table, from its statistics if it is analyzed */
+  auto EstimateTableRows(const std::string &table_name) -> double;
+
   /** Catalog will be used during the planning process. USERS SHOULD ENSURE IT OUTLIVES
    * OPTIMIZER, otherwise it's a dangling reference.
    */
@@ -1,8 +1,25 @@
 #pragma once
 
+#include <functional>
+#include <vector>
+
+#include "execution/expressions/abstract_expression.h"
+#include "execution/expressions/column_value_expression.h"
+
 namespace bustub {
 
 // Note: You can define your optimizer helper functions here
 void OptimizerHelperFunction();
 
+/** @brief rebuild an expression with each of its column references replaced by `rewrite` of it */
+auto RewriteColumns(const AbstractExpressionRef &expr,
+                    const std::function<AbstractExpressionRef(const ColumnValueExpression &)> &rewrite)
+    -> AbstractExpressionRef;
+
+/** @brief collect the column indexes that an expression reads, whatever their tuple index */
+void CollectColumns(const AbstractExpressionRef &expr, std::vector<uint32_t> *col_idxs);
+
+/** @brief AND predicates together; TRUE if there are none */
+auto CombineConjuncts(const std::vector<AbstractExpressionRef> &conjuncts) -> AbstractExpressionRef;
+
 }  // namespace bustub
@@ -13,6 +13,7 @@
 #include "catalog/column.h"
 #include "common/exception.h"
 #include "common/macros.h"
+#include "execution/expressions/parameter_value_expression.h"
 #include "execution/plans/aggregation_plan.h"
 
 namespace bustub {
@@ -26,6 +27,7 @@ class BoundExpression;
 class BoundTableRef;
 class BoundBinaryOp;
 class BoundConstant;
+class BoundParameter;
 class BoundColumnRef;
 class BoundUnaryOp;
 class BoundBaseTableRef;
@@ -81,6 +83,13 @@ class Planner {
  public:
   explicit Planner(const Catalog &catalog) : catalog_(catalog) {}
 
+  /**
+   * Construct a planner for a prepared statement. Its parameters are planned as expressions that read their values
+   * from `parameter_values`.
+   */
+  Planner(const Catalog &catalog, std::shared_ptr<const ParameterValues> parameter_values)
+      : catalog_(catalog), parameter_values_(std::move(parameter_values)) {}
+
   // The following parts are undocumented. One `PlanXXX` functions simply corresponds to a
   // bound thing in the binder.
 
@@ -128,6 +137,8 @@ class Planner {
   auto PlanConstant(const BoundConstant &expr, const std::vector<AbstractPlanNodeRef> &children)
       -> AbstractExpressionRef;
 
+  auto PlanParameter(const BoundParameter &expr) -> AbstractExpressionRef;
+
   auto PlanSelectAgg(const SelectStatement &statement, AbstractPlanNodeRef child) -> AbstractPlanNodeRef;
 
   auto PlanAggCall(const BoundAggCall &agg_call, const std::vector<AbstractPlanNodeRef> &children)
@@ -182,6 +193,9 @@ class Planner {
    */
   const Catalog &catalog_;
 
+  /** The parameter values of the prepared statement being planned, or nullptr for other statements. */
+  std::shared_ptr<const ParameterValues> parameter_values_;
+
   /** An id for all unnamed things */
   size_t universal_id_{0};
 };
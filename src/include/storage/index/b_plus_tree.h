@@ -12,16 +12,20 @@
 
 #include <algorithm>
 #include <deque>
+#include <functional>
 #include <iostream>
+#include <mutex>  // NOLINT
 #include <optional>
 #include <queue>
 #include <shared_mutex>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "common/config.h"
 #include "common/macros.h"
 #include "concurrency/transaction.h"
+#include "storage/index/b_plus_tree_node_cache.h"
 #include "storage/index/index_iterator.h"
 #include "storage/page/b_plus_tree_header_page.h"
 #include "storage/page/b_plus_tree_internal_page.h"
@@ -56,8 +60,20 @@ class Context {
   auto IsRootPage(page_id_t page_id) -> bool { return page_id == root_page_id_; }
 };
 
+/**
+ * How `BPlusTree::Remove` handles pages that underflow.
+ *
+ * EAGER merges or redistributes as soon as a page drops below its min size.
+ * DEFERRED tolerates underflow down to a lower merge threshold and only records the affected leaves, so a delete
+ * does not need to keep write latches on its ancestors. The recorded leaves are merged later by `CompactDeferred`.
+ */
+enum class DeleteMode { EAGER, DEFERRED };
+
 #define BPLUSTREE_TYPE BPlusTree<KeyType, ValueType, KeyComparator>
 
+// Default upper bound on the number of pages pinned by the node cache of one tree.
+static constexpr size_t NODE_CACHE_DEFAULT_MAX_PAGES = 64;
+
 // Main class providing the API for the Interactive B+ Tree.
 INDEX_TEMPLATE_ARGUMENTS
 class BPlusTree {
@@ -78,6 +94,68 @@ class BPlusTree {
   // Remove a key and its value from this B+ tree.
   void Remove(const KeyType &key, Transaction *txn);
 
+  /**
+   * @brief Choose how deletes handle underflowing pages.
+   *
+   * @param mode eager or deferred merging
+   * @param merge_threshold in DEFERRED mode, a non-root page is only rebalanced by `Remove` once its size drops
+   * below this threshold. With the default of 0, pages are allowed to become empty until the next compaction pass.
+   */
+  void SetDeleteMode(DeleteMode mode, int merge_threshold = 0);
+
+  /**
+   * @brief Merge or redistribute the leaves whose rebalancing was deferred by `Remove`. Meant to be called from a
+   * background thread; each pending leaf is found again and rebalanced like in an eager delete, so the pass can run
+   * concurrently with other operations on the tree.
+   *
+   * @return the number of leaves that were rebalanced
+   */
+  auto CompactDeferred(Transaction *txn = nullptr) -> size_t;
+
+  /**
+   * @brief Keep the internal pages of the top `levels` levels pinned, so that descents resolve them without going
+   * through the buffer pool. The cache is rebuilt lazily after splits and merges of the cached levels. Each pinned
+   * page takes a frame away from the buffer pool for as long as the tree lives. Not safe to call concurrently with
+   * other operations on the tree.
+   *
+   * @param levels number of levels to cache, counting the root as the first one; 0 disables the cache
+   * @param max_pages the cache stops at the first level that would pin more pages than this
+   */
+  void SetNodeCache(int levels, size_t max_pages = NODE_CACHE_DEFAULT_MAX_PAGES);
+
+  /**
+   * @brief Split the key space into at most `k` ranges holding about the same number of leaves, using the separators
+   * of the highest internal level with at least `k` children. The ranges only depend on keys, so they stay valid
+   * while the tree changes; they may just become less balanced.
+   *
+   * @return the boundary keys in ascending order, at most k - 1 of them. Range i covers [bounds[i - 1], bounds[i]),
+   * where the first and the last range are unbounded.
+   */
+  auto PartitionKeys(size_t k) -> std::vector<KeyType>;
+
+  /**
+   * @brief Call `fn` with every entry whose key is in [low, high), in key order. A null bound leaves that side of
+   * the range open. `fn` is called while the leaf is read-latched and must not access the tree.
+   */
+  void ScanRange(const KeyType *low, const KeyType *high,
+                 const std::function<void(const KeyType &, const ValueType &)> &fn);
+
+  /**
+   * @brief Scan the whole tree with up to `k` threads, each scanning one range returned by `PartitionKeys`.
+   * `fn` receives the range number along with each entry and is called concurrently from different threads.
+   *
+   * @return the number of ranges that were scanned
+   */
+  auto ParallelScan(size_t k, const std::function<void(size_t, const KeyType &, const ValueType &)> &fn) -> size_t;
+
+  /**
+   * @brief Build an empty tree bottom-up from entries that are sorted by key and free of duplicates. The leaf level
+   * is split into `threads` contiguous runs that are filled concurrently; the internal levels are built afterwards.
+   *
+   * @return false if the tree is not empty
+   */
+  auto BulkLoad(const std::vector<std::pair<KeyType, ValueType>> &entries, size_t threads = 1) -> bool;
+
   // Return the value associated with a given key
   auto GetValue(const KeyType &key, std::vector<ValueType> *result, Transaction *txn = nullptr) -> bool;
 
@@ -141,6 +219,94 @@ class BPlusTree {
    */
   auto ToPrintableBPlusTree(page_id_t root_id) -> PrintableBPlusTree;
 
+  /**
+   * @brief Check whether a page that has just lost an entry must be rebalanced now. In DEFERRED mode, a non-root
+   * leaf above the merge threshold is recorded for `CompactDeferred` instead.
+   *
+   * @param ctx the context of the delete, whose last write guard is the page
+   * @param key the key that was removed, used to find the page again later
+   */
+  auto NeedRebalance(Context &ctx, const KeyType &key) -> bool;
+
+  /**
+   * @brief Descend again to the leaf covering `key` with write latches and rebalance it if it underflows.
+   * @return true if the leaf was rebalanced
+   */
+  auto RebalanceLeaf(const KeyType &key) -> bool;
+
+  /** @return the index of the child of `page` whose subtree may contain `key` */
+  auto ChildIndex(const InternalPage *page, const KeyType &key) const -> int;
+
+  /** @return the index of the first entry of `page` whose key is not below `key` */
+  auto KeyIndex(const LeafPage *page, const KeyType &key) const -> int;
+
+  /*
+   * B-link tree helpers. Every page carries a right link and a high key: if a page has been split after its parent
+   * was read, a descent moves right until the page covers the key. Splits are published bottom-up once the split page
+   * has been released, and only a root split takes the header page latch.
+   */
+
+  /** @return the level of `page`, counting up from the leaves at level 0 */
+  static auto PageLevel(const BPlusTreePage *page) -> int;
+
+  /** @return the right sibling of `page` on its level, or INVALID_PAGE_ID for the rightmost page */
+  static auto RightLink(const BPlusTreePage *page) -> page_id_t;
+
+  /** @return the exclusive upper bound of the keys of `page`, only meaningful if it has a right link */
+  static auto HighKey(const BPlusTreePage *page) -> KeyType;
+
+  /** @return true if `key` is below the high key of `page`, i.e. the descent does not need to move right */
+  auto CoversKey(const BPlusTreePage *page, const KeyType &key) const -> bool;
+
+  /** Follow right links, latching the right sibling before releasing the current page. */
+  void MoveRight(ReadPageGuard *guard, const KeyType &key);
+  void MoveRight(WritePageGuard *guard, const KeyType &key);
+
+  /** Rebuild the node cache if it is enabled and stale. Must be called without holding any page latch. */
+  void RefreshNodeCache();
+
+  /** Delete a page that is no longer part of the tree, deferring the delete while the node cache may pin it. */
+  void DeleteTreePage(page_id_t page_id, bool is_leaf);
+
+  template <typename Guard>
+  auto FetchGuard(page_id_t page_id) -> Guard;
+
+  /**
+   * Descend to the page at `level` that covers `key`. The pages above it are read-latched hand over hand from the
+   * header page down, going through the node cache for the pinned levels, and the page itself is latched with
+   * `Guard` before its parent is released.
+   * @param[out] root_page_id if not null, the root page id seen by the descent
+   * @return the latched page, or nullopt if the tree is empty or its root is below `level`
+   */
+  template <typename Guard>
+  auto FindPage(const KeyType &key, int level, page_id_t *root_page_id = nullptr) -> std::optional<Guard>;
+
+  /** @return the read-latched leftmost leaf, or nullopt if the tree is empty */
+  auto FindLeftmostLeafRead() -> std::optional<ReadPageGuard>;
+
+  /**
+   * Split a full leaf into a new right sibling, linking it into the leaf chain.
+   * @param[out] separator the first key of the new sibling
+   * @return the page id of the new sibling
+   */
+  auto SplitLeaf(WritePageGuard *leaf_guard, KeyType *separator) -> page_id_t;
+
+  /**
+   * Publish the split of a page at `level` - 1 into `right_page_id` to the page at `level` that covers `separator`,
+   * splitting it and publishing that split in turn if it is full. Called without holding any latch.
+   */
+  void InsertIntoParent(int level, KeyType separator, page_id_t right_page_id);
+
+  /** Put a new root at `level` above the root level, if nobody else has done so yet. */
+  void GrowTree(int level);
+
+  /**
+   * @brief Merge or redistribute the page at the back of `ctx.write_set_` if it underflows, and propagate the merge
+   * upwards. `ctx.write_set_` must hold the write guards of the path to the page (back), starting at the root or at a
+   * page that does not underflow when it loses an entry (front). Siblings are latched from left to right.
+   */
+  void Rebalance(Context &ctx);
+
   // member variable
   std::string index_name_;
   BufferPoolManager *bpm_;
@@ -149,6 +315,15 @@ class BPlusTree {
   int leaf_max_size_;
   int internal_max_size_;
   page_id_t header_page_id_;
+  DeleteMode delete_mode_{DeleteMode::EAGER};
+  int merge_threshold_{0};
+  // Keys of the leaves whose rebalancing has been deferred, protected by `deferred_latch_`.
+  std::mutex deferred_latch_;
+  std::vector<KeyType> deferred_keys_;
+  // Pinned upper levels, used by descents when `node_cache_levels_` > 0.
+  int node_cache_levels_{0};
+  size_t node_cache_max_pages_{NODE_CACHE_DEFAULT_MAX_PAGES};
+  BPlusTreeNodeCache node_cache_;
 };
 
 /**
@@ -11,9 +11,11 @@
 
 #pragma once
 
+#include <functional>
 #include <map>
 #include <memory>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "container/hash/hash_function.h"
@@ -35,6 +37,20 @@ class BPlusTreeIndex : public Index {
 
   void ScanKey(const Tuple &key, std::vector<RID> *result, Transaction *transaction) override;
 
+  /**
+   * Build an empty index from unsorted entries. The entries are sorted with `threads` threads, and then bulk-loaded
+   * into the tree. As with `InsertEntry`, only the first entry of a key is kept.
+   * @return false if the index is not empty
+   */
+  auto BulkLoad(std::vector<std::pair<KeyType, ValueType>> entries, size_t threads, Transaction *transaction) -> bool;
+
+  /** @return the boundary keys splitting the index into at most `k` ranges, see `BPlusTree::PartitionKeys` */
+  auto PartitionKeys(size_t k) -> std::vector<KeyType>;
+
+  /** Call `fn` with every entry in [low, high), see `BPlusTree::ScanRange` */
+  void ScanRange(const KeyType *low, const KeyType *high,
+                 const std::function<void(const KeyType &, const ValueType &)> &fn);
+
   auto GetBeginIterator() -> INDEXITERATOR_TYPE;
 
   auto GetBeginIterator(const KeyType &key) -> INDEXITERATOR_TYPE;
@@ -48,6 +64,9 @@ class BPlusTreeIndex : public Index {
   std::shared_ptr<BPlusTree<KeyType, ValueType, KeyComparator>> container_;
 };
 
+// Minimum number of entries each thread sorts during a bulk load.
+static constexpr size_t BULK_LOAD_MIN_ENTRIES_PER_THREAD = 4096;
+
 /** We only support index table with one integer key for now in BusTub. Hardcode everything here. */
 
 constexpr static const auto TWO_INTEGER_SIZE = 8;
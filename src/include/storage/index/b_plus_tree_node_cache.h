@@ -0,0 +1,137 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// b_plus_tree_node_cache.h
+//
+// Identification: src/include/storage/index/b_plus_tree_node_cache.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <atomic>
+#include <mutex>  // NOLINT
+#include <shared_mutex>
+#include <unordered_map>
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "common/config.h"
+#include "common/macros.h"
+#include "storage/page/page.h"
+
+namespace bustub {
+
+/**
+ * BPlusTreeNodeCache keeps the upper levels of a B+ tree permanently pinned, so that a descent can resolve a child
+ * page id to its frame without going through the buffer pool page table and the buffer pool latch. The cached pages
+ * are still latched as usual while they are read.
+ *
+ * The cache never blocks: readers and rebuilders only try to take the cache latch, and simply bypass the cache when
+ * it is busy. Structural changes of the cached levels mark the cache stale; the next descent rebuilds it.
+ */
+class BPlusTreeNodeCache {
+ public:
+  /**
+   * A shared hold on the cache. Pages found through a reader stay pinned as long as the reader is alive.
+   */
+  class Reader {
+   public:
+    explicit Reader(const BPlusTreeNodeCache *cache) : cache_(cache), lock_(cache->latch_, std::try_to_lock) {}
+
+    /** @return the pinned frame of `page_id`, or nullptr if the page is not cached or the cache is busy */
+    auto Find(page_id_t page_id) const -> Page * {
+      if (!lock_.owns_lock()) {
+        return nullptr;
+      }
+      auto it = cache_->pages_.find(page_id);
+      return it == cache_->pages_.end() ? nullptr : it->second;
+    }
+
+   private:
+    const BPlusTreeNodeCache *cache_;
+    std::shared_lock<std::shared_mutex> lock_;
+  };
+
+  explicit BPlusTreeNodeCache(BufferPoolManager *bpm) : bpm_(bpm) {}
+  ~BPlusTreeNodeCache();
+
+  DISALLOW_COPY_AND_MOVE(BPlusTreeNodeCache);
+
+  auto Read() const -> Reader { return Reader(this); }
+
+  /** Mark the cache stale after a split or merge of a cached level, or after the root has changed. */
+  void Invalidate() { stale_.store(true, std::memory_order_release); }
+
+  auto IsStale() const -> bool { return stale_.load(std::memory_order_acquire); }
+
+  /**
+   * Defer deleting an internal page until it is no longer pinned by the cache. The page is deleted by the next
+   * `Rebuild` or `Clear`.
+   */
+  void Retire(page_id_t page_id);
+
+  /**
+   * Unpin all pages and pin the internal pages of the top `levels` levels instead, starting at the root. Caching stops
+   * at the first level that would exceed `max_pages` pinned pages. Skipped if another thread is using the cache.
+   *
+   * @param next_level called with a pinned, read-latched page; appends the child page ids of an internal page to its
+   * second argument and returns false for a leaf
+   * @return false if the cache was busy and nothing was done
+   */
+  template <typename NextLevel>
+  auto Rebuild(page_id_t root_page_id, int levels, size_t max_pages, NextLevel &&next_level) -> bool {
+    std::unique_lock lock(latch_, std::try_to_lock);
+    if (!lock.owns_lock()) {
+      return false;
+    }
+    ClearLocked();
+    stale_.store(false, std::memory_order_release);
+
+    std::vector<page_id_t> level{root_page_id};
+    for (int depth = 0; depth < levels && !level.empty() && pages_.size() + level.size() <= max_pages; depth++) {
+      std::vector<page_id_t> children;
+      for (const auto page_id : level) {
+        Page *page = bpm_->FetchPage(page_id);
+        if (page == nullptr) {
+          continue;
+        }
+        page->RLatch();
+        const bool is_internal = next_level(page, &children);
+        page->RUnlatch();
+        if (!is_internal) {
+          // Leaves are never cached, and all pages of this level are leaves.
+          bpm_->UnpinPage(page_id, false);
+          return true;
+        }
+        pages_.emplace(page_id, page);
+      }
+      level = std::move(children);
+    }
+    return true;
+  }
+
+  /** Unpin all pages. Must not be called concurrently with descents. */
+  void Clear();
+
+  auto Size() const -> size_t {
+    std::shared_lock lock(latch_);
+    return pages_.size();
+  }
+
+ private:
+  void ClearLocked();
+
+  BufferPoolManager *bpm_;
+  mutable std::shared_mutex latch_;
+  std::atomic<bool> stale_{true};
+  std::unordered_map<page_id_t, Page *> pages_;
+  // Pages removed from the tree while possibly still pinned here, protected by `retired_latch_`.
+  std::mutex retired_latch_;
+  std::vector<page_id_t> retired_;
+};
+
+}  // namespace bustub
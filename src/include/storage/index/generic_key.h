@@ -83,6 +83,13 @@ class GenericComparator {
       Value lhs_value = (lhs.ToValue(key_schema_, i));
       Value rhs_value = (rhs.ToValue(key_schema_, i));
 
+      // NULL sorts before every other value, so that keys holding one still have a place in the order.
+      if (lhs_value.IsNull() || rhs_value.IsNull()) {
+        if (lhs_value.IsNull() && rhs_value.IsNull()) {
+          continue;
+        }
+        return lhs_value.IsNull() ? -1 : 1;
+      }
       if (lhs_value.CompareLessThan(rhs_value) == CmpBool::CmpTrue) {
         return -1;
       }
@@ -0,0 +1,76 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// key_encoder.h
+//
+// Identification: src/include/storage/index/key_encoder.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <algorithm>
+#include <cstring>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include "catalog/schema.h"
+#include "storage/table/tuple.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/**
+ * KeyEncoder turns (composite) keys into memcmp-comparable byte strings, so that comparing two encoded keys
+ * byte-by-byte gives the same result as comparing the original values column-by-column.
+ *
+ * Each column is encoded as a one-byte null marker followed by the payload:
+ * - NULL sorts before every other value and has no payload.
+ * - Integers are stored big-endian with the sign bit flipped.
+ * - Decimals are stored big-endian with the sign bit flipped for positive numbers and all bits flipped otherwise.
+ * - VARCHARs are stored with every 0x00 byte escaped as 0x00 0xFF and terminated by 0x00 0x00, which keeps the
+ *   encoding prefix-free so that composite keys still compare lexicographically.
+ *
+ * A column can also be encoded in descending order, by inverting all bytes of its encoding. Since the encodings are
+ * prefix-free this exactly reverses their order, so sort keys mixing ASC and DESC columns are still memcmp-comparable.
+ */
+class KeyEncoder {
+ public:
+  /** Append the order-preserving (or order-reversing, if `descending`) encoding of a single value to `out`. */
+  static void EncodeValue(const Value &value, std::string *out, bool descending = false);
+
+  /** @return the encoding of the given values, in order */
+  static auto EncodeValues(const std::vector<Value> &values) -> std::string;
+
+  /** @return the encoding of a key tuple laid out according to `key_schema` */
+  static auto EncodeKey(const Tuple &key, const Schema &key_schema) -> std::string;
+
+  /** @return -1, 0 or 1 as `lhs` is less than, equal to or greater than `rhs` */
+  static inline auto Compare(std::string_view lhs, std::string_view rhs) -> int {
+    const auto len = std::min(lhs.size(), rhs.size());
+    const auto res = len == 0 ? 0 : memcmp(lhs.data(), rhs.data(), len);
+    if (res != 0) {
+      return res < 0 ? -1 : 1;
+    }
+    if (lhs.size() == rhs.size()) {
+      return 0;
+    }
+    return lhs.size() < rhs.size() ? -1 : 1;
+  }
+};
+
+/**
+ * Function object comparing two encoded keys, to be used for trees and sorting.
+ */
+class NormalizedKeyComparator {
+ public:
+  inline auto operator()(std::string_view lhs, std::string_view rhs) const -> int {
+    return KeyEncoder::Compare(lhs, rhs);
+  }
+};
+
+}  // namespace bustub
@@ -18,8 +18,8 @@
 namespace bustub {
 
 #define B_PLUS_TREE_INTERNAL_PAGE_TYPE BPlusTreeInternalPage<KeyType, ValueType, KeyComparator>
-#define INTERNAL_PAGE_HEADER_SIZE 12
-#define INTERNAL_PAGE_SIZE ((BUSTUB_PAGE_SIZE - INTERNAL_PAGE_HEADER_SIZE) / (sizeof(MappingType)))
+#define INTERNAL_PAGE_HEADER_SIZE 20
+#define INTERNAL_PAGE_SIZE ((BUSTUB_PAGE_SIZE - INTERNAL_PAGE_HEADER_SIZE - sizeof(KeyType)) / (sizeof(MappingType)))
 /**
  * Store n indexed keys and n+1 child pointers (page_id) within internal page.
  * Pointer PAGE_ID(i) points to a subtree in which all keys K satisfy:
@@ -32,6 +32,17 @@ namespace bustub {
  *  --------------------------------------------------------------------------
  * | HEADER | KEY(1)+PAGE_ID(1) | KEY(2)+PAGE_ID(2) | ... | KEY(n)+PAGE_ID(n) |
  *  --------------------------------------------------------------------------
+ *
+ * Header format (size in byte, 20 bytes + key size in total):
+ *  ----------------------------------------------------------------------------------------
+ * | PageType (4) | CurrentSize (4) | MaxSize (4) | RightPageId (4) | Level (4) | HighKey |
+ *  ----------------------------------------------------------------------------------------
+ *
+ * RightPageId and HighKey make this a B-link tree node: all keys in the subtree
+ * are below the high key, and keys at or above it live in the right sibling.
+ * The rightmost node of a level has no right sibling and is unbounded.
+ * Level counts up from the leaves, which are level 0; a split is published to
+ * the page one level up that covers the new separator.
  */
 INDEX_TEMPLATE_ARGUMENTS
 class BPlusTreeInternalPage : public BPlusTreePage {
@@ -44,8 +55,9 @@ class BPlusTreeInternalPage : public BPlusTreePage {
    * Writes the necessary header information to a newly created page, must be called after
    * the creation of a new page to make a valid BPlusTreeInternalPage
    * @param max_size Maximal size of the page
+   * @param level Level of the page, the parents of leaves are level 1
    */
-  void Init(int max_size = INTERNAL_PAGE_SIZE);
+  void Init(int max_size = INTERNAL_PAGE_SIZE, int level = 1);
 
   /**
    * @param index The index of the key to get. Index must be non-zero.
@@ -73,6 +85,45 @@ class BPlusTreeInternalPage : public BPlusTreePage {
    */
   auto ValueAt(int index) const -> ValueType;
 
+  /**
+   *
+   * @param index the index
+   * @param value the new value (child page id) at the index
+   */
+  void SetValueAt(int index, const ValueType &value);
+
+  /** B-link helpers: right sibling on the same level, and the exclusive upper bound of this subtree. */
+  auto GetRightPageId() const -> page_id_t;
+  void SetRightPageId(page_id_t right_page_id);
+  auto GetHighKey() const -> KeyType;
+  void SetHighKey(const KeyType &key);
+
+  auto GetLevel() const -> int;
+  void SetLevel(int level);
+
+  /** Insert a key and child pointer at `index`, shifting the following entries to the right. */
+  void InsertAt(int index, const KeyType &key, const ValueType &value);
+
+  /**
+   * Split a full page before inserting an entry at `insert_index`: move the upper entries into the new right
+   * sibling `recipient` so that both pages hold half of the entries once the new one is inserted, handing over
+   * the right page id, the high key and the level. The key at index 0 of `recipient` is the separator to push up.
+   */
+  void MoveHalfTo(BPlusTreeInternalPage *recipient, int insert_index);
+
+  /** Remove the key and child pointer at `index`, shifting the following entries to the left. */
+  void RemoveAt(int index);
+
+  /**
+   * Helpers for merging and redistributing sibling internal pages. `middle_key` is the separator
+   * between this page and `recipient` in the parent page; it is pulled down into the moved entries.
+   * `recipient` is the left sibling for `MoveAllTo` / `MoveFirstToEndOf`, and the right sibling
+   * for `MoveLastToFrontOf`.
+   */
+  void MoveAllTo(BPlusTreeInternalPage *recipient, const KeyType &middle_key);
+  void MoveFirstToEndOf(BPlusTreeInternalPage *recipient, const KeyType &middle_key);
+  void MoveLastToFrontOf(BPlusTreeInternalPage *recipient, const KeyType &middle_key);
+
   /**
    * @brief For test only, return a string representing all keys in
    * this internal page, formatted as "(key1,key2,key3,...)"
@@ -100,6 +151,9 @@ class BPlusTreeInternalPage : public BPlusTreePage {
   }
 
  private:
+  page_id_t right_page_id_;
+  int level_;
+  KeyType high_key_;
   // Flexible array member for page data.
   MappingType array_[0];
 };
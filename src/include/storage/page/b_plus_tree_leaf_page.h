@@ -20,7 +20,7 @@ namespace bustub {
 
 #define B_PLUS_TREE_LEAF_PAGE_TYPE BPlusTreeLeafPage<KeyType, ValueType, KeyComparator>
 #define LEAF_PAGE_HEADER_SIZE 16
-#define LEAF_PAGE_SIZE ((BUSTUB_PAGE_SIZE - LEAF_PAGE_HEADER_SIZE) / sizeof(MappingType))
+#define LEAF_PAGE_SIZE ((BUSTUB_PAGE_SIZE - LEAF_PAGE_HEADER_SIZE - sizeof(KeyType)) / sizeof(MappingType))
 
 /**
  * Store indexed key and record id(record id = page id combined with slot id,
@@ -32,13 +32,18 @@ namespace bustub {
  * | HEADER | KEY(1) + RID(1) | KEY(2) + RID(2) | ... | KEY(n) + RID(n)
  *  ----------------------------------------------------------------------
  *
- *  Header format (size in byte, 16 bytes in total):
+ *  Header format (size in byte, 16 bytes + key size in total):
  *  ---------------------------------------------------------------------
  * | PageType (4) | CurrentSize (4) | MaxSize (4) |
  *  ---------------------------------------------------------------------
  *  -----------------------------------------------
- * |  NextPageId (4)
+ * |  NextPageId (4) | HighKey (key size)
  *  -----------------------------------------------
+ *
+ * NextPageId doubles as the B-link right link. HighKey is an exclusive upper
+ * bound on the keys of this page; it is only meaningful when there is a next
+ * page (the rightmost leaf is unbounded). A reader that looks for a key not
+ * below the high key moves right instead of restarting from the root.
  */
 INDEX_TEMPLATE_ARGUMENTS
 class BPlusTreeLeafPage : public BPlusTreePage {
@@ -58,6 +63,31 @@ class BPlusTreeLeafPage : public BPlusTreePage {
   auto GetNextPageId() const -> page_id_t;
   void SetNextPageId(page_id_t next_page_id);
   auto KeyAt(int index) const -> KeyType;
+  auto ValueAt(int index) const -> ValueType;
+
+  /** B-link helpers: the high key bounds the keys of this page from above when there is a next page. */
+  auto GetHighKey() const -> KeyType;
+  void SetHighKey(const KeyType &key);
+
+  /** Insert an entry at `index`, shifting the following entries to the right. */
+  void InsertAt(int index, const KeyType &key, const ValueType &value);
+
+  /**
+   * Move the upper half of the entries into the new right sibling `recipient` when splitting, handing over
+   * the next page id and the high key. The caller links this page to `recipient` and sets its new high key.
+   */
+  void MoveHalfTo(BPlusTreeLeafPage *recipient);
+
+  /** Remove the entry at `index`, shifting the following entries to the left. */
+  void RemoveAt(int index);
+
+  /**
+   * Helpers for merging and redistributing sibling leaves. `recipient` is the left sibling
+   * for `MoveAllTo` / `MoveFirstToEndOf`, and the right sibling for `MoveLastToFrontOf`.
+   */
+  void MoveAllTo(BPlusTreeLeafPage *recipient);
+  void MoveFirstToEndOf(BPlusTreeLeafPage *recipient);
+  void MoveLastToFrontOf(BPlusTreeLeafPage *recipient);
 
   /**
    * @brief for test only return a string representing all keys in
@@ -86,6 +116,7 @@ class BPlusTreeLeafPage : public BPlusTreePage {
 
  private:
   page_id_t next_page_id_;
+  KeyType high_key_;
   // Flexible array member for page data.
   MappingType array_[0];
 };
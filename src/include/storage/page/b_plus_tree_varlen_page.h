@@ -0,0 +1,141 @@
+//===----------------------------------------------------------------------===//
+//
+//                         CMU-DB Project (15-445/645)
+//                         ***DO NO SHARE PUBLICLY***
+//
+// Identification: src/include/page/b_plus_tree_varlen_page.h
+//
+// Copyright (c) 2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+#pragma once
+
+#include <string>
+#include <string_view>
+
+#include "common/config.h"
+#include "storage/page/b_plus_tree_page.h"
+
+namespace bustub {
+
+#define B_PLUS_TREE_VARLEN_PAGE_TYPE BPlusTreeVarlenPage<ValueType>
+#define VARLEN_PAGE_HEADER_SIZE 20
+
+/**
+ * B+ tree page for variable-length keys (VARCHAR and composite keys). Keys are stored in the
+ * memcmp-comparable format produced by `KeyEncoder`, so they are compared lexicographically.
+ * ValueType is RID for leaf pages and page_id_t for internal pages.
+ *
+ * A slot directory grows from the front of the page and the cells (key bytes followed by the value)
+ * grow from the back of the page. Slots are kept in key order; cells are in no particular order.
+ *
+ * Page format:
+ *  ---------------------------------------------------------------------------
+ * | HEADER | SLOT(1) | SLOT(2) | ... | SLOT(n) | FREE SPACE | ... CELLS ...    |
+ *  ---------------------------------------------------------------------------
+ *
+ * Header format (size in byte, 20 bytes in total):
+ *  ---------------------------------------------------------------------------
+ * | PageType (4) | CurrentSize (4) | NextPageId (4) | FreeSpaceEnd (4) | FragmentedBytes (4) |
+ *  ---------------------------------------------------------------------------
+ *
+ * Slot format (size in byte, 4 bytes in total):
+ *  ---------------------------------
+ * | CellOffset (2) | KeyLength (2) |
+ *  ---------------------------------
+ */
+template <typename ValueType>
+class BPlusTreeVarlenPage {
+ public:
+  // Delete all constructor / destructor to ensure memory safety
+  BPlusTreeVarlenPage() = delete;
+  BPlusTreeVarlenPage(const BPlusTreeVarlenPage &other) = delete;
+  ~BPlusTreeVarlenPage() = delete;
+
+  /**
+   * After creating a new page from buffer pool, must call initialize method to set default values
+   * @param page_type leaf or internal page
+   */
+  void Init(IndexPageType page_type);
+
+  auto IsLeafPage() const -> bool { return page_type_ == IndexPageType::LEAF_PAGE; }
+  auto GetSize() const -> int { return size_; }
+
+  auto GetNextPageId() const -> page_id_t { return next_page_id_; }
+  void SetNextPageId(page_id_t next_page_id) { next_page_id_ = next_page_id; }
+
+  /** @return the encoded key stored in slot `index`, valid until the page is modified */
+  auto KeyAt(int index) const -> std::string_view;
+  auto ValueAt(int index) const -> ValueType;
+  void SetValueAt(int index, const ValueType &value);
+
+  /** @return number of bytes that can still be used by new slots and cells, including fragmented space */
+  auto FreeSpace() const -> size_t;
+
+  /** @return true if an entry with a key of `key_size` bytes fits into this page */
+  auto CanInsert(size_t key_size) const -> bool;
+
+  /** @return the index of the first slot whose key is not less than `key` */
+  auto LowerBound(std::string_view key) const -> int;
+
+  /**
+   * Look up the value associated with `key`.
+   * @return true if the key exists
+   */
+  auto Lookup(std::string_view key, ValueType *value) const -> bool;
+
+  /**
+   * Insert a key/value pair, keeping the slots in key order.
+   * @return false if the key already exists or the page is full
+   */
+  auto Insert(std::string_view key, const ValueType &value) -> bool;
+
+  /**
+   * Insert a key/value pair at slot `index` without checking the key order.
+   * @return false if the page is full
+   */
+  auto InsertAt(int index, std::string_view key, const ValueType &value) -> bool;
+
+  /**
+   * Remove the entry associated with `key`.
+   * @return true if the key existed
+   */
+  auto Remove(std::string_view key) -> bool;
+
+  /** Remove the entry at slot `index`. The cell space becomes fragmented until the next `Compact`. */
+  void RemoveAt(int index);
+
+  /** Rewrite the cells contiguously at the end of the page, reclaiming fragmented space. */
+  void Compact();
+
+  /**
+   * Move the upper half of the entries (by bytes used) into `recipient`, which must be empty.
+   * Used when splitting a page.
+   */
+  void MoveHalfTo(BPlusTreeVarlenPage *recipient);
+
+  /** Move all entries to the end of `recipient`. Used when merging two pages. */
+  void MoveAllTo(BPlusTreeVarlenPage *recipient);
+
+ private:
+  struct Slot {
+    uint16_t offset_;
+    uint16_t key_size_;
+  };
+
+  static constexpr size_t SLOT_SIZE = sizeof(Slot);
+
+  auto CellSize(const Slot &slot) const -> size_t { return slot.key_size_ + sizeof(ValueType); }
+  auto PageData() -> char * { return reinterpret_cast<char *>(this); }
+  auto PageData() const -> const char * { return reinterpret_cast<const char *>(this); }
+
+  IndexPageType page_type_;
+  int size_;
+  page_id_t next_page_id_;
+  uint32_t free_space_end_;
+  uint32_t fragmented_bytes_;
+  // Flexible array member for the slot directory.
+  Slot slots_[0];
+};
+
+}  // namespace bustub
@@ -85,6 +85,12 @@ class TablePage {
    */
   auto GetTuple(const RID &rid) const -> std::pair<TupleMeta, Tuple>;
 
+  /**
+   * Look at a tuple in place, without copying it out of the page.
+   * @return the tuple meta, and the serialized tuple, which is valid while the page is latched
+   */
+  auto PeekTuple(const RID &rid) const -> std::pair<TupleMeta, const char *>;
+
   /**
    * Read a tuple meta from a table.
    */
@@ -1,5 +1,7 @@
 #pragma once
 
+#include <cstring>
+
 #include "storage/page/page.h"
 #include "storage/table/tmp_tuple.h"
 #include "storage/table/tuple.h"
@@ -22,15 +24,53 @@ class TmpTuplePage : public Page {
  public:
   void Init(page_id_t page_id, uint32_t page_size) {
     memcpy(GetData(), &page_id, sizeof(page_id_t));
-    memcpy(GetData() + sizeof(page_id_t), &page_size, sizeof(uint32_t));
+    SetLSN(INVALID_LSN);
+    SetFreeSpacePointer(page_size);
   }
 
-  auto GetTablePageId() -> page_id_t { return INVALID_PAGE_ID; }
+  auto GetTablePageId() -> page_id_t { return *reinterpret_cast<page_id_t *>(GetData()); }
+
+  /** @return the offset of the most recently inserted tuple, or the page size if the page is empty */
+  auto GetFreeSpacePointer() -> uint32_t { return *reinterpret_cast<uint32_t *>(GetData() + OFFSET_FREE_SPACE); }
 
-  auto Insert(const Tuple &tuple, TmpTuple *out) -> bool { return false; }
+  auto GetFreeSpaceRemaining() -> uint32_t { return GetFreeSpacePointer() - SIZE_TMP_PAGE_HEADER; }
+
+  /**
+   * Append a tuple to the page.
+   * @param[out] out where the tuple was stored
+   * @return false if the page does not have enough space left
+   */
+  auto Insert(const Tuple &tuple, TmpTuple *out) -> bool {
+    const uint32_t size = sizeof(uint32_t) + tuple.GetLength();
+    if (GetFreeSpaceRemaining() < size) {
+      return false;
+    }
+    const uint32_t offset = GetFreeSpacePointer() - size;
+    tuple.SerializeTo(GetData() + offset);
+    SetFreeSpacePointer(offset);
+    *out = TmpTuple(GetTablePageId(), offset);
+    return true;
+  }
+
+  /**
+   * Read the tuple stored at `offset`. Tuples are read from the free space pointer up to the page size, which visits
+   * them in reverse insertion order.
+   * @return the offset of the tuple inserted before it
+   */
+  auto Get(uint32_t offset, Tuple *tuple) -> uint32_t {
+    tuple->DeserializeFrom(GetData() + offset);
+    return offset + sizeof(uint32_t) + tuple->GetLength();
+  }
 
  private:
   static_assert(sizeof(page_id_t) == 4);
+
+  static constexpr size_t OFFSET_FREE_SPACE = 8;
+  static constexpr size_t SIZE_TMP_PAGE_HEADER = 12;
+
+  void SetFreeSpacePointer(uint32_t free_space_pointer) {
+    memcpy(GetData() + OFFSET_FREE_SPACE, &free_space_pointer, sizeof(uint32_t));
+  }
 };
 
 }  // namespace bustub
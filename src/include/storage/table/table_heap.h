@@ -82,6 +82,9 @@ class TableHeap {
   /** @return the iterator of this table, use this for project 4 except updates */
   auto MakeEagerIterator() -> TableIterator;
 
+  /** @return the RID just past the last tuple currently in the table, where scans that skip new tuples stop */
+  auto GetEndRid() -> RID;
+
   /** @return the id of the first page of this table */
   inline auto GetFirstPageId() const -> page_id_t { return first_page_id_; }
 
@@ -0,0 +1,83 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// tuple_batch.h
+//
+// Identification: src/include/storage/table/tuple_batch.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <vector>
+
+#include "catalog/schema.h"
+#include "common/rid.h"
+#include "storage/table/tuple.h"
+#include "type/value.h"
+
+namespace bustub {
+
+/** The default number of rows executors request per `NextBatch` call. */
+static constexpr size_t BUSTUB_BATCH_SIZE = 1024;
+
+/**
+ * TupleBatch holds a batch of rows in columnar form: one vector of values per column of its schema, plus the RID of
+ * every row. Operators that work on batches read and write whole columns, and only materialize a `Tuple` when a row
+ * leaves the batch world.
+ */
+class TupleBatch {
+ public:
+  TupleBatch() = default;
+
+  /** Create an empty batch with the columns of `schema`. The schema must outlive the batch. */
+  explicit TupleBatch(const Schema *schema) { Reset(schema); }
+
+  /** Drop all rows and switch the batch to the columns of `schema`. */
+  void Reset(const Schema *schema);
+
+  /** Drop all rows, keeping the schema and the allocated capacity. */
+  void Clear();
+
+  auto GetSchema() const -> const Schema & { return *schema_; }
+  auto Size() const -> size_t { return rids_.size(); }
+  auto IsEmpty() const -> bool { return rids_.empty(); }
+  auto ColumnCount() const -> uint32_t { return static_cast<uint32_t>(columns_.size()); }
+
+  auto Column(uint32_t column_idx) const -> const std::vector<Value> & { return columns_[column_idx]; }
+
+  /** Direct access to a column. Writers must keep every column and the RIDs at the same length. */
+  auto ColumnMut(uint32_t column_idx) -> std::vector<Value> & { return columns_[column_idx]; }
+
+  auto ValueAt(size_t row, uint32_t column_idx) const -> const Value & { return columns_[column_idx][row]; }
+  auto GetRID(size_t row) const -> RID { return rids_[row]; }
+  auto RIDs() -> std::vector<RID> & { return rids_; }
+
+  /** Append a row by reading all columns out of `tuple`, which must follow the schema of the batch. */
+  void AppendTuple(const Tuple &tuple, RID rid);
+
+  /** Append a row from one value per column. */
+  void AppendRow(std::vector<Value> values, RID rid);
+
+  /** Append row `row` of `other`, which must have the same number of columns. */
+  void AppendRowFrom(const TupleBatch &other, size_t row);
+
+  /** @return row `row` materialized as a tuple; its RID is available through `GetRID` */
+  auto GetTuple(size_t row) const -> Tuple;
+
+  /** Keep only the rows whose entry in `selection` is true, preserving their order. */
+  void Compact(const std::vector<bool> &selection);
+
+  /** Keep only the first `rows` rows. */
+  void Truncate(size_t rows);
+
+ private:
+  const Schema *schema_{nullptr};
+  std::vector<std::vector<Value>> columns_;
+  std::vector<RID> rids_;
+};
+
+}  // namespace bustub
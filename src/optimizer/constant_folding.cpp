@@ -0,0 +1,208 @@
+#include <memory>
+#include <string>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+#include "catalog/schema.h"
+#include "common/exception.h"
+#include "execution/expressions/arithmetic_expression.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/expressions/logic_expression.h"
+#include "execution/plans/filter_plan.h"
+#include "execution/plans/nested_loop_join_plan.h"
+#include "execution/plans/projection_plan.h"
+#include "execution/plans/values_plan.h"
+#include "optimizer/optimizer.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+auto AsConstant(const AbstractExpressionRef &expr) -> const Value * {
+  if (const auto *const_expr = dynamic_cast<const ConstantValueExpression *>(expr.get()); const_expr != nullptr) {
+    return &const_expr->val_;
+  }
+  return nullptr;
+}
+
+auto MakeBoolean(bool value) -> AbstractExpressionRef {
+  return std::make_shared<ConstantValueExpression>(ValueFactory::GetBooleanValue(value));
+}
+
+auto IsSameColumn(const AbstractExpressionRef &lhs, const AbstractExpressionRef &rhs) -> bool {
+  const auto *lhs_column = dynamic_cast<const ColumnValueExpression *>(lhs.get());
+  const auto *rhs_column = dynamic_cast<const ColumnValueExpression *>(rhs.get());
+  return lhs_column != nullptr && rhs_column != nullptr && lhs_column->GetTupleIdx() == rhs_column->GetTupleIdx() &&
+         lhs_column->GetColIdx() == rhs_column->GetColIdx();
+}
+
+/** Collect the operands of a chain of the same logic operator, e.g. `a`, `b` and `c` of `(a AND b) AND c`. */
+void FlattenLogic(const AbstractExpressionRef &expr, LogicType logic_type,
+                  std::vector<AbstractExpressionRef> *operands) {
+  if (const auto *logic_expr = dynamic_cast<const LogicExpression *>(expr.get());
+      logic_expr != nullptr && logic_expr->logic_type_ == logic_type) {
+    FlattenLogic(logic_expr->GetChildAt(0), logic_type, operands);
+    FlattenLogic(logic_expr->GetChildAt(1), logic_type, operands);
+    return;
+  }
+  operands->push_back(expr);
+}
+
+/**
+ * Simplify `l AND r` or `l OR r`, whose operands are folded. The deciding constant (FALSE for AND, TRUE for OR) decides
+ * the whole chain, the other one is dropped, and so are repeated operands.
+ */
+auto FoldLogic(const LogicExpression &expr, bool is_predicate) -> AbstractExpressionRef {
+  const bool deciding = expr.logic_type_ == LogicType::Or;
+  std::vector<AbstractExpressionRef> operands;
+  FlattenLogic(expr.GetChildAt(0), expr.logic_type_, &operands);
+  FlattenLogic(expr.GetChildAt(1), expr.logic_type_, &operands);
+
+  std::vector<AbstractExpressionRef> kept;
+  std::unordered_set<std::string> seen;
+  for (const auto &operand : operands) {
+    if (const auto *value = AsConstant(operand); value != nullptr) {
+      if (value->IsNull()) {
+        // NULL rejects a row as FALSE does, so it can be dropped from an OR predicate and decides an AND predicate.
+        if (is_predicate) {
+          if (!deciding) {
+            return MakeBoolean(false);
+          }
+          continue;
+        }
+      } else if (value->CastAs(TypeId::BOOLEAN).GetAs<bool>() == deciding) {
+        return MakeBoolean(deciding);
+      } else {
+        continue;
+      }
+    }
+    if (seen.insert(operand->ToString()).second) {
+      kept.push_back(operand);
+    }
+  }
+
+  if (kept.empty()) {
+    return MakeBoolean(!deciding);
+  }
+  auto result = kept[0];
+  for (size_t i = 1; i < kept.size(); i++) {
+    result = std::make_shared<LogicExpression>(result, kept[i], expr.logic_type_);
+  }
+  return result;
+}
+
+}  // namespace
+
+auto Optimizer::FoldExpression(const AbstractExpressionRef &expr, bool is_predicate) -> AbstractExpressionRef {
+  const auto *logic_expr = dynamic_cast<const LogicExpression *>(expr.get());
+  const auto *comparison_expr = dynamic_cast<const ComparisonExpression *>(expr.get());
+  const auto *arithmetic_expr = dynamic_cast<const ArithmeticExpression *>(expr.get());
+
+  // Only the operands of AND and OR are themselves predicates.
+  std::vector<AbstractExpressionRef> children;
+  bool all_constant = true;
+  for (const auto &child : expr->GetChildren()) {
+    children.emplace_back(FoldExpression(child, is_predicate && logic_expr != nullptr));
+    all_constant = all_constant && AsConstant(children.back()) != nullptr;
+  }
+  auto folded = AbstractExpressionRef{expr->CloneWithChildren(std::move(children))};
+
+  if (all_constant && (logic_expr != nullptr || comparison_expr != nullptr || arithmetic_expr != nullptr)) {
+    try {
+      const Schema empty_schema{std::vector<Column>{}};
+      auto value = folded->Evaluate(nullptr, empty_schema);
+      if (is_predicate && value.IsNull()) {
+        return MakeBoolean(false);
+      }
+      return std::make_shared<ConstantValueExpression>(value);
+    } catch (const Exception &) {
+      // Leave the error to be raised if the expression is ever evaluated.
+      return folded;
+    }
+  }
+
+  if (logic_expr != nullptr) {
+    return FoldLogic(dynamic_cast<const LogicExpression &>(*folded), is_predicate);
+  }
+
+  if (comparison_expr != nullptr) {
+    const auto &lhs = folded->GetChildAt(0);
+    const auto &rhs = folded->GetChildAt(1);
+    // `x < x` is FALSE or NULL; `x = x` is kept, as it is NULL rather than TRUE for a NULL x.
+    if (is_predicate && IsSameColumn(lhs, rhs)) {
+      const auto comp_type = comparison_expr->comp_type_;
+      if (comp_type == ComparisonType::NotEqual || comp_type == ComparisonType::LessThan ||
+          comp_type == ComparisonType::GreaterThan) {
+        return MakeBoolean(false);
+      }
+    }
+    // Put the constant on the right, e.g. `col < 3` for `3 > col`.
+    if (AsConstant(lhs) != nullptr && AsConstant(rhs) == nullptr) {
+      return std::make_shared<ComparisonExpression>(rhs, lhs, MirrorComparison(comparison_expr->comp_type_));
+    }
+  }
+
+  return folded;
+}
+
+auto Optimizer::OptimizeConstantFolding(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
+  std::vector<AbstractPlanNodeRef> children;
+  for (const auto &child : plan->GetChildren()) {
+    children.emplace_back(OptimizeConstantFolding(child));
+  }
+  auto optimized_plan = plan->CloneWithChildren(std::move(children));
+
+  auto is_false = [](const AbstractExpressionRef &predicate) {
+    const auto *value = AsConstant(predicate);
+    return value != nullptr && (value->IsNull() || !value->CastAs(TypeId::BOOLEAN).GetAs<bool>());
+  };
+  // A plan that never produces a row is replaced by an empty VALUES.
+  auto empty_plan = [&]() {
+    return std::make_shared<ValuesPlanNode>(optimized_plan->output_schema_,
+                                            std::vector<std::vector<AbstractExpressionRef>>{});
+  };
+
+  if (optimized_plan->GetType() == PlanType::Filter) {
+    const auto &filter_plan = dynamic_cast<const FilterPlanNode &>(*optimized_plan);
+    auto predicate = FoldExpression(filter_plan.GetPredicate(), true);
+    if (is_false(predicate)) {
+      return empty_plan();
+    }
+    if (IsPredicateTrue(predicate)) {
+      return filter_plan.GetChildPlan();
+    }
+    return std::make_shared<FilterPlanNode>(filter_plan.output_schema_, std::move(predicate),
+                                            filter_plan.GetChildPlan());
+  }
+
+  if (optimized_plan->GetType() == PlanType::NestedLoopJoin) {
+    const auto &nlj_plan = dynamic_cast<const NestedLoopJoinPlanNode &>(*optimized_plan);
+    auto predicate = FoldExpression(nlj_plan.Predicate(), true);
+    // A left join still produces every left row when nothing matches.
+    if (nlj_plan.GetJoinType() == JoinType::INNER && is_false(predicate)) {
+      return empty_plan();
+    }
+    return std::make_shared<NestedLoopJoinPlanNode>(nlj_plan.output_schema_, nlj_plan.GetLeftPlan(),
+                                                    nlj_plan.GetRightPlan(), std::move(predicate),
+                                                    nlj_plan.GetJoinType());
+  }
+
+  if (optimized_plan->GetType() == PlanType::Projection) {
+    const auto &projection_plan = dynamic_cast<const ProjectionPlanNode &>(*optimized_plan);
+    std::vector<AbstractExpressionRef> exprs;
+    for (const auto &expr : projection_plan.GetExpressions()) {
+      exprs.emplace_back(FoldExpression(expr, false));
+    }
+    return std::make_shared<ProjectionPlanNode>(projection_plan.output_schema_, std::move(exprs),
+                                                projection_plan.GetChildPlan());
+  }
+
+  return optimized_plan;
+}
+
+}  // namespace bustub
@@ -0,0 +1,297 @@
+#include <algorithm>
+#include <memory>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include "catalog/catalog.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/expressions/logic_expression.h"
+#include "execution/plans/aggregation_plan.h"
+#include "execution/plans/filter_plan.h"
+#include "execution/plans/hash_join_plan.h"
+#include "execution/plans/index_scan_plan.h"
+#include "execution/plans/limit_plan.h"
+#include "execution/plans/mock_scan_plan.h"
+#include "execution/plans/nested_loop_join_plan.h"
+#include "execution/plans/projection_plan.h"
+#include "execution/plans/seq_scan_plan.h"
+#include "execution/plans/sort_merge_join_plan.h"
+#include "execution/plans/topn_plan.h"
+#include "execution/plans/values_plan.h"
+#include "optimizer/optimizer.h"
+
+namespace bustub {
+
+namespace {
+
+/** The number of rows assumed for a table without statistics or a known size */
+constexpr double DEFAULT_TABLE_ROWS = 1000;
+/** The selectivities assumed for predicates on columns without statistics */
+constexpr double DEFAULT_EQUAL_SELECTIVITY = 0.1;
+constexpr double DEFAULT_RANGE_SELECTIVITY = 1.0 / 3;
+constexpr double DEFAULT_SELECTIVITY = 0.5;
+
+auto DefaultSelectivity(ComparisonType comp_type) -> double {
+  switch (comp_type) {
+    case ComparisonType::Equal:
+      return DEFAULT_EQUAL_SELECTIVITY;
+    case ComparisonType::NotEqual:
+      return 1 - DEFAULT_EQUAL_SELECTIVITY;
+    default:
+      return DEFAULT_RANGE_SELECTIVITY;
+  }
+}
+
+auto IsJoin(PlanType type) -> bool {
+  return type == PlanType::NestedLoopJoin || type == PlanType::HashJoin || type == PlanType::SortMergeJoin;
+}
+
+}  // namespace
+
+auto Optimizer::EstimateTableRows(const std::string &table_name) -> double {
+  if (const auto *table_info = catalog_.GetTable(table_name);
+      table_info != Catalog::NULL_TABLE_INFO && table_info->stats_.IsAnalyzed()) {
+    return table_info->stats_.GetRowCount();
+  }
+  if (auto rows = EstimatedCardinality(table_name); rows.has_value()) {
+    return static_cast<double>(*rows);
+  }
+  return DEFAULT_TABLE_ROWS;
+}
+
+auto Optimizer::ResolveColumn(const AbstractPlanNodeRef &plan, uint32_t col_idx)
+    -> std::optional<std::pair<const TableInfo *, uint32_t>> {
+  switch (plan->GetType()) {
+    case PlanType::SeqScan: {
+      const auto &scan_plan = dynamic_cast<const SeqScanPlanNode &>(*plan);
+      const auto *table_info = catalog_.GetTable(scan_plan.GetTableOid());
+      if (table_info == Catalog::NULL_TABLE_INFO) {
+        return std::nullopt;
+      }
+      return std::make_pair(table_info, scan_plan.column_ids_.empty() ? col_idx : scan_plan.column_ids_[col_idx]);
+    }
+    case PlanType::MockScan: {
+      const auto &mock_plan = dynamic_cast<const MockScanPlanNode &>(*plan);
+      const auto *table_info = catalog_.GetTable(mock_plan.GetTable());
+      if (table_info == Catalog::NULL_TABLE_INFO) {
+        return std::nullopt;
+      }
+      const auto &column_ids = mock_plan.GetColumnIds();
+      return std::make_pair(table_info, column_ids.empty() ? col_idx : column_ids[col_idx]);
+    }
+    case PlanType::IndexScan: {
+      const auto *index_info = catalog_.GetIndex(dynamic_cast<const IndexScanPlanNode &>(*plan).GetIndexOid());
+      const auto *table_info = index_info == Catalog::NULL_INDEX_INFO ? Catalog::NULL_TABLE_INFO
+                                                                      : catalog_.GetTable(index_info->table_name_);
+      if (table_info == Catalog::NULL_TABLE_INFO) {
+        return std::nullopt;
+      }
+      return std::make_pair(table_info, col_idx);
+    }
+    case PlanType::Filter:
+    case PlanType::Sort:
+    case PlanType::Limit:
+    case PlanType::TopN:
+      return ResolveColumn(plan->GetChildAt(0), col_idx);
+    case PlanType::Projection: {
+      const auto &expr = dynamic_cast<const ProjectionPlanNode &>(*plan).GetExpressions()[col_idx];
+      if (const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(expr.get()); column_expr != nullptr) {
+        return ResolveColumn(plan->GetChildAt(0), column_expr->GetColIdx());
+      }
+      return std::nullopt;
+    }
+    case PlanType::Aggregation: {
+      const auto &group_bys = dynamic_cast<const AggregationPlanNode &>(*plan).GetGroupBys();
+      if (col_idx >= group_bys.size()) {
+        return std::nullopt;
+      }
+      if (const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(group_bys[col_idx].get());
+          column_expr != nullptr) {
+        return ResolveColumn(plan->GetChildAt(0), column_expr->GetColIdx());
+      }
+      return std::nullopt;
+    }
+    default:
+      break;
+  }
+  if (IsJoin(plan->GetType())) {
+    const auto left_column_cnt = plan->GetChildAt(0)->OutputSchema().GetColumnCount();
+    if (col_idx < left_column_cnt) {
+      return ResolveColumn(plan->GetChildAt(0), col_idx);
+    }
+    return ResolveColumn(plan->GetChildAt(1), col_idx - left_column_cnt);
+  }
+  return std::nullopt;
+}
+
+auto Optimizer::EstimateDistinct(const AbstractExpressionRef &expr, const std::vector<AbstractPlanNodeRef> &inputs)
+    -> std::optional<double> {
+  const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(expr.get());
+  if (column_expr == nullptr || column_expr->GetTupleIdx() >= inputs.size()) {
+    return std::nullopt;
+  }
+  const auto &input = inputs[column_expr->GetTupleIdx()];
+  auto origin = ResolveColumn(input, column_expr->GetColIdx());
+  if (!origin.has_value()) {
+    return std::nullopt;
+  }
+  auto distinct = origin->first->stats_.EstimateDistinct(origin->second);
+  if (!distinct.has_value()) {
+    return std::nullopt;
+  }
+  // Filters below can only remove values.
+  return std::max(std::min(*distinct, EstimateCardinality(input)), 1.0);
+}
+
+auto Optimizer::EstimateSelectivity(const AbstractExpressionRef &predicate,
+                                    const std::vector<AbstractPlanNodeRef> &inputs) -> double {
+  if (const auto *const_expr = dynamic_cast<const ConstantValueExpression *>(predicate.get()); const_expr != nullptr) {
+    return !const_expr->val_.IsNull() && const_expr->val_.CastAs(TypeId::BOOLEAN).GetAs<bool>() ? 1 : 0;
+  }
+
+  if (const auto *logic_expr = dynamic_cast<const LogicExpression *>(predicate.get()); logic_expr != nullptr) {
+    const auto lhs = EstimateSelectivity(logic_expr->GetChildAt(0), inputs);
+    const auto rhs = EstimateSelectivity(logic_expr->GetChildAt(1), inputs);
+    // The operands are assumed to be independent.
+    return logic_expr->logic_type_ == LogicType::And ? lhs * rhs : lhs + rhs - lhs * rhs;
+  }
+
+  const auto *comparison_expr = dynamic_cast<const ComparisonExpression *>(predicate.get());
+  if (comparison_expr == nullptr) {
+    return DEFAULT_SELECTIVITY;
+  }
+  auto comp_type = comparison_expr->comp_type_;
+  auto lhs = comparison_expr->GetChildAt(0);
+  auto rhs = comparison_expr->GetChildAt(1);
+  if (dynamic_cast<const ConstantValueExpression *>(lhs.get()) != nullptr) {
+    std::swap(lhs, rhs);
+    comp_type = MirrorComparison(comp_type);
+  }
+  const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(lhs.get());
+  if (column_expr == nullptr || column_expr->GetTupleIdx() >= inputs.size()) {
+    return DefaultSelectivity(comp_type);
+  }
+
+  // `column op constant`, from the statistics of the column.
+  if (const auto *const_expr = dynamic_cast<const ConstantValueExpression *>(rhs.get()); const_expr != nullptr) {
+    auto origin = ResolveColumn(inputs[column_expr->GetTupleIdx()], column_expr->GetColIdx());
+    if (origin.has_value()) {
+      if (auto selectivity = origin->first->stats_.EstimateSelectivity(origin->second, comp_type, const_expr->val_);
+          selectivity.has_value()) {
+        return *selectivity;
+      }
+    }
+    return DefaultSelectivity(comp_type);
+  }
+
+  // `column = column` (or `column = parameter`) matches a value of the column with more distinct values.
+  if (comp_type != ComparisonType::Equal && comp_type != ComparisonType::NotEqual) {
+    return DefaultSelectivity(comp_type);
+  }
+  auto lhs_distinct = EstimateDistinct(lhs, inputs);
+  auto rhs_distinct = EstimateDistinct(rhs, inputs);
+  double equal = DEFAULT_EQUAL_SELECTIVITY;
+  if (lhs_distinct.has_value() || rhs_distinct.has_value()) {
+    equal = 1 / std::max(lhs_distinct.value_or(1), rhs_distinct.value_or(1));
+  }
+  return comp_type == ComparisonType::Equal ? equal : 1 - equal;
+}
+
+auto Optimizer::EstimateCardinality(const AbstractPlanNodeRef &plan) -> double {
+  switch (plan->GetType()) {
+    case PlanType::SeqScan: {
+      const auto &scan_plan = dynamic_cast<const SeqScanPlanNode &>(*plan);
+      const auto rows = EstimateTableRows(scan_plan.table_name_);
+      return scan_plan.filter_predicate_ == nullptr ? rows
+                                                    : rows * EstimateSelectivity(scan_plan.filter_predicate_, {plan});
+    }
+    case PlanType::MockScan: {
+      const auto &mock_plan = dynamic_cast<const MockScanPlanNode &>(*plan);
+      const auto rows = EstimateTableRows(mock_plan.GetTable());
+      return mock_plan.GetFilterPredicate() == nullptr
+                 ? rows
+                 : rows * EstimateSelectivity(mock_plan.GetFilterPredicate(), {plan});
+    }
+    case PlanType::IndexScan: {
+      const auto &index_scan_plan = dynamic_cast<const IndexScanPlanNode &>(*plan);
+      const auto *index_info = catalog_.GetIndex(index_scan_plan.GetIndexOid());
+      const auto rows =
+          index_info == Catalog::NULL_INDEX_INFO ? DEFAULT_TABLE_ROWS : EstimateTableRows(index_info->table_name_);
+      return index_scan_plan.filter_predicate_ == nullptr
+                 ? rows
+                 : rows * EstimateSelectivity(index_scan_plan.filter_predicate_, {plan});
+    }
+    case PlanType::Values:
+      return static_cast<double>(dynamic_cast<const ValuesPlanNode &>(*plan).GetValues().size());
+    case PlanType::Filter: {
+      const auto &filter_plan = dynamic_cast<const FilterPlanNode &>(*plan);
+      return EstimateCardinality(filter_plan.GetChildPlan()) *
+             EstimateSelectivity(filter_plan.GetPredicate(), {filter_plan.GetChildPlan()});
+    }
+    case PlanType::NestedLoopJoin: {
+      const auto &nlj_plan = dynamic_cast<const NestedLoopJoinPlanNode &>(*plan);
+      const auto left_rows = EstimateCardinality(nlj_plan.GetLeftPlan());
+      const auto rows = left_rows * EstimateCardinality(nlj_plan.GetRightPlan()) *
+                        EstimateSelectivity(nlj_plan.Predicate(), {nlj_plan.GetLeftPlan(), nlj_plan.GetRightPlan()});
+      // A left join produces each left row at least once.
+      return nlj_plan.GetJoinType() == JoinType::LEFT ? std::max(rows, left_rows) : rows;
+    }
+    case PlanType::HashJoin:
+    case PlanType::SortMergeJoin: {
+      const auto &left_plan = plan->GetChildAt(0);
+      const auto &right_plan = plan->GetChildAt(1);
+      std::vector<AbstractExpressionRef> left_keys;
+      std::vector<AbstractExpressionRef> right_keys;
+      JoinType join_type;
+      if (plan->GetType() == PlanType::HashJoin) {
+        const auto &join_plan = dynamic_cast<const HashJoinPlanNode &>(*plan);
+        left_keys = join_plan.LeftJoinKeyExpressions();
+        right_keys = join_plan.RightJoinKeyExpressions();
+        join_type = join_plan.GetJoinType();
+      } else {
+        const auto &join_plan = dynamic_cast<const SortMergeJoinPlanNode &>(*plan);
+        left_keys = join_plan.LeftJoinKeyExpressions();
+        right_keys = join_plan.RightJoinKeyExpressions();
+        join_type = join_plan.GetJoinType();
+      }
+      const auto left_rows = EstimateCardinality(left_plan);
+      auto rows = left_rows * EstimateCardinality(right_plan);
+      for (size_t i = 0; i < left_keys.size(); i++) {
+        // The key expressions are both evaluated with tuple index 0, on their own side.
+        auto lhs_distinct = EstimateDistinct(left_keys[i], {left_plan});
+        auto rhs_distinct = EstimateDistinct(right_keys[i], {right_plan});
+        rows *= lhs_distinct.has_value() || rhs_distinct.has_value()
+                    ? 1 / std::max(lhs_distinct.value_or(1), rhs_distinct.value_or(1))
+                    : DEFAULT_EQUAL_SELECTIVITY;
+      }
+      return join_type == JoinType::LEFT ? std::max(rows, left_rows) : rows;
+    }
+    case PlanType::Aggregation: {
+      const auto &agg_plan = dynamic_cast<const AggregationPlanNode &>(*plan);
+      if (agg_plan.GetGroupBys().empty()) {
+        return 1;
+      }
+      const auto input_rows = EstimateCardinality(agg_plan.GetChildPlan());
+      double groups = 1;
+      for (const auto &group_by : agg_plan.GetGroupBys()) {
+        groups *=
+            EstimateDistinct(group_by, {agg_plan.GetChildPlan()}).value_or(input_rows * DEFAULT_EQUAL_SELECTIVITY);
+      }
+      return std::max(std::min(groups, input_rows), 1.0);
+    }
+    case PlanType::Limit:
+      return std::min(EstimateCardinality(plan->GetChildAt(0)),
+                      static_cast<double>(dynamic_cast<const LimitPlanNode &>(*plan).GetLimit()));
+    case PlanType::TopN:
+      return std::min(EstimateCardinality(plan->GetChildAt(0)),
+                      static_cast<double>(dynamic_cast<const TopNPlanNode &>(*plan).GetN()));
+    default:
+      return plan->GetChildren().empty() ? 1 : EstimateCardinality(plan->GetChildAt(0));
+  }
+}
+
+}  // namespace bustub
@@ -0,0 +1,179 @@
+#include <algorithm>
+#include <memory>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include "binder/bound_order_by.h"
+#include "catalog/catalog.h"
+#include "common/macros.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/plans/abstract_plan.h"
+#include "execution/plans/filter_plan.h"
+#include "execution/plans/hash_join_plan.h"
+#include "execution/plans/index_scan_plan.h"
+#include "execution/plans/projection_plan.h"
+#include "execution/plans/sort_merge_join_plan.h"
+#include "execution/plans/sort_plan.h"
+#include "execution/plans/topn_plan.h"
+#include "optimizer/optimizer.h"
+
+namespace bustub {
+
+namespace {
+
+/** @return the column indexes referenced by `exprs`, or nullopt if any of them is not a plain column reference */
+auto ColumnIdxs(const std::vector<AbstractExpressionRef> &exprs) -> std::optional<std::vector<uint32_t>> {
+  std::vector<uint32_t> col_idxs;
+  for (const auto &expr : exprs) {
+    const auto *column_value_expr = dynamic_cast<const ColumnValueExpression *>(expr.get());
+    if (column_value_expr == nullptr) {
+      return std::nullopt;
+    }
+    col_idxs.push_back(column_value_expr->GetColIdx());
+  }
+  return col_idxs;
+}
+
+/** @return the columns of ascending ORDER BYs, or nullopt if any of them is descending or not a column reference */
+auto AscendingColumnIdxs(const std::vector<std::pair<OrderByType, AbstractExpressionRef>> &order_bys)
+    -> std::optional<std::vector<uint32_t>> {
+  std::vector<AbstractExpressionRef> exprs;
+  for (const auto &[order_type, expr] : order_bys) {
+    if (!(order_type == OrderByType::ASC || order_type == OrderByType::DEFAULT)) {
+      return std::nullopt;
+    }
+    exprs.push_back(expr);
+  }
+  return ColumnIdxs(exprs);
+}
+
+/** @return true if `prefix` is a prefix of `cols` */
+auto IsPrefix(const std::vector<uint32_t> &prefix, const std::vector<uint32_t> &cols) -> bool {
+  return prefix.size() <= cols.size() && std::equal(prefix.begin(), prefix.end(), cols.begin());
+}
+
+/** @return a sort of `plan` in ascending order of `keys`, which are column references of its output */
+auto SortOnKeys(const AbstractPlanNodeRef &plan, const std::vector<AbstractExpressionRef> &keys)
+    -> AbstractPlanNodeRef {
+  std::vector<std::pair<OrderByType, AbstractExpressionRef>> order_bys;
+  for (const auto &key : keys) {
+    const auto &column_value_expr = dynamic_cast<const ColumnValueExpression &>(*key);
+    order_bys.emplace_back(OrderByType::ASC, std::make_shared<ColumnValueExpression>(
+                                                 0, column_value_expr.GetColIdx(), column_value_expr.GetReturnType()));
+  }
+  return std::make_shared<SortPlanNode>(plan->output_schema_, plan, std::move(order_bys));
+}
+
+}  // namespace
+
+auto Optimizer::IsSortedOn(const AbstractPlanNodeRef &plan, const std::vector<uint32_t> &col_idxs) -> bool {
+  switch (plan->GetType()) {
+    case PlanType::Sort: {
+      auto sorted_cols = AscendingColumnIdxs(dynamic_cast<const SortPlanNode &>(*plan).GetOrderBy());
+      return sorted_cols.has_value() && IsPrefix(col_idxs, *sorted_cols);
+    }
+    case PlanType::TopN: {
+      auto sorted_cols = AscendingColumnIdxs(dynamic_cast<const TopNPlanNode &>(*plan).GetOrderBy());
+      return sorted_cols.has_value() && IsPrefix(col_idxs, *sorted_cols);
+    }
+    case PlanType::IndexScan: {
+      // An index scan emits the table rows in the order of the index keys.
+      const auto *index_info = catalog_.GetIndex(dynamic_cast<const IndexScanPlanNode &>(*plan).GetIndexOid());
+      return index_info != Catalog::NULL_INDEX_INFO && IsPrefix(col_idxs, index_info->index_->GetKeyAttrs());
+    }
+    case PlanType::Filter:
+      return IsSortedOn(plan->GetChildAt(0), col_idxs);
+    case PlanType::SortMergeJoin: {
+      // The left columns come first in the join output, so their indexes are unchanged.
+      auto sorted_cols = ColumnIdxs(dynamic_cast<const SortMergeJoinPlanNode &>(*plan).LeftJoinKeyExpressions());
+      return sorted_cols.has_value() && IsPrefix(col_idxs, *sorted_cols);
+    }
+    default:
+      return false;
+  }
+}
+
+auto Optimizer::OptimizeHashJoinAsSortMergeJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
+  std::vector<AbstractPlanNodeRef> children;
+  for (const auto &child : plan->GetChildren()) {
+    children.emplace_back(OptimizeHashJoinAsSortMergeJoin(child));
+  }
+  auto optimized_plan = plan->CloneWithChildren(std::move(children));
+
+  if (optimized_plan->GetType() == PlanType::HashJoin) {
+    // Both inputs are already sorted on the join keys: merging them saves building the hash table.
+    const auto &hash_join_plan = dynamic_cast<const HashJoinPlanNode &>(*optimized_plan);
+    auto left_cols = ColumnIdxs(hash_join_plan.LeftJoinKeyExpressions());
+    auto right_cols = ColumnIdxs(hash_join_plan.RightJoinKeyExpressions());
+    if (left_cols.has_value() && right_cols.has_value() && IsSortedOn(hash_join_plan.GetLeftPlan(), *left_cols) &&
+        IsSortedOn(hash_join_plan.GetRightPlan(), *right_cols)) {
+      return std::make_shared<SortMergeJoinPlanNode>(
+          hash_join_plan.output_schema_, hash_join_plan.GetLeftPlan(), hash_join_plan.GetRightPlan(),
+          hash_join_plan.LeftJoinKeyExpressions(), hash_join_plan.RightJoinKeyExpressions(),
+          hash_join_plan.GetJoinType());
+    }
+  }
+
+  if (optimized_plan->GetType() == PlanType::Sort) {
+    // The join output is sorted on its keys anyway: sort the inputs instead and merge them, which keeps the order.
+    const auto &sort_plan = dynamic_cast<const SortPlanNode &>(*optimized_plan);
+    auto sort_cols = AscendingColumnIdxs(sort_plan.GetOrderBy());
+    if (!sort_cols.has_value()) {
+      return optimized_plan;
+    }
+    // The planner usually puts a projection between the sort and the join; see through it if it only picks columns.
+    AbstractPlanNodeRef projection_plan = nullptr;
+    auto join_plan = sort_plan.GetChildPlan();
+    if (join_plan->GetType() == PlanType::Projection) {
+      auto projected_cols = ColumnIdxs(dynamic_cast<const ProjectionPlanNode &>(*join_plan).GetExpressions());
+      if (!projected_cols.has_value()) {
+        return optimized_plan;
+      }
+      for (auto &col_idx : *sort_cols) {
+        col_idx = (*projected_cols)[col_idx];
+      }
+      projection_plan = join_plan;
+      join_plan = join_plan->GetChildAt(0);
+    }
+    if (join_plan->GetType() != PlanType::HashJoin) {
+      return optimized_plan;
+    }
+    const auto &hash_join_plan = dynamic_cast<const HashJoinPlanNode &>(*join_plan);
+    auto left_cols = ColumnIdxs(hash_join_plan.LeftJoinKeyExpressions());
+    auto right_cols = ColumnIdxs(hash_join_plan.RightJoinKeyExpressions());
+    if (!left_cols.has_value() || !right_cols.has_value()) {
+      return optimized_plan;
+    }
+    // In an inner join the right keys equal the left keys, so ordering on either of them works.
+    const auto left_column_cnt = hash_join_plan.GetLeftPlan()->OutputSchema().GetColumnCount();
+    std::vector<uint32_t> right_output_cols;
+    for (const auto col_idx : *right_cols) {
+      right_output_cols.push_back(left_column_cnt + col_idx);
+    }
+    if (!IsPrefix(*sort_cols, *left_cols) &&
+        !(hash_join_plan.GetJoinType() == JoinType::INNER && IsPrefix(*sort_cols, right_output_cols))) {
+      return optimized_plan;
+    }
+
+    auto left = hash_join_plan.GetLeftPlan();
+    if (!IsSortedOn(left, *left_cols)) {
+      left = SortOnKeys(left, hash_join_plan.LeftJoinKeyExpressions());
+    }
+    auto right = hash_join_plan.GetRightPlan();
+    if (!IsSortedOn(right, *right_cols)) {
+      right = SortOnKeys(right, hash_join_plan.RightJoinKeyExpressions());
+    }
+    AbstractPlanNodeRef merge_join_plan = std::make_shared<SortMergeJoinPlanNode>(
+        hash_join_plan.output_schema_, std::move(left), std::move(right), hash_join_plan.LeftJoinKeyExpressions(),
+        hash_join_plan.RightJoinKeyExpressions(), hash_join_plan.GetJoinType());
+    if (projection_plan != nullptr) {
+      return projection_plan->CloneWithChildren({std::move(merge_join_plan)});
+    }
+    return merge_join_plan;
+  }
+
+  return optimized_plan;
+}
+
+}  // namespace bustub
@@ -0,0 +1,339 @@
+#include <algorithm>
+#include <cstdint>
+#include <memory>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include "catalog/schema.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/plans/filter_plan.h"
+#include "execution/plans/nested_loop_join_plan.h"
+#include "execution/plans/projection_plan.h"
+#include "optimizer/optimizer.h"
+#include "optimizer/optimizer_internal.h"
+
+namespace bustub {
+
+namespace {
+
+/** Above this many relations, the join order is chosen greedily rather than by dynamic programming. */
+constexpr size_t MAX_DP_RELATIONS = 10;
+/** Masks of relations are 64-bit. */
+constexpr size_t MAX_RELATIONS = 64;
+
+using RelationMask = uint64_t;
+
+/** An input of a chain of inner joins, and where its columns start in the output of the chain. */
+struct JoinRelation {
+  AbstractPlanNodeRef plan_;
+  uint32_t offset_;
+  double cardinality_;
+};
+
+/** A conjunct of the join predicates, on the output of the whole chain, and the relations it reads. */
+struct JoinConjunct {
+  AbstractExpressionRef expr_;
+  RelationMask mask_;
+  double selectivity_;
+};
+
+auto IsInnerJoin(const AbstractPlanNodeRef &plan) -> bool {
+  return plan->GetType() == PlanType::NestedLoopJoin &&
+         dynamic_cast<const NestedLoopJoinPlanNode &>(*plan).GetJoinType() == JoinType::INNER;
+}
+
+/**
+ * Flatten a tree of inner nested loop joins (and filters on them) into its relations and the conjuncts of its
+ * predicates, rewritten to read the output of the whole tree, which starts at `offset`.
+ */
+void FlattenJoins(const AbstractPlanNodeRef &plan, uint32_t offset, std::vector<JoinRelation> *relations,
+                  std::vector<AbstractExpressionRef> *conjuncts) {
+  std::vector<AbstractExpressionRef> predicates;
+  if (plan->GetType() == PlanType::Filter && IsInnerJoin(plan->GetChildAt(0))) {
+    FlattenJoins(plan->GetChildAt(0), offset, relations, conjuncts);
+    SplitConjuncts(dynamic_cast<const FilterPlanNode &>(*plan).GetPredicate(), &predicates);
+    for (const auto &predicate : predicates) {
+      conjuncts->push_back(RewriteColumns(predicate, [&](const ColumnValueExpression &column_expr) {
+        return std::make_shared<ColumnValueExpression>(0, column_expr.GetColIdx() + offset,
+                                                       column_expr.GetReturnType());
+      }));
+    }
+    return;
+  }
+  if (!IsInnerJoin(plan)) {
+    relations->push_back({plan, offset, 0});
+    return;
+  }
+  const auto &nlj_plan = dynamic_cast<const NestedLoopJoinPlanNode &>(*plan);
+  const auto right_offset = offset + nlj_plan.GetLeftPlan()->OutputSchema().GetColumnCount();
+  FlattenJoins(nlj_plan.GetLeftPlan(), offset, relations, conjuncts);
+  FlattenJoins(nlj_plan.GetRightPlan(), right_offset, relations, conjuncts);
+  SplitConjuncts(nlj_plan.Predicate(), &predicates);
+  for (const auto &predicate : predicates) {
+    conjuncts->push_back(RewriteColumns(predicate, [&](const ColumnValueExpression &column_expr) {
+      return std::make_shared<ColumnValueExpression>(
+          0, column_expr.GetColIdx() + (column_expr.GetTupleIdx() == 0 ? offset : right_offset),
+          column_expr.GetReturnType());
+    }));
+  }
+}
+
+/** Rebuild a tree flattened by `FlattenJoins` with its relations replaced, in the same order. */
+auto ReplaceRelations(const AbstractPlanNodeRef &plan, const std::vector<AbstractPlanNodeRef> &relation_plans,
+                      size_t *next) -> AbstractPlanNodeRef {
+  if ((plan->GetType() == PlanType::Filter && IsInnerJoin(plan->GetChildAt(0))) || IsInnerJoin(plan)) {
+    std::vector<AbstractPlanNodeRef> children;
+    for (const auto &child : plan->GetChildren()) {
+      children.emplace_back(ReplaceRelations(child, relation_plans, next));
+    }
+    return plan->CloneWithChildren(std::move(children));
+  }
+  return relation_plans[(*next)++];
+}
+
+/** The order of the relations to join left-deep, and its estimated cost. */
+struct JoinOrder {
+  std::vector<size_t> relations_;
+  double cardinality_;
+  double cost_;
+};
+
+class JoinOrderSearch {
+ public:
+  JoinOrderSearch(const std::vector<JoinRelation> &relations, const std::vector<JoinConjunct> &conjuncts)
+      : relations_(relations), conjuncts_(conjuncts) {}
+
+  /** @return the order with the lowest cost; cross products are avoided while a connected relation remains */
+  auto Search() const -> JoinOrder { return relations_.size() <= MAX_DP_RELATIONS ? SearchDP() : SearchGreedy(); }
+
+  /** @return the order of the relations as they were written */
+  auto WrittenOrder() const -> JoinOrder {
+    JoinOrder order{{0}, relations_[0].cardinality_, relations_[0].cardinality_};
+    for (size_t i = 1; i < relations_.size(); i++) {
+      order = Extend(order, Mask(order), i);
+    }
+    return order;
+  }
+
+ private:
+  static auto Mask(const JoinOrder &order) -> RelationMask {
+    RelationMask mask = 0;
+    for (const auto idx : order.relations_) {
+      mask |= RelationMask{1} << idx;
+    }
+    return mask;
+  }
+
+  /** @return whether a conjunct connects relation `idx` to the joined ones */
+  auto IsConnected(RelationMask joined, size_t idx) const -> bool {
+    const RelationMask bit = RelationMask{1} << idx;
+    return std::any_of(conjuncts_.begin(), conjuncts_.end(), [&](const JoinConjunct &conjunct) {
+      return (conjunct.mask_ & bit) != 0 && (conjunct.mask_ & joined) != 0;
+    });
+  }
+
+  /** @return the relations that can be joined next */
+  auto Candidates(RelationMask joined) const -> std::vector<size_t> {
+    std::vector<size_t> connected;
+    std::vector<size_t> all;
+    for (size_t idx = 0; idx < relations_.size(); idx++) {
+      if ((joined & (RelationMask{1} << idx)) == 0) {
+        all.push_back(idx);
+        if (IsConnected(joined, idx)) {
+          connected.push_back(idx);
+        }
+      }
+    }
+    return connected.empty() ? all : connected;
+  }
+
+  /**
+   * Join relation `idx` to an order. The cost counts the rows that each join reads and produces, so that small
+   * intermediate results are preferred.
+   */
+  auto Extend(const JoinOrder &order, RelationMask joined, size_t idx) const -> JoinOrder {
+    const RelationMask bit = RelationMask{1} << idx;
+    double cardinality = order.cardinality_ * relations_[idx].cardinality_;
+    for (const auto &conjunct : conjuncts_) {
+      if ((conjunct.mask_ & bit) != 0 && (conjunct.mask_ & ~(joined | bit)) == 0) {
+        cardinality *= conjunct.selectivity_;
+      }
+    }
+    JoinOrder extended{order.relations_, cardinality, order.cost_ + relations_[idx].cardinality_ + cardinality};
+    extended.relations_.push_back(idx);
+    return extended;
+  }
+
+  auto SearchDP() const -> JoinOrder {
+    const auto n = relations_.size();
+    std::vector<std::optional<JoinOrder>> best(size_t{1} << n);
+    for (size_t idx = 0; idx < n; idx++) {
+      best[size_t{1} << idx] = JoinOrder{{idx}, relations_[idx].cardinality_, relations_[idx].cardinality_};
+    }
+    // Every proper subset of a set is a smaller number, so the subsets are complete when a set is extended.
+    for (size_t joined = 1; joined < best.size(); joined++) {
+      if (!best[joined].has_value()) {
+        continue;
+      }
+      for (const auto idx : Candidates(joined)) {
+        auto extended = Extend(*best[joined], joined, idx);
+        auto &slot = best[joined | (size_t{1} << idx)];
+        if (!slot.has_value() || extended.cost_ < slot->cost_) {
+          slot = std::move(extended);
+        }
+      }
+    }
+    return *best.back();
+  }
+
+  auto SearchGreedy() const -> JoinOrder {
+    // Start from the smallest relation and join the one that keeps the result smallest.
+    size_t first = 0;
+    for (size_t idx = 1; idx < relations_.size(); idx++) {
+      if (relations_[idx].cardinality_ < relations_[first].cardinality_) {
+        first = idx;
+      }
+    }
+    JoinOrder order{{first}, relations_[first].cardinality_, relations_[first].cardinality_};
+    while (order.relations_.size() < relations_.size()) {
+      const auto joined = Mask(order);
+      std::optional<JoinOrder> next;
+      for (const auto idx : Candidates(joined)) {
+        auto extended = Extend(order, joined, idx);
+        if (!next.has_value() || extended.cardinality_ < next->cardinality_) {
+          next = std::move(extended);
+        }
+      }
+      order = std::move(*next);
+    }
+    return order;
+  }
+
+  const std::vector<JoinRelation> &relations_;
+  const std::vector<JoinConjunct> &conjuncts_;
+};
+
+}  // namespace
+
+auto Optimizer::OptimizeJoinOrder(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
+  const bool is_join_root =
+      IsInnerJoin(plan) || (plan->GetType() == PlanType::Filter && IsInnerJoin(plan->GetChildAt(0)));
+  std::vector<JoinRelation> relations;
+  std::vector<AbstractExpressionRef> predicates;
+  if (is_join_root) {
+    FlattenJoins(plan, 0, &relations, &predicates);
+  }
+  if (relations.size() < 3 || relations.size() > MAX_RELATIONS) {
+    std::vector<AbstractPlanNodeRef> children;
+    for (const auto &child : plan->GetChildren()) {
+      children.emplace_back(OptimizeJoinOrder(child));
+    }
+    return plan->CloneWithChildren(std::move(children));
+  }
+
+  const auto &join_plan = plan->GetType() == PlanType::Filter ? plan->GetChildAt(0) : plan;
+  std::vector<AbstractPlanNodeRef> relation_plans;
+  std::vector<RelationMask> relation_of_column;
+  for (size_t idx = 0; idx < relations.size(); idx++) {
+    relations[idx].plan_ = OptimizeJoinOrder(relations[idx].plan_);
+    relation_plans.push_back(relations[idx].plan_);
+    relation_of_column.resize(relation_of_column.size() + relations[idx].plan_->OutputSchema().GetColumnCount(),
+                              RelationMask{1} << idx);
+  }
+
+  // Conjuncts on a single relation filter it before the joins; those on none are checked once, on top.
+  std::vector<std::vector<AbstractExpressionRef>> relation_filters(relations.size());
+  std::vector<AbstractExpressionRef> top_filters;
+  std::vector<JoinConjunct> conjuncts;
+  for (const auto &predicate : predicates) {
+    std::vector<uint32_t> col_idxs;
+    CollectColumns(predicate, &col_idxs);
+    RelationMask mask = 0;
+    for (const auto col_idx : col_idxs) {
+      mask |= relation_of_column[col_idx];
+    }
+    if (mask == 0) {
+      top_filters.push_back(predicate);
+    } else if ((mask & (mask - 1)) == 0) {
+      const auto idx = __builtin_ctzll(mask);
+      const auto offset = relations[idx].offset_;
+      relation_filters[idx].push_back(RewriteColumns(predicate, [&](const ColumnValueExpression &column_expr) {
+        return std::make_shared<ColumnValueExpression>(0, column_expr.GetColIdx() - offset,
+                                                       column_expr.GetReturnType());
+      }));
+    } else {
+      conjuncts.push_back({predicate, mask, EstimateSelectivity(predicate, {join_plan})});
+    }
+  }
+  for (size_t idx = 0; idx < relations.size(); idx++) {
+    auto &relation = relations[idx];
+    if (!relation_filters[idx].empty()) {
+      relation.plan_ = std::make_shared<FilterPlanNode>(relation.plan_->output_schema_,
+                                                        CombineConjuncts(relation_filters[idx]), relation.plan_);
+    }
+    relation.cardinality_ = EstimateCardinality(relation.plan_);
+  }
+
+  // Keep the written order unless another one is estimated to be cheaper.
+  const JoinOrderSearch search{relations, conjuncts};
+  const auto order = search.Search();
+  if (order.cost_ >= search.WrittenOrder().cost_) {
+    size_t next = 0;
+    return ReplaceRelations(plan, relation_plans, &next);
+  }
+
+  // Build the left-deep tree; `positions` maps the columns of the written tree to those of the one built so far.
+  const auto column_cnt = relation_of_column.size();
+  std::vector<uint32_t> positions(column_cnt);
+  auto place = [&](size_t idx, uint32_t start) {
+    const auto &relation = relations[idx];
+    for (uint32_t i = 0; i < relation.plan_->OutputSchema().GetColumnCount(); i++) {
+      positions[relation.offset_ + i] = start + i;
+    }
+  };
+  auto joined_plan = relations[order.relations_[0]].plan_;
+  RelationMask joined = RelationMask{1} << order.relations_[0];
+  place(order.relations_[0], 0);
+  for (size_t i = 1; i < order.relations_.size(); i++) {
+    const auto idx = order.relations_[i];
+    const auto &right_plan = relations[idx].plan_;
+    const RelationMask bit = RelationMask{1} << idx;
+    std::vector<AbstractExpressionRef> join_predicates;
+    for (const auto &conjunct : conjuncts) {
+      if ((conjunct.mask_ & bit) == 0 || (conjunct.mask_ & ~(joined | bit)) != 0) {
+        continue;
+      }
+      join_predicates.push_back(RewriteColumns(conjunct.expr_, [&](const ColumnValueExpression &column_expr) {
+        const auto col_idx = column_expr.GetColIdx();
+        if ((relation_of_column[col_idx] & bit) != 0) {
+          return std::make_shared<ColumnValueExpression>(1, col_idx - relations[idx].offset_,
+                                                         column_expr.GetReturnType());
+        }
+        return std::make_shared<ColumnValueExpression>(0, positions[col_idx], column_expr.GetReturnType());
+      }));
+    }
+    const auto left_column_cnt = joined_plan->OutputSchema().GetColumnCount();
+    auto schema = std::make_shared<Schema>(NestedLoopJoinPlanNode::InferJoinSchema(*joined_plan, *right_plan));
+    joined_plan = std::make_shared<NestedLoopJoinPlanNode>(std::move(schema), joined_plan, right_plan,
+                                                           CombineConjuncts(join_predicates), JoinType::INNER);
+    joined |= bit;
+    place(idx, left_column_cnt);
+  }
+
+  // Restore the columns to the written order.
+  std::vector<AbstractExpressionRef> exprs;
+  for (uint32_t col_idx = 0; col_idx < column_cnt; col_idx++) {
+    exprs.emplace_back(std::make_shared<ColumnValueExpression>(0, positions[col_idx],
+                                                               plan->OutputSchema().GetColumn(col_idx).GetType()));
+  }
+  AbstractPlanNodeRef result =
+      std::make_shared<ProjectionPlanNode>(plan->output_schema_, std::move(exprs), joined_plan);
+  if (!top_filters.empty()) {
+    result = std::make_shared<FilterPlanNode>(plan->output_schema_, CombineConjuncts(top_filters), result);
+  }
+  return result;
+}
+
+}  // namespace bustub
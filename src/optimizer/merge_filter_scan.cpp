@@ -1,7 +1,9 @@
 #include <memory>
 #include <vector>
+#include "execution/expressions/logic_expression.h"
 #include "execution/plans/filter_plan.h"
 #include "execution/plans/limit_plan.h"
+#include "execution/plans/mock_scan_plan.h"
 #include "execution/plans/seq_scan_plan.h"
 #include "execution/plans/sort_plan.h"
 #include "execution/plans/topn_plan.h"
@@ -22,12 +24,24 @@ auto Optimizer::OptimizeMergeFilterScan(const AbstractPlanNodeRef &plan) -> Abst
     const auto &filter_plan = dynamic_cast<const FilterPlanNode &>(*optimized_plan);
     BUSTUB_ASSERT(optimized_plan->children_.size() == 1, "must have exactly one children");
     const auto &child_plan = *optimized_plan->children_[0];
+    // The filter and the scan have the same output, so the predicates of both can be ANDed together.
+    auto merge_predicate = [&](const AbstractExpressionRef &scan_predicate) -> AbstractExpressionRef {
+      if (scan_predicate == nullptr) {
+        return filter_plan.GetPredicate();
+      }
+      return std::make_shared<LogicExpression>(scan_predicate, filter_plan.GetPredicate(), LogicType::And);
+    };
     if (child_plan.GetType() == PlanType::SeqScan) {
       const auto &seq_scan_plan = dynamic_cast<const SeqScanPlanNode &>(child_plan);
-      if (seq_scan_plan.filter_predicate_ == nullptr) {
-        return std::make_shared<SeqScanPlanNode>(filter_plan.output_schema_, seq_scan_plan.table_oid_,
-                                                 seq_scan_plan.table_name_, filter_plan.GetPredicate());
-      }
+      return std::make_shared<SeqScanPlanNode>(
+          filter_plan.output_schema_, seq_scan_plan.table_oid_, seq_scan_plan.table_name_,
+          merge_predicate(seq_scan_plan.filter_predicate_), seq_scan_plan.column_ids_);
+    }
+    if (child_plan.GetType() == PlanType::MockScan) {
+      const auto &mock_scan_plan = dynamic_cast<const MockScanPlanNode &>(child_plan);
+      return std::make_shared<MockScanPlanNode>(filter_plan.output_schema_, mock_scan_plan.GetTable(),
+                                                merge_predicate(mock_scan_plan.GetFilterPredicate()),
+                                                mock_scan_plan.GetColumnIds());
     }
   }
 
@@ -7,22 +7,123 @@
 #include "execution/expressions/column_value_expression.h"
 #include "execution/expressions/comparison_expression.h"
 #include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/expressions/logic_expression.h"
 #include "execution/plans/abstract_plan.h"
 #include "execution/plans/filter_plan.h"
 #include "execution/plans/hash_join_plan.h"
 #include "execution/plans/nested_loop_join_plan.h"
 #include "execution/plans/projection_plan.h"
 #include "optimizer/optimizer.h"
+#include "optimizer/optimizer_internal.h"
 #include "type/type_id.h"
 
 namespace bustub {
 
+auto Optimizer::ExtractEquiJoinKeys(const AbstractExpressionRef &expr, std::vector<AbstractExpressionRef> *left_keys,
+                                    std::vector<AbstractExpressionRef> *right_keys) -> bool {
+  if (const auto *logic_expr = dynamic_cast<const LogicExpression *>(expr.get()); logic_expr != nullptr) {
+    return logic_expr->logic_type_ == LogicType::And &&
+           ExtractEquiJoinKeys(logic_expr->GetChildAt(0), left_keys, right_keys) &&
+           ExtractEquiJoinKeys(logic_expr->GetChildAt(1), left_keys, right_keys);
+  }
+  const auto *cmp_expr = dynamic_cast<const ComparisonExpression *>(expr.get());
+  if (cmp_expr == nullptr || cmp_expr->comp_type_ != ComparisonType::Equal) {
+    return false;
+  }
+  const auto *lhs = dynamic_cast<const ColumnValueExpression *>(cmp_expr->GetChildAt(0).get());
+  const auto *rhs = dynamic_cast<const ColumnValueExpression *>(cmp_expr->GetChildAt(1).get());
+  if (lhs == nullptr || rhs == nullptr || lhs->GetTupleIdx() == rhs->GetTupleIdx()) {
+    return false;
+  }
+  if (lhs->GetTupleIdx() == 0) {
+    left_keys->emplace_back(cmp_expr->GetChildAt(0));
+    right_keys->emplace_back(cmp_expr->GetChildAt(1));
+  } else {
+    left_keys->emplace_back(cmp_expr->GetChildAt(1));
+    right_keys->emplace_back(cmp_expr->GetChildAt(0));
+  }
+  return true;
+}
+
+auto Optimizer::MakeHashJoin(const SchemaRef &output, const AbstractPlanNodeRef &left, const AbstractPlanNodeRef &right,
+                             std::vector<AbstractExpressionRef> left_keys,
+                             std::vector<AbstractExpressionRef> right_keys, JoinType join_type) -> AbstractPlanNodeRef {
+  // A left join keeps every row of its left input, which is therefore always the probe side.
+  if (join_type != JoinType::INNER || EstimateCardinality(right) <= EstimateCardinality(left)) {
+    return std::make_shared<HashJoinPlanNode>(output, left, right, std::move(left_keys), std::move(right_keys),
+                                              join_type);
+  }
+
+  const auto left_column_cnt = left->OutputSchema().GetColumnCount();
+  const auto right_column_cnt = right->OutputSchema().GetColumnCount();
+  const auto &columns = output->GetColumns();
+  std::vector<Column> swapped_columns(columns.begin() + left_column_cnt, columns.end());
+  swapped_columns.insert(swapped_columns.end(), columns.begin(), columns.begin() + left_column_cnt);
+  auto swap_side = [](std::vector<AbstractExpressionRef> *keys) {
+    for (auto &key : *keys) {
+      key = RewriteColumns(key, [](const ColumnValueExpression &column_expr) {
+        return std::make_shared<ColumnValueExpression>(1 - column_expr.GetTupleIdx(), column_expr.GetColIdx(),
+                                                       column_expr.GetReturnType());
+      });
+    }
+  };
+  swap_side(&left_keys);
+  swap_side(&right_keys);
+  auto hash_join_plan = std::make_shared<HashJoinPlanNode>(std::make_shared<Schema>(swapped_columns), right, left,
+                                                           std::move(right_keys), std::move(left_keys), join_type);
+
+  std::vector<AbstractExpressionRef> exprs;
+  for (size_t i = 0; i < columns.size(); i++) {
+    const auto col_idx = i < left_column_cnt ? i + right_column_cnt : i - left_column_cnt;
+    exprs.emplace_back(std::make_shared<ColumnValueExpression>(0, col_idx, columns[i].GetType()));
+  }
+  return std::make_shared<ProjectionPlanNode>(output, std::move(exprs), std::move(hash_join_plan));
+}
+
 auto Optimizer::OptimizeNLJAsHashJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
-  // TODO(student): implement NestedLoopJoin -> HashJoin optimizer rule
-  // Note for 2023 Spring: You should at least support join keys of the form:
-  // 1. <column expr> = <column expr>
-  // 2. <column expr> = <column expr> AND <column expr> = <column expr>
-  return plan;
+  std::vector<AbstractPlanNodeRef> children;
+  for (const auto &child : plan->GetChildren()) {
+    children.emplace_back(OptimizeNLJAsHashJoin(child));
+  }
+  auto optimized_plan = plan->CloneWithChildren(std::move(children));
+
+  if (optimized_plan->GetType() == PlanType::NestedLoopJoin) {
+    const auto &nlj_plan = dynamic_cast<const NestedLoopJoinPlanNode &>(*optimized_plan);
+    std::vector<AbstractExpressionRef> left_keys;
+    std::vector<AbstractExpressionRef> right_keys;
+    if (ExtractEquiJoinKeys(nlj_plan.Predicate(), &left_keys, &right_keys)) {
+      return MakeHashJoin(nlj_plan.output_schema_, nlj_plan.GetLeftPlan(), nlj_plan.GetRightPlan(),
+                          std::move(left_keys), std::move(right_keys), nlj_plan.GetJoinType());
+    }
+    if (nlj_plan.GetJoinType() != JoinType::INNER) {
+      return optimized_plan;
+    }
+    // An inner join can hash on its equi-join conjuncts and check the others on its output. The keys of the conjuncts
+    // that matched before the predicate was rejected as a whole are extracted again below.
+    left_keys.clear();
+    right_keys.clear();
+    std::vector<AbstractExpressionRef> conjuncts;
+    SplitConjuncts(nlj_plan.Predicate(), &conjuncts);
+    std::vector<AbstractExpressionRef> residual;
+    for (const auto &conjunct : conjuncts) {
+      if (!ExtractEquiJoinKeys(conjunct, &left_keys, &right_keys)) {
+        const auto left_column_cnt = nlj_plan.GetLeftPlan()->OutputSchema().GetColumnCount();
+        residual.push_back(RewriteColumns(conjunct, [&](const ColumnValueExpression &column_expr) {
+          return std::make_shared<ColumnValueExpression>(
+              0, column_expr.GetColIdx() + (column_expr.GetTupleIdx() == 0 ? 0 : left_column_cnt),
+              column_expr.GetReturnType());
+        }));
+      }
+    }
+    if (!left_keys.empty()) {
+      auto hash_join_plan = MakeHashJoin(nlj_plan.output_schema_, nlj_plan.GetLeftPlan(), nlj_plan.GetRightPlan(),
+                                         std::move(left_keys), std::move(right_keys), nlj_plan.GetJoinType());
+      return std::make_shared<FilterPlanNode>(nlj_plan.output_schema_, CombineConjuncts(residual),
+                                              std::move(hash_join_plan));
+    }
+  }
+  return optimized_plan;
 }
 
 }  // namespace bustub
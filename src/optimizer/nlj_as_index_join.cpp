@@ -32,6 +32,24 @@ auto Optimizer::MatchIndex(const std::string &table_name, uint32_t index_key_idx
   return std::nullopt;
 }
 
+auto Optimizer::MatchIndexPrefix(const std::string &table_name, const std::vector<uint32_t> &key_idxs)
+    -> std::optional<std::tuple<index_oid_t, std::string>> {
+  const IndexInfo *best = nullptr;
+  for (const auto *index_info : catalog_.GetTableIndexes(table_name)) {
+    const auto &key_attrs = index_info->index_->GetKeyAttrs();
+    if (key_attrs.size() < key_idxs.size() || !std::equal(key_idxs.begin(), key_idxs.end(), key_attrs.begin())) {
+      continue;
+    }
+    if (best == nullptr || key_attrs.size() < best->index_->GetKeyAttrs().size()) {
+      best = index_info;
+    }
+  }
+  if (best == nullptr) {
+    return std::nullopt;
+  }
+  return std::make_optional(std::make_tuple(best->index_oid_, best->name_));
+}
+
 auto Optimizer::OptimizeNLJAsIndexJoin(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
   std::vector<AbstractPlanNodeRef> children;
   for (const auto &child : plan->GetChildren()) {
@@ -9,11 +9,21 @@ namespace bustub {
 
 auto Optimizer::OptimizeCustom(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
   auto p = plan;
+  p = OptimizeConstantFolding(p);
   p = OptimizeMergeProjection(p);
+  p = OptimizeJoinOrder(p);
+  p = OptimizePredicatePushdown(p);
   p = OptimizeMergeFilterNLJ(p);
   p = OptimizeNLJAsHashJoin(p);
   p = OptimizeOrderByAsIndexScan(p);
   p = OptimizeSortLimitAsTopN(p);
+  p = OptimizeHashJoinAsSortMergeJoin(p);
+  // Filters are merged into scans last, as the rules above match plain scans.
+  p = OptimizeMergeFilterScan(p);
+  p = OptimizeSeqScanAsIndexScan(p);
+  // Pruning columns may leave projections that only rename the columns of a scan.
+  p = OptimizeProjectionPushdown(p);
+  p = OptimizeMergeProjection(p);
   return p;
 }
 
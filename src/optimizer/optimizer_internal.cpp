@@ -1,5 +1,48 @@
+#include "optimizer/optimizer_internal.h"
+
+#include <memory>
+#include <utility>
+
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/logic_expression.h"
+#include "type/value_factory.h"
+
 namespace bustub {
 
 void OptimizerHelperFunction() {}
 
+auto RewriteColumns(const AbstractExpressionRef &expr,
+                    const std::function<AbstractExpressionRef(const ColumnValueExpression &)> &rewrite)
+    -> AbstractExpressionRef {
+  if (const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(expr.get()); column_expr != nullptr) {
+    return rewrite(*column_expr);
+  }
+  std::vector<AbstractExpressionRef> children;
+  for (const auto &child : expr->GetChildren()) {
+    children.emplace_back(RewriteColumns(child, rewrite));
+  }
+  return expr->CloneWithChildren(std::move(children));
+}
+
+void CollectColumns(const AbstractExpressionRef &expr, std::vector<uint32_t> *col_idxs) {
+  if (const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(expr.get()); column_expr != nullptr) {
+    col_idxs->push_back(column_expr->GetColIdx());
+    return;
+  }
+  for (const auto &child : expr->GetChildren()) {
+    CollectColumns(child, col_idxs);
+  }
+}
+
+auto CombineConjuncts(const std::vector<AbstractExpressionRef> &conjuncts) -> AbstractExpressionRef {
+  if (conjuncts.empty()) {
+    return std::make_shared<ConstantValueExpression>(ValueFactory::GetBooleanValue(true));
+  }
+  auto result = conjuncts[0];
+  for (size_t i = 1; i < conjuncts.size(); i++) {
+    result = std::make_shared<LogicExpression>(result, conjuncts[i], LogicType::And);
+  }
+  return result;
+}
+
 }  // namespace bustub
@@ -54,24 +54,14 @@ auto Optimizer::OptimizeOrderByAsIndexScan(const AbstractPlanNodeRef &plan) -> A
 
     if (child_plan->GetType() == PlanType::SeqScan) {
       const auto &seq_scan = dynamic_cast<const SeqScanPlanNode &>(*child_plan);
-      const auto *table_info = catalog_.GetTable(seq_scan.GetTableOid());
-      const auto indices = catalog_.GetTableIndexes(table_info->name_);
-
-      for (const auto *index : indices) {
-        const auto &columns = index->key_schema_.GetColumns();
-        // check index key schema == order by columns
-        bool valid = true;
-        if (columns.size() == order_by_column_ids.size()) {
-          for (size_t i = 0; i < columns.size(); i++) {
-            if (columns[i].GetName() != table_info->schema_.GetColumn(order_by_column_ids[i]).GetName()) {
-              valid = false;
-              break;
-            }
-          }
-          if (valid) {
-            return std::make_shared<IndexScanPlanNode>(optimized_plan->output_schema_, index->index_oid_);
-          }
-        }
+      // An index scan produces all rows of the table.
+      if (seq_scan.filter_predicate_ != nullptr || !seq_scan.column_ids_.empty()) {
+        return optimized_plan;
+      }
+      // The index is ordered by all of its key columns, so it satisfies any ORDER BY on a prefix of them.
+      if (auto index = MatchIndexPrefix(seq_scan.table_name_, order_by_column_ids); index != std::nullopt) {
+        auto [index_oid, index_name] = *index;
+        return std::make_shared<IndexScanPlanNode>(optimized_plan->output_schema_, index_oid);
       }
     }
   }
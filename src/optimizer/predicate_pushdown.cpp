@@ -0,0 +1,284 @@
+#include <algorithm>
+#include <iterator>
+#include <map>
+#include <memory>
+#include <string>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/plans/filter_plan.h"
+#include "execution/plans/nested_loop_join_plan.h"
+#include "execution/plans/projection_plan.h"
+#include "optimizer/optimizer.h"
+#include "optimizer/optimizer_internal.h"
+
+namespace bustub {
+
+namespace {
+
+auto WithFilter(const AbstractPlanNodeRef &plan, const std::vector<AbstractExpressionRef> &predicates)
+    -> AbstractPlanNodeRef {
+  if (predicates.empty()) {
+    return plan;
+  }
+  return std::make_shared<FilterPlanNode>(plan->output_schema_, CombineConjuncts(predicates), plan);
+}
+
+/** @return the columns of an `a = b` conjunct between two different columns, or nullptr */
+auto AsColumnEquality(const AbstractExpressionRef &expr)
+    -> std::pair<const ColumnValueExpression *, const ColumnValueExpression *> {
+  const auto *cmp_expr = dynamic_cast<const ComparisonExpression *>(expr.get());
+  if (cmp_expr == nullptr || cmp_expr->comp_type_ != ComparisonType::Equal) {
+    return {nullptr, nullptr};
+  }
+  const auto *lhs = dynamic_cast<const ColumnValueExpression *>(cmp_expr->GetChildAt(0).get());
+  const auto *rhs = dynamic_cast<const ColumnValueExpression *>(cmp_expr->GetChildAt(1).get());
+  // `a = a` is not TRUE where `a` is NULL, so it is kept as it is.
+  if (lhs == nullptr || rhs == nullptr || lhs->GetColIdx() == rhs->GetColIdx()) {
+    return {nullptr, nullptr};
+  }
+  return {lhs, rhs};
+}
+
+/** @return the column and the constant of a `col = constant` conjunct, or nullptr */
+auto AsConstantEquality(const AbstractExpressionRef &expr)
+    -> std::pair<const ColumnValueExpression *, const AbstractExpressionRef *> {
+  const auto *cmp_expr = dynamic_cast<const ComparisonExpression *>(expr.get());
+  if (cmp_expr == nullptr || cmp_expr->comp_type_ != ComparisonType::Equal) {
+    return {nullptr, nullptr};
+  }
+  const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(cmp_expr->GetChildAt(0).get());
+  const auto *const_expr = dynamic_cast<const ConstantValueExpression *>(cmp_expr->GetChildAt(1).get());
+  if (column_expr == nullptr || const_expr == nullptr || const_expr->val_.IsNull()) {
+    return {nullptr, nullptr};
+  }
+  return {column_expr, &cmp_expr->GetChildAt(1)};
+}
+
+auto MakeEquality(const ColumnValueExpression &lhs, const ColumnValueExpression &rhs) -> AbstractExpressionRef {
+  return std::make_shared<ComparisonExpression>(std::make_shared<ColumnValueExpression>(lhs),
+                                                std::make_shared<ColumnValueExpression>(rhs), ComparisonType::Equal);
+}
+
+/**
+ * Rewrite the conjuncts of an inner join (on its output columns) with the equalities they imply. Columns that are
+ * equal to each other form a class: the equalities of a class are replaced by a chain over its left columns, a chain
+ * over its right columns and a single equality between the two sides, so that every class whose columns span both
+ * sides yields a join key (a=b AND b=c gives a=c for a join of {a, c} with {b}). A `col = constant` conjunct is copied
+ * to every column of its class, so that each side can filter on it.
+ */
+auto DeriveEqualities(const std::vector<AbstractExpressionRef> &conjuncts, uint32_t left_column_cnt)
+    -> std::vector<AbstractExpressionRef> {
+  std::map<uint32_t, uint32_t> parent;
+  std::map<uint32_t, const ColumnValueExpression *> columns;
+  auto find = [&](uint32_t col_idx) {
+    while (parent[col_idx] != col_idx) {
+      col_idx = parent[col_idx] = parent[parent[col_idx]];
+    }
+    return col_idx;
+  };
+  auto add = [&](const ColumnValueExpression *column_expr) {
+    if (columns.emplace(column_expr->GetColIdx(), column_expr).second) {
+      parent[column_expr->GetColIdx()] = column_expr->GetColIdx();
+    }
+  };
+
+  std::vector<AbstractExpressionRef> derived;
+  std::vector<std::pair<const ColumnValueExpression *, const AbstractExpressionRef *>> constants;
+  for (const auto &conjunct : conjuncts) {
+    if (auto [lhs, rhs] = AsColumnEquality(conjunct); lhs != nullptr) {
+      add(lhs);
+      add(rhs);
+      parent[find(lhs->GetColIdx())] = find(rhs->GetColIdx());
+      continue;
+    }
+    if (auto constant = AsConstantEquality(conjunct); constant.first != nullptr) {
+      constants.push_back(constant);
+    }
+    derived.push_back(conjunct);
+  }
+
+  // The members of each class, in column order.
+  std::map<uint32_t, std::vector<const ColumnValueExpression *>> classes;
+  for (const auto &[col_idx, column_expr] : columns) {
+    classes[find(col_idx)].push_back(column_expr);
+  }
+  for (const auto &[root, members] : classes) {
+    const auto right_begin = std::partition_point(members.begin(), members.end(), [&](const auto *column_expr) {
+      return column_expr->GetColIdx() < left_column_cnt;
+    });
+    for (auto it = members.begin(); it != members.end(); ++it) {
+      if (it != members.begin() && it != right_begin) {
+        derived.push_back(MakeEquality(**std::prev(it), **it));
+      }
+    }
+    if (right_begin != members.begin() && right_begin != members.end()) {
+      derived.push_back(MakeEquality(**members.begin(), **right_begin));
+    }
+  }
+  for (const auto &[column_expr, constant] : constants) {
+    if (columns.count(column_expr->GetColIdx()) == 0) {
+      continue;
+    }
+    for (const auto *member : classes[find(column_expr->GetColIdx())]) {
+      if (member->GetColIdx() != column_expr->GetColIdx()) {
+        derived.push_back(std::make_shared<ComparisonExpression>(std::make_shared<ColumnValueExpression>(*member),
+                                                                 *constant, ComparisonType::Equal));
+      }
+    }
+  }
+
+  // Drop the repeated conjuncts, e.g. a constant copied to a column from two others.
+  std::vector<AbstractExpressionRef> result;
+  std::unordered_set<std::string> seen;
+  for (auto &conjunct : derived) {
+    if (seen.insert(conjunct->ToString()).second) {
+      result.push_back(std::move(conjunct));
+    }
+  }
+  return result;
+}
+
+/** Where a conjunct on the output of a join can be checked. */
+enum class JoinSide { None, Left, Right, Both };
+
+auto SideOf(const AbstractExpressionRef &expr, uint32_t left_column_cnt) -> JoinSide {
+  std::vector<uint32_t> col_idxs;
+  CollectColumns(expr, &col_idxs);
+  if (col_idxs.empty()) {
+    return JoinSide::None;
+  }
+  const auto is_left = [&](uint32_t col_idx) { return col_idx < left_column_cnt; };
+  if (std::all_of(col_idxs.begin(), col_idxs.end(), is_left)) {
+    return JoinSide::Left;
+  }
+  if (std::none_of(col_idxs.begin(), col_idxs.end(), is_left)) {
+    return JoinSide::Right;
+  }
+  return JoinSide::Both;
+}
+
+auto PushDownPredicates(const AbstractPlanNodeRef &plan, std::vector<AbstractExpressionRef> predicates)
+    -> AbstractPlanNodeRef;
+
+auto PushDownJoin(const NestedLoopJoinPlanNode &nlj_plan, std::vector<AbstractExpressionRef> predicates)
+    -> AbstractPlanNodeRef {
+  const auto left_column_cnt = nlj_plan.GetLeftPlan()->OutputSchema().GetColumnCount();
+  // The join predicate, on the output of the join like the predicates from above.
+  std::vector<AbstractExpressionRef> join_conjuncts;
+  SplitConjuncts(nlj_plan.Predicate(), &join_conjuncts);
+  for (auto &conjunct : join_conjuncts) {
+    conjunct = RewriteColumns(conjunct, [&](const ColumnValueExpression &column_expr) {
+      return std::make_shared<ColumnValueExpression>(
+          0, column_expr.GetColIdx() + (column_expr.GetTupleIdx() == 0 ? 0 : left_column_cnt),
+          column_expr.GetReturnType());
+    });
+  }
+
+  std::vector<AbstractExpressionRef> left_predicates;
+  std::vector<AbstractExpressionRef> right_predicates;
+  std::vector<AbstractExpressionRef> kept;
+  std::vector<AbstractExpressionRef> above;
+  auto push = [&](const AbstractExpressionRef &conjunct, JoinSide side, std::vector<AbstractExpressionRef> *rest) {
+    if (side == JoinSide::Left) {
+      left_predicates.push_back(conjunct);
+    } else if (side == JoinSide::Right) {
+      right_predicates.push_back(RewriteColumns(conjunct, [&](const ColumnValueExpression &column_expr) {
+        return std::make_shared<ColumnValueExpression>(0, column_expr.GetColIdx() - left_column_cnt,
+                                                       column_expr.GetReturnType());
+      }));
+    } else {
+      rest->push_back(conjunct);
+    }
+  };
+
+  if (nlj_plan.GetJoinType() == JoinType::INNER) {
+    // Above an inner join, a predicate may as well be part of the join.
+    predicates.insert(predicates.end(), join_conjuncts.begin(), join_conjuncts.end());
+    for (const auto &conjunct : DeriveEqualities(predicates, left_column_cnt)) {
+      push(conjunct, SideOf(conjunct, left_column_cnt), &kept);
+    }
+  } else if (nlj_plan.GetJoinType() == JoinType::LEFT) {
+    // A left join pads the right side of the left rows that match nothing: only filters on the left side can move
+    // below it, and only conditions on the right side can leave the join.
+    for (const auto &predicate : predicates) {
+      const auto side = SideOf(predicate, left_column_cnt);
+      push(predicate, side == JoinSide::Left ? side : JoinSide::Both, &above);
+    }
+    for (const auto &conjunct : join_conjuncts) {
+      const auto side = SideOf(conjunct, left_column_cnt);
+      push(conjunct, side == JoinSide::Right ? side : JoinSide::Both, &kept);
+    }
+  } else {
+    above = std::move(predicates);
+    kept = std::move(join_conjuncts);
+  }
+
+  for (auto &conjunct : kept) {
+    conjunct = RewriteColumns(conjunct, [&](const ColumnValueExpression &column_expr) {
+      const auto col_idx = column_expr.GetColIdx();
+      return col_idx < left_column_cnt
+                 ? std::make_shared<ColumnValueExpression>(0, col_idx, column_expr.GetReturnType())
+                 : std::make_shared<ColumnValueExpression>(1, col_idx - left_column_cnt, column_expr.GetReturnType());
+    });
+  }
+  auto join_plan = std::make_shared<NestedLoopJoinPlanNode>(
+      nlj_plan.output_schema_, PushDownPredicates(nlj_plan.GetLeftPlan(), std::move(left_predicates)),
+      PushDownPredicates(nlj_plan.GetRightPlan(), std::move(right_predicates)), CombineConjuncts(kept),
+      nlj_plan.GetJoinType());
+  return WithFilter(join_plan, above);
+}
+
+/** Push `predicates`, on the output of `plan`, as far down the plan as they can go. */
+auto PushDownPredicates(const AbstractPlanNodeRef &plan, std::vector<AbstractExpressionRef> predicates)
+    -> AbstractPlanNodeRef {
+  if (plan->GetType() == PlanType::Filter) {
+    SplitConjuncts(dynamic_cast<const FilterPlanNode &>(*plan).GetPredicate(), &predicates);
+    return PushDownPredicates(plan->GetChildAt(0), std::move(predicates));
+  }
+
+  if (plan->GetType() == PlanType::NestedLoopJoin) {
+    return PushDownJoin(dynamic_cast<const NestedLoopJoinPlanNode &>(*plan), std::move(predicates));
+  }
+
+  if (plan->GetType() == PlanType::Projection) {
+    // A predicate on columns that the projection passes through is a predicate on the same columns of its child.
+    const auto &projection_plan = dynamic_cast<const ProjectionPlanNode &>(*plan);
+    const auto &exprs = projection_plan.GetExpressions();
+    std::vector<AbstractExpressionRef> pushed;
+    std::vector<AbstractExpressionRef> above;
+    for (const auto &predicate : predicates) {
+      std::vector<uint32_t> col_idxs;
+      CollectColumns(predicate, &col_idxs);
+      if (!std::all_of(col_idxs.begin(), col_idxs.end(), [&](uint32_t col_idx) {
+            return dynamic_cast<const ColumnValueExpression *>(exprs[col_idx].get()) != nullptr;
+          })) {
+        above.push_back(predicate);
+        continue;
+      }
+      pushed.push_back(RewriteColumns(
+          predicate, [&](const ColumnValueExpression &column_expr) { return exprs[column_expr.GetColIdx()]; }));
+    }
+    return WithFilter(plan->CloneWithChildren({PushDownPredicates(projection_plan.GetChildPlan(), std::move(pushed))}),
+                      above);
+  }
+
+  std::vector<AbstractPlanNodeRef> children;
+  for (const auto &child : plan->GetChildren()) {
+    children.emplace_back(PushDownPredicates(child, {}));
+  }
+  return WithFilter(plan->CloneWithChildren(std::move(children)), predicates);
+}
+
+}  // namespace
+
+auto Optimizer::OptimizePredicatePushdown(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
+  return PushDownPredicates(plan, {});
+}
+
+}  // namespace bustub
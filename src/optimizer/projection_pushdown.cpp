@@ -0,0 +1,354 @@
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <memory>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include "catalog/schema.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/plans/abstract_plan.h"
+#include "execution/plans/aggregation_plan.h"
+#include "execution/plans/filter_plan.h"
+#include "execution/plans/hash_join_plan.h"
+#include "execution/plans/limit_plan.h"
+#include "execution/plans/mock_scan_plan.h"
+#include "execution/plans/nested_loop_join_plan.h"
+#include "execution/plans/projection_plan.h"
+#include "execution/plans/seq_scan_plan.h"
+#include "execution/plans/sort_merge_join_plan.h"
+#include "execution/plans/sort_plan.h"
+#include "execution/plans/topn_plan.h"
+#include "optimizer/optimizer.h"
+
+namespace bustub {
+
+namespace {
+
+/**
+ * The position of each output column of a plan in the output of the pruned plan. Columns that were pruned map to
+ * `PRUNED`.
+ */
+using ColumnMap = std::vector<uint32_t>;
+
+constexpr uint32_t PRUNED = std::numeric_limits<uint32_t>::max();
+
+using OrderBys = std::vector<std::pair<OrderByType, AbstractExpressionRef>>;
+
+auto IdentityMap(size_t column_cnt) -> ColumnMap {
+  ColumnMap map(column_cnt);
+  for (size_t i = 0; i < column_cnt; i++) {
+    map[i] = i;
+  }
+  return map;
+}
+
+/** Mark the columns that `expr` reads from the left (tuple 0) and the right (tuple 1) input. */
+void CollectColumns(const AbstractExpressionRef &expr, std::vector<bool> *left, std::vector<bool> *right) {
+  if (const auto *column_value_expr = dynamic_cast<const ColumnValueExpression *>(expr.get());
+      column_value_expr != nullptr) {
+    auto *used = column_value_expr->GetTupleIdx() == 0 ? left : right;
+    used->at(column_value_expr->GetColIdx()) = true;
+    return;
+  }
+  for (const auto &child : expr->GetChildren()) {
+    CollectColumns(child, left, right);
+  }
+}
+
+/** @return `expr` with the column references of the left and the right input moved to their pruned positions */
+auto RemapColumns(const AbstractExpressionRef &expr, const ColumnMap &left, const ColumnMap &right)
+    -> AbstractExpressionRef {
+  if (const auto *column_value_expr = dynamic_cast<const ColumnValueExpression *>(expr.get());
+      column_value_expr != nullptr) {
+    const auto &map = column_value_expr->GetTupleIdx() == 0 ? left : right;
+    const auto col_idx = map[column_value_expr->GetColIdx()];
+    BUSTUB_ENSURE(col_idx != PRUNED, "a referenced column was pruned");
+    return std::make_shared<ColumnValueExpression>(column_value_expr->GetTupleIdx(), col_idx,
+                                                   column_value_expr->GetReturnType());
+  }
+  std::vector<AbstractExpressionRef> children;
+  for (const auto &child : expr->GetChildren()) {
+    children.emplace_back(RemapColumns(child, left, right));
+  }
+  return expr->CloneWithChildren(std::move(children));
+}
+
+auto RemapOrderBys(const OrderBys &order_bys, const ColumnMap &map) -> OrderBys {
+  OrderBys remapped;
+  for (const auto &[order_type, expr] : order_bys) {
+    remapped.emplace_back(order_type, RemapColumns(expr, map, map));
+  }
+  return remapped;
+}
+
+/**
+ * Keep the required columns of a scan. A scan keeps at least one column, so that a parent that reads no column (e.g.
+ * `COUNT(*)`) still sees every row.
+ * @return the output column indexes to keep, or nullopt if all of them are kept
+ */
+auto KeptColumns(std::vector<bool> required) -> std::optional<std::vector<uint32_t>> {
+  if (std::all_of(required.begin(), required.end(), [](bool r) { return r; })) {
+    return std::nullopt;
+  }
+  if (std::none_of(required.begin(), required.end(), [](bool r) { return r; })) {
+    required[0] = true;
+  }
+  std::vector<uint32_t> kept;
+  for (uint32_t i = 0; i < required.size(); i++) {
+    if (required[i]) {
+      kept.push_back(i);
+    }
+  }
+  return kept;
+}
+
+auto KeptSchema(const Schema &schema, const std::vector<uint32_t> &kept) -> SchemaRef {
+  std::vector<Column> columns;
+  columns.reserve(kept.size());
+  for (const auto col_idx : kept) {
+    columns.push_back(schema.GetColumn(col_idx));
+  }
+  return std::make_shared<Schema>(columns);
+}
+
+auto KeptMap(size_t column_cnt, const std::vector<uint32_t> &kept) -> ColumnMap {
+  ColumnMap map(column_cnt, PRUNED);
+  for (uint32_t i = 0; i < kept.size(); i++) {
+    map[kept[i]] = i;
+  }
+  return map;
+}
+
+/** @return the table columns of a scan that produces `column_ids` (empty for all) and keeps the outputs `kept` */
+auto KeptColumnIds(const std::vector<uint32_t> &column_ids, const std::vector<uint32_t> &kept)
+    -> std::vector<uint32_t> {
+  std::vector<uint32_t> kept_ids;
+  kept_ids.reserve(kept.size());
+  for (const auto col_idx : kept) {
+    kept_ids.push_back(column_ids.empty() ? col_idx : column_ids[col_idx]);
+  }
+  return kept_ids;
+}
+
+auto JoinSchema(const AbstractPlanNode &left, const AbstractPlanNode &right) -> SchemaRef {
+  std::vector<Column> columns = left.OutputSchema().GetColumns();
+  const auto &right_columns = right.OutputSchema().GetColumns();
+  columns.insert(columns.end(), right_columns.begin(), right_columns.end());
+  return std::make_shared<Schema>(columns);
+}
+
+auto JoinMap(const ColumnMap &left_map, const ColumnMap &right_map, size_t left_column_cnt) -> ColumnMap {
+  ColumnMap map = left_map;
+  for (const auto col_idx : right_map) {
+    map.push_back(col_idx == PRUNED ? PRUNED : col_idx + left_column_cnt);
+  }
+  return map;
+}
+
+/**
+ * Prune the output columns of `plan` that neither its parent (`required`) nor any expression of the plan tree reads.
+ * @return the pruned plan, and where each output column of `plan` went in its output
+ */
+auto PruneColumns(const AbstractPlanNodeRef &plan, std::vector<bool> required)
+    -> std::pair<AbstractPlanNodeRef, ColumnMap> {
+  const auto column_cnt = plan->OutputSchema().GetColumnCount();
+  switch (plan->GetType()) {
+    case PlanType::SeqScan: {
+      const auto &seq_scan_plan = dynamic_cast<const SeqScanPlanNode &>(*plan);
+      if (seq_scan_plan.filter_predicate_ != nullptr) {
+        CollectColumns(seq_scan_plan.filter_predicate_, &required, &required);
+      }
+      auto kept = KeptColumns(std::move(required));
+      if (!kept.has_value()) {
+        break;
+      }
+      auto map = KeptMap(column_cnt, *kept);
+      auto filter_predicate = seq_scan_plan.filter_predicate_ == nullptr
+                                  ? nullptr
+                                  : RemapColumns(seq_scan_plan.filter_predicate_, map, map);
+      return {std::make_shared<SeqScanPlanNode>(KeptSchema(plan->OutputSchema(), *kept), seq_scan_plan.table_oid_,
+                                                seq_scan_plan.table_name_, std::move(filter_predicate),
+                                                KeptColumnIds(seq_scan_plan.column_ids_, *kept)),
+              std::move(map)};
+    }
+    case PlanType::MockScan: {
+      const auto &mock_scan_plan = dynamic_cast<const MockScanPlanNode &>(*plan);
+      const auto &filter_predicate = mock_scan_plan.GetFilterPredicate();
+      if (filter_predicate != nullptr) {
+        CollectColumns(filter_predicate, &required, &required);
+      }
+      auto kept = KeptColumns(std::move(required));
+      if (!kept.has_value()) {
+        break;
+      }
+      auto map = KeptMap(column_cnt, *kept);
+      return {std::make_shared<MockScanPlanNode>(
+                  KeptSchema(plan->OutputSchema(), *kept), mock_scan_plan.GetTable(),
+                  filter_predicate == nullptr ? nullptr : RemapColumns(filter_predicate, map, map),
+                  KeptColumnIds(mock_scan_plan.GetColumnIds(), *kept)),
+              std::move(map)};
+    }
+    case PlanType::Projection: {
+      const auto &projection_plan = dynamic_cast<const ProjectionPlanNode &>(*plan);
+      auto kept = KeptColumns(std::move(required));
+      if (!kept.has_value()) {
+        kept = IdentityMap(column_cnt);
+      }
+      const auto &child = projection_plan.GetChildAt(0);
+      std::vector<bool> child_required(child->OutputSchema().GetColumnCount());
+      for (const auto col_idx : *kept) {
+        CollectColumns(projection_plan.GetExpressions()[col_idx], &child_required, &child_required);
+      }
+      auto [pruned_child, child_map] = PruneColumns(child, std::move(child_required));
+      std::vector<AbstractExpressionRef> expressions;
+      for (const auto col_idx : *kept) {
+        expressions.emplace_back(RemapColumns(projection_plan.GetExpressions()[col_idx], child_map, child_map));
+      }
+      return {std::make_shared<ProjectionPlanNode>(KeptSchema(plan->OutputSchema(), *kept), std::move(expressions),
+                                                   std::move(pruned_child)),
+              KeptMap(column_cnt, *kept)};
+    }
+    case PlanType::Filter: {
+      const auto &filter_plan = dynamic_cast<const FilterPlanNode &>(*plan);
+      CollectColumns(filter_plan.GetPredicate(), &required, &required);
+      auto [pruned_child, child_map] = PruneColumns(filter_plan.GetChildAt(0), std::move(required));
+      auto predicate = RemapColumns(filter_plan.GetPredicate(), child_map, child_map);
+      return {std::make_shared<FilterPlanNode>(pruned_child->output_schema_, std::move(predicate), pruned_child),
+              std::move(child_map)};
+    }
+    case PlanType::Sort: {
+      const auto &sort_plan = dynamic_cast<const SortPlanNode &>(*plan);
+      for (const auto &[order_type, expr] : sort_plan.GetOrderBy()) {
+        CollectColumns(expr, &required, &required);
+      }
+      auto [pruned_child, child_map] = PruneColumns(sort_plan.GetChildAt(0), std::move(required));
+      auto order_bys = RemapOrderBys(sort_plan.GetOrderBy(), child_map);
+      return {std::make_shared<SortPlanNode>(pruned_child->output_schema_, pruned_child, std::move(order_bys)),
+              std::move(child_map)};
+    }
+    case PlanType::TopN: {
+      const auto &topn_plan = dynamic_cast<const TopNPlanNode &>(*plan);
+      for (const auto &[order_type, expr] : topn_plan.GetOrderBy()) {
+        CollectColumns(expr, &required, &required);
+      }
+      auto [pruned_child, child_map] = PruneColumns(topn_plan.GetChildAt(0), std::move(required));
+      auto order_bys = RemapOrderBys(topn_plan.GetOrderBy(), child_map);
+      return {std::make_shared<TopNPlanNode>(pruned_child->output_schema_, pruned_child, std::move(order_bys),
+                                             topn_plan.GetN()),
+              std::move(child_map)};
+    }
+    case PlanType::Limit: {
+      const auto &limit_plan = dynamic_cast<const LimitPlanNode &>(*plan);
+      auto [pruned_child, child_map] = PruneColumns(limit_plan.GetChildAt(0), std::move(required));
+      return {std::make_shared<LimitPlanNode>(pruned_child->output_schema_, pruned_child, limit_plan.GetLimit()),
+              std::move(child_map)};
+    }
+    case PlanType::Aggregation: {
+      // The aggregation keeps its output; only its input is pruned.
+      const auto &agg_plan = dynamic_cast<const AggregationPlanNode &>(*plan);
+      const auto &child = agg_plan.GetChildPlan();
+      std::vector<bool> child_required(child->OutputSchema().GetColumnCount());
+      for (const auto &expr : agg_plan.GetGroupBys()) {
+        CollectColumns(expr, &child_required, &child_required);
+      }
+      for (const auto &expr : agg_plan.GetAggregates()) {
+        CollectColumns(expr, &child_required, &child_required);
+      }
+      auto [pruned_child, child_map] = PruneColumns(child, std::move(child_required));
+      std::vector<AbstractExpressionRef> group_bys;
+      for (const auto &expr : agg_plan.GetGroupBys()) {
+        group_bys.emplace_back(RemapColumns(expr, child_map, child_map));
+      }
+      std::vector<AbstractExpressionRef> aggregates;
+      for (const auto &expr : agg_plan.GetAggregates()) {
+        aggregates.emplace_back(RemapColumns(expr, child_map, child_map));
+      }
+      return {std::make_shared<AggregationPlanNode>(plan->output_schema_, std::move(pruned_child), std::move(group_bys),
+                                                    std::move(aggregates), agg_plan.GetAggregateTypes()),
+              IdentityMap(column_cnt)};
+    }
+    case PlanType::NestedLoopJoin:
+    case PlanType::HashJoin:
+    case PlanType::SortMergeJoin: {
+      const auto &left = plan->GetChildAt(0);
+      const auto &right = plan->GetChildAt(1);
+      const auto left_column_cnt = left->OutputSchema().GetColumnCount();
+      if (column_cnt != left_column_cnt + right->OutputSchema().GetColumnCount()) {
+        break;
+      }
+      std::vector<bool> left_required(required.begin(), required.begin() + left_column_cnt);
+      std::vector<bool> right_required(required.begin() + left_column_cnt, required.end());
+      if (plan->GetType() == PlanType::NestedLoopJoin) {
+        const auto &nlj_plan = dynamic_cast<const NestedLoopJoinPlanNode &>(*plan);
+        CollectColumns(nlj_plan.Predicate(), &left_required, &right_required);
+        auto [pruned_left, left_map] = PruneColumns(left, std::move(left_required));
+        auto [pruned_right, right_map] = PruneColumns(right, std::move(right_required));
+        auto predicate = RemapColumns(nlj_plan.Predicate(), left_map, right_map);
+        auto output_schema = JoinSchema(*pruned_left, *pruned_right);
+        auto map = JoinMap(left_map, right_map, pruned_left->OutputSchema().GetColumnCount());
+        return {std::make_shared<NestedLoopJoinPlanNode>(std::move(output_schema), std::move(pruned_left),
+                                                         std::move(pruned_right), std::move(predicate),
+                                                         nlj_plan.GetJoinType()),
+                std::move(map)};
+      }
+
+      // The key expressions of each side are evaluated against that side only, whatever their tuple index.
+      const auto &left_keys = plan->GetType() == PlanType::HashJoin
+                                  ? dynamic_cast<const HashJoinPlanNode &>(*plan).LeftJoinKeyExpressions()
+                                  : dynamic_cast<const SortMergeJoinPlanNode &>(*plan).LeftJoinKeyExpressions();
+      const auto &right_keys = plan->GetType() == PlanType::HashJoin
+                                   ? dynamic_cast<const HashJoinPlanNode &>(*plan).RightJoinKeyExpressions()
+                                   : dynamic_cast<const SortMergeJoinPlanNode &>(*plan).RightJoinKeyExpressions();
+      for (const auto &expr : left_keys) {
+        CollectColumns(expr, &left_required, &left_required);
+      }
+      for (const auto &expr : right_keys) {
+        CollectColumns(expr, &right_required, &right_required);
+      }
+      auto [pruned_left, left_map] = PruneColumns(left, std::move(left_required));
+      auto [pruned_right, right_map] = PruneColumns(right, std::move(right_required));
+      std::vector<AbstractExpressionRef> pruned_left_keys;
+      for (const auto &expr : left_keys) {
+        pruned_left_keys.emplace_back(RemapColumns(expr, left_map, left_map));
+      }
+      std::vector<AbstractExpressionRef> pruned_right_keys;
+      for (const auto &expr : right_keys) {
+        pruned_right_keys.emplace_back(RemapColumns(expr, right_map, right_map));
+      }
+      auto output_schema = JoinSchema(*pruned_left, *pruned_right);
+      auto map = JoinMap(left_map, right_map, pruned_left->OutputSchema().GetColumnCount());
+      if (plan->GetType() == PlanType::HashJoin) {
+        const auto join_type = dynamic_cast<const HashJoinPlanNode &>(*plan).GetJoinType();
+        return {std::make_shared<HashJoinPlanNode>(std::move(output_schema), std::move(pruned_left),
+                                                   std::move(pruned_right), std::move(pruned_left_keys),
+                                                   std::move(pruned_right_keys), join_type),
+                std::move(map)};
+      }
+      const auto join_type = dynamic_cast<const SortMergeJoinPlanNode &>(*plan).GetJoinType();
+      return {std::make_shared<SortMergeJoinPlanNode>(std::move(output_schema), std::move(pruned_left),
+                                                      std::move(pruned_right), std::move(pruned_left_keys),
+                                                      std::move(pruned_right_keys), join_type),
+              std::move(map)};
+    }
+    default:
+      break;
+  }
+
+  // Any other plan reads all columns of its children, and keeps all of its own columns.
+  std::vector<AbstractPlanNodeRef> children;
+  for (const auto &child : plan->GetChildren()) {
+    children.emplace_back(PruneColumns(child, std::vector<bool>(child->OutputSchema().GetColumnCount(), true)).first);
+  }
+  return {plan->CloneWithChildren(std::move(children)), IdentityMap(column_cnt)};
+}
+
+}  // namespace
+
+auto Optimizer::OptimizeProjectionPushdown(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
+  // The result of the query keeps all of its columns, in order.
+  return PruneColumns(plan, std::vector<bool>(plan->OutputSchema().GetColumnCount(), true)).first;
+}
+
+}  // namespace bustub
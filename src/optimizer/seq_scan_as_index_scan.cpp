@@ -0,0 +1,220 @@
+#include <algorithm>
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <optional>
+#include <utility>
+#include <vector>
+
+#include "catalog/catalog.h"
+#include "common/config.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/expression_util.h"
+#include "execution/plans/index_scan_plan.h"
+#include "execution/plans/seq_scan_plan.h"
+#include "optimizer/optimizer.h"
+#include "optimizer/optimizer_internal.h"
+#include "storage/index/b_plus_tree_index.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+/** A row fetched through an index costs about as much as this many rows of a sequential scan (a random heap read). */
+constexpr double INDEX_FETCH_COST = 4;
+
+/** The values that the conjuncts of a predicate allow in an INTEGER column, from `low_` to `high_` inclusive. */
+struct ColumnRange {
+  int64_t low_{BUSTUB_INT32_MIN};
+  int64_t high_{BUSTUB_INT32_MAX};
+  std::vector<AbstractExpressionRef> conjuncts_;
+
+  auto IsPoint() const -> bool { return low_ >= high_; }
+};
+
+/** Collect the ranges that `column op constant` conjuncts put on the INTEGER columns of a scan. */
+auto CollectRanges(const AbstractExpressionRef &predicate) -> std::map<uint32_t, ColumnRange> {
+  std::vector<AbstractExpressionRef> conjuncts;
+  SplitConjuncts(predicate, &conjuncts);
+  std::map<uint32_t, ColumnRange> ranges;
+  for (const auto &conjunct : conjuncts) {
+    const auto *cmp_expr = dynamic_cast<const ComparisonExpression *>(conjunct.get());
+    if (cmp_expr == nullptr) {
+      continue;
+    }
+    // Constants are on the right after constant folding.
+    const auto *column_expr = dynamic_cast<const ColumnValueExpression *>(cmp_expr->GetChildAt(0).get());
+    const auto *const_expr = dynamic_cast<const ConstantValueExpression *>(cmp_expr->GetChildAt(1).get());
+    if (column_expr == nullptr || const_expr == nullptr || column_expr->GetReturnType() != TypeId::INTEGER ||
+        const_expr->val_.IsNull()) {
+      continue;
+    }
+    int64_t value;
+    if (const_expr->val_.GetTypeId() == TypeId::INTEGER) {
+      value = const_expr->val_.GetAs<int32_t>();
+    } else if (const_expr->val_.GetTypeId() == TypeId::BIGINT) {
+      value = const_expr->val_.GetAs<int64_t>();
+    } else {
+      continue;
+    }
+
+    auto &range = ranges[column_expr->GetColIdx()];
+    switch (cmp_expr->comp_type_) {
+      case ComparisonType::Equal:
+        range.low_ = std::max(range.low_, value);
+        range.high_ = std::min(range.high_, value);
+        break;
+      case ComparisonType::LessThan:
+        range.high_ = std::min(range.high_, value - 1);
+        break;
+      case ComparisonType::LessThanOrEqual:
+        range.high_ = std::min(range.high_, value);
+        break;
+      case ComparisonType::GreaterThan:
+        range.low_ = std::max(range.low_, value + 1);
+        break;
+      case ComparisonType::GreaterThanOrEqual:
+        range.low_ = std::max(range.low_, value);
+        break;
+      default:
+        continue;
+    }
+    range.conjuncts_.push_back(conjunct);
+  }
+  return ranges;
+}
+
+auto IntegerKeyValue(int64_t value) -> Value {
+  return ValueFactory::GetIntegerValue(
+      static_cast<int32_t>(std::clamp<int64_t>(value, BUSTUB_INT32_MIN, BUSTUB_INT32_MAX)));
+}
+
+/** The range of index keys that a scan reads, and the conjuncts of the predicate that it covers. */
+struct KeyRange {
+  std::vector<Value> low_key_;
+  std::vector<Value> high_key_;
+  std::vector<AbstractExpressionRef> conjuncts_;
+};
+
+/**
+ * Match the ranges of a predicate against the key columns of an index: the leading key columns that are compared
+ * with `=` and then a range on the next one bound the scan.
+ * @return the range of keys to scan, or nullopt if the index does not narrow the scan
+ */
+auto MatchKeyRange(const IndexInfo &index_info, const std::map<uint32_t, ColumnRange> &ranges)
+    -> std::optional<KeyRange> {
+  // The index scan executor reads B+ tree indexes on integer keys only.
+  if (dynamic_cast<const BPlusTreeIndexForTwoIntegerColumn *>(index_info.index_.get()) == nullptr) {
+    return std::nullopt;
+  }
+  const auto &key_attrs = index_info.index_->GetKeyAttrs();
+  for (const auto &column : index_info.key_schema_.GetColumns()) {
+    if (column.GetType() != TypeId::INTEGER) {
+      return std::nullopt;
+    }
+  }
+
+  KeyRange key_range;
+  std::vector<int64_t> prefix;
+  const ColumnRange *range = nullptr;
+  for (const auto key_attr : key_attrs) {
+    auto it = ranges.find(key_attr);
+    if (it == ranges.end()) {
+      break;
+    }
+    key_range.conjuncts_.insert(key_range.conjuncts_.end(), it->second.conjuncts_.begin(), it->second.conjuncts_.end());
+    if (!it->second.IsPoint()) {
+      range = &it->second;
+      break;
+    }
+    prefix.push_back(it->second.low_);
+    // Nothing matches a column whose bounds cross: the scan is empty.
+    if (it->second.low_ > it->second.high_) {
+      key_range.low_key_.assign(key_attrs.size(), IntegerKeyValue(0));
+      key_range.high_key_ = key_range.low_key_;
+      return key_range;
+    }
+  }
+  if (prefix.empty() && range == nullptr) {
+    return std::nullopt;
+  }
+
+  // The other key columns are padded with NULL, which the key comparator puts before every other value, so that the
+  // range covers all their values.
+  auto make_key = [&](std::vector<int64_t> values) {
+    std::vector<Value> key;
+    for (const auto value : values) {
+      key.push_back(IntegerKeyValue(value));
+    }
+    key.resize(key_attrs.size(), ValueFactory::GetNullValueByType(TypeId::INTEGER));
+    return key;
+  };
+  auto low = prefix;
+  if (range != nullptr) {
+    low.push_back(range->low_);
+  }
+  key_range.low_key_ = make_key(low);
+
+  // The scan ends at the key right after the range, if there is one.
+  auto high = prefix;
+  if (range != nullptr && range->high_ < BUSTUB_INT32_MAX) {
+    high.push_back(range->high_ + 1);
+    key_range.high_key_ = make_key(high);
+  } else if (!high.empty() && high.back() < BUSTUB_INT32_MAX) {
+    high.back() += 1;
+    key_range.high_key_ = make_key(high);
+  }
+  return key_range;
+}
+
+}  // namespace
+
+auto Optimizer::OptimizeSeqScanAsIndexScan(const AbstractPlanNodeRef &plan) -> AbstractPlanNodeRef {
+  std::vector<AbstractPlanNodeRef> children;
+  for (const auto &child : plan->GetChildren()) {
+    children.emplace_back(OptimizeSeqScanAsIndexScan(child));
+  }
+  AbstractPlanNodeRef optimized_plan = plan->CloneWithChildren(std::move(children));
+
+  if (optimized_plan->GetType() != PlanType::SeqScan) {
+    return optimized_plan;
+  }
+  const auto &seq_scan = dynamic_cast<const SeqScanPlanNode &>(*optimized_plan);
+  // An index scan produces whole rows.
+  if (seq_scan.filter_predicate_ == nullptr || !seq_scan.column_ids_.empty()) {
+    return optimized_plan;
+  }
+
+  // Take the index that reads the fewest rows, if it is cheaper than reading them all.
+  const auto ranges = CollectRanges(seq_scan.filter_predicate_);
+  const auto table_rows = EstimateTableRows(seq_scan.table_name_);
+  double best_cost = table_rows;
+  const IndexInfo *best_index = nullptr;
+  std::optional<KeyRange> best_range;
+  for (const auto *index_info : catalog_.GetTableIndexes(seq_scan.table_name_)) {
+    auto key_range = MatchKeyRange(*index_info, ranges);
+    if (!key_range.has_value()) {
+      continue;
+    }
+    const auto cost =
+        table_rows * EstimateSelectivity(CombineConjuncts(key_range->conjuncts_), {optimized_plan}) * INDEX_FETCH_COST;
+    if (cost < best_cost) {
+      best_cost = cost;
+      best_index = index_info;
+      best_range = std::move(key_range);
+    }
+  }
+  if (best_index == nullptr) {
+    return optimized_plan;
+  }
+  // The index compares NULL keys as equal to any key, so the rows in the range are still checked by the whole
+  // predicate.
+  return std::make_shared<IndexScanPlanNode>(seq_scan.output_schema_, best_index->index_oid_,
+                                             seq_scan.filter_predicate_, std::move(best_range->low_key_),
+                                             std::move(best_range->high_key_));
+}
+
+}  // namespace bustub
@@ -8,6 +8,7 @@
 #include "binder/expressions/bound_column_ref.h"
 #include "binder/expressions/bound_constant.h"
 #include "binder/expressions/bound_func_call.h"
+#include "binder/expressions/bound_parameter.h"
 #include "binder/expressions/bound_unary_op.h"
 #include "binder/statement/select_statement.h"
 #include "common/exception.h"
@@ -15,6 +16,7 @@
 #include "common/util/string_util.h"
 #include "execution/expressions/column_value_expression.h"
 #include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/parameter_value_expression.h"
 #include "execution/plans/abstract_plan.h"
 #include "fmt/format.h"
 #include "planner/planner.h"
@@ -100,6 +102,13 @@ auto Planner::PlanConstant(const BoundConstant &expr, const std::vector<Abstract
   return std::make_shared<ConstantValueExpression>(expr.val_);
 }
 
+auto Planner::PlanParameter(const BoundParameter &expr) -> AbstractExpressionRef {
+  if (parameter_values_ == nullptr) {
+    throw Exception("parameters are only supported in prepared statements");
+  }
+  return std::make_shared<ParameterValueExpression>(expr.param_idx_, expr.type_id_, parameter_values_);
+}
+
 void Planner::AddAggCallToContext(BoundExpression &expr) {
   switch (expr.type_) {
     case ExpressionType::AGG_CALL: {
@@ -127,7 +136,8 @@ void Planner::AddAggCallToContext(BoundExpression &expr) {
       }
       return;
     }
-    case ExpressionType::CONSTANT: {
+    case ExpressionType::CONSTANT:
+    case ExpressionType::PARAMETER: {
       return;
     }
     case ExpressionType::ALIAS: {
@@ -166,6 +176,10 @@ auto Planner::PlanExpression(const BoundExpression &expr, const std::vector<Abst
       const auto &constant_expr = dynamic_cast<const BoundConstant &>(expr);
       return std::make_tuple(UNNAMED_COLUMN, PlanConstant(constant_expr, children));
     }
+    case ExpressionType::PARAMETER: {
+      const auto &parameter_expr = dynamic_cast<const BoundParameter &>(expr);
+      return std::make_tuple(UNNAMED_COLUMN, PlanParameter(parameter_expr));
+    }
     case ExpressionType::ALIAS: {
       const auto &alias_expr = dynamic_cast<const BoundAlias &>(expr);
       auto [_1, expr] = PlanExpression(*alias_expr.child_, children);
@@ -1,5 +1,7 @@
 #include <sstream>
 #include <string>
+#include <thread>  // NOLINT
+#include <type_traits>
 
 #include "common/exception.h"
 #include "common/logger.h"
@@ -16,7 +18,8 @@ BPLUSTREE_TYPE::BPlusTree(std::string name, page_id_t header_page_id, BufferPool
       comparator_(std::move(comparator)),
       leaf_max_size_(leaf_max_size),
       internal_max_size_(internal_max_size),
-      header_page_id_(header_page_id) {
+      header_page_id_(header_page_id),
+      node_cache_(buffer_pool_manager) {
   WritePageGuard guard = bpm_->FetchPageWrite(header_page_id_);
   auto root_page = guard.AsMut<BPlusTreeHeaderPage>();
   root_page->root_page_id_ = INVALID_PAGE_ID;
@@ -26,7 +29,10 @@ BPLUSTREE_TYPE::BPlusTree(std::string name, page_id_t header_page_id, BufferPool
  * Helper function to decide whether current b+tree is empty
  */
 INDEX_TEMPLATE_ARGUMENTS
-auto BPLUSTREE_TYPE::IsEmpty() const -> bool { return true; }
+auto BPLUSTREE_TYPE::IsEmpty() const -> bool {
+  auto header_guard = bpm_->FetchPageRead(header_page_id_);
+  return header_guard.template As<BPlusTreeHeaderPage>()->root_page_id_ == INVALID_PAGE_ID;
+}
 /*****************************************************************************
  * SEARCH
  *****************************************************************************/
@@ -37,10 +43,17 @@ auto BPLUSTREE_TYPE::IsEmpty() const -> bool { return true; }
  */
 INDEX_TEMPLATE_ARGUMENTS
 auto BPLUSTREE_TYPE::GetValue(const KeyType &key, std::vector<ValueType> *result, Transaction *txn) -> bool {
-  // Declaration of context instance.
-  Context ctx;
-  (void)ctx;
-  return false;
+  auto leaf_guard = FindPage<ReadPageGuard>(key, 0);
+  if (!leaf_guard.has_value()) {
+    return false;
+  }
+  const auto *leaf = leaf_guard->template As<LeafPage>();
+  const int index = KeyIndex(leaf, key);
+  if (index == leaf->GetSize() || comparator_(leaf->KeyAt(index), key) != 0) {
+    return false;
+  }
+  result->push_back(leaf->ValueAt(index));
+  return true;
 }
 
 /*****************************************************************************
@@ -50,15 +63,46 @@ auto BPLUSTREE_TYPE::GetValue(const KeyType &key, std::vector<ValueType> *result
  * Insert constant key & value pair into b+ tree
  * if current tree is empty, start new tree, update root page id and insert
  * entry, otherwise insert into leaf page.
+ * A full leaf is split while only the leaf is latched; the split is published
+ * to the parent level once the leaf has been released.
  * @return: since we only support unique key, if user try to insert duplicate
  * keys return false, otherwise return true.
  */
 INDEX_TEMPLATE_ARGUMENTS
 auto BPLUSTREE_TYPE::Insert(const KeyType &key, const ValueType &value, Transaction *txn) -> bool {
-  // Declaration of context instance.
-  Context ctx;
-  (void)ctx;
-  return false;
+  auto leaf_guard = FindPage<WritePageGuard>(key, 0);
+  while (!leaf_guard.has_value()) {
+    // Start a new tree, unless somebody else has done so since the descent.
+    auto header_guard = bpm_->FetchPageWrite(header_page_id_);
+    auto *header = header_guard.template AsMut<BPlusTreeHeaderPage>();
+    if (header->root_page_id_ == INVALID_PAGE_ID) {
+      page_id_t root_page_id;
+      auto root_guard = bpm_->NewPageGuarded(&root_page_id);
+      auto *root = root_guard.template AsMut<LeafPage>();
+      root->Init(leaf_max_size_);
+      root->InsertAt(0, key, value);
+      header->root_page_id_ = root_page_id;
+      return true;
+    }
+    header_guard.Drop();
+    leaf_guard = FindPage<WritePageGuard>(key, 0);
+  }
+
+  auto *leaf = leaf_guard->template AsMut<LeafPage>();
+  const int index = KeyIndex(leaf, key);
+  if (index < leaf->GetSize() && comparator_(leaf->KeyAt(index), key) == 0) {
+    return false;
+  }
+  leaf->InsertAt(index, key, value);
+  if (leaf->GetSize() < leaf->GetMaxSize()) {
+    return true;
+  }
+
+  KeyType separator;
+  const page_id_t new_page_id = SplitLeaf(&*leaf_guard, &separator);
+  leaf_guard->Drop();
+  InsertIntoParent(1, separator, new_page_id);
+  return true;
 }
 
 /*****************************************************************************
@@ -69,13 +113,733 @@ auto BPLUSTREE_TYPE::Insert(const KeyType &key, const ValueType &value, Transact
  * If current tree is empty, return immediately.
  * If not, User needs to first find the right leaf page as deletion target, then
  * delete entry from leaf page. Remember to deal with redistribute or merge if
- * necessary.
+ * necessary: NeedRebalance decides (and defers, in DEFERRED mode), and the leaf
+ * is then rebalanced by RebalanceLeaf, which latches the path from the root.
  */
 INDEX_TEMPLATE_ARGUMENTS
 void BPLUSTREE_TYPE::Remove(const KeyType &key, Transaction *txn) {
-  // Declaration of context instance.
   Context ctx;
-  (void)ctx;
+  auto leaf_guard = FindPage<WritePageGuard>(key, 0, &ctx.root_page_id_);
+  if (!leaf_guard.has_value()) {
+    return;
+  }
+  auto *leaf = leaf_guard->template AsMut<LeafPage>();
+  const int index = KeyIndex(leaf, key);
+  if (index == leaf->GetSize() || comparator_(leaf->KeyAt(index), key) != 0) {
+    return;
+  }
+  leaf->RemoveAt(index);
+
+  ctx.write_set_.push_back(std::move(*leaf_guard));
+  if (NeedRebalance(ctx, key)) {
+    // Parents are always latched before their children, so the leaf is released and the tree descended again.
+    ctx.write_set_.clear();
+    RebalanceLeaf(key);
+  }
+}
+
+/*****************************************************************************
+ * DEFERRED REMOVE
+ *****************************************************************************/
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::SetDeleteMode(DeleteMode mode, int merge_threshold) {
+  delete_mode_ = mode;
+  merge_threshold_ = merge_threshold;
+}
+
+/*
+ * Called by Remove once the entry has been deleted from the leaf at the back of ctx.write_set_.
+ * Root pages only need attention when they become empty (leaf) or have a single child left (internal).
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::NeedRebalance(Context &ctx, const KeyType &key) -> bool {
+  auto &guard = ctx.write_set_.back();
+  const auto *page = guard.template As<BPlusTreePage>();
+  if (ctx.IsRootPage(guard.PageId())) {
+    return page->IsLeafPage() ? page->GetSize() == 0 : page->GetSize() == 1;
+  }
+  if (page->GetSize() >= page->GetMinSize()) {
+    return false;
+  }
+  if (delete_mode_ == DeleteMode::EAGER || page->GetSize() < merge_threshold_) {
+    return true;
+  }
+  std::scoped_lock lock(deferred_latch_);
+  deferred_keys_.push_back(key);
+  return false;
+}
+
+/*
+ * Descend to the leaf covering `key` with write latches, taken from the header page down like in any other descent,
+ * and rebalance the leaf if it still underflows. A page that can lose an entry without underflowing stops the
+ * rebalancing, so the latches above it are released as soon as it is latched.
+ * @return : true if the leaf was rebalanced
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::RebalanceLeaf(const KeyType &key) -> bool {
+  Context ctx;
+  ctx.header_page_ = bpm_->FetchPageWrite(header_page_id_);
+  ctx.root_page_id_ = ctx.header_page_->template As<BPlusTreeHeaderPage>()->root_page_id_;
+  if (ctx.root_page_id_ == INVALID_PAGE_ID) {
+    return false;
+  }
+  auto guard = bpm_->FetchPageWrite(ctx.root_page_id_);
+  while (true) {
+    // A page reached through a right link is not in the latched parent yet, Rebalance leaves it alone.
+    MoveRight(&guard, key);
+    const auto *page = guard.template As<BPlusTreePage>();
+    if (page->IsLeafPage()) {
+      break;
+    }
+    if (!ctx.IsRootPage(guard.PageId()) && page->GetSize() > page->GetMinSize()) {
+      ctx.header_page_ = std::nullopt;
+      ctx.write_set_.clear();
+    }
+    const auto *internal = reinterpret_cast<const InternalPage *>(page);
+    auto child_guard = bpm_->FetchPageWrite(internal->ValueAt(ChildIndex(internal, key)));
+    ctx.write_set_.push_back(std::move(guard));
+    guard = std::move(child_guard);
+  }
+
+  // The leaf may have been refilled since it was found underflowing.
+  const auto *leaf = guard.template As<LeafPage>();
+  if (ctx.IsRootPage(guard.PageId()) ? leaf->GetSize() > 0 : leaf->GetSize() >= leaf->GetMinSize()) {
+    return false;
+  }
+  ctx.write_set_.push_back(std::move(guard));
+  Rebalance(ctx);
+  return true;
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::Rebalance(Context &ctx) {
+  while (!ctx.write_set_.empty()) {
+    auto guard = std::move(ctx.write_set_.back());
+    ctx.write_set_.pop_back();
+    const auto page_id = guard.PageId();
+    const auto *page = guard.template As<BPlusTreePage>();
+
+    if (ctx.IsRootPage(page_id)) {
+      // A root with a right link has been split, and stays until the new root is published.
+      if (RightLink(page) != INVALID_PAGE_ID) {
+        return;
+      }
+      auto *header = ctx.header_page_->template AsMut<BPlusTreeHeaderPage>();
+      if (page->IsLeafPage() && page->GetSize() == 0) {
+        header->root_page_id_ = INVALID_PAGE_ID;
+      } else if (!page->IsLeafPage() && page->GetSize() == 1) {
+        header->root_page_id_ = reinterpret_cast<const InternalPage *>(page)->ValueAt(0);
+      } else {
+        return;
+      }
+      const bool is_leaf = page->IsLeafPage();
+      guard.Drop();
+      node_cache_.Invalidate();
+      DeleteTreePage(page_id, is_leaf);
+      return;
+    }
+    if (page->GetSize() >= page->GetMinSize() || ctx.write_set_.empty()) {
+      return;
+    }
+
+    // A page reached through a right link is not in the parent until its split is published.
+    auto *parent = ctx.write_set_.back().template AsMut<InternalPage>();
+    const int index = parent->ValueIndex(page_id);
+    if (index < 0 || parent->GetSize() < 2) {
+      return;
+    }
+
+    // Always work on a pair of adjacent children (left, right), preferring the left sibling. Pages of a level are
+    // latched from left to right, so the page is released while its left sibling is latched.
+    const int right_index = index == 0 ? 1 : index;
+    WritePageGuard left_guard;
+    WritePageGuard right_guard;
+    if (index == 0) {
+      left_guard = std::move(guard);
+      right_guard = bpm_->FetchPageWrite(parent->ValueAt(1));
+    } else {
+      guard.Drop();
+      left_guard = bpm_->FetchPageWrite(parent->ValueAt(index - 1));
+      right_guard = bpm_->FetchPageWrite(page_id);
+    }
+    // The page may have been refilled while it was released. A left page that has been split into a sibling that
+    // is not published yet is no longer adjacent to the right page.
+    const auto *underflowing = (index == 0 ? left_guard : right_guard).template As<BPlusTreePage>();
+    if (underflowing->GetSize() >= underflowing->GetMinSize() ||
+        RightLink(left_guard.template As<BPlusTreePage>()) != right_guard.PageId()) {
+      return;
+    }
+    const KeyType middle_key = parent->KeyAt(right_index);
+    const bool is_leaf = underflowing->IsLeafPage();
+
+    bool merged = false;
+    if (is_leaf) {
+      auto *left = left_guard.template AsMut<LeafPage>();
+      auto *right = right_guard.template AsMut<LeafPage>();
+      if (left->GetSize() + right->GetSize() < left->GetMaxSize()) {
+        right->MoveAllTo(left);
+        merged = true;
+      } else {
+        if (index == 0) {
+          right->MoveFirstToEndOf(left);
+        } else {
+          left->MoveLastToFrontOf(right);
+        }
+        parent->SetKeyAt(right_index, right->KeyAt(0));
+        left->SetHighKey(right->KeyAt(0));
+      }
+    } else {
+      auto *left = left_guard.template AsMut<InternalPage>();
+      auto *right = right_guard.template AsMut<InternalPage>();
+      if (left->GetSize() + right->GetSize() <= left->GetMaxSize()) {
+        right->MoveAllTo(left, middle_key);
+        merged = true;
+      } else if (index == 0) {
+        const KeyType separator = right->KeyAt(1);
+        right->MoveFirstToEndOf(left, middle_key);
+        parent->SetKeyAt(right_index, separator);
+        left->SetHighKey(separator);
+      } else {
+        const KeyType separator = left->KeyAt(left->GetSize() - 1);
+        left->MoveLastToFrontOf(right, middle_key);
+        parent->SetKeyAt(right_index, separator);
+        left->SetHighKey(separator);
+      }
+    }
+    if (!merged) {
+      return;
+    }
+
+    // The right page is now empty. Remove it from the parent and check whether the parent underflows in turn.
+    const auto right_page_id = right_guard.PageId();
+    parent->RemoveAt(right_index);
+    left_guard.Drop();
+    right_guard.Drop();
+    DeleteTreePage(right_page_id, is_leaf);
+  }
+}
+
+/*
+ * Rebalance the leaves recorded by Remove in DEFERRED mode. Each pending key goes through RebalanceLeaf, which takes
+ * its latches in the same order as every other operation, so the pass can run next to inserts, deletes and lookups.
+ * @return : the number of leaves that were rebalanced
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::CompactDeferred(Transaction *txn) -> size_t {
+  std::vector<KeyType> keys;
+  {
+    std::scoped_lock lock(deferred_latch_);
+    keys.swap(deferred_keys_);
+  }
+
+  size_t rebalanced = 0;
+  for (const auto &key : keys) {
+    if (RebalanceLeaf(key)) {
+      rebalanced++;
+    }
+  }
+  return rebalanced;
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::ChildIndex(const InternalPage *page, const KeyType &key) const -> int {
+  // Find the last child whose separator is <= key. The first key is invalid and acts as -inf.
+  int lo = 1;
+  int hi = page->GetSize();
+  while (lo < hi) {
+    int mid = lo + (hi - lo) / 2;
+    if (comparator_(page->KeyAt(mid), key) <= 0) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo - 1;
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::KeyIndex(const LeafPage *page, const KeyType &key) const -> int {
+  // Find the first entry whose key is >= key.
+  int lo = 0;
+  int hi = page->GetSize();
+  while (lo < hi) {
+    int mid = lo + (hi - lo) / 2;
+    if (comparator_(page->KeyAt(mid), key) < 0) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo;
+}
+
+/*****************************************************************************
+ * B-LINK
+ *****************************************************************************/
+/*
+ * Latches are always taken in the same order: the header page first, then the pages of a higher level before those
+ * of a lower level, and the pages of a level from left to right. A page is never latched while a page below it or
+ * to its right is held, so no two operations can wait for each other.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::PageLevel(const BPlusTreePage *page) -> int {
+  return page->IsLeafPage() ? 0 : reinterpret_cast<const InternalPage *>(page)->GetLevel();
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::RightLink(const BPlusTreePage *page) -> page_id_t {
+  return page->IsLeafPage() ? reinterpret_cast<const LeafPage *>(page)->GetNextPageId()
+                            : reinterpret_cast<const InternalPage *>(page)->GetRightPageId();
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::HighKey(const BPlusTreePage *page) -> KeyType {
+  return page->IsLeafPage() ? reinterpret_cast<const LeafPage *>(page)->GetHighKey()
+                            : reinterpret_cast<const InternalPage *>(page)->GetHighKey();
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::CoversKey(const BPlusTreePage *page, const KeyType &key) const -> bool {
+  return RightLink(page) == INVALID_PAGE_ID || comparator_(key, HighKey(page)) < 0;
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::MoveRight(ReadPageGuard *guard, const KeyType &key) {
+  while (!CoversKey(guard->template As<BPlusTreePage>(), key)) {
+    // The right sibling is latched before the current page is released.
+    *guard = bpm_->FetchPageRead(RightLink(guard->template As<BPlusTreePage>()));
+  }
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::MoveRight(WritePageGuard *guard, const KeyType &key) {
+  while (!CoversKey(guard->template As<BPlusTreePage>(), key)) {
+    *guard = bpm_->FetchPageWrite(RightLink(guard->template As<BPlusTreePage>()));
+  }
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::SetNodeCache(int levels, size_t max_pages) {
+  node_cache_levels_ = levels;
+  node_cache_max_pages_ = max_pages;
+  node_cache_.Clear();
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::RefreshNodeCache() {
+  if (node_cache_levels_ <= 0 || !node_cache_.IsStale()) {
+    return;
+  }
+  // The header page stays latched while the cache latches pages top-down, so the root cannot be removed meanwhile.
+  auto header_guard = bpm_->FetchPageRead(header_page_id_);
+  const page_id_t root_page_id = header_guard.template As<BPlusTreeHeaderPage>()->root_page_id_;
+  if (root_page_id == INVALID_PAGE_ID) {
+    return;
+  }
+  node_cache_.Rebuild(root_page_id, node_cache_levels_, node_cache_max_pages_,
+                      [](Page *page, std::vector<page_id_t> *children) {
+                        const auto *tree_page = reinterpret_cast<const BPlusTreePage *>(page->GetData());
+                        if (tree_page->IsLeafPage()) {
+                          return false;
+                        }
+                        const auto *internal = reinterpret_cast<const InternalPage *>(tree_page);
+                        for (int i = 0; i < internal->GetSize(); i++) {
+                          children->push_back(internal->ValueAt(i));
+                        }
+                        return true;
+                      });
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::DeleteTreePage(page_id_t page_id, bool is_leaf) {
+  if (node_cache_levels_ > 0 && !is_leaf) {
+    node_cache_.Retire(page_id);
+    return;
+  }
+  bpm_->DeletePage(page_id);
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+template <typename Guard>
+auto BPLUSTREE_TYPE::FetchGuard(page_id_t page_id) -> Guard {
+  if constexpr (std::is_same_v<Guard, WritePageGuard>) {
+    return bpm_->FetchPageWrite(page_id);
+  } else {
+    return bpm_->FetchPageRead(page_id);
+  }
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+template <typename Guard>
+auto BPLUSTREE_TYPE::FindPage(const KeyType &key, int level, page_id_t *root_page_id) -> std::optional<Guard> {
+  RefreshNodeCache();
+  auto header_guard = bpm_->FetchPageRead(header_page_id_);
+  const page_id_t root_id = header_guard.template As<BPlusTreeHeaderPage>()->root_page_id_;
+  if (root_page_id != nullptr) {
+    *root_page_id = root_id;
+  }
+  if (root_id == INVALID_PAGE_ID) {
+    return std::nullopt;
+  }
+
+  // The current page is either a cached page latched through its frame, or held by `guard`. The next page is always
+  // latched before the current one is released.
+  const auto reader = node_cache_.Read();
+  Page *cached = nullptr;
+  ReadPageGuard guard;
+  const auto current = [&] {
+    return reinterpret_cast<const BPlusTreePage *>(cached != nullptr ? cached->GetData() : guard.GetData());
+  };
+  const auto release = [&] {
+    if (cached != nullptr) {
+      cached->RUnlatch();
+      cached = nullptr;
+    } else {
+      guard.Drop();
+    }
+  };
+  const auto move_to = [&](page_id_t page_id) {
+    Page *next = reader.Find(page_id);
+    if (next != nullptr) {
+      next->RLatch();
+      release();
+      cached = next;
+    } else {
+      auto next_guard = bpm_->FetchPageRead(page_id);
+      release();
+      guard = std::move(next_guard);
+    }
+  };
+
+  move_to(root_id);
+  const int root_level = PageLevel(current());
+  if (root_level <= level) {
+    release();
+    if (root_level < level) {
+      return std::nullopt;
+    }
+    // The root cannot be replaced while the header page is latched, but it may be split before it is latched again.
+    auto target = FetchGuard<Guard>(root_id);
+    header_guard.Drop();
+    MoveRight(&target, key);
+    return std::make_optional(std::move(target));
+  }
+  header_guard.Drop();
+
+  while (true) {
+    while (!CoversKey(current(), key)) {
+      move_to(RightLink(current()));
+    }
+    const auto *internal = reinterpret_cast<const InternalPage *>(current());
+    const page_id_t child_page_id = internal->ValueAt(ChildIndex(internal, key));
+    if (internal->GetLevel() == level + 1) {
+      auto target = FetchGuard<Guard>(child_page_id);
+      release();
+      MoveRight(&target, key);
+      return std::make_optional(std::move(target));
+    }
+    move_to(child_page_id);
+  }
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::FindLeftmostLeafRead() -> std::optional<ReadPageGuard> {
+  auto header_guard = bpm_->FetchPageRead(header_page_id_);
+  const page_id_t root_page_id = header_guard.template As<BPlusTreeHeaderPage>()->root_page_id_;
+  if (root_page_id == INVALID_PAGE_ID) {
+    return std::nullopt;
+  }
+
+  // The leftmost child of the leftmost page never moves right: splits only hand entries over to the right.
+  auto guard = bpm_->FetchPageRead(root_page_id);
+  header_guard.Drop();
+  while (!guard.template As<BPlusTreePage>()->IsLeafPage()) {
+    guard = bpm_->FetchPageRead(guard.template As<InternalPage>()->ValueAt(0));
+  }
+  return std::make_optional(std::move(guard));
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::SplitLeaf(WritePageGuard *leaf_guard, KeyType *separator) -> page_id_t {
+  page_id_t new_page_id;
+  // The new page is unreachable until it is linked below, so it does not need a latch yet.
+  auto new_guard = bpm_->NewPageGuarded(&new_page_id);
+  auto *new_leaf = new_guard.template AsMut<LeafPage>();
+  new_leaf->Init(leaf_max_size_);
+
+  auto *leaf = leaf_guard->template AsMut<LeafPage>();
+  leaf->MoveHalfTo(new_leaf);
+  *separator = new_leaf->KeyAt(0);
+  leaf->SetNextPageId(new_page_id);
+  leaf->SetHighKey(*separator);
+  return new_page_id;
+}
+
+/*
+ * No latch is held between a split and its publication: until then, descents reach the new page through the right
+ * link of the split page. The parent is found again by key, as the page it was reached from may have been split or
+ * merged in the meantime.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::InsertIntoParent(int level, KeyType separator, page_id_t right_page_id) {
+  while (true) {
+    auto parent_guard = FindPage<WritePageGuard>(separator, level);
+    if (!parent_guard.has_value()) {
+      // The split page is on the root level.
+      GrowTree(level);
+      continue;
+    }
+    auto *parent = parent_guard->template AsMut<InternalPage>();
+    // A new root takes in the whole root level, so the split may be published already.
+    if (parent->ValueIndex(right_page_id) >= 0) {
+      return;
+    }
+    const int index = ChildIndex(parent, separator) + 1;
+    if (parent->GetSize() < parent->GetMaxSize()) {
+      parent->InsertAt(index, separator, right_page_id);
+      return;
+    }
+
+    // The parent is full: split it, insert into the half that covers the separator and publish this split in turn.
+    page_id_t new_page_id;
+    auto new_guard = bpm_->NewPageGuarded(&new_page_id);
+    auto *new_internal = new_guard.template AsMut<InternalPage>();
+    new_internal->Init(internal_max_size_);
+    parent->MoveHalfTo(new_internal, index);
+    const KeyType parent_separator = new_internal->KeyAt(0);
+    parent->SetRightPageId(new_page_id);
+    parent->SetHighKey(parent_separator);
+    auto *target = comparator_(separator, parent_separator) < 0 ? parent : new_internal;
+    target->InsertAt(ChildIndex(target, separator) + 1, separator, right_page_id);
+    // Cached levels stay correct through right links, but the new sibling should be pinned as well.
+    node_cache_.Invalidate();
+
+    new_guard.Drop();
+    parent_guard->Drop();
+    level++;
+    separator = parent_separator;
+    right_page_id = new_page_id;
+  }
+}
+
+/*
+ * The new root takes in the old root and the pages that the old root has been split into, which are chained to it
+ * through right links. The splits that do not fit are published into the new root like any other.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::GrowTree(int level) {
+  auto header_guard = bpm_->FetchPageWrite(header_page_id_);
+  auto *header = header_guard.template AsMut<BPlusTreeHeaderPage>();
+  auto guard = bpm_->FetchPageRead(header->root_page_id_);
+  if (PageLevel(guard.template As<BPlusTreePage>()) != level - 1) {
+    // Somebody else has grown the tree already.
+    return;
+  }
+
+  page_id_t root_page_id;
+  auto root_guard = bpm_->NewPageGuarded(&root_page_id);
+  auto *root = root_guard.template AsMut<InternalPage>();
+  root->Init(internal_max_size_, level);
+  root->InsertAt(0, KeyType{}, guard.PageId());
+  while (root->GetSize() < root->GetMaxSize() && RightLink(guard.template As<BPlusTreePage>()) != INVALID_PAGE_ID) {
+    const KeyType high_key = HighKey(guard.template As<BPlusTreePage>());
+    guard = bpm_->FetchPageRead(RightLink(guard.template As<BPlusTreePage>()));
+    root->InsertAt(root->GetSize(), high_key, guard.PageId());
+  }
+  header->root_page_id_ = root_page_id;
+  node_cache_.Invalidate();
+}
+
+/*****************************************************************************
+ * PARALLEL SCAN AND BULK LOAD
+ *****************************************************************************/
+/*
+ * Walk down level by level along the leftmost pages, keeping the lower bound key of every page of the level below,
+ * until a level has at least k pages or is made of leaves. Each level is read through the right links, holding the
+ * leftmost page of the level so that the descent can continue from it. The boundaries are then picked evenly from
+ * the lower bounds.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::PartitionKeys(size_t k) -> std::vector<KeyType> {
+  std::vector<KeyType> bounds;
+  auto header_guard = bpm_->FetchPageRead(header_page_id_);
+  const page_id_t root_page_id = header_guard.template As<BPlusTreeHeaderPage>()->root_page_id_;
+  if (k <= 1 || root_page_id == INVALID_PAGE_ID) {
+    return bounds;
+  }
+  auto guard = bpm_->FetchPageRead(root_page_id);
+  header_guard.Drop();
+
+  // The lower bound of the first page of a level is -inf, lower_bounds[0] is never used.
+  std::vector<KeyType> lower_bounds(1);
+  while (lower_bounds.size() < k && !guard.template As<BPlusTreePage>()->IsLeafPage()) {
+    std::vector<KeyType> next_lower_bounds(1);
+    const auto *internal = guard.template As<InternalPage>();
+    std::optional<ReadPageGuard> sibling_guard;
+    while (true) {
+      for (int i = 1; i < internal->GetSize(); i++) {
+        next_lower_bounds.push_back(internal->KeyAt(i));
+      }
+      if (internal->GetRightPageId() == INVALID_PAGE_ID) {
+        break;
+      }
+      next_lower_bounds.push_back(internal->GetHighKey());
+      sibling_guard = bpm_->FetchPageRead(internal->GetRightPageId());
+      internal = sibling_guard->template As<InternalPage>();
+    }
+    sibling_guard = std::nullopt;
+    guard = bpm_->FetchPageRead(guard.template As<InternalPage>()->ValueAt(0));
+    lower_bounds = std::move(next_lower_bounds);
+  }
+
+  const size_t parts = std::min(k, lower_bounds.size());
+  for (size_t i = 1; i < parts; i++) {
+    bounds.push_back(lower_bounds[i * lower_bounds.size() / parts]);
+  }
+  return bounds;
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_TYPE::ScanRange(const KeyType *low, const KeyType *high,
+                               const std::function<void(const KeyType &, const ValueType &)> &fn) {
+  auto leaf_guard = low == nullptr ? FindLeftmostLeafRead() : FindPage<ReadPageGuard>(*low, 0);
+  if (!leaf_guard.has_value()) {
+    return;
+  }
+
+  auto guard = std::move(*leaf_guard);
+  while (true) {
+    const auto *leaf = guard.template As<LeafPage>();
+    for (int i = 0; i < leaf->GetSize(); i++) {
+      const KeyType key = leaf->KeyAt(i);
+      if (low != nullptr && comparator_(key, *low) < 0) {
+        continue;
+      }
+      if (high != nullptr && comparator_(key, *high) >= 0) {
+        return;
+      }
+      fn(key, leaf->ValueAt(i));
+    }
+    if (leaf->GetNextPageId() == INVALID_PAGE_ID) {
+      return;
+    }
+    guard = bpm_->FetchPageRead(leaf->GetNextPageId());
+  }
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::ParallelScan(size_t k, const std::function<void(size_t, const KeyType &, const ValueType &)> &fn)
+    -> size_t {
+  const auto bounds = PartitionKeys(k);
+  const size_t parts = bounds.size() + 1;
+  std::vector<std::thread> threads;
+  threads.reserve(parts);
+  for (size_t part = 0; part < parts; part++) {
+    threads.emplace_back([&, part] {
+      const KeyType *low = part == 0 ? nullptr : &bounds[part - 1];
+      const KeyType *high = part == parts - 1 ? nullptr : &bounds[part];
+      ScanRange(low, high, [&](const KeyType &key, const ValueType &value) { fn(part, key, value); });
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  return parts;
+}
+
+/*
+ * Leaves are filled up to one entry below their max size, and entries are spread evenly so that the last leaf does
+ * not underflow. Every thread builds a contiguous run of leaves and links them; the runs are linked together and the
+ * internal levels are built once all threads are done.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_TYPE::BulkLoad(const std::vector<std::pair<KeyType, ValueType>> &entries, size_t threads) -> bool {
+  auto header_guard = bpm_->FetchPageWrite(header_page_id_);
+  auto *header = header_guard.template AsMut<BPlusTreeHeaderPage>();
+  if (header->root_page_id_ != INVALID_PAGE_ID) {
+    return false;
+  }
+  if (entries.empty()) {
+    return true;
+  }
+
+  const size_t leaf_fill = std::max(leaf_max_size_ - 1, 1);
+  const size_t leaf_count = (entries.size() + leaf_fill - 1) / leaf_fill;
+  const size_t run_count = std::clamp<size_t>(threads, 1, leaf_count);
+  // The entries of leaf i are [leaf_begin(i), leaf_begin(i + 1)).
+  const auto leaf_begin = [&](size_t leaf) { return leaf * entries.size() / leaf_count; };
+
+  std::vector<page_id_t> leaf_ids(leaf_count);
+  const auto build_run = [&](size_t first_leaf, size_t last_leaf) {
+    BasicPageGuard prev_guard;
+    for (size_t leaf_index = first_leaf; leaf_index < last_leaf; leaf_index++) {
+      // Nobody else can reach these pages yet, so they do not need latches.
+      auto guard = bpm_->NewPageGuarded(&leaf_ids[leaf_index]);
+      auto *leaf = guard.template AsMut<LeafPage>();
+      leaf->Init(leaf_max_size_);
+      for (size_t i = leaf_begin(leaf_index); i < leaf_begin(leaf_index + 1); i++) {
+        leaf->InsertAt(leaf->GetSize(), entries[i].first, entries[i].second);
+      }
+      if (leaf_index > first_leaf) {
+        auto *prev = prev_guard.template AsMut<LeafPage>();
+        prev->SetNextPageId(leaf_ids[leaf_index]);
+        prev->SetHighKey(leaf->KeyAt(0));
+      }
+      prev_guard = std::move(guard);
+    }
+  };
+
+  std::vector<std::thread> workers;
+  for (size_t run = 0; run < run_count; run++) {
+    workers.emplace_back(build_run, run * leaf_count / run_count, (run + 1) * leaf_count / run_count);
+  }
+  for (auto &worker : workers) {
+    worker.join();
+  }
+  for (size_t run = 1; run < run_count; run++) {
+    const size_t first_leaf = run * leaf_count / run_count;
+    auto guard = bpm_->FetchPageBasic(leaf_ids[first_leaf - 1]);
+    auto *leaf = guard.template AsMut<LeafPage>();
+    leaf->SetNextPageId(leaf_ids[first_leaf]);
+    leaf->SetHighKey(entries[leaf_begin(first_leaf)].first);
+  }
+
+  // Build the internal levels from the (lower bound, page id) pairs of the level below.
+  std::vector<page_id_t> level = std::move(leaf_ids);
+  std::vector<KeyType> lower_bounds(level.size());
+  for (size_t i = 0; i < level.size(); i++) {
+    lower_bounds[i] = entries[leaf_begin(i)].first;
+  }
+  const size_t internal_fill = std::max(internal_max_size_ - 1, 2);
+  for (int page_level = 1; level.size() > 1; page_level++) {
+    const size_t page_count = (level.size() + internal_fill - 1) / internal_fill;
+    std::vector<page_id_t> next_level(page_count);
+    std::vector<KeyType> next_lower_bounds(page_count);
+    BasicPageGuard prev_guard;
+    for (size_t page_index = 0; page_index < page_count; page_index++) {
+      const size_t begin = page_index * level.size() / page_count;
+      const size_t end = (page_index + 1) * level.size() / page_count;
+      auto guard = bpm_->NewPageGuarded(&next_level[page_index]);
+      auto *internal = guard.template AsMut<InternalPage>();
+      internal->Init(internal_max_size_, page_level);
+      for (size_t i = begin; i < end; i++) {
+        internal->InsertAt(internal->GetSize(), lower_bounds[i], level[i]);
+      }
+      next_lower_bounds[page_index] = lower_bounds[begin];
+      if (page_index > 0) {
+        auto *prev = prev_guard.template AsMut<InternalPage>();
+        prev->SetRightPageId(next_level[page_index]);
+        prev->SetHighKey(lower_bounds[begin]);
+      }
+      prev_guard = std::move(guard);
+    }
+    level = std::move(next_level);
+    lower_bounds = std::move(next_lower_bounds);
+  }
+
+  header->root_page_id_ = level[0];
+  node_cache_.Invalidate();
+  return true;
 }
 
 /*****************************************************************************
@@ -109,7 +873,10 @@ auto BPLUSTREE_TYPE::End() -> INDEXITERATOR_TYPE { return INDEXITERATOR_TYPE();
  * @return Page id of the root of this tree
  */
 INDEX_TEMPLATE_ARGUMENTS
-auto BPLUSTREE_TYPE::GetRootPageId() -> page_id_t { return 0; }
+auto BPLUSTREE_TYPE::GetRootPageId() -> page_id_t {
+  auto header_guard = bpm_->FetchPageRead(header_page_id_);
+  return header_guard.template As<BPlusTreeHeaderPage>()->root_page_id_;
+}
 
 /*****************************************************************************
  * UTILITIES AND DEBUG
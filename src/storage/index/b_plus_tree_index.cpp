@@ -11,6 +11,9 @@
 
 #include "storage/index/b_plus_tree_index.h"
 
+#include <algorithm>
+#include <thread>  // NOLINT
+
 namespace bustub {
 /*
  * Constructor
@@ -51,6 +54,65 @@ void BPLUSTREE_INDEX_TYPE::ScanKey(const Tuple &key, std::vector<RID> *result, T
   container_->GetValue(index_key, result, transaction);
 }
 
+/*
+ * Every thread stable-sorts one chunk, then the chunks are merged pairwise, with one thread per pair, until a single
+ * run is left. Stability keeps the entries of a key in their original order, so the first one is kept.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_INDEX_TYPE::BulkLoad(std::vector<std::pair<KeyType, ValueType>> entries, size_t threads,
+                                    Transaction *transaction) -> bool {
+  const auto less = [this](const auto &lhs, const auto &rhs) { return comparator_(lhs.first, rhs.first) < 0; };
+  const size_t chunk_count =
+      std::clamp<size_t>(entries.size() / BULK_LOAD_MIN_ENTRIES_PER_THREAD, 1, std::max<size_t>(threads, 1));
+  std::vector<size_t> run_begin(chunk_count + 1);
+  for (size_t i = 0; i <= chunk_count; i++) {
+    run_begin[i] = i * entries.size() / chunk_count;
+  }
+
+  std::vector<std::thread> workers;
+  for (size_t i = 0; i < chunk_count; i++) {
+    workers.emplace_back(
+        [&, i] { std::stable_sort(entries.begin() + run_begin[i], entries.begin() + run_begin[i + 1], less); });
+  }
+  for (auto &worker : workers) {
+    worker.join();
+  }
+
+  while (run_begin.size() > 2) {
+    workers.clear();
+    std::vector<size_t> merged_begin;
+    for (size_t i = 0; i + 1 < run_begin.size(); i += 2) {
+      merged_begin.push_back(run_begin[i]);
+      if (i + 2 < run_begin.size()) {
+        workers.emplace_back([&, i] {
+          std::inplace_merge(entries.begin() + run_begin[i], entries.begin() + run_begin[i + 1],
+                             entries.begin() + run_begin[i + 2], less);
+        });
+      }
+    }
+    for (auto &worker : workers) {
+      worker.join();
+    }
+    merged_begin.push_back(entries.size());
+    run_begin = std::move(merged_begin);
+  }
+
+  entries.erase(
+      std::unique(entries.begin(), entries.end(),
+                  [this](const auto &lhs, const auto &rhs) { return comparator_(lhs.first, rhs.first) == 0; }),
+      entries.end());
+  return container_->BulkLoad(entries, threads);
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+auto BPLUSTREE_INDEX_TYPE::PartitionKeys(size_t k) -> std::vector<KeyType> { return container_->PartitionKeys(k); }
+
+INDEX_TEMPLATE_ARGUMENTS
+void BPLUSTREE_INDEX_TYPE::ScanRange(const KeyType *low, const KeyType *high,
+                                     const std::function<void(const KeyType &, const ValueType &)> &fn) {
+  container_->ScanRange(low, high, fn);
+}
+
 INDEX_TEMPLATE_ARGUMENTS
 auto BPLUSTREE_INDEX_TYPE::GetBeginIterator() -> INDEXITERATOR_TYPE { return container_->Begin(); }
 
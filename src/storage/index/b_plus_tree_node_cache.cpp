@@ -0,0 +1,49 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// b_plus_tree_node_cache.cpp
+//
+// Identification: src/storage/index/b_plus_tree_node_cache.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "storage/index/b_plus_tree_node_cache.h"
+
+namespace bustub {
+
+BPlusTreeNodeCache::~BPlusTreeNodeCache() { Clear(); }
+
+void BPlusTreeNodeCache::Retire(page_id_t page_id) {
+  {
+    std::scoped_lock lock(retired_latch_);
+    retired_.push_back(page_id);
+  }
+  Invalidate();
+}
+
+void BPlusTreeNodeCache::Clear() {
+  std::unique_lock lock(latch_);
+  ClearLocked();
+  stale_.store(true, std::memory_order_release);
+}
+
+void BPlusTreeNodeCache::ClearLocked() {
+  for (const auto &[page_id, page] : pages_) {
+    bpm_->UnpinPage(page_id, false);
+  }
+  pages_.clear();
+
+  std::vector<page_id_t> retired;
+  {
+    std::scoped_lock lock(retired_latch_);
+    retired.swap(retired_);
+  }
+  for (const auto page_id : retired) {
+    bpm_->DeletePage(page_id);
+  }
+}
+
+}  // namespace bustub
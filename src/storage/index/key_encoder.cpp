@@ -0,0 +1,119 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// key_encoder.cpp
+//
+// Identification: src/storage/index/key_encoder.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "storage/index/key_encoder.h"
+
+#include <cstring>
+
+#include "common/exception.h"
+
+namespace bustub {
+
+namespace {
+
+constexpr char KEY_NULL_MARKER = 0x00;
+constexpr char KEY_NOT_NULL_MARKER = 0x01;
+
+/** Append `bits` in big-endian byte order. */
+template <typename T>
+void AppendBigEndian(T bits, std::string *out) {
+  for (int shift = (sizeof(T) - 1) * 8; shift >= 0; shift -= 8) {
+    out->push_back(static_cast<char>((bits >> shift) & 0xFF));
+  }
+}
+
+/** Append a signed integer so that unsigned byte order matches signed order. */
+template <typename Signed, typename Unsigned>
+void AppendSigned(Signed value, std::string *out) {
+  constexpr Unsigned sign_bit = static_cast<Unsigned>(1) << (sizeof(Unsigned) * 8 - 1);
+  AppendBigEndian<Unsigned>(static_cast<Unsigned>(value) ^ sign_bit, out);
+}
+
+}  // namespace
+
+void KeyEncoder::EncodeValue(const Value &value, std::string *out, bool descending) {
+  if (descending) {
+    const size_t begin = out->size();
+    EncodeValue(value, out);
+    for (size_t i = begin; i < out->size(); i++) {
+      (*out)[i] = static_cast<char>(~(*out)[i]);
+    }
+    return;
+  }
+  if (value.IsNull()) {
+    out->push_back(KEY_NULL_MARKER);
+    return;
+  }
+  out->push_back(KEY_NOT_NULL_MARKER);
+
+  switch (value.GetTypeId()) {
+    case TypeId::BOOLEAN:
+    case TypeId::TINYINT:
+      AppendSigned<int8_t, uint8_t>(value.GetAs<int8_t>(), out);
+      break;
+    case TypeId::SMALLINT:
+      AppendSigned<int16_t, uint16_t>(value.GetAs<int16_t>(), out);
+      break;
+    case TypeId::INTEGER:
+      AppendSigned<int32_t, uint32_t>(value.GetAs<int32_t>(), out);
+      break;
+    case TypeId::BIGINT:
+      AppendSigned<int64_t, uint64_t>(value.GetAs<int64_t>(), out);
+      break;
+    case TypeId::TIMESTAMP:
+      AppendBigEndian<uint64_t>(value.GetAs<uint64_t>(), out);
+      break;
+    case TypeId::DECIMAL: {
+      auto d = value.GetAs<double>();
+      uint64_t bits;
+      memcpy(&bits, &d, sizeof(bits));
+      constexpr uint64_t sign_bit = static_cast<uint64_t>(1) << 63;
+      bits = (bits & sign_bit) != 0 ? ~bits : bits ^ sign_bit;
+      AppendBigEndian<uint64_t>(bits, out);
+      break;
+    }
+    case TypeId::VARCHAR: {
+      // The stored length includes the trailing '\0'.
+      const char *data = value.GetData();
+      const uint32_t len = value.GetLength() - 1;
+      for (uint32_t i = 0; i < len; i++) {
+        out->push_back(data[i]);
+        if (data[i] == '\0') {
+          out->push_back(static_cast<char>(0xFF));
+        }
+      }
+      out->push_back('\0');
+      out->push_back('\0');
+      break;
+    }
+    default:
+      throw NotImplementedException("key type not supported by KeyEncoder");
+  }
+}
+
+auto KeyEncoder::EncodeValues(const std::vector<Value> &values) -> std::string {
+  std::string out;
+  for (const auto &value : values) {
+    EncodeValue(value, &out);
+  }
+  return out;
+}
+
+auto KeyEncoder::EncodeKey(const Tuple &key, const Schema &key_schema) -> std::string {
+  std::string out;
+  for (uint32_t i = 0; i < key_schema.GetColumnCount(); i++) {
+    EncodeValue(key.GetValue(&key_schema, i), &out);
+  }
+  return out;
+}
+
+}  // namespace bustub
@@ -9,6 +9,7 @@
 //
 //===----------------------------------------------------------------------===//
 
+#include <algorithm>
 #include <iostream>
 #include <sstream>
 
@@ -22,29 +23,127 @@ namespace bustub {
 /*
  * Init method after creating a new internal page
  * Including set page type, set current size, and set max page size
+ * The right page id should start out as INVALID_PAGE_ID (no high key)
  */
 INDEX_TEMPLATE_ARGUMENTS
-void B_PLUS_TREE_INTERNAL_PAGE_TYPE::Init(int max_size) {}
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::Init(int max_size, int level) {
+  SetPageType(IndexPageType::INTERNAL_PAGE);
+  SetSize(0);
+  SetMaxSize(max_size);
+  right_page_id_ = INVALID_PAGE_ID;
+  level_ = level;
+}
 /*
  * Helper method to get/set the key associated with input "index"(a.k.a
  * array offset)
  */
 INDEX_TEMPLATE_ARGUMENTS
-auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::KeyAt(int index) const -> KeyType {
-  // replace with your own code
-  KeyType key{};
-  return key;
-}
+auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::KeyAt(int index) const -> KeyType { return array_[index].first; }
 
 INDEX_TEMPLATE_ARGUMENTS
-void B_PLUS_TREE_INTERNAL_PAGE_TYPE::SetKeyAt(int index, const KeyType &key) {}
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::SetKeyAt(int index, const KeyType &key) { array_[index].first = key; }
 
 /*
  * Helper method to get the value associated with input "index"(a.k.a array
  * offset)
  */
 INDEX_TEMPLATE_ARGUMENTS
-auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::ValueAt(int index) const -> ValueType { return 0; }
+auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::ValueAt(int index) const -> ValueType { return array_[index].second; }
+
+/*
+ * Helper method to find the index of the child pointer equal to input "value"
+ * @return : the index, or -1 if this page does not point to value
+ */
+INDEX_TEMPLATE_ARGUMENTS
+auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::ValueIndex(const ValueType &value) const -> int {
+  for (int i = 0; i < GetSize(); i++) {
+    if (array_[i].second == value) {
+      return i;
+    }
+  }
+  return -1;
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::SetValueAt(int index, const ValueType &value) { array_[index].second = value; }
+
+INDEX_TEMPLATE_ARGUMENTS
+auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::GetRightPageId() const -> page_id_t { return right_page_id_; }
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::SetRightPageId(page_id_t right_page_id) { right_page_id_ = right_page_id; }
+
+INDEX_TEMPLATE_ARGUMENTS
+auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::GetHighKey() const -> KeyType { return high_key_; }
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::SetHighKey(const KeyType &key) { high_key_ = key; }
+
+INDEX_TEMPLATE_ARGUMENTS
+auto B_PLUS_TREE_INTERNAL_PAGE_TYPE::GetLevel() const -> int { return level_; }
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::SetLevel(int level) { level_ = level; }
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::InsertAt(int index, const KeyType &key, const ValueType &value) {
+  std::move_backward(array_ + index, array_ + GetSize(), array_ + GetSize() + 1);
+  array_[index] = {key, value};
+  IncreaseSize(1);
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::MoveHalfTo(BPlusTreeInternalPage *recipient, int insert_index) {
+  // Once the pending entry is inserted, this page holds the first (size + 1) / 2 entries, rounded up.
+  const int left_size = (GetSize() + 2) / 2;
+  const int split = insert_index < left_size ? left_size - 1 : left_size;
+  std::copy(array_ + split, array_ + GetSize(), recipient->array_);
+  recipient->SetSize(GetSize() - split);
+  recipient->SetRightPageId(GetRightPageId());
+  recipient->SetHighKey(GetHighKey());
+  recipient->SetLevel(GetLevel());
+  SetSize(split);
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::RemoveAt(int index) {
+  std::move(array_ + index + 1, array_ + GetSize(), array_ + index);
+  IncreaseSize(-1);
+}
+
+/*****************************************************************************
+ * MERGE / REDISTRIBUTE
+ *****************************************************************************/
+/*
+ * Append all entries to the left sibling `recipient`. The first key of this page is invalid, so it is replaced by
+ * the separator pulled down from the parent.
+ */
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::MoveAllTo(BPlusTreeInternalPage *recipient, const KeyType &middle_key) {
+  array_[0].first = middle_key;
+  std::copy(array_, array_ + GetSize(), recipient->array_ + recipient->GetSize());
+  recipient->IncreaseSize(GetSize());
+  recipient->SetRightPageId(GetRightPageId());
+  recipient->SetHighKey(GetHighKey());
+  SetSize(0);
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::MoveFirstToEndOf(BPlusTreeInternalPage *recipient, const KeyType &middle_key) {
+  recipient->array_[recipient->GetSize()] = {middle_key, array_[0].second};
+  recipient->IncreaseSize(1);
+  RemoveAt(0);
+}
+
+INDEX_TEMPLATE_ARGUMENTS
+void B_PLUS_TREE_INTERNAL_PAGE_TYPE::MoveLastToFrontOf(BPlusTreeInternalPage *recipient, const KeyType &middle_key) {
+  std::move_backward(recipient->array_, recipient->array_ + recipient->GetSize(),
+                     recipient->array_ + recipient->GetSize() + 1);
+  recipient->array_[1].first = middle_key;
+  recipient->array_[0].second = array_[GetSize() - 1].second;
+  recipient->IncreaseSize(1);
+  IncreaseSize(-1);
+}
 
 // valuetype for internalNode should be page id_t
 template class BPlusTreeInternalPage<GenericKey<4>, page_id_t, GenericComparator<4>>;
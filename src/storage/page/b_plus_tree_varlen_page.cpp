@@ -0,0 +1,218 @@
+//===----------------------------------------------------------------------===//
+//
+//                         CMU-DB Project (15-445/645)
+//                         ***DO NO SHARE PUBLICLY***
+//
+// Identification: src/page/b_plus_tree_varlen_page.cpp
+//
+// Copyright (c) 2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <algorithm>
+#include <cstring>
+
+#include "common/macros.h"
+#include "common/rid.h"
+#include "storage/index/key_encoder.h"
+#include "storage/page/b_plus_tree_varlen_page.h"
+
+namespace bustub {
+
+/*****************************************************************************
+ * HELPER METHODS AND UTILITIES
+ *****************************************************************************/
+
+/**
+ * Init method after creating a new page
+ * Including set page type, set current size to zero, set next page id and reset the cell heap
+ */
+template <typename ValueType>
+void B_PLUS_TREE_VARLEN_PAGE_TYPE::Init(IndexPageType page_type) {
+  page_type_ = page_type;
+  size_ = 0;
+  next_page_id_ = INVALID_PAGE_ID;
+  free_space_end_ = BUSTUB_PAGE_SIZE;
+  fragmented_bytes_ = 0;
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::KeyAt(int index) const -> std::string_view {
+  BUSTUB_ASSERT(index >= 0 && index < size_, "slot index out of range");
+  return {PageData() + slots_[index].offset_, slots_[index].key_size_};
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::ValueAt(int index) const -> ValueType {
+  BUSTUB_ASSERT(index >= 0 && index < size_, "slot index out of range");
+  // Cells are not aligned, so always go through memcpy.
+  ValueType value;
+  memcpy(&value, PageData() + slots_[index].offset_ + slots_[index].key_size_, sizeof(ValueType));
+  return value;
+}
+
+template <typename ValueType>
+void B_PLUS_TREE_VARLEN_PAGE_TYPE::SetValueAt(int index, const ValueType &value) {
+  BUSTUB_ASSERT(index >= 0 && index < size_, "slot index out of range");
+  memcpy(PageData() + slots_[index].offset_ + slots_[index].key_size_, &value, sizeof(ValueType));
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::FreeSpace() const -> size_t {
+  return free_space_end_ - (VARLEN_PAGE_HEADER_SIZE + size_ * SLOT_SIZE) + fragmented_bytes_;
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::CanInsert(size_t key_size) const -> bool {
+  return SLOT_SIZE + key_size + sizeof(ValueType) <= FreeSpace();
+}
+
+/*****************************************************************************
+ * LOOKUP
+ *****************************************************************************/
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::LowerBound(std::string_view key) const -> int {
+  int lo = 0;
+  int hi = size_;
+  while (lo < hi) {
+    int mid = lo + (hi - lo) / 2;
+    if (KeyEncoder::Compare(KeyAt(mid), key) < 0) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo;
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::Lookup(std::string_view key, ValueType *value) const -> bool {
+  int index = LowerBound(key);
+  if (index == size_ || KeyEncoder::Compare(KeyAt(index), key) != 0) {
+    return false;
+  }
+  *value = ValueAt(index);
+  return true;
+}
+
+/*****************************************************************************
+ * INSERTION / REMOVAL
+ *****************************************************************************/
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::Insert(std::string_view key, const ValueType &value) -> bool {
+  int index = LowerBound(key);
+  if (index < size_ && KeyEncoder::Compare(KeyAt(index), key) == 0) {
+    return false;
+  }
+  return InsertAt(index, key, value);
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::InsertAt(int index, std::string_view key, const ValueType &value) -> bool {
+  BUSTUB_ASSERT(index >= 0 && index <= size_, "slot index out of range");
+  if (!CanInsert(key.size())) {
+    return false;
+  }
+  const size_t cell_size = key.size() + sizeof(ValueType);
+  const size_t slots_end = VARLEN_PAGE_HEADER_SIZE + (size_ + 1) * SLOT_SIZE;
+  if (free_space_end_ < slots_end + cell_size) {
+    // Enough space in total, but it is fragmented.
+    Compact();
+  }
+
+  free_space_end_ -= cell_size;
+  memcpy(PageData() + free_space_end_, key.data(), key.size());
+  memcpy(PageData() + free_space_end_ + key.size(), &value, sizeof(ValueType));
+
+  memmove(&slots_[index + 1], &slots_[index], (size_ - index) * SLOT_SIZE);
+  slots_[index].offset_ = static_cast<uint16_t>(free_space_end_);
+  slots_[index].key_size_ = static_cast<uint16_t>(key.size());
+  size_++;
+  return true;
+}
+
+template <typename ValueType>
+auto B_PLUS_TREE_VARLEN_PAGE_TYPE::Remove(std::string_view key) -> bool {
+  int index = LowerBound(key);
+  if (index == size_ || KeyEncoder::Compare(KeyAt(index), key) != 0) {
+    return false;
+  }
+  RemoveAt(index);
+  return true;
+}
+
+template <typename ValueType>
+void B_PLUS_TREE_VARLEN_PAGE_TYPE::RemoveAt(int index) {
+  BUSTUB_ASSERT(index >= 0 && index < size_, "slot index out of range");
+  const auto &slot = slots_[index];
+  if (slot.offset_ == free_space_end_) {
+    // The cell borders the free space, give it back directly.
+    free_space_end_ += CellSize(slot);
+  } else {
+    fragmented_bytes_ += CellSize(slot);
+  }
+  memmove(&slots_[index], &slots_[index + 1], (size_ - index - 1) * SLOT_SIZE);
+  size_--;
+}
+
+template <typename ValueType>
+void B_PLUS_TREE_VARLEN_PAGE_TYPE::Compact() {
+  char buffer[BUSTUB_PAGE_SIZE];
+  uint32_t end = BUSTUB_PAGE_SIZE;
+  for (int i = 0; i < size_; i++) {
+    const size_t cell_size = CellSize(slots_[i]);
+    end -= cell_size;
+    memcpy(buffer + end, PageData() + slots_[i].offset_, cell_size);
+    slots_[i].offset_ = static_cast<uint16_t>(end);
+  }
+  memcpy(PageData() + end, buffer + end, BUSTUB_PAGE_SIZE - end);
+  free_space_end_ = end;
+  fragmented_bytes_ = 0;
+}
+
+/*****************************************************************************
+ * SPLIT / MERGE
+ *****************************************************************************/
+
+template <typename ValueType>
+void B_PLUS_TREE_VARLEN_PAGE_TYPE::MoveHalfTo(BPlusTreeVarlenPage *recipient) {
+  BUSTUB_ASSERT(recipient->GetSize() == 0, "recipient must be empty");
+  BUSTUB_ASSERT(size_ >= 2, "cannot split a page with less than two entries");
+
+  // Split by bytes rather than by entry count, so both halves have a similar amount of free space.
+  size_t total = 0;
+  for (int i = 0; i < size_; i++) {
+    total += SLOT_SIZE + CellSize(slots_[i]);
+  }
+  int split = 0;
+  size_t used = 0;
+  while (split < size_ - 1 && used < total / 2) {
+    used += SLOT_SIZE + CellSize(slots_[split]);
+    split++;
+  }
+  split = std::max(split, 1);
+
+  for (int i = split; i < size_; i++) {
+    recipient->InsertAt(recipient->GetSize(), KeyAt(i), ValueAt(i));
+    fragmented_bytes_ += CellSize(slots_[i]);
+  }
+  size_ = split;
+  Compact();
+}
+
+template <typename ValueType>
+void B_PLUS_TREE_VARLEN_PAGE_TYPE::MoveAllTo(BPlusTreeVarlenPage *recipient) {
+  for (int i = 0; i < size_; i++) {
+    [[maybe_unused]] bool inserted = recipient->InsertAt(recipient->GetSize(), KeyAt(i), ValueAt(i));
+    BUSTUB_ASSERT(inserted, "recipient does not have enough space for merging");
+  }
+  size_ = 0;
+  free_space_end_ = BUSTUB_PAGE_SIZE;
+  fragmented_bytes_ = 0;
+}
+
+template class BPlusTreeVarlenPage<RID>;
+template class BPlusTreeVarlenPage<page_id_t>;
+}  // namespace bustub
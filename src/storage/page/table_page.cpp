@@ -81,6 +81,15 @@ auto TablePage::GetTuple(const RID &rid) const -> std::pair<TupleMeta, Tuple> {
   return std::make_pair(meta, std::move(tuple));
 }
 
+auto TablePage::PeekTuple(const RID &rid) const -> std::pair<TupleMeta, const char *> {
+  auto tuple_id = rid.GetSlotNum();
+  if (tuple_id >= num_tuples_) {
+    throw bustub::Exception("Tuple ID out of range");
+  }
+  auto &[offset, size, meta] = tuple_info_[tuple_id];
+  return std::make_pair(meta, page_start_ + offset);
+}
+
 auto TablePage::GetTupleMeta(const RID &rid) const -> TupleMeta {
   auto tuple_id = rid.GetSlotNum();
   if (tuple_id >= num_tuples_) {
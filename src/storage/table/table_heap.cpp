@@ -107,16 +107,18 @@ auto TableHeap::GetTupleMeta(RID rid) -> TupleMeta {
   return page->GetTupleMeta(rid);
 }
 
-auto TableHeap::MakeIterator() -> TableIterator {
+auto TableHeap::GetEndRid() -> RID {
   std::unique_lock<std::mutex> guard(latch_);
   auto last_page_id = last_page_id_;
   guard.unlock();
 
   auto page_guard = bpm_->FetchPageRead(last_page_id);
   auto page = page_guard.As<TablePage>();
-  return {this, {first_page_id_, 0}, {last_page_id, page->GetNumTuples()}};
+  return {last_page_id, page->GetNumTuples()};
 }
 
+auto TableHeap::MakeIterator() -> TableIterator { return {this, {first_page_id_, 0}, GetEndRid()}; }
+
 auto TableHeap::MakeEagerIterator() -> TableIterator { return {this, {first_page_id_, 0}, {INVALID_PAGE_ID, 0}}; }
 
 void TableHeap::UpdateTupleInPlaceUnsafe(const TupleMeta &meta, const Tuple &tuple, RID rid) {
@@ -0,0 +1,95 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// tuple_batch.cpp
+//
+// Identification: src/storage/table/tuple_batch.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include "storage/table/tuple_batch.h"
+
+#include <utility>
+
+#include "common/macros.h"
+
+namespace bustub {
+
+void TupleBatch::Reset(const Schema *schema) {
+  schema_ = schema;
+  columns_.clear();
+  columns_.resize(schema->GetColumnCount());
+  rids_.clear();
+}
+
+void TupleBatch::Clear() {
+  for (auto &column : columns_) {
+    column.clear();
+  }
+  rids_.clear();
+}
+
+void TupleBatch::AppendTuple(const Tuple &tuple, RID rid) {
+  for (uint32_t i = 0; i < columns_.size(); i++) {
+    columns_[i].push_back(tuple.GetValue(schema_, i));
+  }
+  rids_.push_back(rid);
+}
+
+void TupleBatch::AppendRow(std::vector<Value> values, RID rid) {
+  BUSTUB_ASSERT(values.size() == columns_.size(), "row does not match the batch schema");
+  for (uint32_t i = 0; i < columns_.size(); i++) {
+    columns_[i].push_back(std::move(values[i]));
+  }
+  rids_.push_back(rid);
+}
+
+void TupleBatch::AppendRowFrom(const TupleBatch &other, size_t row) {
+  BUSTUB_ASSERT(other.columns_.size() == columns_.size(), "batches have a different number of columns");
+  for (uint32_t i = 0; i < columns_.size(); i++) {
+    columns_[i].push_back(other.columns_[i][row]);
+  }
+  rids_.push_back(other.rids_[row]);
+}
+
+auto TupleBatch::GetTuple(size_t row) const -> Tuple {
+  std::vector<Value> values;
+  values.reserve(columns_.size());
+  for (const auto &column : columns_) {
+    values.push_back(column[row]);
+  }
+  return {std::move(values), schema_};
+}
+
+void TupleBatch::Compact(const std::vector<bool> &selection) {
+  BUSTUB_ASSERT(selection.size() == rids_.size(), "selection does not match the batch size");
+  size_t kept = 0;
+  for (size_t row = 0; row < rids_.size(); row++) {
+    if (!selection[row]) {
+      continue;
+    }
+    if (kept != row) {
+      for (auto &column : columns_) {
+        column[kept] = std::move(column[row]);
+      }
+      rids_[kept] = rids_[row];
+    }
+    kept++;
+  }
+  Truncate(kept);
+}
+
+void TupleBatch::Truncate(size_t rows) {
+  if (rows >= rids_.size()) {
+    return;
+  }
+  for (auto &column : columns_) {
+    column.erase(column.begin() + rows, column.end());
+  }
+  rids_.resize(rows);
+}
+
+}  // namespace bustub
@@ -0,0 +1,74 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// plan_cache_test.cpp
+//
+// Identification: test/common/plan_cache_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <string>
+
+#include "common/plan_cache.h"
+#include "gtest/gtest.h"
+#include "sql_test_util.h"  // NOLINT
+
+namespace bustub {
+
+static auto MakePlan(uint64_t version) -> std::shared_ptr<const CachedPlan> {
+  return std::make_shared<const CachedPlan>(CachedPlan{nullptr, nullptr, false, version});
+}
+
+// NOLINTNEXTLINE
+TEST(PlanCacheTest, NormalizeTest) {
+  ASSERT_EQ(PlanCache::Normalize("  SELECT *\n  FROM t\tWHERE a = 1 ;; "), "select * from t where a = 1");
+  ASSERT_EQ(PlanCache::Normalize("select 'A  B' from \"T\""), "select 'A  B' from \"T\"");
+  ASSERT_NE(PlanCache::Normalize("select 'a'"), PlanCache::Normalize("select 'A'"));
+}
+
+// NOLINTNEXTLINE
+TEST(PlanCacheTest, EvictionTest) {
+  PlanCache cache(2);
+  cache.Put("a", MakePlan(0));
+  cache.Put("b", MakePlan(0));
+  ASSERT_NE(cache.Get("a", 0), nullptr);
+
+  // `b` is the least recently used plan now.
+  cache.Put("c", MakePlan(0));
+  ASSERT_EQ(cache.Size(), 2);
+  ASSERT_EQ(cache.Get("b", 0), nullptr);
+  ASSERT_NE(cache.Get("a", 0), nullptr);
+  ASSERT_NE(cache.Get("c", 0), nullptr);
+
+  // Plans of an older version are dropped.
+  ASSERT_EQ(cache.Get("a", 1), nullptr);
+  ASSERT_EQ(cache.Size(), 1);
+}
+
+// NOLINTNEXTLINE
+TEST(PlanCacheTest, PreparedStatementTest) {
+  SqlTestInstance bustub;
+
+  bustub.Execute("prepare q(int) as select colA, colB from __mock_table_1 where colA = $1;");
+  ASSERT_EQ(bustub.Execute("execute q(3);"), "3 300 \n");
+  ASSERT_EQ(bustub.Execute("execute q(7);"), "7 700 \n");
+  ASSERT_THROW(bustub.Execute("execute q(1, 2);"), Exception);
+  ASSERT_THROW(bustub.Execute("select * from __mock_table_1 where colA = $1;"), Exception);
+
+  // The prepared statement is planned again after a setting that affects planning has changed.
+  bustub.Execute("set force_optimizer_starter_rule = yes;");
+  ASSERT_EQ(bustub.Execute("execute q(5);"), "5 500 \n");
+
+  // Repeated queries are answered from the plan cache.
+  ASSERT_EQ(bustub.Execute("select colB from __mock_table_1 where colA = 9;"), "900 \n");
+  ASSERT_EQ(bustub.Execute("SELECT colB\n FROM __mock_table_1 WHERE colA = 9"), "900 \n");
+
+  bustub.Execute("deallocate q;");
+  ASSERT_THROW(bustub.Execute("execute q(3);"), Exception);
+}
+
+}  // namespace bustub
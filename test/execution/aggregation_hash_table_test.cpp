@@ -0,0 +1,150 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// aggregation_hash_table_test.cpp
+//
+// Identification: test/execution/aggregation_hash_table_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <algorithm>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "execution/aggregation_hash_table.h"
+#include "gtest/gtest.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(AggregationHashTableTest, IntegerKeyTest) {
+  AggregationHashTable aht(
+      {TypeId::INTEGER},
+      {AggregationType::CountStarAggregate, AggregationType::SumAggregate, AggregationType::MinAggregate,
+       AggregationType::MaxAggregate, AggregationType::CountAggregate},
+      {TypeId::INTEGER, TypeId::INTEGER, TypeId::INTEGER, TypeId::INTEGER, TypeId::INTEGER});
+
+  // Enough groups to grow the table several times, inserted over several batches; key 3 gets NULL keys.
+  const int group_count = 10000;
+  for (int batch = 0; batch < 4; batch++) {
+    std::vector<std::vector<Value>> keys(1);
+    std::vector<std::vector<Value>> inputs(5);
+    for (int i = 0; i < group_count; i++) {
+      keys[0].push_back(i == 3 ? ValueFactory::GetNullValueByType(TypeId::INTEGER) : ValueFactory::GetIntegerValue(i));
+      auto input =
+          batch == 0 ? ValueFactory::GetNullValueByType(TypeId::INTEGER) : ValueFactory::GetIntegerValue(batch);
+      for (int agg = 1; agg < 5; agg++) {
+        inputs[agg].push_back(input);
+      }
+    }
+    aht.InsertBatch(keys, inputs, group_count);
+  }
+
+  ASSERT_EQ(aht.Size(), group_count);
+  for (size_t group = 0; group < aht.Size(); group++) {
+    ASSERT_EQ(aht.AggregateAt(group, 0).GetAs<int32_t>(), 4);
+    ASSERT_EQ(aht.AggregateAt(group, 1).GetAs<int32_t>(), 6);
+    ASSERT_EQ(aht.AggregateAt(group, 2).GetAs<int32_t>(), 1);
+    ASSERT_EQ(aht.AggregateAt(group, 3).GetAs<int32_t>(), 3);
+    ASSERT_EQ(aht.AggregateAt(group, 4).GetAs<int32_t>(), 3);
+  }
+  ASSERT_TRUE(aht.KeyAt(3, 0).IsNull());
+
+  aht.Clear();
+  ASSERT_EQ(aht.Size(), 0);
+  ASSERT_EQ(aht.InitialAggregate(0).GetAs<int32_t>(), 0);
+  ASSERT_TRUE(aht.InitialAggregate(1).IsNull());
+  ASSERT_TRUE(aht.InitialAggregate(4).IsNull());
+}
+
+// NOLINTNEXTLINE
+TEST(AggregationHashTableTest, CompositeKeyTest) {
+  AggregationHashTable aht({TypeId::VARCHAR, TypeId::INTEGER},
+                           {AggregationType::SumAggregate, AggregationType::MaxAggregate},
+                           {TypeId::DECIMAL, TypeId::VARCHAR});
+
+  std::vector<std::vector<Value>> keys(2);
+  std::vector<std::vector<Value>> inputs(2);
+  std::map<std::string, double> expected_sums;
+  std::map<std::string, std::string> expected_maxes;
+  for (int i = 0; i < 3000; i++) {
+    const auto name = std::string(i % 7, 'a');
+    keys[0].push_back(ValueFactory::GetVarcharValue(name));
+    keys[1].push_back(ValueFactory::GetIntegerValue(i % 5));
+    inputs[0].push_back(ValueFactory::GetDecimalValue(0.5));
+    inputs[1].push_back(ValueFactory::GetVarcharValue(std::to_string(i % 10)));
+    const auto key = name + "/" + std::to_string(i % 5);
+    expected_sums[key] += 0.5;
+    expected_maxes[key] = std::max(expected_maxes[key], std::to_string(i % 10));
+  }
+  aht.InsertBatch(keys, inputs, 3000);
+
+  ASSERT_EQ(aht.Size(), expected_sums.size());
+  for (size_t group = 0; group < aht.Size(); group++) {
+    const auto key = aht.KeyAt(group, 0).ToString() + "/" + aht.KeyAt(group, 1).ToString();
+    ASSERT_DOUBLE_EQ(aht.AggregateAt(group, 0).GetAs<double>(), expected_sums[key]) << key;
+    ASSERT_EQ(aht.AggregateAt(group, 1).ToString(), expected_maxes[key]) << key;
+  }
+}
+
+// NOLINTNEXTLINE
+TEST(AggregationHashTableTest, MergePartitionsTest) {
+  const std::vector<AggregationType> agg_types{AggregationType::CountStarAggregate, AggregationType::SumAggregate,
+                                               AggregationType::MinAggregate, AggregationType::MaxAggregate};
+  const std::vector<TypeId> input_types(4, TypeId::INTEGER);
+
+  // Two partial tables over overlapping keys; the second one also has the NULL key, and NULL inputs for key 0.
+  std::vector<AggregationHashTable> partials;
+  for (int part = 0; part < 2; part++) {
+    partials.emplace_back(std::vector<TypeId>{TypeId::INTEGER}, agg_types, input_types);
+    std::vector<std::vector<Value>> keys(1);
+    std::vector<std::vector<Value>> inputs(4);
+    for (int i = part * 50; i < part * 50 + 100; i++) {
+      keys[0].push_back(i == 120 ? ValueFactory::GetNullValueByType(TypeId::INTEGER)
+                                 : ValueFactory::GetIntegerValue(i));
+      auto input = part == 1 && i == 50 ? ValueFactory::GetNullValueByType(TypeId::INTEGER)
+                                        : ValueFactory::GetIntegerValue(part + 1);
+      for (int agg = 1; agg < 4; agg++) {
+        inputs[agg].push_back(input);
+      }
+    }
+    partials.back().InsertBatch(keys, inputs, 100);
+  }
+
+  const size_t partitions = 3;
+  std::vector<AggregationHashTable> merged;
+  for (size_t p = 0; p < partitions; p++) {
+    merged.emplace_back(std::vector<TypeId>{TypeId::INTEGER}, agg_types, input_types);
+    for (const auto &partial : partials) {
+      for (size_t group = 0; group < partial.Size(); group++) {
+        if (partial.PartitionOf(group, partitions) == p) {
+          merged[p].MergeGroup(partial, group);
+        }
+      }
+    }
+  }
+
+  std::map<std::string, std::vector<std::string>> results;
+  for (const auto &table : merged) {
+    for (size_t group = 0; group < table.Size(); group++) {
+      auto key = table.KeyAt(group, 0).ToString();
+      ASSERT_EQ(results.count(key), 0) << key << " is in more than one partition";
+      for (size_t agg = 0; agg < agg_types.size(); agg++) {
+        results[key].push_back(table.AggregateAt(group, agg).ToString());
+      }
+    }
+  }
+  ASSERT_EQ(results.size(), 150);
+  ASSERT_EQ(results["0"], (std::vector<std::string>{"1", "1", "1", "1"}));
+  ASSERT_EQ(results["50"], (std::vector<std::string>{"2", "1", "1", "1"}));
+  ASSERT_EQ(results["99"], (std::vector<std::string>{"2", "3", "1", "2"}));
+  ASSERT_EQ(results["149"], (std::vector<std::string>{"1", "2", "2", "2"}));
+  ASSERT_EQ(results["integer_null"], (std::vector<std::string>{"1", "2", "2", "2"}));
+}
+
+}  // namespace bustub
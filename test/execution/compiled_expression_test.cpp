@@ -0,0 +1,111 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// compiled_expression_test.cpp
+//
+// Identification: test/execution/compiled_expression_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <vector>
+
+#include "execution/compiled_expression.h"
+#include "execution/expressions/arithmetic_expression.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/logic_expression.h"
+#include "gtest/gtest.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+auto Col(uint32_t col_idx, TypeId type) -> AbstractExpressionRef {
+  return std::make_shared<ColumnValueExpression>(0, col_idx, type);
+}
+
+auto Const(const Value &value) -> AbstractExpressionRef { return std::make_shared<ConstantValueExpression>(value); }
+
+auto Cmp(AbstractExpressionRef left, AbstractExpressionRef right, ComparisonType comp_type) -> AbstractExpressionRef {
+  return std::make_shared<ComparisonExpression>(std::move(left), std::move(right), comp_type);
+}
+
+auto Logic(AbstractExpressionRef left, AbstractExpressionRef right, LogicType logic_type) -> AbstractExpressionRef {
+  return std::make_shared<LogicExpression>(std::move(left), std::move(right), logic_type);
+}
+
+}  // namespace
+
+// NOLINTNEXTLINE
+TEST(CompiledExpressionTest, MatchesInterpretedTest) {
+  Schema schema{std::vector{Column{"a", TypeId::INTEGER}, Column{"b", TypeId::VARCHAR, 16},
+                            Column{"c", TypeId::BOOLEAN}, Column{"d", TypeId::DECIMAL}}};
+  TupleBatch batch{&schema};
+  const auto null_int = ValueFactory::GetNullValueByType(TypeId::INTEGER);
+  const auto null_varchar = ValueFactory::GetNullValueByType(TypeId::VARCHAR);
+  const auto null_bool = ValueFactory::GetNullValueByType(TypeId::BOOLEAN);
+  for (int i = 0; i < 12; i++) {
+    batch.AppendRow(
+        {i % 4 == 3 ? null_int : ValueFactory::GetIntegerValue(i - 6),
+         i % 5 == 4 ? null_varchar : ValueFactory::GetVarcharValue(i % 2 == 0 ? "x" : "xy"),
+         i % 3 == 2 ? null_bool : ValueFactory::GetBooleanValue(i % 2 == 0), ValueFactory::GetDecimalValue(i * 0.5)},
+        RID{});
+  }
+
+  const auto a = Col(0, TypeId::INTEGER);
+  const auto b = Col(1, TypeId::VARCHAR);
+  const auto c = Col(2, TypeId::BOOLEAN);
+  const auto d = Col(3, TypeId::DECIMAL);
+  const auto int_max = Const(ValueFactory::GetIntegerValue(BUSTUB_INT32_MAX));
+  const std::vector<AbstractExpressionRef> exprs{
+      a,
+      d,
+      Const(ValueFactory::GetVarcharValue("x")),
+      // Arithmetic wraps around like the interpreted one.
+      std::make_shared<ArithmeticExpression>(std::make_shared<ArithmeticExpression>(a, int_max, ArithmeticType::Plus),
+                                             Const(ValueFactory::GetIntegerValue(1)), ArithmeticType::Minus),
+      Cmp(a, Const(ValueFactory::GetIntegerValue(0)), ComparisonType::LessThan),
+      Cmp(Const(ValueFactory::GetIntegerValue(-2)), a, ComparisonType::NotEqual),
+      Cmp(b, Const(ValueFactory::GetVarcharValue("x")), ComparisonType::GreaterThan),
+      Cmp(b, b, ComparisonType::Equal),
+      Cmp(c, Const(ValueFactory::GetBooleanValue(true)), ComparisonType::Equal),
+      // Compared with a DECIMAL, evaluated by the expression itself.
+      Cmp(d, Const(ValueFactory::GetDecimalValue(2.0)), ComparisonType::GreaterThanOrEqual),
+      Logic(c, Cmp(a, Const(ValueFactory::GetIntegerValue(-3)), ComparisonType::GreaterThan), LogicType::And),
+      Logic(c, Cmp(b, Const(ValueFactory::GetVarcharValue("xy")), ComparisonType::Equal), LogicType::Or),
+      Logic(Const(ValueFactory::GetBooleanValue(false)), Const(null_bool), LogicType::And),
+  };
+
+  for (const auto &expr : exprs) {
+    std::vector<Value> expected;
+    expr->EvaluateBatch(batch, &expected);
+    CompiledExpression compiled{expr};
+    std::vector<Value> actual;
+    compiled.Evaluate(batch, &actual);
+    ASSERT_EQ(actual.size(), expected.size()) << expr->ToString();
+    for (size_t i = 0; i < expected.size(); i++) {
+      ASSERT_EQ(actual[i].GetTypeId(), expected[i].GetTypeId()) << expr->ToString() << " row " << i;
+      ASSERT_EQ(actual[i].IsNull(), expected[i].IsNull()) << expr->ToString() << " row " << i;
+      if (!expected[i].IsNull()) {
+        ASSERT_EQ(actual[i].ToString(), expected[i].ToString()) << expr->ToString() << " row " << i;
+      }
+    }
+    if (expr->GetReturnType() != TypeId::BOOLEAN) {
+      continue;
+    }
+    std::vector<bool> selection;
+    compiled.EvaluatePredicate(batch, &selection);
+    ASSERT_EQ(selection.size(), expected.size());
+    for (size_t i = 0; i < expected.size(); i++) {
+      ASSERT_EQ(selection[i], !expected[i].IsNull() && expected[i].GetAs<bool>()) << expr->ToString() << " row " << i;
+    }
+  }
+}
+
+}  // namespace bustub
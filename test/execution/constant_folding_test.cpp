@@ -0,0 +1,44 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// constant_folding_test.cpp
+//
+// Identification: test/execution/constant_folding_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <string>
+
+#include "gtest/gtest.h"
+#include "sql_test_util.h"  // NOLINT
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(ConstantFoldingTest, FoldPredicatesTest) {
+  SqlTestInstance bustub;
+
+  // `1 + 2 > colA` is folded and turned into `colA < 3`, which then repeats the other conjunct.
+  ASSERT_NE(bustub
+                .Execute("explain (o) select colA from __mock_table_1 where 1 + 2 > colA and (1 = 1 or colB = 1) "
+                         "and colA < 3;")
+                .find("MockScan { table=__mock_table_1, columns=[0], filter=(#0.0<3) }"),
+            std::string::npos);
+  ASSERT_EQ(bustub.Execute("select colA from __mock_table_1 where 1 + 2 > colA;"), "0 \n1 \n2 \n");
+
+  // A filter that never holds leaves nothing to scan.
+  ASSERT_NE(bustub.Execute("explain (o) select count(*) from __mock_table_1 where 1 = 2 and colA > 3;")
+                .find("Values { rows=0 }"),
+            std::string::npos);
+  ASSERT_EQ(bustub.Execute("select count(*) from __mock_table_1 where colA < colA;"), "0 \n");
+  ASSERT_EQ(bustub.Execute("select count(*) from __mock_table_1 a, __mock_table_3 b where 1 = 2;"), "0 \n");
+
+  // `colE = colE` is NULL, not TRUE, where colE is NULL.
+  ASSERT_EQ(bustub.Execute("select count(*) from __mock_table_3 where colE = colE;"), "50 \n");
+  ASSERT_EQ(bustub.Execute("select 1 + 2, colA from __mock_table_1 where colA = 2 or 1 = null;"), "3 2 \n");
+}
+
+}  // namespace bustub
@@ -0,0 +1,85 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// external_sort_test.cpp
+//
+// Identification: test/execution/external_sort_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "execution/external_sort.h"
+#include "gtest/gtest.h"
+#include "storage/disk/disk_manager_memory.h"
+#include "storage/index/key_encoder.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+/**
+ * Sort `rows` (key, seq) tuples whose keys repeat every `keys` rows, and check that they come out by key, and by
+ * insertion order among equal keys.
+ */
+void RunSort(ExternalSorter *sorter, int rows, int keys) {
+  Schema schema{std::vector{Column{"key", TypeId::INTEGER}, Column{"seq", TypeId::INTEGER}}};
+  for (int i = 0; i < rows; i++) {
+    // Spread the keys, so that every run holds keys from the whole range.
+    const int key = (i * 7919) % keys;
+    std::string sort_key;
+    KeyEncoder::EncodeValue(ValueFactory::GetIntegerValue(key), &sort_key, true);
+    sorter->Add(std::move(sort_key),
+                Tuple{{ValueFactory::GetIntegerValue(key), ValueFactory::GetIntegerValue(i)}, &schema});
+  }
+  sorter->Sort();
+
+  int count = 0;
+  int prev_key = keys;
+  int prev_seq = -1;
+  Tuple tuple;
+  while (sorter->Next(&tuple)) {
+    const int key = tuple.GetValue(&schema, 0).GetAs<int32_t>();
+    const int seq = tuple.GetValue(&schema, 1).GetAs<int32_t>();
+    // The keys are sorted in descending order.
+    ASSERT_LE(key, prev_key);
+    if (key == prev_key) {
+      ASSERT_GT(seq, prev_seq);
+    }
+    prev_key = key;
+    prev_seq = seq;
+    count++;
+  }
+  ASSERT_EQ(count, rows);
+}
+
+}  // namespace
+
+// NOLINTNEXTLINE
+TEST(ExternalSortTest, MultiPassMergeTest) {
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto bpm = std::make_unique<BufferPoolManager>(64, disk_manager.get());
+
+  // A few dozen rows per run gives several times SORT_MAX_MERGE_FANIN runs, so that runs are merged in more than one
+  // pass before the final merge.
+  ExternalSorter sorter(bpm.get(), 4096, 2);
+  RunSort(&sorter, 10000, 500);
+  ASSERT_TRUE(sorter.IsSpilled());
+}
+
+// NOLINTNEXTLINE
+TEST(ExternalSortTest, NoBufferPoolTest) {
+  // Without a buffer pool, the input is sorted in memory whatever the budget.
+  ExternalSorter sorter(nullptr, 1, 4);
+  RunSort(&sorter, 10000, 500);
+  ASSERT_FALSE(sorter.IsSpilled());
+}
+
+}  // namespace bustub
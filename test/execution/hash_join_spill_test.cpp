@@ -0,0 +1,134 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// hash_join_spill_test.cpp
+//
+// Identification: test/execution/hash_join_spill_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <algorithm>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "execution/executor_context.h"
+#include "execution/executor_factory.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/plans/hash_join_plan.h"
+#include "execution/plans/values_plan.h"
+#include "fmt/format.h"
+#include "gtest/gtest.h"
+#include "sql_test_util.h"  // NOLINT
+#include "storage/disk/disk_manager_memory.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+/** A VALUES plan of `rows` (key, tag) rows, with keys from 0 to `keys` - 1. */
+auto MakeInput(int rows, int keys) -> AbstractPlanNodeRef {
+  auto schema = std::make_shared<Schema>(std::vector{Column{"key", TypeId::INTEGER}, Column{"tag", TypeId::INTEGER}});
+  std::vector<std::vector<AbstractExpressionRef>> values;
+  for (int i = 0; i < rows; i++) {
+    values.push_back({std::make_shared<ConstantValueExpression>(ValueFactory::GetIntegerValue(i % keys)),
+                      std::make_shared<ConstantValueExpression>(ValueFactory::GetIntegerValue(i))});
+  }
+  return std::make_shared<ValuesPlanNode>(schema, std::move(values));
+}
+
+/**
+ * Join `left` and `right` on their keys with the given buffer pool, memory budget and parallelism, and return the
+ * sorted output.
+ */
+auto RunJoin(BufferPoolManager *bpm, size_t memory_budget, JoinType join_type, const AbstractPlanNodeRef &left,
+             const AbstractPlanNodeRef &right, size_t parallelism = 1) -> std::vector<std::string> {
+  auto schema =
+      std::make_shared<Schema>(std::vector{Column{"l.key", TypeId::INTEGER}, Column{"l.tag", TypeId::INTEGER},
+                                           Column{"r.key", TypeId::INTEGER}, Column{"r.tag", TypeId::INTEGER}});
+  auto plan = std::make_shared<HashJoinPlanNode>(
+      schema, left, right,
+      std::vector<AbstractExpressionRef>{std::make_shared<ColumnValueExpression>(0, 0, TypeId::INTEGER)},
+      std::vector<AbstractExpressionRef>{std::make_shared<ColumnValueExpression>(1, 0, TypeId::INTEGER)}, join_type);
+
+  ExecutorContext exec_ctx{nullptr, nullptr, bpm, nullptr, nullptr, false};
+  exec_ctx.SetMemoryBudget(memory_budget);
+  exec_ctx.SetParallelism(parallelism);
+  auto executor = ExecutorFactory::CreateExecutor(&exec_ctx, plan);
+  executor->Init();
+  std::vector<std::string> rows;
+  Tuple tuple;
+  RID rid;
+  while (executor->Next(&tuple, &rid)) {
+    rows.push_back(fmt::format("{} {} {} {}", tuple.GetValue(schema.get(), 0).ToString(),
+                               tuple.GetValue(schema.get(), 1).ToString(), tuple.GetValue(schema.get(), 2).ToString(),
+                               tuple.GetValue(schema.get(), 3).ToString()));
+  }
+  std::sort(rows.begin(), rows.end());
+  return rows;
+}
+
+/** Join inputs whose keys 0-299 match twice on the right, 300-1199 once and 1200-1499 never. */
+auto RunJoin(BufferPoolManager *bpm, size_t memory_budget, JoinType join_type) -> std::vector<std::string> {
+  return RunJoin(bpm, memory_budget, join_type, MakeInput(3000, 1500), MakeInput(1500, 1200));
+}
+
+}  // namespace
+
+// NOLINTNEXTLINE
+TEST(HashJoinSpillTest, SpillTest) {
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto bpm = std::make_unique<BufferPoolManager>(64, disk_manager.get());
+
+  // A budget that a few rows already exceed spills both inputs, and splits the spilled partitions again.
+  for (const auto join_type : {JoinType::INNER, JoinType::LEFT}) {
+    const auto expected = RunJoin(bpm.get(), DEFAULT_OPERATOR_MEMORY_BUDGET, join_type);
+    ASSERT_EQ(expected.size(), join_type == JoinType::INNER ? 3000 : 3600);
+    ASSERT_EQ(RunJoin(bpm.get(), 1024, join_type), expected);
+  }
+}
+
+// NOLINTNEXTLINE
+TEST(HashJoinSpillTest, SkewTest) {
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto bpm = std::make_unique<BufferPoolManager>(64, disk_manager.get());
+
+  // A single key cannot be split by hash bits: the pair is joined in memory once the split levels run out, and its
+  // 300 x 200 output rows are produced one at a time.
+  const auto rows = RunJoin(bpm.get(), 1024, JoinType::INNER, MakeInput(300, 1), MakeInput(200, 1));
+  ASSERT_EQ(rows.size(), 60000);
+  ASSERT_EQ(rows,
+            RunJoin(nullptr, DEFAULT_OPERATOR_MEMORY_BUDGET, JoinType::INNER, MakeInput(300, 1), MakeInput(200, 1)));
+}
+
+// NOLINTNEXTLINE
+TEST(HashJoinSpillTest, ParallelOutputBudgetTest) {
+  // 10000 build rows make 4 partitions. The workers buffer the output of whole partitions within the budget, and the
+  // partitions that do not fit are probed on demand.
+  auto left = MakeInput(10000, 5000);
+  auto right = MakeInput(10000, 5000);
+  for (const auto join_type : {JoinType::INNER, JoinType::LEFT}) {
+    const auto expected = RunJoin(nullptr, DEFAULT_OPERATOR_MEMORY_BUDGET, join_type, left, right);
+    ASSERT_EQ(expected.size(), 20000);
+    ASSERT_EQ(RunJoin(nullptr, DEFAULT_OPERATOR_MEMORY_BUDGET, join_type, left, right, 4), expected);
+    ASSERT_EQ(RunJoin(nullptr, 1850000, join_type, left, right, 4), expected);
+    ASSERT_EQ(RunJoin(nullptr, 1, join_type, left, right, 4), expected);
+  }
+}
+
+// NOLINTNEXTLINE
+TEST(HashJoinSpillTest, NoBufferPoolTest) {
+  // Mock tables run without a buffer pool, so the join stays in memory whatever the budget.
+  SqlTestInstance bustub;
+  bustub.Execute("set operator_memory_budget = 1;");
+  ASSERT_EQ(bustub.Execute("select count(*) from __mock_table_1 a, __mock_table_1 b where a.colA = b.colA;"), "100 \n");
+  ASSERT_EQ(RunJoin(nullptr, 1, JoinType::LEFT), RunJoin(nullptr, DEFAULT_OPERATOR_MEMORY_BUDGET, JoinType::LEFT));
+}
+
+}  // namespace bustub
@@ -0,0 +1,88 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// index_scan_test.cpp
+//
+// Identification: test/execution/index_scan_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <cstdio>
+#include <string>
+#include <vector>
+
+#include "catalog/catalog.h"
+#include "gtest/gtest.h"
+#include "sql_test_util.h"  // NOLINT
+#include "type/value_factory.h"
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(IndexScanTest, KeyRangeTest) {
+  {
+    SqlTestInstance bustub("test.db");
+    bustub.Execute("create table t(a int, b int, c int);");
+    // The executors that insert rows are not part of this test, so the rows go straight into the table heap.
+    auto *table_info = bustub.GetInstance()->catalog_->GetTable("t");
+    auto insert = [&](const Value &a, const Value &b, int c) {
+      Tuple tuple{{a, b, ValueFactory::GetIntegerValue(c)}, &table_info->schema_};
+      ASSERT_TRUE(table_info->table_->InsertTuple(TupleMeta{INVALID_TXN_ID, INVALID_TXN_ID, false}, tuple).has_value());
+    };
+    for (int i = 0; i < 1000; i++) {
+      insert(ValueFactory::GetIntegerValue(i / 100), ValueFactory::GetIntegerValue(i % 100), i);
+    }
+    // A NULL in a key column that the predicate does not bound is still in the range of the index scan.
+    insert(ValueFactory::GetIntegerValue(5), ValueFactory::GetNullValueByType(TypeId::INTEGER), 1000);
+    bustub.Execute("create index t_ab on t(a, b);");
+    bustub.Execute("create index t_c on t(c);");
+    bustub.Execute("analyze t;");
+
+    auto explain = [&](const std::string &query) { return bustub.Execute("explain (o) " + query); };
+
+    // Point lookup.
+    std::string query = "select c from t where c = 42";
+    ASSERT_NE(explain(query).find("range=[(42), (43))"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "42 \n");
+
+    // Range on one column.
+    query = "select c from t where c >= 100 and c < 103";
+    ASSERT_NE(explain(query).find("range=[(100), (103))"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "100 \n101 \n102 \n");
+
+    // Prefix of a composite key, followed by a range on the next column.
+    query = "select c from t where a = 3 and b > 96";
+    ASSERT_NE(explain(query).find("range=[(3, 97), (4, integer_null))"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "397 \n398 \n399 \n");
+
+    // Prefix of a composite key, with the rest of the key open.
+    query = "select count(*) from t where a = 5";
+    ASSERT_NE(explain(query).find("range=[(5, integer_null), (6, integer_null))"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "101 \n");
+
+    // Bounds that cross leave nothing to read.
+    query = "select c from t where c > 500 and c < 400";
+    ASSERT_EQ(explain(query).find("SeqScan"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "");
+    query = "select c from t where a = 2 and b > 50 and b < 40";
+    ASSERT_EQ(explain(query).find("SeqScan"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "");
+
+    // Reading most of the table through the index costs more than a sequential scan.
+    query = "select count(*) from t where c > 100";
+    ASSERT_EQ(explain(query).find("IndexScan"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "900 \n");
+
+    // A predicate that no index key starts with is not matched.
+    query = "select count(*) from t where b = 7";
+    ASSERT_EQ(explain(query).find("IndexScan"), std::string::npos) << explain(query);
+    ASSERT_EQ(bustub.Execute(query + ";"), "10 \n");
+  }
+  remove("test.db");
+  remove("test.log");
+}
+
+}  // namespace bustub
@@ -0,0 +1,116 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// join_order_test.cpp
+//
+// Identification: test/execution/join_order_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <string>
+
+#include "catalog/table_statistics.h"
+#include "gtest/gtest.h"
+#include "sql_test_util.h"  // NOLINT
+#include "type/value_factory.h"
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(JoinOrderTest, ColumnStatisticsTest) {
+  ColumnStatistics column;
+  for (int i = 0; i < 100000; i++) {
+    const auto value =
+        i % 10 == 9 ? ValueFactory::GetNullValueByType(TypeId::INTEGER) : ValueFactory::GetIntegerValue(i % 20000);
+    column.Add(value);
+    column.Sample(value);
+  }
+  column.BuildHistogram();
+
+  ASSERT_EQ(column.GetNullCount(), 10000);
+  ASSERT_EQ(column.GetValueCount(), 90000);
+  // 18000 distinct values, within the error of the sketch.
+  ASSERT_NEAR(column.EstimateDistinct(), 18000, 18000 * 0.05);
+  ASSERT_NEAR(column.EstimateSelectivity(ComparisonType::LessThan, ValueFactory::GetIntegerValue(5000)), 0.25, 0.03);
+  ASSERT_NEAR(column.EstimateSelectivity(ComparisonType::GreaterThanOrEqual, ValueFactory::GetIntegerValue(5000)), 0.75,
+              0.03);
+  ASSERT_NEAR(column.EstimateSelectivity(ComparisonType::Equal, ValueFactory::GetIntegerValue(42)), 1.0 / 18000,
+              0.0001);
+  ASSERT_EQ(column.EstimateSelectivity(ComparisonType::Equal, ValueFactory::GetIntegerValue(-1)), 0);
+  ASSERT_EQ(column.EstimateSelectivity(ComparisonType::LessThan, ValueFactory::GetIntegerValue(-1)), 0);
+
+  // Values added after the histogram is built are counted into it.
+  for (int i = 0; i < 90000; i++) {
+    column.Add(ValueFactory::GetIntegerValue(30000));
+  }
+  ASSERT_NEAR(column.EstimateSelectivity(ComparisonType::GreaterThan, ValueFactory::GetIntegerValue(20000)), 0.5, 0.03);
+}
+
+// NOLINTNEXTLINE
+TEST(JoinOrderTest, ReorderJoinsTest) {
+  SqlTestInstance bustub;
+  const std::string query =
+      "select a.colB, c.v4 from __mock_table_1 a, __mock_table_3 b, __mock_t8 c "
+      "where a.colA = b.colE and b.colE = c.v4 and a.colA > 3";
+
+  // Without statistics, the tables are joined in the written order.
+  auto plan = bustub.Execute("explain (o) " + query);
+  ASSERT_LT(plan.find("table=__mock_table_1"), plan.find("table=__mock_t8")) << plan;
+
+  bustub.Execute("analyze __mock_table_1;");
+  bustub.Execute("analyze __mock_table_3;");
+  bustub.Execute("analyze __mock_t8;");
+  // __mock_t8 has 10 rows, and half of the values of __mock_table_3 are NULL: they are joined first, below the last
+  // join of the plan.
+  plan = bustub.Execute("explain (o) " + query);
+  const auto inner_join = plan.rfind("Join {");
+  ASSERT_LT(plan.find("table=__mock_table_1"), inner_join) << plan;
+  ASSERT_GT(plan.find("table=__mock_table_3"), inner_join) << plan;
+  ASSERT_GT(plan.find("table=__mock_t8"), inner_join) << plan;
+  ASSERT_EQ(bustub.Execute(query + " order by c.v4;"), "400 4 \n600 6 \n800 8 \n");
+}
+
+// NOLINTNEXTLINE
+TEST(JoinOrderTest, HashJoinBuildSideTest) {
+  SqlTestInstance bustub;
+  bustub.Execute("analyze __mock_table_1;");
+  bustub.Execute("analyze __mock_t8;");
+
+  // The hash table is built on the right input, so the 10 rows of __mock_t8 move there.
+  const std::string query = "select * from __mock_t8 a, __mock_table_1 b where a.v4 = b.colA";
+  auto plan = bustub.Execute("explain (o) " + query);
+  ASSERT_LT(plan.find("table=__mock_table_1"), plan.find("table=__mock_t8")) << plan;
+  ASSERT_EQ(bustub.Execute(query + " and a.v4 < 3 order by a.v4;"), "0 0 0 \n1 1 100 \n2 2 200 \n");
+
+  // The left input of a left join is never the build side.
+  plan = bustub.Execute("explain (o) select * from __mock_t8 a left join __mock_table_1 b on a.v4 = b.colA;");
+  ASSERT_LT(plan.find("table=__mock_t8"), plan.find("table=__mock_table_1")) << plan;
+}
+
+// NOLINTNEXTLINE
+TEST(JoinOrderTest, SwappedHashJoinOutputTest) {
+  SqlTestInstance bustub;
+  const std::string query = "select * from __mock_t8 a, __mock_table_1 b where a.v4 = b.colA";
+  const auto unswapped = bustub.Execute(query + " order by a.v4;");
+  ASSERT_EQ(unswapped.substr(0, 16), "0 0 0 \n1 1 100 \n") << unswapped;
+
+  bustub.Execute("analyze __mock_table_1;");
+  bustub.Execute("analyze __mock_t8;");
+  // The right input is larger, so the inputs are swapped, and a projection puts the columns back in the written order.
+  const auto plan = bustub.Execute("explain (o,s) " + query);
+  ASSERT_NE(plan.find("=== OPTIMIZER ===\n"
+                      "Projection { exprs=[#0.2, #0.0, #0.1] } | (a.v4:INTEGER, b.colA:INTEGER, b.colB:INTEGER)\n"),
+            std::string::npos)
+      << plan;
+  ASSERT_NE(plan.find("HashJoin { type=Inner, left_key=[#0.0], right_key=[#1.0] } | "
+                      "(b.colA:INTEGER, b.colB:INTEGER, a.v4:INTEGER)"),
+            std::string::npos)
+      << plan;
+  ASSERT_LT(plan.find("table=__mock_table_1"), plan.find("table=__mock_t8")) << plan;
+  ASSERT_EQ(bustub.Execute(query + " order by a.v4;"), unswapped);
+}
+
+}  // namespace bustub
@@ -0,0 +1,82 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// morsel_queue_test.cpp
+//
+// Identification: test/execution/morsel_queue_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <atomic>
+#include <memory>
+#include <thread>  // NOLINT
+#include <vector>
+
+#include "execution/executor_context.h"
+#include "execution/executor_factory.h"
+#include "execution/executors/gather_executor.h"
+#include "execution/morsel_queue.h"
+#include "execution/plans/mock_scan_plan.h"
+#include "gtest/gtest.h"
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(MorselQueueTest, ConcurrentRowsTest) {
+  const size_t row_count = 100000;
+  MorselQueue queue;
+  std::vector<std::atomic<int>> seen(row_count);
+  std::vector<std::thread> threads;
+  for (int t = 0; t < 8; t++) {
+    threads.emplace_back([&] {
+      queue.InitRows(row_count, 1000);
+      size_t begin;
+      size_t end;
+      while (queue.NextRows(&begin, &end)) {
+        for (size_t row = begin; row < end; row++) {
+          seen[row]++;
+        }
+      }
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  for (size_t row = 0; row < row_count; row++) {
+    ASSERT_EQ(seen[row], 1) << row;
+  }
+}
+
+// NOLINTNEXTLINE
+TEST(MorselQueueTest, GatherMockScanTest) {
+  ExecutorContext exec_ctx{nullptr, nullptr, nullptr, nullptr, nullptr, false};
+  exec_ctx.SetParallelism(4);
+  auto schema = std::make_shared<Schema>(std::vector{Column{"x", TypeId::INTEGER}, Column{"y", TypeId::INTEGER}});
+  auto plan = std::make_shared<MockScanPlanNode>(schema, "__mock_t4_1m");
+
+  auto executor = ExecutorFactory::CreateExecutor(&exec_ctx, plan);
+  ASSERT_NE(dynamic_cast<GatherExecutor *>(executor.get()), nullptr);
+
+  // Rescanning must restart all workers; every value of x appears twice in the table.
+  for (int scan = 0; scan < 2; scan++) {
+    executor->Init();
+    std::vector<int> seen(500000);
+    TupleBatch batch;
+    size_t rows = 0;
+    while (executor->NextBatch(&batch, BUSTUB_BATCH_SIZE)) {
+      for (size_t i = 0; i < batch.Size(); i++) {
+        seen[batch.ValueAt(i, 0).GetAs<int32_t>()]++;
+      }
+      rows += batch.Size();
+    }
+    ASSERT_EQ(rows, 1000000);
+    for (size_t x = 0; x < seen.size(); x++) {
+      ASSERT_EQ(seen[x], 2) << x;
+    }
+  }
+}
+
+}  // namespace bustub
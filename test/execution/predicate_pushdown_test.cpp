@@ -0,0 +1,94 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// predicate_pushdown_test.cpp
+//
+// Identification: test/execution/predicate_pushdown_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <string>
+
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/logic_expression.h"
+#include "execution/plans/mock_scan_plan.h"
+#include "execution/plans/nested_loop_join_plan.h"
+#include "gtest/gtest.h"
+#include "optimizer/optimizer.h"
+#include "sql_test_util.h"  // NOLINT
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(PredicatePushdownTest, PushDownThroughJoinsTest) {
+  SqlTestInstance bustub;
+
+  // The filters on one table reach its scan, and `a = c AND c = b` gives the `a = b` that joins the first two tables.
+  const std::string query =
+      "select a.colA, b.colE, c.v4 from __mock_table_1 a, __mock_table_3 b, __mock_t8 c "
+      "where a.colA = c.v4 and c.v4 = b.colE and c.v4 < 5 and a.colB >= 100";
+  auto plan = bustub.Execute("explain (o) " + query);
+  ASSERT_EQ(plan.find("NestedLoopJoin"), std::string::npos) << plan;
+  ASSERT_NE(plan.find("MockScan { table=__mock_t8, filter=(#0.0<5) }"), std::string::npos) << plan;
+  ASSERT_NE(plan.find("MockScan { table=__mock_table_1, filter=(#0.1>=100) }"), std::string::npos) << plan;
+  ASSERT_EQ(bustub.Execute(query + " order by c.v4;"), "2 2 2 \n4 4 4 \n");
+
+  // A constant that one column of an equality is compared with also filters the other column.
+  plan = bustub.Execute("explain (o) select * from __mock_table_1 a, __mock_t8 c where a.colA = c.v4 and c.v4 = 3;");
+  ASSERT_NE(plan.find("filter=(#0.0=3)"), plan.rfind("filter=(#0.0=3)")) << plan;
+
+  // Below a left join, only the left side is filtered by the WHERE clause, and only the right side by the ON clause.
+  const std::string left_join_query =
+      "select a.colA, c.v4 from __mock_table_1 a left join __mock_t8 c on a.colA = c.v4 and c.v4 > 6 "
+      "where a.colA < 9 and a.colA > 5 order by a.colA";
+  plan = bustub.Execute("explain (o) " + left_join_query);
+  ASSERT_NE(plan.find("MockScan { table=__mock_t8, filter=(#0.0>6) }"), std::string::npos) << plan;
+  ASSERT_EQ(bustub.Execute(left_join_query + ";"), "6 integer_null \n7 7 \n8 8 \n");
+  ASSERT_EQ(
+      bustub.Execute("select count(*) from __mock_table_1 a left join __mock_t8 c on a.colA = c.v4 and a.colA > 6;"),
+      "100 \n");
+
+  // The other conjuncts of an inner equi-join are checked on the output of the hash join.
+  plan = bustub.Execute(
+      "explain (o) select count(*) from __mock_table_1 a, __mock_table_1 b where a.colA = b.colA and a.colA < b.colB;");
+  ASSERT_NE(plan.find("HashJoin"), std::string::npos) << plan;
+  ASSERT_EQ(bustub.Execute(
+                "select count(*) from __mock_table_1 a, __mock_table_1 b where a.colA = b.colA and a.colA < b.colB;"),
+            "99 \n");
+}
+
+// NOLINTNEXTLINE
+TEST(PredicatePushdownTest, HashJoinResidualTest) {
+  SqlTestInstance bustub;
+  auto scan_schema =
+      std::make_shared<Schema>(std::vector<Column>{Column("colA", TypeId::INTEGER), Column("colB", TypeId::INTEGER)});
+  auto left = std::make_shared<MockScanPlanNode>(scan_schema, "__mock_table_1");
+  auto right = std::make_shared<MockScanPlanNode>(scan_schema, "__mock_table_1");
+  auto column = [](uint32_t tuple_idx, uint32_t col_idx) {
+    return std::make_shared<ColumnValueExpression>(tuple_idx, col_idx, TypeId::INTEGER);
+  };
+
+  // l.colA = r.colA AND l.colB > r.colB: the equality is taken as a key before the whole predicate is rejected, and
+  // again from its own conjunct.
+  auto predicate = std::make_shared<LogicExpression>(
+      std::make_shared<ComparisonExpression>(column(0, 0), column(1, 0), ComparisonType::Equal),
+      std::make_shared<ComparisonExpression>(column(0, 1), column(1, 1), ComparisonType::GreaterThan), LogicType::And);
+  auto nlj_plan = std::make_shared<NestedLoopJoinPlanNode>(
+      std::make_shared<Schema>(NestedLoopJoinPlanNode::InferJoinSchema(*left, *right)), left, right, predicate,
+      JoinType::INNER);
+
+  Optimizer optimizer(*bustub.GetInstance()->catalog_, false);
+  const auto plan = optimizer.OptimizeNLJAsHashJoin(nlj_plan);
+  ASSERT_EQ(plan->ToString(false),
+            "Filter { predicate=(#0.1>#0.3) }\n"
+            "  HashJoin { type=Inner, left_key=[#0.0], right_key=[#1.0] }\n"
+            "    MockScan { table=__mock_table_1 }\n"
+            "    MockScan { table=__mock_table_1 }");
+}
+
+}  // namespace bustub
@@ -0,0 +1,41 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// projection_pushdown_test.cpp
+//
+// Identification: test/execution/projection_pushdown_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <string>
+
+#include "gtest/gtest.h"
+#include "sql_test_util.h"  // NOLINT
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(ProjectionPushdownTest, ScanOnlyReadColumnsTest) {
+  SqlTestInstance bustub;
+
+  ASSERT_NE(bustub.Execute("explain (o) select colB from __mock_table_1;")
+                .find("MockScan { table=__mock_table_1, columns=[1] }"),
+            std::string::npos);
+  ASSERT_EQ(bustub.Execute("select colB from __mock_table_1 where colB < 300;"), "0 \n100 \n200 \n");
+
+  // The aggregation only reads v1 and v5; COUNT(*) still needs one column to count the rows.
+  ASSERT_NE(
+      bustub.Execute("explain (o) select v1, sum(v5) from __mock_agg_input_small group by v1;").find("columns=[0, 4]"),
+      std::string::npos);
+  ASSERT_EQ(bustub.Execute("select count(*) from __mock_agg_input_small;"), "1000 \n");
+
+  // The join keys are kept on both sides, and the join output is narrowed to what the projection reads.
+  ASSERT_EQ(bustub.Execute("select b.colF, a.colB from __mock_table_1 a, __mock_table_3 b "
+                           "where a.colA = b.colE and a.colA < 5 order by a.colB;"),
+            "0-\U0001F4A9 0 \n2-\U0001F4A9 200 \n4-\U0001F4A9 400 \n");
+}
+
+}  // namespace bustub
@@ -0,0 +1,86 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// scan_filter_test.cpp
+//
+// Identification: test/execution/scan_filter_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <vector>
+
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/expressions/logic_expression.h"
+#include "execution/scan_filter.h"
+#include "gtest/gtest.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+auto Compare(uint32_t col_idx, TypeId type, ComparisonType comp_type, int value) -> AbstractExpressionRef {
+  return std::make_shared<ComparisonExpression>(
+      std::make_shared<ColumnValueExpression>(0, col_idx, type),
+      std::make_shared<ConstantValueExpression>(ValueFactory::GetIntegerValue(value)), comp_type);
+}
+
+auto And(AbstractExpressionRef left, AbstractExpressionRef right) -> AbstractExpressionRef {
+  return std::make_shared<LogicExpression>(std::move(left), std::move(right), LogicType::And);
+}
+
+}  // namespace
+
+// NOLINTNEXTLINE
+TEST(ScanFilterTest, CompiledComparisonTest) {
+  Schema schema{std::vector{Column{"a", TypeId::INTEGER}, Column{"b", TypeId::VARCHAR, 16}, Column{"c", TypeId::BIGINT},
+                            Column{"d", TypeId::SMALLINT}}};
+  // a >= 10 AND c < 100 AND d != 3 AND b = 'x'
+  auto b_is_x = std::make_shared<ComparisonExpression>(
+      std::make_shared<ColumnValueExpression>(0, 1, TypeId::VARCHAR),
+      std::make_shared<ConstantValueExpression>(ValueFactory::GetVarcharValue("x")), ComparisonType::Equal);
+  auto predicate = And(And(Compare(0, TypeId::INTEGER, ComparisonType::GreaterThanOrEqual, 10),
+                           Compare(2, TypeId::BIGINT, ComparisonType::LessThan, 100)),
+                       And(Compare(3, TypeId::SMALLINT, ComparisonType::NotEqual, 3), b_is_x));
+  ScanFilter filter(predicate, {}, &schema);
+  // Only the VARCHAR comparison is left to evaluate on values.
+  ASSERT_EQ(filter.GetResidual(), b_is_x);
+
+  auto make_tuple = [&](const Value &a, int64_t c, int16_t d) {
+    return Tuple{
+        {a, ValueFactory::GetVarcharValue("y"), ValueFactory::GetBigIntValue(c), ValueFactory::GetSmallIntValue(d)},
+        &schema};
+  };
+  ASSERT_TRUE(filter.MatchData(make_tuple(ValueFactory::GetIntegerValue(10), 99, 4).GetData()));
+  ASSERT_FALSE(filter.MatchData(make_tuple(ValueFactory::GetIntegerValue(9), 99, 4).GetData()));
+  ASSERT_FALSE(filter.MatchData(make_tuple(ValueFactory::GetIntegerValue(10), 100, 4).GetData()));
+  ASSERT_FALSE(filter.MatchData(make_tuple(ValueFactory::GetIntegerValue(10), 99, 3).GetData()));
+  // A comparison with NULL is never true.
+  ASSERT_FALSE(filter.MatchData(make_tuple(ValueFactory::GetNullValueByType(TypeId::INTEGER), 99, 4).GetData()));
+  ASSERT_FALSE(filter.MatchResidual(make_tuple(ValueFactory::GetIntegerValue(10), 99, 4), schema));
+}
+
+// NOLINTNEXTLINE
+TEST(ScanFilterTest, ProjectedColumnsTest) {
+  // The scan produces table columns 2 and 0, and the predicate is `5 > #0.1`, i.e. `table column 0 < 5`.
+  auto predicate = std::make_shared<ComparisonExpression>(
+      std::make_shared<ConstantValueExpression>(ValueFactory::GetIntegerValue(5)),
+      std::make_shared<ColumnValueExpression>(0, 1, TypeId::INTEGER), ComparisonType::GreaterThan);
+  ScanFilter filter(predicate, {2, 0}, nullptr);
+  ASSERT_EQ(filter.GetResidual(), nullptr);
+
+  auto row = [](int a) {
+    return std::vector{ValueFactory::GetIntegerValue(a), ValueFactory::GetIntegerValue(100),
+                       ValueFactory::GetIntegerValue(100)};
+  };
+  ASSERT_TRUE(filter.MatchValues(row(4)));
+  ASSERT_FALSE(filter.MatchValues(row(5)));
+}
+
+}  // namespace bustub
@@ -0,0 +1,98 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// sort_merge_join_test.cpp
+//
+// Identification: test/execution/sort_merge_join_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <optional>
+#include <string>
+#include <vector>
+
+#include "execution/executor_context.h"
+#include "execution/executor_factory.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "execution/plans/sort_merge_join_plan.h"
+#include "execution/plans/values_plan.h"
+#include "fmt/format.h"
+#include "fmt/ranges.h"
+#include "gtest/gtest.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+namespace {
+
+/** A VALUES plan of (key, tag) rows; a missing key is NULL. */
+auto MakeInput(const std::vector<std::pair<std::optional<int>, int>> &rows) -> AbstractPlanNodeRef {
+  auto schema = std::make_shared<Schema>(std::vector{Column{"key", TypeId::INTEGER}, Column{"tag", TypeId::INTEGER}});
+  std::vector<std::vector<AbstractExpressionRef>> values;
+  for (const auto &[key, tag] : rows) {
+    auto key_value =
+        key.has_value() ? ValueFactory::GetIntegerValue(*key) : ValueFactory::GetNullValueByType(TypeId::INTEGER);
+    values.push_back({std::make_shared<ConstantValueExpression>(key_value),
+                      std::make_shared<ConstantValueExpression>(ValueFactory::GetIntegerValue(tag))});
+  }
+  return std::make_shared<ValuesPlanNode>(schema, std::move(values));
+}
+
+auto RunJoin(JoinType join_type) -> std::vector<std::string> {
+  auto left = MakeInput({{std::nullopt, 0}, {1, 1}, {2, 2}, {2, 3}, {4, 4}, {5, 5}, {5, 6}});
+  auto right = MakeInput({{std::nullopt, 10}, {2, 12}, {2, 13}, {3, 14}, {5, 15}, {6, 16}});
+  auto schema =
+      std::make_shared<Schema>(std::vector{Column{"l.key", TypeId::INTEGER}, Column{"l.tag", TypeId::INTEGER},
+                                           Column{"r.key", TypeId::INTEGER}, Column{"r.tag", TypeId::INTEGER}});
+  auto plan = std::make_shared<SortMergeJoinPlanNode>(
+      schema, left, right,
+      std::vector<AbstractExpressionRef>{std::make_shared<ColumnValueExpression>(0, 0, TypeId::INTEGER)},
+      std::vector<AbstractExpressionRef>{std::make_shared<ColumnValueExpression>(1, 0, TypeId::INTEGER)}, join_type);
+
+  ExecutorContext exec_ctx{nullptr, nullptr, nullptr, nullptr, nullptr, false};
+  auto executor = ExecutorFactory::CreateExecutor(&exec_ctx, plan);
+  executor->Init();
+  std::vector<std::string> rows;
+  Tuple tuple;
+  RID rid;
+  while (executor->Next(&tuple, &rid)) {
+    std::vector<std::string> values;
+    for (uint32_t i = 0; i < schema->GetColumnCount(); i++) {
+      values.push_back(tuple.GetValue(schema.get(), i).ToString());
+    }
+    rows.push_back(fmt::format("({})", fmt::join(values, ", ")));
+  }
+  return rows;
+}
+
+}  // namespace
+
+// NOLINTNEXTLINE
+TEST(SortMergeJoinTest, InnerJoinWithDuplicatesTest) {
+  // Duplicate keys on both sides produce every pair, replayed from the rewind buffer.
+  std::vector<std::string> expected{"(2, 2, 2, 12)", "(2, 2, 2, 13)", "(2, 3, 2, 12)",
+                                    "(2, 3, 2, 13)", "(5, 5, 5, 15)", "(5, 6, 5, 15)"};
+  ASSERT_EQ(RunJoin(JoinType::INNER), expected);
+}
+
+// NOLINTNEXTLINE
+TEST(SortMergeJoinTest, LeftJoinTest) {
+  // NULL keys never match, but are kept by a left join.
+  std::vector<std::string> expected{"(integer_null, 0, integer_null, integer_null)",
+                                    "(1, 1, integer_null, integer_null)",
+                                    "(2, 2, 2, 12)",
+                                    "(2, 2, 2, 13)",
+                                    "(2, 3, 2, 12)",
+                                    "(2, 3, 2, 13)",
+                                    "(4, 4, integer_null, integer_null)",
+                                    "(5, 5, 5, 15)",
+                                    "(5, 6, 5, 15)"};
+  ASSERT_EQ(RunJoin(JoinType::LEFT), expected);
+}
+
+}  // namespace bustub
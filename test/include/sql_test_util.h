@@ -0,0 +1,47 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// sql_test_util.h
+//
+// Identification: test/include/sql_test_util.h
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#pragma once
+
+#include <memory>
+#include <sstream>
+#include <string>
+
+#include "common/bustub_instance.h"
+
+namespace bustub {
+
+/** A BustubInstance with the mock tables, whose queries return their result as text. */
+class SqlTestInstance {
+ public:
+  /** Only the mock tables work without a database file, as there is no buffer pool. */
+  SqlTestInstance() : bustub_(std::make_unique<BustubInstance>()) { bustub_->GenerateMockTable(); }
+
+  explicit SqlTestInstance(const std::string &db_file_name) : bustub_(std::make_unique<BustubInstance>(db_file_name)) {
+    bustub_->GenerateMockTable();
+  }
+
+  /** @return the result of `sql`, one row per line, with a space after every value */
+  auto Execute(const std::string &sql) -> std::string {
+    std::stringstream result;
+    auto writer = SimpleStreamWriter(result, true, " ");
+    bustub_->ExecuteSql(sql, writer);
+    return result.str();
+  }
+
+  auto GetInstance() -> BustubInstance * { return bustub_.get(); }
+
+ private:
+  std::unique_ptr<BustubInstance> bustub_;
+};
+
+}  // namespace bustub
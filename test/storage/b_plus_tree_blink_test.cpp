@@ -0,0 +1,157 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// b_plus_tree_blink_test.cpp
+//
+// Identification: test/storage/b_plus_tree_blink_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <atomic>
+#include <thread>  // NOLINT
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "gtest/gtest.h"
+#include "storage/disk/disk_manager_memory.h"
+#include "storage/index/b_plus_tree.h"
+#include "test_util.h"  // NOLINT
+
+namespace bustub {
+
+using BLinkTree = BPlusTree<GenericKey<8>, RID, GenericComparator<8>>;
+
+// Even keys are in the tree from the start, odd keys are inserted by `num_writers` threads while `num_scanners`
+// threads keep scanning. Every scan must see the keys in order, and all the even keys.
+void RunInsertScanTest(BLinkTree *tree, int64_t scale, size_t num_writers, size_t num_scanners) {
+  GenericKey<8> index_key;
+  for (int64_t key = 0; key < scale; key += 2) {
+    index_key.SetFromInteger(key);
+    tree->Insert(index_key, RID(key));
+  }
+
+  std::atomic<size_t> writers_left{num_writers};
+  std::vector<std::thread> threads;
+  for (size_t tid = 0; tid < num_writers; tid++) {
+    threads.emplace_back([&, tid] {
+      GenericKey<8> key;
+      for (int64_t k = 1 + 2 * static_cast<int64_t>(tid); k < scale; k += 2 * static_cast<int64_t>(num_writers)) {
+        key.SetFromInteger(k);
+        EXPECT_TRUE(tree->Insert(key, RID(k)));
+      }
+      writers_left--;
+    });
+  }
+  for (size_t tid = 0; tid < num_scanners; tid++) {
+    threads.emplace_back([&, tid] {
+      GenericKey<8> low;
+      GenericKey<8> high;
+      low.SetFromInteger(scale / 4);
+      high.SetFromInteger(scale / 2);
+      do {
+        int64_t prev = -1;
+        bool ordered = true;
+        int64_t even_keys = 0;
+        // Odd scanners only read a range, whose lower bound is found through a descent instead of the leftmost leaf.
+        const bool bounded = tid % 2 == 1;
+        tree->ScanRange(bounded ? &low : nullptr, bounded ? &high : nullptr,
+                        [&](const GenericKey<8> &key, const RID &rid) {
+                          const int64_t k = key.ToString();
+                          ordered = ordered && k > prev && rid == RID(k);
+                          even_keys += static_cast<int64_t>(k % 2 == 0);
+                          prev = k;
+                        });
+        EXPECT_TRUE(ordered);
+        EXPECT_EQ(even_keys, bounded ? scale / 8 : scale / 2);
+      } while (writers_left > 0);
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+
+  std::vector<RID> rids;
+  for (int64_t key = 0; key < scale; key++) {
+    rids.clear();
+    index_key.SetFromInteger(key);
+    EXPECT_TRUE(tree->GetValue(index_key, &rids));
+    ASSERT_EQ(rids.size(), 1);
+    EXPECT_EQ(rids[0], RID(key));
+  }
+  int64_t count = 0;
+  tree->ScanRange(nullptr, nullptr, [&](const GenericKey<8> &key, const RID &rid) {
+    EXPECT_EQ(key.ToString(), count);
+    count++;
+  });
+  EXPECT_EQ(count, scale);
+}
+
+// NOLINTNEXTLINE
+TEST(BPlusTreeBLinkTest, ConcurrentInsertScanTest) {
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+  page_id_t page_id;
+  bpm->NewPage(&page_id);
+  // Small pages, so that leaves, internal pages and the root keep splitting while the scans run.
+  BLinkTree tree("foo_pk", page_id, bpm, comparator, 3, 3);
+
+  RunInsertScanTest(&tree, 4000, 4, 4);
+
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete bpm;
+}
+
+// NOLINTNEXTLINE
+TEST(BPlusTreeBLinkTest, ConcurrentInsertDeleteTest) {
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+  page_id_t page_id;
+  bpm->NewPage(&page_id);
+  BLinkTree tree("foo_pk", page_id, bpm, comparator, 3, 3);
+
+  // Every thread inserts its own keys and deletes them again, except for the multiples of 3, so that splits race
+  // with merges on the same pages.
+  const int64_t scale = 3000;
+  const int64_t num_threads = 4;
+  std::vector<std::thread> threads;
+  for (int64_t tid = 0; tid < num_threads; tid++) {
+    threads.emplace_back([&, tid] {
+      GenericKey<8> key;
+      for (int64_t k = tid; k < scale; k += num_threads) {
+        key.SetFromInteger(k);
+        EXPECT_TRUE(tree.Insert(key, RID(k)));
+      }
+      for (int64_t k = tid; k < scale; k += num_threads) {
+        if (k % 3 != 0) {
+          key.SetFromInteger(k);
+          tree.Remove(key, nullptr);
+        }
+      }
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+
+  int64_t expected = 0;
+  tree.ScanRange(nullptr, nullptr, [&](const GenericKey<8> &key, const RID &rid) {
+    EXPECT_EQ(key.ToString(), expected);
+    EXPECT_EQ(rid, RID(expected));
+    expected += 3;
+  });
+  EXPECT_EQ(expected, scale);
+
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete bpm;
+}
+
+}  // namespace bustub
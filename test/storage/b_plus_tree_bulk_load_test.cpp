@@ -0,0 +1,172 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// b_plus_tree_bulk_load_test.cpp
+//
+// Identification: test/storage/b_plus_tree_bulk_load_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <algorithm>
+#include <mutex>  // NOLINT
+#include <utility>
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "gtest/gtest.h"
+#include "storage/disk/disk_manager_memory.h"
+#include "storage/index/b_plus_tree.h"
+#include "test_util.h"  // NOLINT
+
+namespace bustub {
+
+using LoadedTree = BPlusTree<GenericKey<8>, RID, GenericComparator<8>>;
+
+auto ScanKeys(LoadedTree *tree, const int64_t *low, const int64_t *high) -> std::vector<int64_t> {
+  GenericKey<8> low_key;
+  GenericKey<8> high_key;
+  if (low != nullptr) {
+    low_key.SetFromInteger(*low);
+  }
+  if (high != nullptr) {
+    high_key.SetFromInteger(*high);
+  }
+  std::vector<int64_t> keys;
+  tree->ScanRange(low == nullptr ? nullptr : &low_key, high == nullptr ? nullptr : &high_key,
+                  [&](const GenericKey<8> &key, const RID &rid) {
+                    EXPECT_EQ(rid, RID(key.ToString()));
+                    keys.push_back(key.ToString());
+                  });
+  return keys;
+}
+
+// NOLINTNEXTLINE
+TEST(BPlusTreeBulkLoadTest, ScanRangeTest) {
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+  page_id_t page_id;
+  bpm->NewPage(&page_id);
+  LoadedTree tree("foo_pk", page_id, bpm, comparator, 4, 4);
+
+  // Even keys only, so that range bounds can fall between keys.
+  const int64_t scale = 1000;
+  std::vector<std::pair<GenericKey<8>, RID>> entries;
+  std::vector<int64_t> keys;
+  for (int64_t key = 0; key < scale; key += 2) {
+    GenericKey<8> index_key;
+    index_key.SetFromInteger(key);
+    entries.emplace_back(index_key, RID(key));
+    keys.push_back(key);
+  }
+  ASSERT_TRUE(tree.BulkLoad(entries, 4));
+  EXPECT_FALSE(tree.BulkLoad(entries, 4));
+
+  EXPECT_EQ(ScanKeys(&tree, nullptr, nullptr), keys);
+  const std::vector<std::pair<int64_t, int64_t>> ranges{{0, 10}, {1, 11},     {100, 101}, {99, 99},    {500, 400},
+                                                        {-5, 3}, {996, 2000}, {998, 999}, {2000, 3000}};
+  for (const auto &[low, high] : ranges) {
+    std::vector<int64_t> expected;
+    std::copy_if(keys.begin(), keys.end(), std::back_inserter(expected),
+                 [&, low = low, high = high](int64_t key) { return key >= low && key < high; });
+    EXPECT_EQ(ScanKeys(&tree, &low, &high), expected) << "[" << low << ", " << high << ")";
+    std::vector<int64_t> from_low;
+    std::copy_if(keys.begin(), keys.end(), std::back_inserter(from_low),
+                 [&, low = low](int64_t key) { return key >= low; });
+    EXPECT_EQ(ScanKeys(&tree, &low, nullptr), from_low);
+  }
+
+  // The loaded tree takes inserts and deletes like any other.
+  GenericKey<8> index_key;
+  for (int64_t key = 1; key < scale; key += 2) {
+    index_key.SetFromInteger(key);
+    ASSERT_TRUE(tree.Insert(index_key, RID(key)));
+  }
+  for (int64_t key = 0; key < scale; key += 4) {
+    index_key.SetFromInteger(key);
+    tree.Remove(index_key, nullptr);
+  }
+  keys.clear();
+  for (int64_t key = 0; key < scale; key++) {
+    if (key % 4 != 0) {
+      keys.push_back(key);
+    }
+  }
+  EXPECT_EQ(ScanKeys(&tree, nullptr, nullptr), keys);
+  std::vector<RID> rids;
+  for (int64_t key = 0; key < scale; key++) {
+    rids.clear();
+    index_key.SetFromInteger(key);
+    EXPECT_EQ(tree.GetValue(index_key, &rids), key % 4 != 0);
+  }
+
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete bpm;
+}
+
+// NOLINTNEXTLINE
+TEST(BPlusTreeBulkLoadTest, ParallelScanTest) {
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+  page_id_t page_id;
+  bpm->NewPage(&page_id);
+  LoadedTree tree("foo_pk", page_id, bpm, comparator, 4, 4);
+
+  // An empty tree has a single, unbounded range.
+  EXPECT_TRUE(tree.PartitionKeys(4).empty());
+
+  const int64_t scale = 2000;
+  std::vector<std::pair<GenericKey<8>, RID>> entries;
+  for (int64_t key = 0; key < scale; key++) {
+    GenericKey<8> index_key;
+    index_key.SetFromInteger(key);
+    entries.emplace_back(index_key, RID(key));
+  }
+  ASSERT_TRUE(tree.BulkLoad(entries, 3));
+
+  for (const size_t k : {1, 2, 4, 7, 1000}) {
+    const auto bounds = tree.PartitionKeys(k);
+    EXPECT_LT(bounds.size(), k);
+    EXPECT_TRUE(std::is_sorted(bounds.begin(), bounds.end(),
+                               [&](const auto &lhs, const auto &rhs) { return comparator(lhs, rhs) <= 0; }));
+
+    std::mutex latch;
+    std::vector<std::vector<int64_t>> parts(bounds.size() + 1);
+    EXPECT_EQ(tree.ParallelScan(k,
+                                [&](size_t part, const GenericKey<8> &key, const RID &rid) {
+                                  std::scoped_lock lock(latch);
+                                  parts[part].push_back(key.ToString());
+                                }),
+              bounds.size() + 1);
+
+    // Every range holds the keys between its bounds, in order, and the ranges cover the tree exactly once.
+    std::vector<int64_t> all;
+    for (size_t part = 0; part < parts.size(); part++) {
+      for (const auto key : parts[part]) {
+        EXPECT_TRUE(part == 0 || key >= bounds[part - 1].ToString());
+        EXPECT_TRUE(part == bounds.size() || key < bounds[part].ToString());
+      }
+      EXPECT_TRUE(std::is_sorted(parts[part].begin(), parts[part].end()));
+      all.insert(all.end(), parts[part].begin(), parts[part].end());
+    }
+    ASSERT_EQ(all.size(), scale);
+    for (int64_t key = 0; key < scale; key++) {
+      EXPECT_EQ(all[key], key);
+    }
+  }
+  // With 4 leaves per internal page, the tree is deep enough to give 7 ranges.
+  EXPECT_EQ(tree.PartitionKeys(7).size(), 6);
+
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete bpm;
+}
+
+}  // namespace bustub
@@ -10,6 +10,7 @@
 //
 //===----------------------------------------------------------------------===//
 
+#include <atomic>
 #include <chrono>  // NOLINT
 #include <cstdio>
 #include <functional>
@@ -402,4 +403,63 @@ TEST(BPlusTreeConcurrentTest, MixTest2) {
   delete bpm;
 }
 
+TEST(BPlusTreeConcurrentTest, DeferredDeleteTest) {
+  // create KeyComparator and index schema
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+
+  // create and fetch header_page
+  page_id_t page_id;
+  bpm->NewPage(&page_id);
+  // create b+ tree
+  BPlusTree<GenericKey<8>, RID, GenericComparator<8>> tree("foo_pk", page_id, bpm, comparator, 3, 3);
+  tree.SetDeleteMode(DeleteMode::DEFERRED);
+
+  std::vector<int64_t> perserved_keys;
+  std::vector<int64_t> dynamic_keys;
+  for (int64_t i = 1; i <= 1000; i++) {
+    if (i % 5 == 0) {
+      perserved_keys.push_back(i);
+    } else {
+      dynamic_keys.push_back(i);
+    }
+  }
+  InsertHelper(&tree, perserved_keys);
+  InsertHelper(&tree, dynamic_keys);
+
+  // The compaction pass runs in the background while keys are deleted, inserted again and looked up.
+  std::atomic<bool> done{false};
+  std::thread compactor([&] {
+    while (!done) {
+      tree.CompactDeferred();
+    }
+  });
+  std::vector<std::thread> threads;
+  for (uint64_t tid = 0; tid < 4; tid++) {
+    threads.emplace_back([&, tid] {
+      DeleteHelperSplit(&tree, dynamic_keys, 4, tid);
+      InsertHelperSplit(&tree, dynamic_keys, 4, tid);
+      DeleteHelperSplit(&tree, dynamic_keys, 4, tid);
+      LookupHelper(&tree, perserved_keys, tid);
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  done = true;
+  compactor.join();
+  tree.CompactDeferred();
+
+  std::vector<int64_t> scanned;
+  tree.ScanRange(nullptr, nullptr,
+                 [&](const GenericKey<8> &key, const RID &rid) { scanned.push_back(key.ToString()); });
+  EXPECT_EQ(scanned, perserved_keys);
+
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete bpm;
+}
+
 }  // namespace bustub
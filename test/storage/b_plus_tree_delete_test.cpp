@@ -156,4 +156,75 @@ TEST(BPlusTreeTests, DeleteTest2) {
   delete transaction;
   delete bpm;
 }
+
+TEST(BPlusTreeTests, DeferredDeleteTest) {
+  // create KeyComparator and index schema
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+  // create and fetch header_page
+  page_id_t page_id;
+  auto header_page = bpm->NewPage(&page_id);
+  // create b+ tree
+  BPlusTree<GenericKey<8>, RID, GenericComparator<8>> tree("foo_pk", header_page->GetPageId(), bpm, comparator, 4, 4);
+  GenericKey<8> index_key;
+  // create transaction
+  auto *transaction = new Transaction(0);
+
+  const int64_t scale = 400;
+  for (int64_t key = 0; key < scale; key++) {
+    index_key.SetFromInteger(key);
+    tree.Insert(index_key, RID(key), transaction);
+  }
+  auto check_keys = [&](auto is_present) {
+    std::vector<RID> rids;
+    for (int64_t key = 0; key < scale; key++) {
+      rids.clear();
+      index_key.SetFromInteger(key);
+      EXPECT_EQ(tree.GetValue(index_key, &rids), is_present(key));
+    }
+    int64_t prev = -1;
+    tree.ScanRange(nullptr, nullptr, [&](const GenericKey<8> &key, const RID &rid) {
+      EXPECT_GT(key.ToString(), prev);
+      EXPECT_TRUE(is_present(key.ToString()));
+      prev = key.ToString();
+    });
+  };
+
+  // EAGER deletes rebalance right away and leave nothing to compact.
+  for (int64_t key = 1; key < scale; key += 10) {
+    index_key.SetFromInteger(key);
+    tree.Remove(index_key, transaction);
+  }
+  EXPECT_EQ(tree.CompactDeferred(transaction), 0);
+  check_keys([](int64_t key) { return key % 10 != 1; });
+
+  // DEFERRED deletes only record the underflowing leaves, which the next compaction pass rebalances.
+  tree.SetDeleteMode(DeleteMode::DEFERRED);
+  for (int64_t key = 0; key < scale; key++) {
+    if (key % 10 > 1) {
+      index_key.SetFromInteger(key);
+      tree.Remove(index_key, transaction);
+    }
+  }
+  check_keys([](int64_t key) { return key % 10 == 0; });
+  EXPECT_GT(tree.CompactDeferred(transaction), 0);
+  EXPECT_EQ(tree.CompactDeferred(transaction), 0);
+  check_keys([](int64_t key) { return key % 10 == 0; });
+
+  // Below the merge threshold, which is the min leaf size here, deletes rebalance right away again.
+  tree.SetDeleteMode(DeleteMode::DEFERRED, 2);
+  for (int64_t key = 0; key < scale; key += 20) {
+    index_key.SetFromInteger(key);
+    tree.Remove(index_key, transaction);
+  }
+  EXPECT_EQ(tree.CompactDeferred(transaction), 0);
+  check_keys([](int64_t key) { return key % 20 == 10; });
+
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete transaction;
+  delete bpm;
+}
 }  // namespace bustub
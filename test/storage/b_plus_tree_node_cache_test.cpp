@@ -0,0 +1,105 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// b_plus_tree_node_cache_test.cpp
+//
+// Identification: test/storage/b_plus_tree_node_cache_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <thread>  // NOLINT
+#include <vector>
+
+#include "buffer/buffer_pool_manager.h"
+#include "gtest/gtest.h"
+#include "storage/disk/disk_manager_memory.h"
+#include "storage/index/b_plus_tree.h"
+#include "test_util.h"  // NOLINT
+
+namespace bustub {
+
+using CachedTree = BPlusTree<GenericKey<8>, RID, GenericComparator<8>>;
+
+void CheckKeys(CachedTree *tree, int64_t scale, const std::function<bool(int64_t)> &is_present) {
+  GenericKey<8> index_key;
+  std::vector<RID> rids;
+  for (int64_t key = 0; key < scale; key++) {
+    rids.clear();
+    index_key.SetFromInteger(key);
+    ASSERT_EQ(tree->GetValue(index_key, &rids), is_present(key)) << "key " << key;
+    if (is_present(key)) {
+      EXPECT_EQ(rids[0], RID(key));
+    }
+  }
+}
+
+// NOLINTNEXTLINE
+TEST(BPlusTreeNodeCacheTest, SplitMergeTest) {
+  auto key_schema = ParseCreateStatement("a bigint");
+  GenericComparator<8> comparator(key_schema.get());
+
+  auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
+  auto *bpm = new BufferPoolManager(50, disk_manager.get());
+  page_id_t page_id;
+  bpm->NewPage(&page_id);
+  CachedTree tree("foo_pk", page_id, bpm, comparator, 3, 3);
+  // Cache the top three levels, so that the cached levels split, merge and move as the tree grows and shrinks.
+  tree.SetNodeCache(3, 16);
+
+  const int64_t scale = 1000;
+  GenericKey<8> index_key;
+  // Grow the tree one key at a time, looking up every key after each root split, so that stale cached pages would
+  // route descents to the wrong leaves.
+  for (int64_t key = 0; key < scale; key++) {
+    index_key.SetFromInteger(key);
+    ASSERT_TRUE(tree.Insert(index_key, RID(key)));
+    if ((key & (key + 1)) == 0) {
+      CheckKeys(&tree, key + 1, [](int64_t) { return true; });
+    }
+  }
+  CheckKeys(&tree, scale, [](int64_t) { return true; });
+
+  // Merges retire the cached internal pages and collapse the root.
+  for (int64_t key = 0; key < scale; key++) {
+    if (key % 50 != 0) {
+      index_key.SetFromInteger(key);
+      tree.Remove(index_key, nullptr);
+    }
+  }
+  CheckKeys(&tree, scale, [](int64_t key) { return key % 50 == 0; });
+
+  // Grow the tree again, concurrently, while the cache is rebuilt.
+  std::vector<std::thread> threads;
+  for (int64_t tid = 0; tid < 4; tid++) {
+    threads.emplace_back([&, tid] {
+      GenericKey<8> key;
+      for (int64_t k = tid; k < scale; k += 4) {
+        if (k % 50 != 0) {
+          key.SetFromInteger(k);
+          EXPECT_TRUE(tree.Insert(key, RID(k)));
+        }
+      }
+    });
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+  CheckKeys(&tree, scale, [](int64_t) { return true; });
+
+  // Empty the tree: the cache must let go of the last root.
+  for (int64_t key = 0; key < scale; key++) {
+    index_key.SetFromInteger(key);
+    tree.Remove(index_key, nullptr);
+  }
+  EXPECT_TRUE(tree.IsEmpty());
+  CheckKeys(&tree, scale, [](int64_t) { return false; });
+
+  tree.SetNodeCache(0);
+  bpm->UnpinPage(HEADER_PAGE_ID, true);
+  delete bpm;
+}
+
+}  // namespace bustub
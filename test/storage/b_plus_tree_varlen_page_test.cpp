@@ -0,0 +1,141 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// b_plus_tree_varlen_page_test.cpp
+//
+// Identification: test/storage/b_plus_tree_varlen_page_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <algorithm>
+#include <string>
+#include <vector>
+
+#include "common/rid.h"
+#include "gtest/gtest.h"
+#include "storage/index/key_encoder.h"
+#include "storage/page/b_plus_tree_varlen_page.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+using VarlenLeafPage = BPlusTreeVarlenPage<RID>;
+
+TEST(KeyEncoderTest, OrderTest) {
+  std::vector<int32_t> ints{-100, -1, 0, 1, 7, 256, 65536, BUSTUB_INT32_MAX};
+  for (size_t i = 1; i < ints.size(); i++) {
+    auto lhs = KeyEncoder::EncodeValues({ValueFactory::GetIntegerValue(ints[i - 1])});
+    auto rhs = KeyEncoder::EncodeValues({ValueFactory::GetIntegerValue(ints[i])});
+    ASSERT_LT(KeyEncoder::Compare(lhs, rhs), 0) << ints[i - 1] << " vs " << ints[i];
+  }
+
+  std::vector<double> decimals{-1e10, -2.5, -0.5, 0.0, 0.5, 2.5, 1e10};
+  for (size_t i = 1; i < decimals.size(); i++) {
+    auto lhs = KeyEncoder::EncodeValues({ValueFactory::GetDecimalValue(decimals[i - 1])});
+    auto rhs = KeyEncoder::EncodeValues({ValueFactory::GetDecimalValue(decimals[i])});
+    ASSERT_LT(KeyEncoder::Compare(lhs, rhs), 0) << decimals[i - 1] << " vs " << decimals[i];
+  }
+
+  // NULL sorts first
+  auto null_key = KeyEncoder::EncodeValues({ValueFactory::GetNullValueByType(TypeId::INTEGER)});
+  auto min_key = KeyEncoder::EncodeValues({ValueFactory::GetIntegerValue(BUSTUB_INT32_MIN)});
+  ASSERT_LT(KeyEncoder::Compare(null_key, min_key), 0);
+}
+
+TEST(KeyEncoderTest, CompositeVarcharTest) {
+  // A shorter string must sort before its extensions even when followed by another column.
+  auto k1 = KeyEncoder::EncodeValues({ValueFactory::GetVarcharValue("ab"), ValueFactory::GetIntegerValue(100)});
+  auto k2 = KeyEncoder::EncodeValues({ValueFactory::GetVarcharValue("abc"), ValueFactory::GetIntegerValue(0)});
+  auto k3 = KeyEncoder::EncodeValues({ValueFactory::GetVarcharValue("abc"), ValueFactory::GetIntegerValue(1)});
+  auto k4 = KeyEncoder::EncodeValues({ValueFactory::GetVarcharValue("b"), ValueFactory::GetIntegerValue(-5)});
+  ASSERT_LT(KeyEncoder::Compare(k1, k2), 0);
+  ASSERT_LT(KeyEncoder::Compare(k2, k3), 0);
+  ASSERT_LT(KeyEncoder::Compare(k3, k4), 0);
+  ASSERT_EQ(KeyEncoder::Compare(k3, k3), 0);
+}
+
+TEST(BPlusTreeVarlenPageTest, InsertLookupRemoveTest) {
+  alignas(8) char data[BUSTUB_PAGE_SIZE];
+  auto *page = reinterpret_cast<VarlenLeafPage *>(data);
+  page->Init(IndexPageType::LEAF_PAGE);
+  ASSERT_TRUE(page->IsLeafPage());
+
+  std::vector<std::string> names{"delta", "alpha", "charlie", "bravo", "echo"};
+  for (size_t i = 0; i < names.size(); i++) {
+    auto key = KeyEncoder::EncodeValues({ValueFactory::GetVarcharValue(names[i])});
+    ASSERT_TRUE(page->Insert(key, RID(0, i)));
+    ASSERT_FALSE(page->Insert(key, RID(1, i)));
+  }
+  ASSERT_EQ(page->GetSize(), 5);
+
+  // slots are kept in key order
+  for (int i = 1; i < page->GetSize(); i++) {
+    ASSERT_LT(KeyEncoder::Compare(page->KeyAt(i - 1), page->KeyAt(i)), 0);
+  }
+
+  RID rid;
+  auto charlie = KeyEncoder::EncodeValues({ValueFactory::GetVarcharValue("charlie")});
+  ASSERT_TRUE(page->Lookup(charlie, &rid));
+  ASSERT_EQ(rid, RID(0, 2));
+
+  auto before = page->FreeSpace();
+  ASSERT_TRUE(page->Remove(charlie));
+  ASSERT_FALSE(page->Lookup(charlie, &rid));
+  ASSERT_GT(page->FreeSpace(), before);
+  ASSERT_EQ(page->GetSize(), 4);
+}
+
+TEST(BPlusTreeVarlenPageTest, FillCompactSplitTest) {
+  alignas(8) char data[BUSTUB_PAGE_SIZE];
+  alignas(8) char sibling_data[BUSTUB_PAGE_SIZE];
+  auto *page = reinterpret_cast<VarlenLeafPage *>(data);
+  auto *sibling = reinterpret_cast<VarlenLeafPage *>(sibling_data);
+  page->Init(IndexPageType::LEAF_PAGE);
+  sibling->Init(IndexPageType::LEAF_PAGE);
+
+  // Fill the page with keys of varying length until it is full.
+  std::vector<std::string> keys;
+  for (int i = 0;; i++) {
+    auto key = KeyEncoder::EncodeValues(
+        {ValueFactory::GetVarcharValue(std::string(i % 17, 'x')), ValueFactory::GetIntegerValue(i)});
+    if (!page->CanInsert(key.size())) {
+      ASSERT_FALSE(page->Insert(key, RID(i, i)));
+      break;
+    }
+    ASSERT_TRUE(page->Insert(key, RID(i, i)));
+    keys.push_back(key);
+  }
+
+  // Remove every other key and insert them back; this only works if fragmented space is reclaimed.
+  for (size_t i = 0; i < keys.size(); i += 2) {
+    ASSERT_TRUE(page->Remove(keys[i]));
+  }
+  for (size_t i = 0; i < keys.size(); i += 2) {
+    ASSERT_TRUE(page->Insert(keys[i], RID(i, i)));
+  }
+  ASSERT_EQ(page->GetSize(), static_cast<int>(keys.size()));
+
+  page->MoveHalfTo(sibling);
+  ASSERT_GT(page->GetSize(), 0);
+  ASSERT_GT(sibling->GetSize(), 0);
+  ASSERT_EQ(page->GetSize() + sibling->GetSize(), static_cast<int>(keys.size()));
+  ASSERT_LT(KeyEncoder::Compare(page->KeyAt(page->GetSize() - 1), sibling->KeyAt(0)), 0);
+
+  std::sort(keys.begin(), keys.end(), [](const auto &a, const auto &b) { return KeyEncoder::Compare(a, b) < 0; });
+  for (const auto &key : keys) {
+    RID rid;
+    ASSERT_TRUE(page->Lookup(key, &rid) || sibling->Lookup(key, &rid));
+  }
+
+  sibling->MoveAllTo(page);
+  ASSERT_EQ(sibling->GetSize(), 0);
+  ASSERT_EQ(page->GetSize(), static_cast<int>(keys.size()));
+  for (int i = 0; i < page->GetSize(); i++) {
+    ASSERT_EQ(page->KeyAt(i), keys[i]);
+  }
+}
+
+}  // namespace bustub
@@ -10,6 +10,7 @@
 //
 //===----------------------------------------------------------------------===//
 
+#include <string>
 #include <vector>
 
 #include "gtest/gtest.h"
@@ -19,7 +20,7 @@
 namespace bustub {
 
 // NOLINTNEXTLINE
-TEST(TmpTuplePageTest, DISABLED_BasicTest) {
+TEST(TmpTuplePageTest, BasicTest) {
   // There are many ways to do this assignment, and this is only one of them.
   // If you don't like the TmpTuplePage idea, please feel free to delete this test case entirely.
   // You will get full credit as long as you are correctly using a linear probe hash table.
@@ -48,4 +49,44 @@ TEST(TmpTuplePageTest, DISABLED_BasicTest) {
   ASSERT_EQ(*reinterpret_cast<uint32_t *>(data + BUSTUB_PAGE_SIZE - 4), 123);
 }
 
+// NOLINTNEXTLINE
+TEST(TmpTuplePageTest, InsertGetTest) {
+  Page page;
+  auto *tmp_page = reinterpret_cast<TmpTuplePage *>(&page);
+  tmp_page->Init(15445, BUSTUB_PAGE_SIZE);
+  ASSERT_EQ(tmp_page->GetTablePageId(), 15445);
+  ASSERT_EQ(tmp_page->GetFreeSpacePointer(), BUSTUB_PAGE_SIZE);
+
+  Schema schema{std::vector{Column{"a", TypeId::INTEGER}, Column{"b", TypeId::VARCHAR, 64}}};
+  std::vector<TmpTuple> locations;
+  int inserted = 0;
+  while (true) {
+    Tuple tuple{
+        {ValueFactory::GetIntegerValue(inserted), ValueFactory::GetVarcharValue(std::string(inserted % 7, 'x'))},
+        &schema};
+    TmpTuple out{INVALID_PAGE_ID, 0};
+    if (!tmp_page->Insert(tuple, &out)) {
+      break;
+    }
+    ASSERT_EQ(out.GetPageId(), 15445);
+    locations.push_back(out);
+    inserted++;
+  }
+  ASSERT_GT(inserted, 100);
+  ASSERT_LT(tmp_page->GetFreeSpaceRemaining(), 64);
+
+  // Walking up from the free space pointer visits the tuples newest first.
+  int expected = inserted - 1;
+  Tuple tuple;
+  for (uint32_t offset = tmp_page->GetFreeSpacePointer(); offset < BUSTUB_PAGE_SIZE;
+       offset = tmp_page->Get(offset, &tuple)) {
+    ASSERT_EQ(offset, locations[expected].GetOffset());
+    tmp_page->Get(offset, &tuple);
+    ASSERT_EQ(tuple.GetValue(&schema, 0).GetAs<int32_t>(), expected);
+    ASSERT_EQ(tuple.GetValue(&schema, 1).GetAs<char *>(), std::string(expected % 7, 'x'));
+    expected--;
+  }
+  ASSERT_EQ(expected, -1);
+}
+
 }  // namespace bustub
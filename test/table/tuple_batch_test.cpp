@@ -0,0 +1,87 @@
+//===----------------------------------------------------------------------===//
+//
+//                         BusTub
+//
+// tuple_batch_test.cpp
+//
+// Identification: test/table/tuple_batch_test.cpp
+//
+// Copyright (c) 2015-2023, Carnegie Mellon University Database Group
+//
+//===----------------------------------------------------------------------===//
+
+#include <memory>
+#include <vector>
+
+#include "execution/expressions/arithmetic_expression.h"
+#include "execution/expressions/column_value_expression.h"
+#include "execution/expressions/comparison_expression.h"
+#include "execution/expressions/constant_value_expression.h"
+#include "gtest/gtest.h"
+#include "storage/table/tuple_batch.h"
+#include "type/value_factory.h"
+
+namespace bustub {
+
+// NOLINTNEXTLINE
+TEST(TupleBatchTest, AppendCompactTest) {
+  Schema schema{std::vector{Column{"a", TypeId::INTEGER}, Column{"b", TypeId::VARCHAR, 16}}};
+  TupleBatch batch{&schema};
+  for (int i = 0; i < 10; i++) {
+    Tuple tuple{{ValueFactory::GetIntegerValue(i), ValueFactory::GetVarcharValue(std::to_string(i))}, &schema};
+    batch.AppendTuple(tuple, RID{0, static_cast<uint32_t>(i)});
+  }
+  ASSERT_EQ(batch.Size(), 10);
+  ASSERT_EQ(batch.ValueAt(3, 0).GetAs<int32_t>(), 3);
+
+  std::vector<bool> selection(10);
+  for (int i = 0; i < 10; i++) {
+    selection[i] = i % 3 == 0;
+  }
+  batch.Compact(selection);
+  ASSERT_EQ(batch.Size(), 4);
+  for (size_t row = 0; row < batch.Size(); row++) {
+    auto tuple = batch.GetTuple(row);
+    ASSERT_EQ(tuple.GetValue(&schema, 0).GetAs<int32_t>(), static_cast<int32_t>(row * 3));
+    ASSERT_EQ(tuple.GetValue(&schema, 1).ToString(), std::to_string(row * 3));
+    ASSERT_EQ(batch.GetRID(row).GetSlotNum(), row * 3);
+  }
+
+  batch.Truncate(1);
+  ASSERT_EQ(batch.Size(), 1);
+  batch.Clear();
+  ASSERT_TRUE(batch.IsEmpty());
+}
+
+// NOLINTNEXTLINE
+TEST(TupleBatchTest, EvaluateBatchTest) {
+  Schema schema{std::vector{Column{"a", TypeId::INTEGER}, Column{"b", TypeId::INTEGER}}};
+  TupleBatch batch{&schema};
+  for (int i = 0; i < 100; i++) {
+    batch.AppendRow({ValueFactory::GetIntegerValue(i), ValueFactory::GetIntegerValue(100 - i)}, RID{});
+  }
+  batch.ColumnMut(1)[7] = ValueFactory::GetNullValueByType(TypeId::INTEGER);
+
+  auto col_a = std::make_shared<ColumnValueExpression>(0, 0, TypeId::INTEGER);
+  auto col_b = std::make_shared<ColumnValueExpression>(0, 1, TypeId::INTEGER);
+  auto sum = std::make_shared<ArithmeticExpression>(col_a, col_b, ArithmeticType::Plus);
+  auto pred = std::make_shared<ComparisonExpression>(
+      sum, std::make_shared<ConstantValueExpression>(ValueFactory::GetIntegerValue(100)), ComparisonType::Equal);
+
+  // The batch result must match row-at-a-time evaluation, including NULL propagation.
+  std::vector<Value> results;
+  pred->EvaluateBatch(batch, &results);
+  ASSERT_EQ(results.size(), batch.Size());
+  for (size_t row = 0; row < batch.Size(); row++) {
+    auto tuple = batch.GetTuple(row);
+    auto expected = pred->Evaluate(&tuple, schema);
+    ASSERT_EQ(results[row].IsNull(), expected.IsNull());
+    if (!expected.IsNull()) {
+      ASSERT_EQ(results[row].GetAs<bool>(), expected.GetAs<bool>());
+    }
+  }
+  ASSERT_TRUE(results[7].IsNull());
+  ASSERT_TRUE(results[8].GetAs<bool>());
+}
+
+}  // namespace bustub
@@ -34,6 +34,7 @@ auto ClockMs() -> uint64_t {
 
 static const size_t BUSTUB_READ_THREAD = 4;
 static const size_t BUSTUB_WRITE_THREAD = 2;
+static const size_t BUSTUB_MAX_THREAD = 64;
 static const size_t LRU_K_SIZE = 4;
 static const size_t BUSTUB_BPM_SIZE = 256;
 static const size_t TOTAL_KEYS = 100000;
@@ -119,6 +120,9 @@ auto main(int argc, char **argv) -> int {
 
   argparse::ArgumentParser program("bustub-btree-bench");
   program.add_argument("--duration").help("run btree bench for n milliseconds");
+  program.add_argument("--read-threads").help("number of reader threads");
+  program.add_argument("--write-threads").help("number of writer threads");
+  program.add_argument("--node-cache-levels").help("number of upper b+ tree levels to keep pinned");
 
   try {
     program.parse_args(argc, argv);
@@ -133,11 +137,33 @@ auto main(int argc, char **argv) -> int {
     duration_ms = std::stoi(program.get("--duration"));
   }
 
+  size_t read_threads = BUSTUB_READ_THREAD;
+  if (program.present("--read-threads")) {
+    read_threads = std::stoul(program.get("--read-threads"));
+  }
+
+  size_t write_threads = BUSTUB_WRITE_THREAD;
+  if (program.present("--write-threads")) {
+    write_threads = std::stoul(program.get("--write-threads"));
+  }
+
+  if (read_threads + write_threads == 0 || read_threads + write_threads > BUSTUB_MAX_THREAD) {
+    std::cerr << "the total number of threads must be between 1 and " << BUSTUB_MAX_THREAD << std::endl;
+    return 1;
+  }
+
+  int node_cache_levels = 0;
+  if (program.present("--node-cache-levels")) {
+    node_cache_levels = std::stoi(program.get("--node-cache-levels"));
+  }
+
   auto disk_manager = std::make_unique<DiskManagerUnlimitedMemory>();
   auto bpm = std::make_unique<BufferPoolManager>(BUSTUB_BPM_SIZE, disk_manager.get(), LRU_K_SIZE);
 
-  fmt::print(stderr, "[info] total_keys={}, duration_ms={}, lru_k_size={}, bpm_size={}\n", TOTAL_KEYS, duration_ms,
-             LRU_K_SIZE, BUSTUB_BPM_SIZE);
+  fmt::print(stderr,
+             "[info] total_keys={}, duration_ms={}, lru_k_size={}, bpm_size={}, read_threads={}, write_threads={}, "
+             "node_cache_levels={}\n",
+             TOTAL_KEYS, duration_ms, LRU_K_SIZE, BUSTUB_BPM_SIZE, read_threads, write_threads, node_cache_levels);
 
   auto key_schema = bustub::ParseCreateStatement("a bigint");
   bustub::GenericComparator<8> comparator(key_schema.get());
@@ -147,6 +173,7 @@ auto main(int argc, char **argv) -> int {
 
   bustub::BPlusTree<bustub::GenericKey<8>, bustub::RID, bustub::GenericComparator<8>> index("foo_pk", page_id,
                                                                                             bpm.get(), comparator);
+  index.SetNodeCache(node_cache_levels);
 
   for (size_t key = 0; key < TOTAL_KEYS; key++) {
     bustub::GenericKey<8> index_key;
@@ -164,13 +191,13 @@ auto main(int argc, char **argv) -> int {
 
   std::vector<std::thread> threads;
 
-  for (size_t thread_id = 0; thread_id < BUSTUB_READ_THREAD; thread_id++) {
-    threads.emplace_back(std::thread([thread_id, &index, duration_ms, &total_metrics] {
+  for (size_t thread_id = 0; thread_id < read_threads; thread_id++) {
+    threads.emplace_back(std::thread([thread_id, read_threads, &index, duration_ms, &total_metrics] {
       BTreeMetrics metrics(fmt::format("read  {:>2}", thread_id), duration_ms);
       metrics.Begin();
 
-      size_t key_start = TOTAL_KEYS / BUSTUB_READ_THREAD * thread_id;
-      size_t key_end = TOTAL_KEYS / BUSTUB_READ_THREAD * (thread_id + 1);
+      size_t key_start = TOTAL_KEYS / read_threads * thread_id;
+      size_t key_end = TOTAL_KEYS / read_threads * (thread_id + 1);
       std::random_device r;
       std::default_random_engine gen(r());
       std::uniform_int_distribution<size_t> dis(key_start, key_end - 1);
@@ -210,13 +237,13 @@ auto main(int argc, char **argv) -> int {
     }));
   }
 
-  for (size_t thread_id = 0; thread_id < BUSTUB_WRITE_THREAD; thread_id++) {
-    threads.emplace_back(std::thread([thread_id, &index, duration_ms, &total_metrics] {
+  for (size_t thread_id = 0; thread_id < write_threads; thread_id++) {
+    threads.emplace_back(std::thread([thread_id, write_threads, &index, duration_ms, &total_metrics] {
       BTreeMetrics metrics(fmt::format("write {:>2}", thread_id), duration_ms);
       metrics.Begin();
 
-      size_t key_start = TOTAL_KEYS / BUSTUB_WRITE_THREAD * thread_id;
-      size_t key_end = TOTAL_KEYS / BUSTUB_WRITE_THREAD * (thread_id + 1);
+      size_t key_start = TOTAL_KEYS / write_threads * thread_id;
+      size_t key_end = TOTAL_KEYS / write_threads * (thread_id + 1);
       std::random_device r;
       std::default_random_engine gen(r());
       std::uniform_int_distribution<size_t> dis(key_start, key_end - 1);
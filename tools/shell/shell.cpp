@@ -95,11 +95,8 @@ auto main(int argc, char **argv) -> int {
     }
 
     try {
-      auto writer = bustub::FortTableWriter();
+      auto writer = bustub::FortTableWriter(&std::cout);
       bustub->ExecuteSql(query, writer);
-      for (const auto &table : writer.tables_) {
-        std::cout << table;
-      }
     } catch (bustub::Exception &ex) {
       std::cerr << ex.what() << std::endl;
     }
@@ -1,3 +1,4 @@
+#include <cstdio>
 #include <fstream>
 #include <ios>
 #include <iostream>
@@ -282,9 +283,16 @@ auto main(int argc, char **argv) -> int {  // NOLINT
 
           std::stringstream result;
           auto writer = bustub::SimpleStreamWriter(result, true, " ");
-          bustub->ExecuteSql(query.sql_, writer, check_options);
           if (verbose) {
-            fmt::print("--- YOUR RESULT ---\n{}\n", result.str());
+            // Show the result while the query runs.
+            fmt::print("--- YOUR RESULT ---\n");
+            std::fflush(stdout);
+            auto echo = bustub::SimpleStreamWriter(std::cout, true, " ");
+            auto tee = bustub::TeeWriter(&writer, &echo);
+            bustub->ExecuteSql(query.sql_, tee, check_options);
+            fmt::print("\n");
+          } else {
+            bustub->ExecuteSql(query.sql_, writer, check_options);
           }
           if (verbose) {
             fmt::print("--- EXPECTED RESULT ---\n{}\n", query.expected_result_);